@@ -38,7 +38,14 @@ class LocalArchiveBackend:
         session = storage.get_session(session_id)
         if not session:
             raise ValueError("session not found")
-        runs = [run for run in storage.list_runs(org_id=None, limit=10000) if run.session_id == session_id]
+        runs = []
+        cursor = None
+        while True:
+            page = storage.list_runs_page(session_id=session_id, limit=500, cursor=cursor)
+            runs.extend(page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
         payload: Dict[str, Any] = {
             "session": asdict(session),
             "runs": [asdict(run) for run in runs],
@@ -57,8 +64,8 @@ class LocalArchiveBackend:
         if "run" in payload:
             run = RunMetadata(**_normalize_run_payload(payload["run"]))
             storage.create_run(run)
-            for event_payload in payload.get("events", []):
-                event = StreamEnvelope(
+            events = [
+                StreamEnvelope(
                     run_id=event_payload["run_id"],
                     session_id=event_payload["session_id"],
                     stream=StreamChannel(event_payload["stream"]),
@@ -69,7 +76,9 @@ class LocalArchiveBackend:
                     status=event_payload.get("status"),
                     metadata=event_payload.get("metadata", {}),
                 )
-                storage.append_event(event)
+                for event_payload in payload.get("events", [])
+            ]
+            storage.append_events(events)
         if "runs" in payload:
             for run_payload in payload["runs"]:
                 storage.create_run(RunMetadata(**_normalize_run_payload(run_payload)))
@@ -3,13 +3,22 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
 import json
-from typing import Any, Awaitable, Callable, Dict, Optional
+import logging
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
 import sqlite3
+import threading
+import time
 import uuid
 
+from agent_sdk.execution.fair_share import TenantShare
+from agent_sdk.execution.queue_notify import QueueNotifier, notifier_for
+from agent_sdk.storage.async_facade import AsyncStorageBackend
+from agent_sdk.storage.sqlite_pool import SQLiteConnectionManager
+
 try:
     import redis  # type: ignore
 except Exception:  # pragma: no cover - optional
@@ -27,10 +36,19 @@ except Exception:  # pragma: no cover - optional
     KafkaConsumer = None
 
 
+logger = logging.getLogger(__name__)
+
+_SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _decode(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
 @dataclass
 class QueueJob:
     job_id: str
@@ -57,17 +75,36 @@ class QueueBackend:
 
 
 class SQLiteQueueBackend(QueueBackend):
-    def __init__(self, path: str):
+    """Job queue in a SQLite file, safe to share between worker processes.
+
+    Claims run inside ``BEGIN IMMEDIATE`` so only one connection can move a
+    job from ``queued`` to ``running``. A claimed job holds a lease of
+    ``visibility_timeout`` seconds; if it is neither finished nor requeued
+    before the lease expires (e.g. the worker died), the next claim counts
+    that as a failed attempt and makes the job visible again, or moves it to
+    the DLQ once ``max_attempts`` is spent. Every claim stamps the row with a
+    fresh lease token, and acknowledgements, requeues and lease extensions
+    only touch the row while it still carries this backend's token, so a
+    worker whose lease lapsed cannot finish or requeue a job someone else
+    has since claimed.
+
+    Jobs are queued per tenant (the payload's ``org_id``) and claims follow
+    the same weighted fair queuing as :class:`FairShareScheduler`: each
+    tenant's virtual time and :class:`TenantShare` live in the database, so
+    every worker process shares one fair order and one set of concurrency
+    caps. Within a tenant, lower ``priority`` values are claimed first, then
+    oldest first.
+    """
+
+    def __init__(self, path: str, visibility_timeout: float = 300.0, busy_timeout_ms: int = 5000):
         self.path = path
+        self.visibility_timeout = visibility_timeout
+        self._pool = SQLiteConnectionManager(path, busy_timeout_ms=busy_timeout_ms)
+        self._leases: Dict[str, str] = {}
         self._init_db()
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
     def _init_db(self) -> None:
-        with self._connect() as conn:
+        with self._pool.writer() as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS jobs (
@@ -93,139 +130,636 @@ class SQLiteQueueBackend(QueueBackend):
                 )
                 """
             )
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "priority" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+            if "lease_expires_at" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN lease_expires_at REAL")
+            if "org_id" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN org_id TEXT NOT NULL DEFAULT 'default'")
+            if "lease_token" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN lease_token TEXT")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS queue_tenants (
+                    org_id TEXT PRIMARY KEY,
+                    weight REAL NOT NULL DEFAULT 1.0,
+                    max_concurrency INTEGER,
+                    priority_class INTEGER NOT NULL DEFAULT 0,
+                    vtime REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS queue_meta (key TEXT PRIMARY KEY, value REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, priority, created_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs (status, lease_expires_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_tenant ON jobs (status, org_id, priority, created_at)"
+            )
+
+    def set_tenant_share(self, org_id: str, share: TenantShare) -> None:
+        with self._pool.writer() as conn:
+            conn.execute(
+                """
+                INSERT INTO queue_tenants (org_id, weight, max_concurrency, priority_class)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(org_id) DO UPDATE SET
+                    weight = excluded.weight,
+                    max_concurrency = excluded.max_concurrency,
+                    priority_class = excluded.priority_class
+                """,
+                (org_id, share.weight, share.max_concurrency, share.priority_class),
+            )
 
-    def enqueue(self, payload: Dict[str, Any], max_attempts: int) -> str:
+    def get_tenant_share(self, org_id: str) -> TenantShare:
+        with self._pool.reader() as conn:
+            row = conn.execute(
+                "SELECT weight, max_concurrency, priority_class FROM queue_tenants WHERE org_id = ?",
+                (org_id,),
+            ).fetchone()
+        if row is None:
+            return TenantShare()
+        return TenantShare(
+            weight=row["weight"],
+            max_concurrency=row["max_concurrency"],
+            priority_class=row["priority_class"],
+        )
+
+    def enqueue(self, payload: Dict[str, Any], max_attempts: int, priority: int = 0) -> str:
         job_id = f"job_{uuid.uuid4().hex}"
         now = _now_iso()
-        with self._connect() as conn:
+        org_id = payload.get("org_id") or "default"
+        with self._pool.writer() as conn:
+            backlogged = conn.execute(
+                "SELECT 1 FROM jobs WHERE status = 'queued' AND org_id = ? LIMIT 1", (org_id,)
+            ).fetchone()
+            if not backlogged:
+                # A tenant returning from idle starts at the current virtual clock.
+                clock = self._clock(conn)
+                conn.execute(
+                    """
+                    INSERT INTO queue_tenants (org_id, vtime) VALUES (?, ?)
+                    ON CONFLICT(org_id) DO UPDATE SET vtime = MAX(vtime, excluded.vtime)
+                    """,
+                    (org_id, clock),
+                )
             conn.execute(
                 """
-                INSERT INTO jobs (job_id, payload_json, status, attempts, max_attempts, last_error, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO jobs (job_id, payload_json, status, attempts, max_attempts, last_error,
+                                  created_at, updated_at, priority, org_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (job_id, json.dumps(payload), "queued", 0, max_attempts, None, now, now),
+                (job_id, json.dumps(payload), "queued", 0, max_attempts, None, now, now, priority, org_id),
             )
         return job_id
 
     def claim_next(self) -> Optional[QueueJob]:
-        with self._connect() as conn:
+        jobs = self.claim_batch(1)
+        return jobs[0] if jobs else None
+
+    def claim_batch(self, limit: int, visibility_timeout: Optional[float] = None) -> List[QueueJob]:
+        """Atomically lease up to ``limit`` jobs for ``visibility_timeout`` seconds."""
+        if limit <= 0:
+            return []
+        lease = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        now = time.time()
+        rows = []
+        with self._pool.writer() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._expire_leases(conn, now)
+            tenants = self._backlogged_tenants(conn)
+            clock = None
+            while len(rows) < limit:
+                org_id = self._pick_tenant(tenants)
+                if org_id is None:
+                    break
+                tenant = tenants[org_id]
+                row = self._claim_from(conn, org_id, now + lease)
+                if row is None:
+                    del tenants[org_id]
+                    continue
+                rows.append(row)
+                clock = tenant["vtime"]
+                tenant["vtime"] += 1.0 / max(tenant["weight"], 1e-9)
+                tenant["running"] += 1
+                conn.execute(
+                    """
+                    INSERT INTO queue_tenants (org_id, vtime) VALUES (?, ?)
+                    ON CONFLICT(org_id) DO UPDATE SET vtime = excluded.vtime
+                    """,
+                    (org_id, tenant["vtime"]),
+                )
+            if clock is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO queue_meta (key, value) VALUES ('clock', ?)", (clock,)
+                )
+        for row in rows:
+            self._leases[row["job_id"]] = row["lease_token"]
+        return [
+            QueueJob(
+                job_id=row["job_id"],
+                payload=json.loads(row["payload_json"] or "{}"),
+                attempts=row["attempts"],
+                max_attempts=row["max_attempts"],
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def _clock(conn: sqlite3.Connection) -> float:
+        row = conn.execute("SELECT value FROM queue_meta WHERE key = 'clock'").fetchone()
+        return row["value"] if row else 0.0
+
+    def _backlogged_tenants(self, conn: sqlite3.Connection) -> Dict[str, Dict[str, Any]]:
+        """Tenants with queued jobs, found by seeking the tenant index once per tenant."""
+        tenants: Dict[str, Dict[str, Any]] = {}
+        org_id = ""
+        while True:
             row = conn.execute(
                 """
-                SELECT job_id, payload_json, attempts, max_attempts
-                FROM jobs
-                WHERE status = 'queued'
-                ORDER BY created_at ASC
+                SELECT org_id FROM jobs
+                WHERE status = 'queued' AND org_id > ?
+                ORDER BY org_id
                 LIMIT 1
+                """,
+                (org_id,),
+            ).fetchone()
+            if row is None:
+                break
+            org_id = row["org_id"]
+            share = conn.execute(
+                "SELECT weight, max_concurrency, priority_class, vtime FROM queue_tenants WHERE org_id = ?",
+                (org_id,),
+            ).fetchone()
+            cap = share["max_concurrency"] if share else None
+            running = 0
+            if cap is not None:
+                running = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = 'running' AND org_id = ?", (org_id,)
+                ).fetchone()[0]
+            tenants[org_id] = {
+                "weight": share["weight"] if share else 1.0,
+                "max_concurrency": cap,
+                "priority_class": share["priority_class"] if share else 0,
+                "vtime": share["vtime"] if share else 0.0,
+                "running": running,
+            }
+        return tenants
+
+    @staticmethod
+    def _pick_tenant(tenants: Dict[str, Dict[str, Any]]) -> Optional[str]:
+        best_id = None
+        best_key = None
+        for org_id, tenant in tenants.items():
+            cap = tenant["max_concurrency"]
+            if cap is not None and tenant["running"] >= cap:
+                continue
+            key = (tenant["priority_class"], tenant["vtime"], org_id)
+            if best_key is None or key < best_key:
+                best_id, best_key = org_id, key
+        return best_id
+
+    def _claim_from(self, conn: sqlite3.Connection, org_id: str, lease_expires_at: float):
+        params = (lease_expires_at, uuid.uuid4().hex, _now_iso(), org_id)
+        if _SQLITE_HAS_RETURNING:
+            return conn.execute(
                 """
+                UPDATE jobs SET status = 'running', lease_expires_at = ?, lease_token = ?, updated_at = ?
+                WHERE job_id = (
+                    SELECT job_id FROM jobs
+                    WHERE status = 'queued' AND org_id = ?
+                    ORDER BY priority, created_at
+                    LIMIT 1
+                )
+                RETURNING job_id, payload_json, attempts, max_attempts, lease_token
+                """,
+                params,
             ).fetchone()
-            if not row:
-                return None
+        # SQLite < 3.35: the IMMEDIATE lock keeps SELECT + UPDATE atomic.
+        row = conn.execute(  # pragma: no cover
+            """
+            SELECT job_id, payload_json, attempts, max_attempts, ? AS lease_token FROM jobs
+            WHERE status = 'queued' AND org_id = ?
+            ORDER BY priority, created_at
+            LIMIT 1
+            """,
+            (params[1], org_id),
+        ).fetchone()
+        if row is not None:  # pragma: no cover
             conn.execute(
-                "UPDATE jobs SET status = 'running', updated_at = ? WHERE job_id = ?",
-                (_now_iso(), row["job_id"]),
+                """
+                UPDATE jobs SET status = 'running', lease_expires_at = ?, lease_token = ?, updated_at = ?
+                WHERE job_id = ?
+                """,
+                (*params[:3], row["job_id"]),
             )
-            return QueueJob(
-                job_id=row["job_id"],
-                payload=json.loads(row["payload_json"] or "{}"),
-                attempts=row["attempts"],
-                max_attempts=row["max_attempts"],
+        return row
+
+    def extend_lease(self, job_id: str, visibility_timeout: Optional[float] = None) -> bool:
+        """Push back the lease of a running job; False if it is no longer leased."""
+        lease = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        token = self._leases.get(job_id)
+        if token is None:
+            return False
+        with self._pool.writer() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET lease_expires_at = ?, updated_at = ?
+                WHERE job_id = ? AND status = 'running' AND lease_token = ?
+                """,
+                (time.time() + lease, _now_iso(), job_id, token),
             )
+            return cursor.rowcount > 0
+
+    def _expire_leases(self, conn: sqlite3.Connection, now: float) -> None:
+        expired = conn.execute(
+            """
+            SELECT job_id, payload_json, attempts, max_attempts
+            FROM jobs
+            WHERE status = 'running' AND lease_expires_at < ?
+            """,
+            (now,),
+        ).fetchall()
+        if not expired:
+            return
+        error = "lease expired"
+        timestamp = _now_iso()
+        exhausted = [row for row in expired if row["attempts"] + 1 >= row["max_attempts"]]
+        retry = [row for row in expired if row["attempts"] + 1 < row["max_attempts"]]
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO dlq (job_id, payload_json, error, attempts, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [(row["job_id"], row["payload_json"], error, row["attempts"] + 1, timestamp) for row in exhausted],
+        )
+        conn.executemany("DELETE FROM jobs WHERE job_id = ?", [(row["job_id"],) for row in exhausted])
+        conn.executemany(
+            """
+            UPDATE jobs
+            SET status = 'queued', attempts = attempts + 1, last_error = ?, lease_expires_at = NULL,
+                lease_token = NULL, updated_at = ?
+            WHERE job_id = ?
+            """,
+            [(error, timestamp, row["job_id"]) for row in retry],
+        )
+
+    def _release(self, job_id: str, action: str) -> Optional[str]:
+        token = self._leases.pop(job_id, None)
+        if token is None:
+            logger.warning("Ignoring %s for job %s: not leased by this backend", action, job_id)
+        return token
+
+    def _lease_lost(self, job_id: str, action: str) -> None:
+        logger.warning("Ignoring %s for job %s: its lease expired and was claimed again", action, job_id)
 
     def mark_done(self, job_id: str) -> None:
-        with self._connect() as conn:
-            conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+        token = self._release(job_id, "mark_done")
+        if token is None:
+            return
+        with self._pool.writer() as conn:
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE job_id = ? AND lease_token = ?", (job_id, token)
+            )
+        if cursor.rowcount == 0:
+            self._lease_lost(job_id, "mark_done")
 
     def mark_failed(self, job: QueueJob, error: str) -> None:
-        with self._connect() as conn:
+        token = self._release(job.job_id, "mark_failed")
+        if token is None:
+            return
+        with self._pool.writer() as conn:
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE job_id = ? AND lease_token = ?", (job.job_id, token)
+            )
+            if cursor.rowcount == 0:
+                self._lease_lost(job.job_id, "mark_failed")
+                return
             conn.execute(
                 """
-                INSERT INTO dlq (job_id, payload_json, error, attempts, created_at)
+                INSERT OR REPLACE INTO dlq (job_id, payload_json, error, attempts, created_at)
                 VALUES (?, ?, ?, ?, ?)
                 """,
                 (job.job_id, json.dumps(job.payload), error, job.attempts, _now_iso()),
             )
-            conn.execute("DELETE FROM jobs WHERE job_id = ?", (job.job_id,))
 
     def requeue(self, job: QueueJob, error: str) -> None:
-        with self._connect() as conn:
-            conn.execute(
+        token = self._release(job.job_id, "requeue")
+        if token is None:
+            return
+        with self._pool.writer() as conn:
+            cursor = conn.execute(
                 """
                 UPDATE jobs
-                SET status = 'queued', attempts = ?, last_error = ?, updated_at = ?
-                WHERE job_id = ?
+                SET status = 'queued', attempts = ?, last_error = ?, lease_expires_at = NULL,
+                    lease_token = NULL, updated_at = ?
+                WHERE job_id = ? AND lease_token = ?
                 """,
-                (job.attempts, error, _now_iso(), job.job_id),
+                (job.attempts, error, _now_iso(), job.job_id, token),
             )
+        if cursor.rowcount == 0:
+            self._lease_lost(job.job_id, "requeue")
+
+    def close(self) -> None:
+        self._pool.close()
 
 
 class RedisQueueBackend(QueueBackend):
-    def __init__(self, url: str, queue_key: str = "agent_sdk:queue", dlq_key: str = "agent_sdk:dlq", client=None):
+    """Redis list queue; jobs are JSON documents carried in the list itself.
+
+    In reliable mode (the default) a claim moves a job atomically from the
+    queue into this worker's processing list with ``LMOVE``/``BLMOVE``, so a
+    crash after the claim cannot lose it. Each worker refreshes a liveness
+    key with a ``lease_timeout`` TTL on every claim and through
+    :meth:`extend_lease`; when that key lapses, :meth:`reap_expired` (run by
+    any worker at most once per lease period) moves the dead worker's jobs
+    back onto the queue one at a time, or into the DLQ once ``max_attempts``
+    is spent.
+    Claims, acknowledgements and requeues each cost one round-trip.
+
+    Entries left by the older format (a bare job id in the list, with the
+    job stored in an ``agent_sdk:job:<id>`` hash) are still claimed: the job
+    is loaded from its hash, which is deleted once the job is acknowledged,
+    dead-lettered, or requeued in the new format.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        queue_key: str = "agent_sdk:queue",
+        dlq_key: str = "agent_sdk:dlq",
+        client=None,
+        reliable: bool = True,
+        worker_id: Optional[str] = None,
+        lease_timeout: float = 60.0,
+        block_timeout: float = 1.0,
+    ):
         if redis is None and client is None:
             raise RuntimeError("redis is required for RedisQueueBackend")
         self._queue_key = queue_key
         self._dlq_key = dlq_key
         self._client = client or redis.Redis.from_url(url)
+        self.reliable = reliable
+        self.worker_id = worker_id or uuid.uuid4().hex
+        self.lease_timeout = lease_timeout
+        self.block_timeout = block_timeout
+        self.visibility_timeout = lease_timeout if reliable else None
+        self._workers_key = f"{queue_key}:workers"
+        self._processing_key = self._worker_processing_key(self.worker_id)
+        self._alive_key = self._worker_alive_key(self.worker_id)
+        self._inflight: Dict[str, str] = {}
+        self._next_reap = 0.0
+
+    def _worker_processing_key(self, worker_id: str) -> str:
+        return f"{self._queue_key}:processing:{worker_id}"
 
-    def _job_key(self, job_id: str) -> str:
+    def _worker_alive_key(self, worker_id: str) -> str:
+        return f"{self._queue_key}:alive:{worker_id}"
+
+    @staticmethod
+    def _legacy_job_key(job_id: str) -> str:
         return f"agent_sdk:job:{job_id}"
 
-    def enqueue(self, payload: Dict[str, Any], max_attempts: int) -> str:
-        job_id = f"job_{uuid.uuid4().hex}"
-        job_key = self._job_key(job_id)
-        self._client.hset(
-            job_key,
-            mapping={
-                "payload_json": json.dumps(payload),
-                "attempts": 0,
+    @staticmethod
+    def _is_legacy(raw: str) -> bool:
+        return not raw.startswith("{")
+
+    @staticmethod
+    def _encode(
+        job_id: str, payload: Dict[str, Any], attempts: int, max_attempts: int, **extra: Any
+    ) -> str:
+        return json.dumps(
+            {
+                "job_id": job_id,
+                "payload": payload,
+                "attempts": attempts,
                 "max_attempts": max_attempts,
-            },
+                **extra,
+            }
         )
-        self._client.lpush(self._queue_key, job_id)
-        return job_id
 
-    def claim_next(self) -> Optional[QueueJob]:
-        job_id = self._client.rpop(self._queue_key)
-        if job_id is None:
-            return None
-        if isinstance(job_id, bytes):
-            job_id = job_id.decode("utf-8")
-        job_key = self._job_key(job_id)
-        payload_json = self._client.hget(job_key, "payload_json") or b"{}"
-        attempts = int(self._client.hget(job_key, "attempts") or 0)
-        max_attempts = int(self._client.hget(job_key, "max_attempts") or 0)
-        return QueueJob(
-            job_id=job_id,
-            payload=json.loads(payload_json),
-            attempts=attempts,
-            max_attempts=max_attempts,
+    def enqueue(self, payload: Dict[str, Any], max_attempts: int) -> str:
+        return self.enqueue_batch([payload], max_attempts)[0]
+
+    def enqueue_batch(self, payloads: List[Dict[str, Any]], max_attempts: int) -> List[str]:
+        """Enqueue several jobs with a single ``LPUSH``; returns their ids in order."""
+        if not payloads:
+            return []
+        job_ids = [f"job_{uuid.uuid4().hex}" for _ in payloads]
+        self._client.lpush(
+            self._queue_key,
+            *(
+                self._encode(job_id, payload, 0, max_attempts)
+                for job_id, payload in zip(job_ids, payloads)
+            ),
         )
+        return job_ids
+
+    def claim_next(self) -> Optional[QueueJob]:
+        jobs = self.claim_batch(1)
+        return jobs[0] if jobs else None
+
+    def claim_batch(self, limit: int) -> List[QueueJob]:
+        """Claim up to ``limit`` jobs without blocking, in one pipelined round-trip."""
+        if limit <= 0:
+            return []
+        self._maybe_reap()
+        pipe = self._client.pipeline(transaction=False)
+        if self.reliable:
+            queued = self._heartbeat(pipe)
+            for _ in range(limit):
+                pipe.lmove(self._queue_key, self._processing_key, "RIGHT", "LEFT")
+            raws = pipe.execute()[queued:]
+        else:
+            for _ in range(limit):
+                pipe.rpop(self._queue_key)
+            raws = pipe.execute()
+        return [self._claimed(raw) for raw in raws if raw is not None]
+
+    def claim_blocking(self, timeout: Optional[float] = None) -> Optional[QueueJob]:
+        """Wait up to ``timeout`` seconds (default ``block_timeout``) for a job."""
+        timeout = self.block_timeout if timeout is None else timeout
+        self._maybe_reap()
+        if self.reliable:
+            pipe = self._client.pipeline(transaction=False)
+            queued = self._heartbeat(pipe)
+            pipe.blmove(self._queue_key, self._processing_key, timeout, "RIGHT", "LEFT")
+            raw = pipe.execute()[queued]
+        else:
+            popped = self._client.brpop(self._queue_key, timeout=timeout)
+            raw = popped[1] if popped else None
+        return self._claimed(raw) if raw is not None else None
+
+    def extend_lease(self, job_id: Optional[str] = None) -> bool:
+        """Refresh this worker's lease, which covers every job it holds."""
+        if not self.reliable:
+            return False
+        self._client.set(self._alive_key, "1", px=int(self.lease_timeout * 1000))
+        return True
+
+    def reap_expired(self) -> int:
+        """Requeue jobs held by workers whose lease lapsed; returns how many were moved."""
+        lease_ms = int(self.lease_timeout * 1000)
+        if not self._client.set(f"{self._queue_key}:reaper", self.worker_id, nx=True, px=lease_ms):
+            return 0
+        moved = 0
+        for member in self._client.smembers(self._workers_key):
+            worker_id = _decode(member)
+            if worker_id == self.worker_id or self._client.exists(self._worker_alive_key(worker_id)):
+                continue
+            processing_key = self._worker_processing_key(worker_id)
+            # One entry at a time, through this worker's own processing list: an
+            # entry is either still the dead worker's or ours, so nothing pushed
+            # meanwhile is dropped and a crash here leaves it for the next reaper.
+            while True:
+                raw = self._client.lmove(processing_key, self._processing_key, "RIGHT", "LEFT")
+                if raw is None:
+                    break
+                raw = _decode(raw)
+                data = self._job_data(raw)
+                attempts = int(data.get("attempts", 0)) + 1
+                max_attempts = int(data.get("max_attempts", 1))
+                args = (data["job_id"], data.get("payload", {}), attempts, max_attempts)
+                pipe = self._client.pipeline(transaction=True)
+                pipe.lrem(self._processing_key, 1, raw)
+                if self._is_legacy(raw):
+                    pipe.delete(self._legacy_job_key(raw))
+                if attempts >= max_attempts:
+                    pipe.lpush(self._dlq_key, self._encode(*args, error="lease expired"))
+                else:
+                    pipe.rpush(self._queue_key, self._encode(*args, last_error="lease expired"))
+                pipe.execute()
+                moved += 1
+            self._client.srem(self._workers_key, worker_id)
+        return moved
 
     def mark_done(self, job_id: str) -> None:
-        self._client.delete(self._job_key(job_id))
+        raw = self._inflight.pop(job_id, None)
+        if raw is None:
+            return
+        if self._is_legacy(raw):
+            pipe = self._client.pipeline(transaction=True)
+            self._release(pipe, raw)
+            pipe.execute()
+        elif self.reliable:
+            self._client.lrem(self._processing_key, 1, raw)
 
     def mark_failed(self, job: QueueJob, error: str) -> None:
-        self._client.hset(
-            self._job_key(job.job_id),
-            mapping={"error": error, "attempts": job.attempts},
+        raw = self._inflight.pop(job.job_id, None)
+        pipe = self._client.pipeline(transaction=True)
+        if raw is not None:
+            self._release(pipe, raw)
+        pipe.lpush(
+            self._dlq_key,
+            self._encode(job.job_id, job.payload, job.attempts, job.max_attempts, error=error),
         )
-        self._client.lpush(self._dlq_key, job.job_id)
+        pipe.execute()
 
     def requeue(self, job: QueueJob, error: str) -> None:
-        self._client.hset(
-            self._job_key(job.job_id),
-            mapping={"attempts": job.attempts, "last_error": error},
+        raw = self._inflight.pop(job.job_id, None)
+        pipe = self._client.pipeline(transaction=True)
+        if raw is not None:
+            self._release(pipe, raw)
+        pipe.lpush(
+            self._queue_key,
+            self._encode(job.job_id, job.payload, job.attempts, job.max_attempts, last_error=error),
+        )
+        pipe.execute()
+
+    def _release(self, pipe, raw: str) -> None:
+        """Queue the commands that drop a claimed entry from this worker's bookkeeping."""
+        if self.reliable:
+            pipe.lrem(self._processing_key, 1, raw)
+        if self._is_legacy(raw):
+            pipe.delete(self._legacy_job_key(raw))
+
+    def _heartbeat(self, pipe) -> int:
+        """Queue the liveness refresh on ``pipe``; returns how many commands it added."""
+        pipe.set(self._alive_key, "1", px=int(self.lease_timeout * 1000))
+        pipe.sadd(self._workers_key, self.worker_id)
+        return 2
+
+    def _maybe_reap(self) -> None:
+        if not self.reliable:
+            return
+        now = time.monotonic()
+        if now >= self._next_reap:
+            self._next_reap = now + self.lease_timeout
+            self.reap_expired()
+
+    def _job_data(self, raw: str) -> Dict[str, Any]:
+        if not self._is_legacy(raw):
+            return json.loads(raw)
+        payload_json, attempts, max_attempts = self._client.hmget(
+            self._legacy_job_key(raw), ["payload_json", "attempts", "max_attempts"]
+        )
+        return {
+            "job_id": raw,
+            "payload": json.loads(_decode(payload_json) or "{}"),
+            "attempts": int(attempts or 0),
+            "max_attempts": int(max_attempts or 1),
+        }
+
+    def _claimed(self, raw: Any) -> QueueJob:
+        raw = _decode(raw)
+        data = self._job_data(raw)
+        job_id = data.get("job_id", f"job_{uuid.uuid4().hex}")
+        self._inflight[job_id] = raw
+        return QueueJob(
+            job_id=job_id,
+            payload=data.get("payload", {}),
+            attempts=int(data.get("attempts", 0)),
+            max_attempts=int(data.get("max_attempts", 1)),
         )
-        self._client.lpush(self._queue_key, job.job_id)
 
 
 class SQSQueueBackend(QueueBackend):
-    def __init__(self, queue_url: str, dlq_url: Optional[str] = None, client=None):
+    """SQS queue with batched, long-polled receives and batched deletes.
+
+    Each receive asks for up to ``max_messages`` (SQS allows 10) and keeps
+    the extras in a local prefetch buffer, leased for ``visibility_timeout``
+    seconds. Buffered messages whose lease has mostly elapsed are extended
+    before they are handed out, and ones whose lease already lapsed are
+    dropped (SQS will redeliver them). :meth:`claim_blocking` long-polls for
+    up to ``wait_time_seconds``. Acknowledgements are collected and sent
+    with ``delete_message_batch`` once ``max_messages`` are pending, before
+    the next receive, or once the oldest has waited ``max_ack_delay`` seconds
+    (default a tenth of ``visibility_timeout``), checked on every claim and
+    lease extension, so a finished job is deleted well before its lease can
+    lapse and redeliver it. Requeued and dead-lettered jobs are deleted at once,
+    right after their new message is sent.
+    """
+
+    def __init__(
+        self,
+        queue_url: str,
+        dlq_url: Optional[str] = None,
+        client=None,
+        max_messages: int = 10,
+        wait_time_seconds: int = 20,
+        visibility_timeout: int = 300,
+        max_ack_delay: Optional[float] = None,
+    ):
         if boto3 is None and client is None:
             raise RuntimeError("boto3 is required for SQSQueueBackend")
         self._client = client or boto3.client("sqs")
         self._queue_url = queue_url
         self._dlq_url = dlq_url
+        self.max_messages = max(1, min(10, max_messages))
+        self.wait_time_seconds = max(0, min(20, wait_time_seconds))
+        self.visibility_timeout = visibility_timeout
+        self.max_ack_delay = visibility_timeout / 10 if max_ack_delay is None else max_ack_delay
+        self._lock = threading.Lock()
+        self._buffer: Deque[Tuple[float, Dict[str, Any]]] = deque()
         self._inflight: Dict[str, str] = {}
+        self._pending_acks: List[str] = []
+        self._oldest_ack = 0.0
 
     def enqueue(self, payload: Dict[str, Any], max_attempts: int) -> str:
         body = json.dumps({"payload": payload, "attempts": 0, "max_attempts": max_attempts})
@@ -233,34 +767,51 @@ class SQSQueueBackend(QueueBackend):
         return response.get("MessageId", f"job_{uuid.uuid4().hex}")
 
     def claim_next(self) -> Optional[QueueJob]:
-        response = self._client.receive_message(
+        return self._claim(wait_time=0)
+
+    def claim_blocking(self, timeout: Optional[float] = None) -> Optional[QueueJob]:
+        """Long-poll for a job for up to ``timeout`` seconds (default ``wait_time_seconds``)."""
+        wait_time = self.wait_time_seconds if timeout is None else max(0, min(20, int(timeout)))
+        return self._claim(wait_time=wait_time)
+
+    def extend_lease(self, job_id: str) -> bool:
+        """Restart the visibility timeout of a job that is still running."""
+        self._flush_due_acks()
+        with self._lock:
+            receipt = self._inflight.get(job_id)
+        if receipt is None:
+            return False
+        self._client.change_message_visibility(
             QueueUrl=self._queue_url,
-            MaxNumberOfMessages=1,
-            WaitTimeSeconds=0,
-        )
-        messages = response.get("Messages", [])
-        if not messages:
-            return None
-        message = messages[0]
-        data = json.loads(message.get("Body", "{}"))
-        job_id = message.get("MessageId", f"job_{uuid.uuid4().hex}")
-        self._inflight[job_id] = message.get("ReceiptHandle")
-        return QueueJob(
-            job_id=job_id,
-            payload=data.get("payload", {}),
-            attempts=int(data.get("attempts", 0)),
-            max_attempts=int(data.get("max_attempts", 1)),
+            ReceiptHandle=receipt,
+            VisibilityTimeout=self.visibility_timeout,
         )
+        return True
+
+    def flush_acks(self) -> None:
+        """Delete every acknowledged message that is still pending."""
+        with self._lock:
+            receipts, self._pending_acks = self._pending_acks, []
+        for start in range(0, len(receipts), 10):
+            chunk = receipts[start : start + 10]
+            response = self._client.delete_message_batch(
+                QueueUrl=self._queue_url,
+                Entries=[
+                    {"Id": str(index), "ReceiptHandle": receipt} for index, receipt in enumerate(chunk)
+                ],
+            )
+            for failure in response.get("Failed", []):
+                logger.warning(
+                    "SQS delete failed for entry %s: %s", failure.get("Id"), failure.get("Message")
+                )
+
+    def close(self) -> None:
+        self.flush_acks()
 
     def mark_done(self, job_id: str) -> None:
-        receipt = self._inflight.pop(job_id, None)
-        if receipt:
-            self._client.delete_message(QueueUrl=self._queue_url, ReceiptHandle=receipt)
+        self._ack(job_id)
 
     def mark_failed(self, job: QueueJob, error: str) -> None:
-        receipt = self._inflight.pop(job.job_id, None)
-        if receipt:
-            self._client.delete_message(QueueUrl=self._queue_url, ReceiptHandle=receipt)
         if self._dlq_url:
             body = json.dumps(
                 {
@@ -271,11 +822,9 @@ class SQSQueueBackend(QueueBackend):
                 }
             )
             self._client.send_message(QueueUrl=self._dlq_url, MessageBody=body)
+        self._ack(job.job_id, flush=True)
 
     def requeue(self, job: QueueJob, error: str) -> None:
-        receipt = self._inflight.pop(job.job_id, None)
-        if receipt:
-            self._client.delete_message(QueueUrl=self._queue_url, ReceiptHandle=receipt)
         body = json.dumps(
             {
                 "payload": job.payload,
@@ -285,6 +834,73 @@ class SQSQueueBackend(QueueBackend):
             }
         )
         self._client.send_message(QueueUrl=self._queue_url, MessageBody=body)
+        self._ack(job.job_id, flush=True)
+
+    def _ack(self, job_id: str, flush: bool = False) -> None:
+        with self._lock:
+            receipt = self._inflight.pop(job_id, None)
+            if receipt:
+                if not self._pending_acks:
+                    self._oldest_ack = time.monotonic()
+                self._pending_acks.append(receipt)
+        if flush:
+            self.flush_acks()
+        else:
+            self._flush_due_acks()
+
+    def _flush_due_acks(self) -> None:
+        with self._lock:
+            due = bool(self._pending_acks) and (
+                len(self._pending_acks) >= self.max_messages
+                or time.monotonic() - self._oldest_ack >= self.max_ack_delay
+            )
+        if due:
+            self.flush_acks()
+
+    def _claim(self, wait_time: int) -> Optional[QueueJob]:
+        self._flush_due_acks()
+        message = self._next_buffered()
+        if message is None:
+            self.flush_acks()
+            response = self._client.receive_message(
+                QueueUrl=self._queue_url,
+                MaxNumberOfMessages=self.max_messages,
+                WaitTimeSeconds=wait_time,
+                VisibilityTimeout=self.visibility_timeout,
+            )
+            received_at = time.monotonic()
+            with self._lock:
+                self._buffer.extend((received_at, msg) for msg in response.get("Messages", []))
+            message = self._next_buffered()
+            if message is None:
+                return None
+        data = json.loads(message.get("Body", "{}"))
+        job_id = message.get("MessageId", f"job_{uuid.uuid4().hex}")
+        with self._lock:
+            self._inflight[job_id] = message.get("ReceiptHandle")
+        return QueueJob(
+            job_id=job_id,
+            payload=data.get("payload", {}),
+            attempts=int(data.get("attempts", 0)),
+            max_attempts=int(data.get("max_attempts", 1)),
+        )
+
+    def _next_buffered(self) -> Optional[Dict[str, Any]]:
+        while True:
+            with self._lock:
+                if not self._buffer:
+                    return None
+                received_at, message = self._buffer.popleft()
+            age = time.monotonic() - received_at
+            if age >= self.visibility_timeout:
+                continue
+            if age >= self.visibility_timeout / 2:
+                self._client.change_message_visibility(
+                    QueueUrl=self._queue_url,
+                    ReceiptHandle=message.get("ReceiptHandle"),
+                    VisibilityTimeout=self.visibility_timeout,
+                )
+            return message
 
 
 class KafkaQueueBackend(QueueBackend):
@@ -343,19 +959,38 @@ class KafkaQueueBackend(QueueBackend):
 
 
 class DurableExecutionQueue:
+    """Run queued jobs with ``handler``, retrying up to ``max_attempts``.
+
+    An idle worker waits on ``notifier`` (picked by :func:`notifier_for`
+    when not given) and wakes as soon as a job is submitted; ``poll_interval``
+    only bounds how long it waits before checking the backend anyway.
+    Backends with ``claim_blocking`` (Redis, SQS) block inside the backend
+    instead. Backend and blocking notifier calls run on ``io_executor`` (an
+    ``AsyncStorageBackend``) when given, otherwise in a worker thread;
+    ``claim_blocking`` always gets its own thread, since it can hold one for a
+    whole block timeout. :meth:`stop` waits for a claim still in flight (at
+    most one backend block timeout) and requeues whatever job it returns, so a
+    job claimed after stop is handed back without using up an attempt.
+    """
+
     def __init__(
         self,
         backend: QueueBackend,
         handler: Callable[[Dict[str, Any]], Awaitable[Any]],
         poll_interval: float = 0.1,
         max_attempts: int = 3,
+        notifier: Optional[QueueNotifier] = None,
+        io_executor: Optional[AsyncStorageBackend] = None,
     ) -> None:
         self._backend = backend
         self._handler = handler
+        self._io_executor = io_executor
         self._poll_interval = poll_interval
         self._max_attempts = max_attempts
+        self._notifier = notifier if notifier is not None else notifier_for(backend)
         self._running = False
         self._worker_task: Optional[asyncio.Task] = None
+        self._claim: Optional[asyncio.Task] = None
         self._results: Dict[str, asyncio.Future] = {}
 
     async def start(self) -> None:
@@ -369,34 +1004,89 @@ class DurableExecutionQueue:
         if self._worker_task:
             self._worker_task.cancel()
             await asyncio.gather(self._worker_task, return_exceptions=True)
+        claim, self._claim = self._claim, None
+        if claim is not None:
+            (job,) = await asyncio.gather(claim, return_exceptions=True)
+            if isinstance(job, QueueJob):
+                await self._run_blocking(
+                    "queue_requeue", self._backend.requeue, job, "queue stopped before the job ran"
+                )
+        flush_acks = getattr(self._backend, "flush_acks", None)
+        if flush_acks is not None:
+            await self._run_blocking("queue_flush_acks", flush_acks)
+        if self._notifier is not None:
+            self._notifier.close()
 
     async def submit(self, payload: Dict[str, Any]) -> Any:
         loop = asyncio.get_running_loop()
         future: asyncio.Future = loop.create_future()
         job_id = self._backend.enqueue(payload, self._max_attempts)
         self._results[job_id] = future
+        if self._notifier is not None:
+            if self._notifier.blocking:
+                await self._run_blocking("queue_notify", self._notifier.notify)
+            else:
+                self._notifier.notify()
         return await future
 
+    async def _run_blocking(self, name: str, func: Callable[..., Any], *args: Any) -> Any:
+        if self._io_executor is not None:
+            return await self._io_executor.run(name, func, *args)
+        return await asyncio.to_thread(func, *args)
+
+    async def _claim_job(self) -> Optional[QueueJob]:
+        if self._notifier is None:
+            claim = asyncio.to_thread(self._backend.claim_blocking)
+        else:
+            claim = self._run_blocking("queue_claim", self._backend.claim_next)
+        # Shielded so a cancelled worker leaves the claim for stop() to settle.
+        self._claim = asyncio.ensure_future(claim)
+        job = await asyncio.shield(self._claim)
+        self._claim = None
+        return job
+
     async def _worker(self) -> None:
         while self._running:
-            job = self._backend.claim_next()
+            job = await self._claim_job()
             if job is None:
-                await asyncio.sleep(self._poll_interval)
+                if self._notifier is not None:
+                    await self._notifier.wait(self._poll_interval)
                 continue
             job.attempts += 1
+            heartbeat = self._start_heartbeat(job)
             try:
                 result = await self._handler(job.payload)
-                self._backend.mark_done(job.job_id)
+                await self._run_blocking("queue_mark_done", self._backend.mark_done, job.job_id)
                 future = self._results.pop(job.job_id, None)
                 if future and not future.cancelled():
                     future.set_result(result)
             except Exception as exc:
                 error = str(exc)
                 if job.attempts >= job.max_attempts:
-                    self._backend.mark_failed(job, error)
+                    await self._run_blocking(
+                        "queue_mark_failed", self._backend.mark_failed, job, error
+                    )
                     future = self._results.pop(job.job_id, None)
                     if future and not future.cancelled():
                         future.set_exception(exc)
                 else:
-                    self._backend.requeue(job, error)
+                    await self._run_blocking("queue_requeue", self._backend.requeue, job, error)
                     await asyncio.sleep(self._poll_interval)
+            finally:
+                if heartbeat is not None:
+                    heartbeat.cancel()
+
+    def _start_heartbeat(self, job: QueueJob) -> Optional[asyncio.Task]:
+        """Keep a leased job invisible to other workers while its handler runs."""
+        timeout = getattr(self._backend, "visibility_timeout", None)
+        if not timeout or not hasattr(self._backend, "extend_lease"):
+            return None
+
+        async def renew() -> None:
+            while True:
+                await asyncio.sleep(timeout / 3)
+                await self._run_blocking(
+                    "queue_extend_lease", self._backend.extend_lease, job.job_id
+                )
+
+        return asyncio.create_task(renew())
@@ -1,6 +1,10 @@
+import asyncio
 import json
 import time
 import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Set
 from agent_sdk.core.agent import Agent
 from agent_sdk.core.messages import Message, make_message
 from agent_sdk.observability.events import ObsEvent
@@ -20,16 +24,71 @@ You are an execution agent. You receive:
 You produce a short textual result for this step.
 """
 
+EXECUTOR_BATCH_SYSTEM_PROMPT = """
+You are an execution agent. You receive:
+- a high-level task
+- every executed step with its tool output
+
+You produce a short textual result covering all steps.
+"""
+
+# per_step: one LLM call per step; batched: one LLM call for the whole plan;
+# template: deterministic text, no LLM calls.
+SUMMARY_MODES = ("per_step", "batched", "template")
+
+
+class _StepEvents:
+    """Holds one step's events so concurrently run steps publish in plan order."""
+
+    def __init__(self) -> None:
+        self.events: List[ObsEvent] = []
+
+    def emit(self, event: ObsEvent) -> None:
+        self.events.append(event)
+
+
+class _SummaryUsage:
+    """LLM calls, tokens and latency spent summarizing one plan."""
+
+    def __init__(self, mode: str) -> None:
+        self.mode = mode
+        self.llm_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_tokens = 0
+        self.latency_ms = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, resp, latency_ms: float) -> None:
+        with self._lock:
+            self.llm_calls += 1
+            self.prompt_tokens += resp.prompt_tokens
+            self.completion_tokens += resp.completion_tokens
+            self.total_tokens += resp.total_tokens
+            self.latency_ms += latency_ms
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "mode": self.mode,
+            "llm_calls": self.llm_calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "latency_ms": self.latency_ms,
+        }
+
+
 class ExecutorAgent(Agent):
     def __init__(self, name: str, context, llm):
         super().__init__(name, context)
         self.llm = llm
 
-    def _run_tool(self, step: PlanStep) -> StepResult:
+    def _run_tool(self, step: PlanStep, events=None) -> StepResult:
         """Execute a tool with comprehensive error handling"""
-        if self.context.events:
-            self.context.events.emit(ObsEvent("executor.step.start", self.name,
-                                              {"step_id": step.id, "description": step.description}))
+        events = self.context.events if events is None else events
+        if events:
+            events.emit(ObsEvent("executor.step.start", self.name,
+                                 {"step_id": step.id, "description": step.description}))
 
         if not step.tool:
             return StepResult(step_id=step.id, success=True, output=None)
@@ -38,11 +97,11 @@ class ExecutorAgent(Agent):
         if tool is None:
             error_msg = f"Tool '{step.tool}' not found"
             logger.error(error_msg)
-            if self.context.events:
-                self.context.events.emit(ObsEvent("executor.tool.not_found", self.name,
-                                                  {"tool": step.tool}))
-                self.context.events.emit(ObsEvent("tool.latency", self.name,
-                                                  {"tool": step.tool, "latency_ms": 0.0, "success": False}))
+            if events:
+                events.emit(ObsEvent("executor.tool.not_found", self.name,
+                                     {"tool": step.tool}))
+                events.emit(ObsEvent("tool.latency", self.name,
+                                     {"tool": step.tool, "latency_ms": 0.0, "success": False}))
             return StepResult(step_id=step.id, success=False, output=None,
                               error=error_msg)
 
@@ -85,9 +144,9 @@ class ExecutorAgent(Agent):
                         logger.warning(error_msg)
                         return StepResult(step_id=step.id, success=False, output=None, error=error_msg)
 
-        if self.context.events:
-            self.context.events.emit(ObsEvent("executor.tool.call", self.name,
-                                              {"tool": step.tool, "inputs": step.inputs}))
+        if events:
+            events.emit(ObsEvent("executor.tool.call", self.name,
+                                 {"tool": step.tool, "inputs": step.inputs}))
 
         start = time.time()
         success = False
@@ -114,48 +173,84 @@ class ExecutorAgent(Agent):
             if replay_store is not None:
                 replay_store.record(step.id, output)
             
-            if self.context.events:
-                self.context.events.emit(ObsEvent("executor.tool.result", self.name,
-                                                  {"tool": step.tool, "output": str(output)[:500]}))
+            if events:
+                events.emit(ObsEvent("executor.tool.result", self.name,
+                                     {"tool": step.tool, "output": str(output)[:500]}))
             
             logger.debug(f"Tool '{step.tool}' executed successfully")
             return StepResult(step_id=step.id, success=True, output=output)
             
         except ToolError as e:
             logger.error(f"Tool error in '{step.tool}': {str(e)}")
-            if self.context.events:
-                self.context.events.emit(ObsEvent("executor.tool.error", self.name,
-                                                  {"tool": step.tool, "error": str(e), "error_type": "ToolError"}))
+            if events:
+                events.emit(ObsEvent("executor.tool.error", self.name,
+                                     {"tool": step.tool, "error": str(e), "error_type": "ToolError"}))
             return StepResult(step_id=step.id, success=False, output=None, error=str(e))
             
         except Exception as e:
             error_msg = f"Unexpected error in tool '{step.tool}': {type(e).__name__}: {str(e)}"
             logger.error(error_msg, exc_info=True)
-            if self.context.events:
-                self.context.events.emit(ObsEvent("executor.tool.error", self.name,
-                                                  {"tool": step.tool, "error": str(e), "error_type": type(e).__name__}))
+            if events:
+                events.emit(ObsEvent("executor.tool.error", self.name,
+                                     {"tool": step.tool, "error": str(e), "error_type": type(e).__name__}))
             return StepResult(step_id=step.id, success=False, output=None, error=str(e))
         finally:
             latency_ms = (time.time() - start) * 1000
-            if self.context.events:
-                self.context.events.emit(ObsEvent("tool.latency", self.name,
-                                                  {"tool": step.tool, "latency_ms": latency_ms,
-                                                   "success": success}))
+            if events:
+                events.emit(ObsEvent("tool.latency", self.name,
+                                     {"tool": step.tool, "latency_ms": latency_ms,
+                                      "success": success}))
 
-    def _summarize_step(self, task: str, step: PlanStep, result: StepResult) -> str:
-        """Summarize step result with retry logic"""
-        if not self.context.model_config or not self.llm:
-            status = "succeeded" if result.success else "failed"
-            detail = result.error if result.error else result.output
-            return f"Step {step.id} {status}: {detail}"
+    def _template_summary(self, step: PlanStep, result: StepResult) -> str:
+        status = "succeeded" if result.success else "failed"
+        detail = result.error if result.error else result.output
+        return f"Step {step.id} {status}: {detail}"
 
+    def _summary_prompt(self, task: str, step: PlanStep, result: StepResult) -> List[Dict[str, str]]:
         tool_output_text = "SUCCESS: " + str(result.output) if result.success else "ERROR: " + str(result.error)
-
-        messages = [
+        return [
             {"role": "system", "content": EXECUTOR_SYSTEM_PROMPT.strip()},
             {"role": "user", "content": f"Task: {task}\nStep {step.id}: {step.description}\nTool: {step.tool}\nOutput: {tool_output_text}"},
         ]
 
+    def _batch_summary_prompt(self, task: str, steps: List[PlanStep],
+                              results: List[StepResult]) -> List[Dict[str, str]]:
+        sections = []
+        for step, result in zip(steps, results):
+            output = "SUCCESS: " + str(result.output) if result.success else "ERROR: " + str(result.error)
+            sections.append(f"Step {step.id}: {step.description}\nTool: {step.tool}\nOutput: {output}")
+        return [
+            {"role": "system", "content": EXECUTOR_BATCH_SYSTEM_PROMPT.strip()},
+            {"role": "user", "content": f"Task: {task}\n\n" + "\n\n".join(sections)},
+        ]
+
+    def _summary_mode(self) -> str:
+        mode = (self.context.config.get("summary_mode") if self.context.config else None) or "per_step"
+        if mode not in SUMMARY_MODES:
+            raise ValueError(f"Unknown summary_mode '{mode}'; expected one of {', '.join(SUMMARY_MODES)}")
+        return mode
+
+    def _can_summarize(self) -> bool:
+        return bool(self.context.model_config and self.llm)
+
+    def _step_summary(self, task: str, step: PlanStep, result: StepResult, events=None,
+                      usage: Optional[_SummaryUsage] = None) -> str:
+        if usage is not None and usage.mode != "per_step":
+            return self._template_summary(step, result)
+        return self._summarize_step(task, step, result, events, usage)
+
+    def _summarize_step(self, task: str, step: PlanStep, result: StepResult, events=None,
+                        usage: Optional[_SummaryUsage] = None) -> str:
+        """Summarize step result with retry logic"""
+        if not self._can_summarize():
+            return self._template_summary(step, result)
+        return self._generate_summary(self._summary_prompt(task, step, result), events, usage,
+                                      step_id=step.id)
+
+    def _generate_summary(self, messages: List[Dict[str, str]], events=None,
+                          usage: Optional[_SummaryUsage] = None, step_id=None) -> str:
+        events = self.context.events if events is None else events
+        subject = "step" if step_id is not None else "plan"
         tokens_estimate = sum(len(m["content"].split()) for m in messages)
         if self.context.rate_limiter:
             self.context.rate_limiter.check(self.name, self.context.model_config.name, tokens_estimate)
@@ -170,51 +265,142 @@ class ExecutorAgent(Agent):
             end = time.time()
             latency_ms = (end - start) * 1000
 
-            if self.context.events:
-                self.context.events.emit(ObsEvent("llm.latency", self.name,
-                                                  {"model": self.context.model_config.name, "latency_ms": latency_ms}))
-                self.context.events.emit(ObsEvent("llm.usage", self.name,
-                                                  {"model": self.context.model_config.name,
-                                                   "prompt_tokens": resp.prompt_tokens,
-                                                   "completion_tokens": resp.completion_tokens,
-                                                   "total_tokens": resp.total_tokens}))
+            if events:
+                events.emit(ObsEvent("llm.latency", self.name,
+                                     {"model": self.context.model_config.name, "latency_ms": latency_ms}))
+                events.emit(ObsEvent("llm.usage", self.name,
+                                     {"model": self.context.model_config.name,
+                                      "prompt_tokens": resp.prompt_tokens,
+                                      "completion_tokens": resp.completion_tokens,
+                                      "total_tokens": resp.total_tokens}))
+            if usage is not None:
+                usage.add(resp, latency_ms)
 
             return resp.text
             
         except LLMError as e:
-            logger.error(f"LLM error in step summarization: {str(e)}")
-            if self.context.events:
-                self.context.events.emit(ObsEvent("llm.error", self.name,
-                                                  {"error": str(e), "step_id": step.id}))
-            return f"Failed to summarize step: {str(e)}"
+            logger.error(f"LLM error in {subject} summarization: {str(e)}")
+            if events:
+                events.emit(ObsEvent("llm.error", self.name,
+                                     {"error": str(e), "step_id": step_id}))
+            return f"Failed to summarize {subject}: {str(e)}"
             
         except Exception as e:
-            error_msg = f"Unexpected error in step summarization: {type(e).__name__}: {str(e)}"
+            error_msg = f"Unexpected error in {subject} summarization: {type(e).__name__}: {str(e)}"
             logger.error(error_msg, exc_info=True)
-            if self.context.events:
-                self.context.events.emit(ObsEvent("executor.error", self.name,
-                                                  {"error": str(e), "error_type": type(e).__name__}))
+            if events:
+                events.emit(ObsEvent("executor.error", self.name,
+                                     {"error": str(e), "error_type": type(e).__name__}))
             return f"Error during summarization: {str(e)}"
 
+    def _max_parallel_steps(self) -> int:
+        if not self.context.config:
+            return 1
+        return max(1, int(self.context.config.get("max_parallel_steps") or 1))
+
+    def _step_waits(self, plan: Plan) -> List[Set[int]]:
+        """Dependencies of each step as indexes into ``plan.steps``."""
+        position = {step.id: index for index, step in enumerate(plan.steps)}
+        deps = plan.dependencies()
+        return [{position[dep] for dep in deps[step.id]} for step in plan.steps]
+
+    def _step_message(self, step: PlanStep, result: StepResult, summary: str) -> Message:
+        content = f"Step {step.id}: {step.description}\nResult: {summary}"
+        return make_message("agent", content,
+                            metadata={"type": "execution_step",
+                                      "step_id": step.id,
+                                      "tool": step.tool,
+                                      "success": result.success})
+
+    def _complete_step(self, step: PlanStep, result: StepResult, summary: str) -> Message:
+        msg = self._step_message(step, result, summary)
+        self.context.apply_run_metadata(msg)
+        self.context.short_term.append(msg)
+        if self.context.events:
+            self.context.events.emit(ObsEvent("executor.step.complete", self.name,
+                                              {"step_id": step.id, "success": result.success}))
+        return msg
+
+    def _step_events(self) -> Optional[_StepEvents]:
+        return _StepEvents() if self.context.events else None
+
+    def _publish(self, events: Optional[_StepEvents]) -> None:
+        if events is not None and self.context.events:
+            for event in events.events:
+                self.context.events.emit(event)
+
+    def _summary_message(self, plan: Plan, summary: str) -> Message:
+        return make_message("agent", f"Plan summary: {summary}",
+                            metadata={"type": "execution_summary", "steps": len(plan.steps)})
+
+    def _emit_summary_usage(self, plan: Plan, usage: _SummaryUsage) -> None:
+        if self.context.events:
+            self.context.events.emit(ObsEvent("executor.summary", self.name,
+                                              {**usage.as_dict(), "steps": len(plan.steps)}))
+
     def execute_plan(self, plan: Plan):
-        messages = []
-        for step in plan.steps:
-            result = self._run_tool(step)
-            summary = self._summarize_step(plan.task, step, result)
-            content = f"Step {step.id}: {step.description}\nResult: {summary}"
-            msg = make_message("agent", content,
-                               metadata={"type": "execution_step",
-                                         "step_id": step.id,
-                                         "tool": step.tool,
-                                         "success": result.success})
+        """Run every step of ``plan`` and return one message per step, in plan order.
+
+        With ``config["max_parallel_steps"]`` above 1, steps whose
+        dependencies have finished run concurrently on up to that many threads.
+        A step without ``depends_on`` depends on the step before it, so plans
+        that never set it still run one step at a time; ``depends_on=[]``
+        marks a step that can start right away. The tools, ``rate_limiter``,
+        ``reliability_manager`` and ``replay_store`` that concurrent steps
+        share must be thread-safe (the built-in ones are).
+        ``config["summary_mode"]`` (see ``SUMMARY_MODES``) picks how results
+        are summarized; ``batched`` appends one ``execution_summary`` message.
+        """
+        usage = _SummaryUsage(self._summary_mode())
+        if self._max_parallel_steps() > 1 and len(plan.steps) > 1:
+            messages, results = self._execute_plan_parallel(plan, usage)
+        else:
+            messages, results = [], []
+            for step in plan.steps:
+                result = self._run_tool(step)
+                summary = self._step_summary(plan.task, step, result, usage=usage)
+                messages.append(self._complete_step(step, result, summary))
+                results.append(result)
+        if usage.mode == "batched" and plan.steps and self._can_summarize():
+            prompt = self._batch_summary_prompt(plan.task, plan.steps, results)
+            msg = self._summary_message(plan, self._generate_summary(prompt, usage=usage))
             self.context.apply_run_metadata(msg)
             self.context.short_term.append(msg)
-            if self.context.events:
-                self.context.events.emit(ObsEvent("executor.step.complete", self.name,
-                                                  {"step_id": step.id, "success": result.success}))
             messages.append(msg)
+        self._emit_summary_usage(plan, usage)
         return messages
 
+    def _run_step(self, task: str, step: PlanStep, events: Optional[_StepEvents], usage: _SummaryUsage):
+        result = self._run_tool(step, events)
+        return result, self._step_summary(task, step, result, events, usage), events
+
+    def _execute_plan_parallel(self, plan: Plan, usage: _SummaryUsage):
+        waits = self._step_waits(plan)
+        limit = self._max_parallel_steps()
+        outcomes: Dict[int, tuple] = {}
+        started: Set[int] = set()
+        running: Dict[Future, int] = {}
+        messages: List[Message] = []
+        with ThreadPoolExecutor(max_workers=limit, thread_name_prefix="plan-step") as pool:
+            while len(messages) < len(plan.steps):
+                for index, step in enumerate(plan.steps):
+                    if index not in started and waits[index].issubset(outcomes):
+                        started.add(index)
+                        events = self._step_events()
+                        future = pool.submit(self._run_step, plan.task, step, events, usage)
+                        running[future] = index
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    outcomes[index] = future.result()
+                # Publish finished steps in plan order so event streams stay deterministic.
+                while len(messages) in outcomes:
+                    index = len(messages)
+                    result, summary, events = outcomes[index]
+                    self._publish(events)
+                    messages.append(self._complete_step(plan.steps[index], result, summary))
+        return messages, [outcomes[index][0] for index in range(len(plan.steps))]
+
     def step(self, incoming: Message) -> Message:
         data = json.loads(incoming.content)
         plan = Plan(
@@ -226,19 +412,28 @@ class ExecutorAgent(Agent):
                     tool=s.get("tool"),
                     inputs=s.get("inputs"),
                     notes=s.get("notes"),
+                    depends_on=s.get("depends_on"),
                 )
                 for s in data["steps"]
             ],
         )
         self.context.short_term.append(incoming)
-        msgs = self.execute_plan(plan)
-        return msgs[-1] if msgs else make_message("agent", "No steps to execute", metadata={"type": "execution"})
+        return self._last_step_message(self.execute_plan(plan))
 
-    async def _run_tool_async(self, step: PlanStep) -> StepResult:
+    @staticmethod
+    def _last_step_message(messages: List[Message]) -> Message:
+        """Reply of ``step``: the last step's message, even when a batched summary follows it."""
+        steps = [m for m in messages if m.metadata.get("type") == "execution_step"]
+        if steps:
+            return steps[-1]
+        return make_message("agent", "No steps to execute", metadata={"type": "execution"})
+
+    async def _run_tool_async(self, step: PlanStep, events=None) -> StepResult:
         """Execute a tool asynchronously with comprehensive error handling"""
-        if self.context.events:
-            self.context.events.emit(ObsEvent("executor.step.start", self.name,
-                                              {"step_id": step.id, "description": step.description}))
+        events = self.context.events if events is None else events
+        if events:
+            events.emit(ObsEvent("executor.step.start", self.name,
+                                 {"step_id": step.id, "description": step.description}))
 
         if not step.tool:
             return StepResult(step_id=step.id, success=True, output=None)
@@ -247,11 +442,11 @@ class ExecutorAgent(Agent):
         if tool is None:
             error_msg = f"Tool '{step.tool}' not found"
             logger.error(error_msg)
-            if self.context.events:
-                self.context.events.emit(ObsEvent("executor.tool.not_found", self.name,
-                                                  {"tool": step.tool}))
-                self.context.events.emit(ObsEvent("tool.latency", self.name,
-                                                  {"tool": step.tool, "latency_ms": 0.0, "success": False}))
+            if events:
+                events.emit(ObsEvent("executor.tool.not_found", self.name,
+                                     {"tool": step.tool}))
+                events.emit(ObsEvent("tool.latency", self.name,
+                                     {"tool": step.tool, "latency_ms": 0.0, "success": False}))
             return StepResult(step_id=step.id, success=False, output=None, error=error_msg)
 
         replay_store = None
@@ -293,9 +488,9 @@ class ExecutorAgent(Agent):
                         logger.warning(error_msg)
                         return StepResult(step_id=step.id, success=False, output=None, error=error_msg)
 
-        if self.context.events:
-            self.context.events.emit(ObsEvent("executor.tool.call", self.name,
-                                              {"tool": step.tool, "inputs": step.inputs}))
+        if events:
+            events.emit(ObsEvent("executor.tool.call", self.name,
+                                 {"tool": step.tool, "inputs": step.inputs}))
         
         start = time.time()
         success = False
@@ -327,47 +522,52 @@ class ExecutorAgent(Agent):
             if replay_store is not None:
                 replay_store.record(step.id, output)
             
-            if self.context.events:
-                self.context.events.emit(ObsEvent("executor.tool.result", self.name,
-                                                  {"tool": step.tool, "output": str(output)[:500]}))
+            if events:
+                events.emit(ObsEvent("executor.tool.result", self.name,
+                                     {"tool": step.tool, "output": str(output)[:500]}))
             
             logger.debug(f"Tool '{step.tool}' executed successfully")
             return StepResult(step_id=step.id, success=True, output=output)
             
         except ToolError as e:
             logger.error(f"Tool error in '{step.tool}': {str(e)}")
-            if self.context.events:
-                self.context.events.emit(ObsEvent("executor.tool.error", self.name,
-                                                  {"tool": step.tool, "error": str(e), "error_type": "ToolError"}))
+            if events:
+                events.emit(ObsEvent("executor.tool.error", self.name,
+                                     {"tool": step.tool, "error": str(e), "error_type": "ToolError"}))
             return StepResult(step_id=step.id, success=False, output=None, error=str(e))
             
         except Exception as e:
             error_msg = f"Unexpected error in tool '{step.tool}': {type(e).__name__}: {str(e)}"
             logger.error(error_msg, exc_info=True)
-            if self.context.events:
-                self.context.events.emit(ObsEvent("executor.tool.error", self.name,
-                                                  {"tool": step.tool, "error": str(e), "error_type": type(e).__name__}))
+            if events:
+                events.emit(ObsEvent("executor.tool.error", self.name,
+                                     {"tool": step.tool, "error": str(e), "error_type": type(e).__name__}))
             return StepResult(step_id=step.id, success=False, output=None, error=str(e))
         finally:
             latency_ms = (time.time() - start) * 1000
-            if self.context.events:
-                self.context.events.emit(ObsEvent("tool.latency", self.name,
-                                                  {"tool": step.tool, "latency_ms": latency_ms,
-                                                   "success": success}))
-
-    async def _summarize_step_async(self, task: str, step: PlanStep, result: StepResult) -> str:
+            if events:
+                events.emit(ObsEvent("tool.latency", self.name,
+                                     {"tool": step.tool, "latency_ms": latency_ms,
+                                      "success": success}))
+
+    async def _step_summary_async(self, task: str, step: PlanStep, result: StepResult, events=None,
+                                  usage: Optional[_SummaryUsage] = None) -> str:
+        if usage is not None and usage.mode != "per_step":
+            return self._template_summary(step, result)
+        return await self._summarize_step_async(task, step, result, events, usage)
+
+    async def _summarize_step_async(self, task: str, step: PlanStep, result: StepResult, events=None,
+                                    usage: Optional[_SummaryUsage] = None) -> str:
         """Summarize step result asynchronously with retry logic"""
-        if not self.context.model_config or not self.llm:
-            status = "succeeded" if result.success else "failed"
-            detail = result.error if result.error else result.output
-            return f"Step {step.id} {status}: {detail}"
-
-        tool_output_text = "SUCCESS: " + str(result.output) if result.success else "ERROR: " + str(result.error)
-        messages = [
-            {"role": "system", "content": EXECUTOR_SYSTEM_PROMPT.strip()},
-            {"role": "user", "content": f"Task: {task}\nStep {step.id}: {step.description}\nTool: {step.tool}\nOutput: {tool_output_text}"},
-        ]
-        
+        if not self._can_summarize():
+            return self._template_summary(step, result)
+        return await self._generate_summary_async(self._summary_prompt(task, step, result), events,
+                                                  usage, step_id=step.id)
+
+    async def _generate_summary_async(self, messages: List[Dict[str, str]], events=None,
+                                      usage: Optional[_SummaryUsage] = None, step_id=None) -> str:
+        events = self.context.events if events is None else events
+        subject = "step" if step_id is not None else "plan"
         tokens_estimate = sum(len(m["content"].split()) for m in messages)
         if self.context.rate_limiter:
             self.context.rate_limiter.check(self.name, self.context.model_config.name, tokens_estimate)
@@ -393,47 +593,86 @@ class ExecutorAgent(Agent):
             end = time.time()
             latency_ms = (end - start) * 1000
 
-            if self.context.events:
-                self.context.events.emit(ObsEvent("llm.latency", self.name,
-                                                  {"model": self.context.model_config.name, "latency_ms": latency_ms}))
-                self.context.events.emit(ObsEvent("llm.usage", self.name,
-                                                  {"model": self.context.model_config.name,
-                                                   "prompt_tokens": resp.prompt_tokens,
-                                                   "completion_tokens": resp.completion_tokens,
-                                                   "total_tokens": resp.total_tokens}))
-            
+            if events:
+                events.emit(ObsEvent("llm.latency", self.name,
+                                     {"model": self.context.model_config.name, "latency_ms": latency_ms}))
+                events.emit(ObsEvent("llm.usage", self.name,
+                                     {"model": self.context.model_config.name,
+                                      "prompt_tokens": resp.prompt_tokens,
+                                      "completion_tokens": resp.completion_tokens,
+                                      "total_tokens": resp.total_tokens}))
+            if usage is not None:
+                usage.add(resp, latency_ms)
+
             return resp.text
             
         except LLMError as e:
-            logger.error(f"LLM error in step summarization: {str(e)}")
-            if self.context.events:
-                self.context.events.emit(ObsEvent("llm.error", self.name,
-                                                  {"error": str(e), "step_id": step.id}))
-            return f"Failed to summarize step: {str(e)}"
+            logger.error(f"LLM error in {subject} summarization: {str(e)}")
+            if events:
+                events.emit(ObsEvent("llm.error", self.name,
+                                     {"error": str(e), "step_id": step_id}))
+            return f"Failed to summarize {subject}: {str(e)}"
             
         except Exception as e:
-            error_msg = f"Unexpected error in step summarization: {type(e).__name__}: {str(e)}"
+            error_msg = f"Unexpected error in {subject} summarization: {type(e).__name__}: {str(e)}"
             logger.error(error_msg, exc_info=True)
-            if self.context.events:
-                self.context.events.emit(ObsEvent("executor.error", self.name,
-                                                  {"error": str(e), "error_type": type(e).__name__}))
+            if events:
+                events.emit(ObsEvent("executor.error", self.name,
+                                     {"error": str(e), "error_type": type(e).__name__}))
             return f"Error during summarization: {str(e)}"
 
     async def execute_plan_async(self, plan: Plan):
-        messages = []
-        for step in plan.steps:
-            result = await self._run_tool_async(step)
-            summary = await self._summarize_step_async(plan.task, step, result)
-            content = f"Step {step.id}: {step.description}\nResult: {summary}"
-            msg = make_message("agent", content,
-                               metadata={"type": "execution_step",
-                                         "step_id": step.id,
-                                         "tool": step.tool,
-                                         "success": result.success})
+        usage = _SummaryUsage(self._summary_mode())
+        if self._max_parallel_steps() > 1 and len(plan.steps) > 1:
+            messages, results = await self._execute_plan_parallel_async(plan, usage)
+        else:
+            messages, results = [], []
+            for step in plan.steps:
+                result = await self._run_tool_async(step)
+                summary = await self._step_summary_async(plan.task, step, result, usage=usage)
+                msg = self._step_message(step, result, summary)
+                self.context.short_term.append(msg)
+                messages.append(msg)
+                results.append(result)
+        if usage.mode == "batched" and plan.steps and self._can_summarize():
+            prompt = self._batch_summary_prompt(plan.task, plan.steps, results)
+            msg = self._summary_message(plan, await self._generate_summary_async(prompt, usage=usage))
             self.context.short_term.append(msg)
             messages.append(msg)
+        self._emit_summary_usage(plan, usage)
         return messages
 
+    async def _execute_plan_parallel_async(self, plan: Plan, usage: _SummaryUsage):
+        waits = self._step_waits(plan)
+        slots = asyncio.Semaphore(self._max_parallel_steps())
+        tasks: List[asyncio.Task] = []
+
+        async def run(index: int, step: PlanStep):
+            if waits[index]:
+                await asyncio.gather(*(tasks[dep] for dep in waits[index]))
+            async with slots:
+                events = self._step_events()
+                result = await self._run_tool_async(step, events)
+                summary = await self._step_summary_async(plan.task, step, result, events, usage)
+            return result, summary, events
+
+        tasks.extend(asyncio.create_task(run(index, step)) for index, step in enumerate(plan.steps))
+        messages, results = [], []
+        try:
+            # Awaiting in plan order publishes events deterministically.
+            for step, task in zip(plan.steps, tasks):
+                result, summary, events = await task
+                self._publish(events)
+                msg = self._step_message(step, result, summary)
+                self.context.short_term.append(msg)
+                messages.append(msg)
+                results.append(result)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return messages, results
+
     async def step_async(self, incoming: Message) -> Message:
         data = json.loads(incoming.content)
         plan = Plan(
@@ -445,11 +684,10 @@ class ExecutorAgent(Agent):
                     tool=s.get("tool"),
                     inputs=s.get("inputs"),
                     notes=s.get("notes"),
+                    depends_on=s.get("depends_on"),
                 )
                 for s in data["steps"]
             ],
         )
         self.context.short_term.append(incoming)
-        msgs = await self.execute_plan_async(plan)
-        from agent_sdk.core.messages import make_message as _mm
-        return msgs[-1] if msgs else _mm("agent", "No steps to execute", metadata={"type": "execution"})
+        return self._last_step_message(await self.execute_plan_async(plan))
@@ -6,6 +6,10 @@ import asyncio
 from dataclasses import dataclass
 from typing import Any, Awaitable, Callable, Optional
 
+from agent_sdk.execution.fair_share import FairShareScheduler
+
+DEFAULT_ORG_ID = "default"
+
 
 @dataclass
 class QueueJob:
@@ -16,17 +20,32 @@ class QueueJob:
 
 
 class ExecutionQueue:
-    def __init__(self, worker_count: int = 2) -> None:
-        self._queue: asyncio.Queue[QueueJob] = asyncio.Queue()
+    """Worker pool that dispatches jobs fairly across tenants.
+
+    Jobs are ordered by ``scheduler`` (a :class:`FairShareScheduler`), so a
+    tenant with a large backlog cannot starve the others and per-tenant
+    concurrency caps hold across all workers.
+    """
+
+    def __init__(self, worker_count: int = 2, scheduler: Optional[FairShareScheduler] = None) -> None:
+        self.scheduler = scheduler or FairShareScheduler()
+        self._ready = asyncio.Condition()
         self._workers = [asyncio.create_task(self._worker()) for _ in range(worker_count)]
 
+    async def _next_job(self) -> tuple:
+        async with self._ready:
+            entry = self.scheduler.pop()
+            while entry is None:
+                await self._ready.wait()
+                entry = self.scheduler.pop()
+            return entry
+
     async def _worker(self) -> None:
         while True:
-            job = await self._queue.get()
-            if job.future.cancelled():
-                self._queue.task_done()
-                continue
+            org_id, job = await self._next_job()
             try:
+                if job.future.cancelled():
+                    continue
                 result = await job.func(*job.args, **job.kwargs)
                 if not job.future.cancelled():
                     job.future.set_result(result)
@@ -34,12 +53,20 @@ class ExecutionQueue:
                 if not job.future.cancelled():
                     job.future.set_exception(exc)
             finally:
-                self._queue.task_done()
+                async with self._ready:
+                    self.scheduler.release(org_id)
+                    self._ready.notify_all()
 
     async def submit(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        return await self.submit_for(DEFAULT_ORG_ID, func, *args, **kwargs)
+
+    async def submit_for(self, org_id: str, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Queue ``func`` on behalf of tenant ``org_id`` and wait for its result."""
         loop = asyncio.get_running_loop()
         future: asyncio.Future = loop.create_future()
-        await self._queue.put(QueueJob(func=func, args=args, kwargs=kwargs, future=future))
+        async with self._ready:
+            self.scheduler.push(org_id, QueueJob(func=func, args=args, kwargs=kwargs, future=future))
+            self._ready.notify()
         return await future
 
     async def shutdown(self) -> None:
@@ -0,0 +1,138 @@
+"""Wake-up notifications for durable queue workers."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from typing import Optional
+
+try:
+    import psycopg
+except ImportError:  # pragma: no cover - optional dependency
+    psycopg = None
+
+
+class QueueNotifier:
+    """Signal queue workers that new work may be available.
+
+    ``notify`` is called after an enqueue; ``wait`` returns True as soon as a
+    notification arrives, or False after ``timeout`` seconds so the worker
+    can fall back to polling its backend. ``blocking`` notifiers do network
+    I/O in ``notify``, so callers on an event loop run it in a worker thread.
+    """
+
+    blocking = False
+
+    def notify(self) -> None:
+        raise NotImplementedError
+
+    async def wait(self, timeout: float) -> bool:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        return None
+
+
+class InProcessNotifier(QueueNotifier):
+    """``asyncio.Event`` notifier for producers and workers on the same loop."""
+
+    def __init__(self) -> None:
+        self._event = asyncio.Event()
+
+    def notify(self) -> None:
+        self._event.set()
+
+    async def wait(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+
+class SQLiteChangeNotifier(InProcessNotifier):
+    """Detect commits to a SQLite file from any connection or process.
+
+    Same-process enqueues wake the worker at once through the in-process
+    event. Commits from other processes are picked up by a slower fallback:
+    every ``check_interval`` seconds ``PRAGMA data_version`` is read on a
+    private connection in a worker thread, so the event loop never does
+    SQLite I/O while a worker idles.
+    """
+
+    def __init__(self, path: str, check_interval: float = 0.25) -> None:
+        super().__init__()
+        self.check_interval = check_interval
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._version = self._data_version()
+
+    def _data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _changed(self) -> bool:
+        version = self._data_version()
+        if version == self._version:
+            return False
+        self._version = version
+        return True
+
+    async def wait(self, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            if await super().wait(min(self.check_interval, remaining)):
+                return True
+            if await asyncio.to_thread(self._changed):
+                return True
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class PostgresNotifier(QueueNotifier):
+    """Cross-process wake-ups over Postgres ``LISTEN``/``NOTIFY``.
+
+    ``notify`` issues ``NOTIFY`` on ``channel``, which reaches the listening
+    connection of every process, this one included; ``wait`` blocks on that
+    connection in a worker thread.
+    """
+
+    blocking = True
+
+    def __init__(self, dsn: str, channel: str = "agent_sdk_queue", connect=None) -> None:
+        if psycopg is None and connect is None:
+            raise RuntimeError("psycopg is required for PostgresNotifier")
+        connect = connect or psycopg.connect
+        self.channel = channel
+        self._listen_conn = connect(dsn, autocommit=True)
+        self._notify_conn = connect(dsn, autocommit=True)
+        self._listen_conn.execute(f'LISTEN "{channel}"')
+
+    def notify(self) -> None:
+        self._notify_conn.execute("SELECT pg_notify(%s, '')", (self.channel,))
+
+    async def wait(self, timeout: float) -> bool:
+        return await asyncio.to_thread(self._receive, timeout)
+
+    def _receive(self, timeout: float) -> bool:
+        for _ in self._listen_conn.notifies(timeout=timeout, stop_after=1):
+            return True
+        return False
+
+    def close(self) -> None:
+        self._listen_conn.close()
+        self._notify_conn.close()
+
+
+def notifier_for(backend: object) -> Optional[QueueNotifier]:
+    """Pick a notifier suited to ``backend``; None when it blocks on its own."""
+    if hasattr(backend, "claim_blocking"):
+        return None
+    path = getattr(backend, "path", None)
+    if isinstance(path, str) and path != ":memory:":
+        return SQLiteChangeNotifier(path)
+    return InProcessNotifier()
@@ -23,6 +23,7 @@ from agent_sdk.memory.compression import (
     SummarizedMessage,
     CompressionStrategy,
     CompactionPolicy,
+    TokenLedger,
     SummarizationEngine,
     ImportanceSamplingEngine,
     TokenBudgetEngine,
@@ -43,6 +44,23 @@ from agent_sdk.memory.persistence import (
     PostgresVectorStore,
     PineconeStore,
 )
+from agent_sdk.memory.vector_index import (
+    VectorIndex,
+    NumpyVectorIndex,
+)
+from agent_sdk.memory.segment_store import SegmentStore
+from agent_sdk.memory.hnsw import HNSWIndex
+from agent_sdk.memory.retrieval_index import BM25Index, MetadataIndex
+from agent_sdk.memory.consolidation import LSHConsolidator, ConsolidationResult
+from agent_sdk.memory.embedding_cache import (
+    EmbeddingCache,
+    CachedEmbeddings,
+    get_default_embedding_cache,
+)
+from agent_sdk.memory.embedding_pipeline import (
+    EmbeddingPipeline,
+    EmbeddingResult,
+)
 
 __all__ = [
     "MemoryType",
@@ -63,6 +81,7 @@ __all__ = [
     "SummarizedMessage",
     "CompressionStrategy",
     "CompactionPolicy",
+    "TokenLedger",
     "SummarizationEngine",
     "ImportanceSamplingEngine",
     "TokenBudgetEngine",
@@ -78,4 +97,17 @@ __all__ = [
     "SQLiteVectorStore",
     "PostgresVectorStore",
     "PineconeStore",
+    "SegmentStore",
+    "VectorIndex",
+    "NumpyVectorIndex",
+    "HNSWIndex",
+    "MetadataIndex",
+    "BM25Index",
+    "LSHConsolidator",
+    "ConsolidationResult",
+    "EmbeddingCache",
+    "CachedEmbeddings",
+    "get_default_embedding_cache",
+    "EmbeddingPipeline",
+    "EmbeddingResult",
 ]
@@ -10,6 +10,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from abc import ABC, abstractmethod
 import asyncio
+import hashlib
 
 
 class CompressionStrategy(str, Enum):
@@ -27,11 +28,24 @@ class CompactionPolicy:
     max_messages: Optional[int] = None
     max_tokens: Optional[int] = None
 
-    def should_compact(self, messages: List["Message"]) -> bool:
+    def should_compact(
+        self,
+        messages: List["Message"],
+        total_tokens: Optional[int] = None,
+    ) -> bool:
+        """
+        Check the thresholds.
+
+        Args:
+            messages: Conversation messages
+            total_tokens: Precomputed token total (e.g. from a TokenLedger);
+                summed from the messages when omitted
+        """
         if self.max_messages is not None and len(messages) > self.max_messages:
             return True
         if self.max_tokens is not None:
-            total_tokens = sum(m.estimate_tokens() for m in messages)
+            if total_tokens is None:
+                total_tokens = sum(m.estimate_tokens() for m in messages)
             if total_tokens > self.max_tokens:
                 return True
         return False
@@ -75,6 +89,61 @@ class SummarizedMessage:
         }
 
 
+class TokenLedger:
+    """
+    Running token total and content digests for one conversation.
+
+    Each accounted message extends a hash chain, so ``digest(i)`` identifies
+    the first ``i`` messages and a ``(start, digest(end))`` pair identifies a
+    message range without rehashing it.
+    """
+
+    def __init__(self):
+        self.total_tokens = 0
+        self._tokens: List[int] = []
+        self._chain: List[bytes] = [b""]
+        self._last: Optional[Message] = None
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def append(self, message: Message) -> None:
+        """Account for one more message."""
+        tokens = message.estimate_tokens()
+        self._tokens.append(tokens)
+        self.total_tokens += tokens
+        payload = f"{message.role}\x00{message.message_id}\x00{message.content}".encode("utf-8")
+        self._chain.append(
+            hashlib.blake2b(self._chain[-1] + payload, digest_size=16).digest()
+        )
+        self._last = message
+
+    def sync(self, messages: List[Message]) -> None:
+        """
+        Catch up with a message list that is only appended to.
+
+        Truncated or replaced histories (detected by length and the identity
+        of the last accounted message) are re-accounted from scratch.
+        """
+        count = len(self._tokens)
+        if count > len(messages) or (count and messages[count - 1] is not self._last):
+            self.reset()
+            count = 0
+        for message in messages[count:]:
+            self.append(message)
+
+    def digest(self, index: int) -> bytes:
+        """Chained digest of the first ``index`` messages."""
+        return self._chain[index]
+
+    def reset(self) -> None:
+        """Forget every accounted message."""
+        self.total_tokens = 0
+        self._tokens.clear()
+        self._chain = [b""]
+        self._last = None
+
+
 class CompressionEngine(ABC):
     """Abstract base for compression strategies."""
 
@@ -86,6 +155,30 @@ class CompressionEngine(ABC):
         """Compress messages."""
         pass
 
+    def stable_prefix(self, messages: List[Message]) -> int:
+        """
+        Number of leading messages whose compressed form can no longer change
+        as messages are appended.
+
+        Engines that compress globally return 0, so every change to the
+        history recompresses it in full.
+        """
+        return 0
+
+    async def compress_segment(
+        self,
+        messages: List[Message],
+    ) -> List[Union[Message, SummarizedMessage]]:
+        """Compress a segment that ends on a ``stable_prefix`` boundary."""
+        return await self.compress(messages)
+
+    async def compress_tail(
+        self,
+        messages: List[Message],
+    ) -> List[Union[Message, SummarizedMessage]]:
+        """Compress the messages that follow a non-empty stable prefix."""
+        return await self.compress(messages)
+
 
 class SummarizationEngine(CompressionEngine):
     """Summarizes messages by creating abstract summaries."""
@@ -120,6 +213,23 @@ class SummarizationEngine(CompressionEngine):
 
         return compressed + recent
 
+    def stable_prefix(self, messages: List[Message]) -> int:
+        """Old messages in completed summarization windows."""
+        old = len(messages) - self.window_size
+        if old <= 0:
+            return 0
+        return (old // self.window_size) * self.window_size
+
+    async def compress_segment(
+        self,
+        messages: List[Message],
+    ) -> List[Union[Message, SummarizedMessage]]:
+        """Summarize each complete window of a stable segment."""
+        return [
+            await self._create_summary(messages[i:i + self.window_size])
+            for i in range(0, len(messages), self.window_size)
+        ]
+
     async def _create_summary(
         self,
         messages: List[Message],
@@ -287,8 +397,33 @@ class ClusteringEngine(CompressionEngine):
         """Compress by clustering similar messages."""
         if len(messages) <= self.cluster_size * 2:
             return messages
+        return await self._cluster(messages)
+
+    def stable_prefix(self, messages: List[Message]) -> int:
+        """Messages in complete clusters once clustering applies."""
+        if len(messages) <= self.cluster_size * 2:
+            return 0
+        return (len(messages) // self.cluster_size) * self.cluster_size
+
+    async def compress_segment(
+        self,
+        messages: List[Message],
+    ) -> List[Union[Message, SummarizedMessage]]:
+        """Cluster a stable segment."""
+        return await self._cluster(messages)
+
+    async def compress_tail(
+        self,
+        messages: List[Message],
+    ) -> List[Union[Message, SummarizedMessage]]:
+        """Cluster the partial cluster that follows the stable prefix."""
+        return await self._cluster(messages)
 
-        # Group messages into clusters
+    async def _cluster(
+        self,
+        messages: List[Message],
+    ) -> List[Union[Message, SummarizedMessage]]:
+        """Group messages into clusters of ``cluster_size``."""
         compressed = []
         for i in range(0, len(messages), self.cluster_size):
             cluster = messages[i:i + self.cluster_size]
@@ -342,6 +477,17 @@ class MemoryCompressionManager:
         self.policy = policy or CompactionPolicy()
         self.summary_hook = summary_hook
         self.auto_compact = auto_compact
+        self.ledger = TokenLedger()
+
+        # Compressed output of messages[:_prefix_end], which the engine
+        # reports as stable, plus the last compressed tail keyed by its
+        # message range.
+        self._prefix_end = 0
+        self._prefix_digest = b""
+        self._prefix_items: List[Union[Message, SummarizedMessage]] = []
+        self._prefix_context: List[str] = []
+        self._tail_key: Optional[Tuple[int, bytes]] = None
+        self._tail_items: List[Union[Message, SummarizedMessage]] = []
 
         # Create appropriate engine
         if strategy == CompressionStrategy.SUMMARIZATION:
@@ -355,30 +501,78 @@ class MemoryCompressionManager:
 
     async def add_message(self, message: Message) -> None:
         """Add message to memory."""
-        message.estimate_tokens()
+        self.ledger.sync(self.messages)
         self.messages.append(message)
+        self.ledger.append(message)
         if self.auto_compact and self.should_compact():
             await self.compress_memory()
 
     def should_compact(self) -> bool:
         """Check if compaction thresholds are exceeded."""
-        return self.policy.should_compact(self.messages)
+        self.ledger.sync(self.messages)
+        return self.policy.should_compact(self.messages, self.ledger.total_tokens)
 
     async def compress_memory(self) -> List[Union[Message, SummarizedMessage]]:
-        """Compress current memory."""
+        """
+        Compress current memory.
+
+        Only messages after the engine's stable prefix are processed; the
+        compressed prefix is reused while the history it covers is unchanged.
+        """
         if not self.messages:
             return []
 
-        compressed = await self.engine.compress(self.messages.copy())
+        await self._refresh()
+        return self._prefix_items + self._tail_items
+
+    async def _refresh(self) -> None:
+        """Bring the compressed prefix and tail up to date with the messages."""
+        ledger = self.ledger
+        ledger.sync(self.messages)
+        count = len(self.messages)
+
+        if self._prefix_end > count or ledger.digest(self._prefix_end) != self._prefix_digest:
+            self._reset_compression()
+
+        stable = self.engine.stable_prefix(self.messages)
+        if stable > self._prefix_end:
+            items = await self.engine.compress_segment(self.messages[self._prefix_end:stable])
+            self._track_summaries(items)
+            self._prefix_items.extend(items)
+            self._prefix_context.extend(self._render(item) for item in items)
+            self._prefix_end = stable
+            self._prefix_digest = ledger.digest(stable)
+
+        tail_key = (self._prefix_end, ledger.digest(count))
+        if tail_key != self._tail_key:
+            tail = self.messages[self._prefix_end:]
+            if not self._prefix_end:
+                self._tail_items = await self.engine.compress(tail)
+            else:
+                self._tail_items = await self.engine.compress_tail(tail) if tail else []
+            self._track_summaries(self._tail_items)
+            self._tail_key = tail_key
 
-        # Track summaries
-        for item in compressed:
+    def _track_summaries(self, items: List[Union[Message, SummarizedMessage]]) -> None:
+        for item in items:
             if isinstance(item, SummarizedMessage):
                 self.compressed_history.append(item)
                 if self.summary_hook:
                     self.summary_hook(item)
 
-        return compressed
+    def _reset_compression(self) -> None:
+        self._prefix_end = 0
+        self._prefix_digest = b""
+        self._prefix_items = []
+        self._prefix_context = []
+        self._tail_key = None
+        self._tail_items = []
+
+    @staticmethod
+    def _render(item: Union[Message, SummarizedMessage]) -> str:
+        if isinstance(item, SummarizedMessage):
+            return item.summary
+        return item.content
 
     async def compact_if_needed(self) -> List[Union[Message, SummarizedMessage]]:
         """Compact memory if thresholds are exceeded."""
@@ -388,23 +582,21 @@ class MemoryCompressionManager:
 
     async def get_compressed_context(self) -> str:
         """Get current memory as compressed context."""
-        compressed = await self.compress_memory()
-
-        context_parts = []
-        for item in compressed:
-            if isinstance(item, SummarizedMessage):
-                context_parts.append(item.summary)
-            else:
-                context_parts.append(item.content)
+        if not self.messages:
+            return ""
 
-        return "\n".join(context_parts)
+        await self._refresh()
+        return "\n".join(
+            self._prefix_context + [self._render(item) for item in self._tail_items]
+        )
 
     def get_compression_stats(self) -> Dict[str, Any]:
         """Get compression statistics."""
         if not self.messages:
             return {}
 
-        original_tokens = sum(m.estimate_tokens() for m in self.messages)
+        self.ledger.sync(self.messages)
+        original_tokens = self.ledger.total_tokens
         summary_count = len(self.compressed_history)
         avg_compression_ratio = (
             sum(s.compression_ratio for s in self.compressed_history)
@@ -424,3 +616,5 @@ class MemoryCompressionManager:
         """Clear memory."""
         self.messages.clear()
         self.compressed_history.clear()
+        self.ledger.reset()
+        self._reset_compression()
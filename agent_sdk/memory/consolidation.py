@@ -0,0 +1,234 @@
+"""Near-duplicate detection for memory consolidation.
+
+Random-hyperplane LSH turns each embedding into a bit signature whose bits
+agree with probability ``1 - angle / pi``. Signatures are split into
+``bands`` of ``rows`` bits; two items become a candidate pair when any band
+matches exactly. Only candidate pairs are checked with an exact cosine, and
+pairs above the threshold are merged into clusters with union-find.
+
+With ``p`` the per-bit agreement for a pair, the chance of it becoming a
+candidate is ``1 - (1 - p**rows) ** bands``: more rows suppress unrelated
+pairs, more bands recover similar ones.
+"""
+
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+
+_PAIR_CHUNK = 1 << 20
+
+
+@dataclass
+class ConsolidationResult:
+    """Clusters of near-duplicate items and the work spent finding them.
+
+    Attributes:
+        clusters: Item IDs per cluster (size >= 2), each in input order.
+        candidate_pairs: Distinct pairs that shared at least one LSH bucket.
+        similar_pairs: Candidate pairs whose cosine exceeded the threshold.
+        elapsed_seconds: Wall time of the search.
+    """
+
+    clusters: List[List[str]] = field(default_factory=list)
+    candidate_pairs: int = 0
+    similar_pairs: int = 0
+    elapsed_seconds: float = 0.0
+
+
+class _DisjointSet:
+    """Union-find with path halving and union by size."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+
+
+class LSHConsolidator:
+    """Find clusters of near-duplicate embeddings without comparing all pairs."""
+
+    def __init__(self, bands: int = 48, rows: int = 14, seed: int = 0):
+        """Initialize the consolidator.
+
+        Args:
+            bands: Number of signature bands (hash tables).
+            rows: Bits per band; at most 62.
+            seed: Seed for the random hyperplanes.
+        """
+        if bands < 1:
+            raise ValueError("bands must be at least 1")
+        if not 1 <= rows <= 62:
+            raise ValueError("rows must be between 1 and 62")
+        self.bands = bands
+        self.rows = rows
+        self.seed = seed
+        self._planes: Dict[int, object] = {}
+
+    def candidate_probability(self, similarity: float) -> float:
+        """Probability that a pair with this cosine becomes a candidate."""
+        angle = math.acos(max(-1.0, min(1.0, similarity)))
+        agreement = 1 - angle / math.pi
+        return 1 - (1 - agreement ** self.rows) ** self.bands
+
+    def find_clusters(
+        self,
+        item_ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        threshold: float,
+    ) -> ConsolidationResult:
+        """Cluster items whose cosine similarity exceeds ``threshold``.
+
+        Args:
+            item_ids: Item IDs aligned with ``embeddings``.
+            embeddings: Vectors; items of different dimensions never match.
+            threshold: Similarity above which two items are merged.
+
+        Returns:
+            ConsolidationResult with clusters and work counters.
+        """
+        if len(item_ids) != len(embeddings):
+            raise ValueError("item_ids must align with embeddings")
+        start = time.perf_counter()
+        result = ConsolidationResult()
+        disjoint = _DisjointSet(len(item_ids))
+
+        by_dimension: Dict[int, List[int]] = {}
+        for position, embedding in enumerate(embeddings):
+            if embedding:
+                by_dimension.setdefault(len(embedding), []).append(position)
+
+        for dimension, positions in by_dimension.items():
+            if len(positions) < 2:
+                continue
+            vectors = [embeddings[i] for i in positions]
+            if np is not None:
+                pairs = self._similar_pairs_numpy(vectors, dimension, threshold, result)
+            else:
+                pairs = self._similar_pairs_python(vectors, dimension, threshold, result)
+            for a, b in pairs:
+                disjoint.union(positions[a], positions[b])
+
+        groups: Dict[int, List[str]] = {}
+        for position, item_id in enumerate(item_ids):
+            groups.setdefault(disjoint.find(position), []).append(item_id)
+        result.clusters = [members for members in groups.values() if len(members) > 1]
+        result.elapsed_seconds = time.perf_counter() - start
+        return result
+
+    def _planes_for(self, dimension: int) -> List[List[float]]:
+        planes = self._planes.get(dimension)
+        if planes is None:
+            rng = random.Random(f"{self.seed}:{dimension}")
+            planes = [
+                [rng.gauss(0.0, 1.0) for _ in range(dimension)]
+                for _ in range(self.bands * self.rows)
+            ]
+            self._planes[dimension] = planes
+        return planes
+
+    def _similar_pairs_numpy(
+        self,
+        vectors: List[Sequence[float]],
+        dimension: int,
+        threshold: float,
+        result: ConsolidationResult,
+    ) -> List[Tuple[int, int]]:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        unit = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        planes = np.asarray(self._planes_for(dimension), dtype=np.float32)
+
+        bits = (unit @ planes.T > 0).reshape(len(vectors), self.bands, self.rows)
+        weights = np.left_shift(np.int64(1), np.arange(self.rows, dtype=np.int64))
+        keys = bits.astype(np.int64) @ weights
+
+        count = len(vectors)
+        pair_codes = []
+        for band in range(self.bands):
+            column = keys[:, band]
+            order = np.argsort(column, kind="stable")
+            ordered = column[order]
+            boundaries = np.flatnonzero(np.diff(ordered)) + 1
+            starts = np.concatenate(([0], boundaries))
+            ends = np.concatenate((boundaries, [count]))
+            for begin, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+                members = np.sort(order[begin:end])
+                left, right = np.triu_indices(len(members), 1)
+                pair_codes.append(members[left].astype(np.int64) * count + members[right])
+        if not pair_codes:
+            return []
+
+        codes = np.unique(np.concatenate(pair_codes))
+        result.candidate_pairs += int(len(codes))
+        similar = []
+        for offset in range(0, len(codes), _PAIR_CHUNK):
+            chunk = codes[offset:offset + _PAIR_CHUNK]
+            left, right = chunk // count, chunk % count
+            scores = np.einsum("ij,ij->i", unit[left], unit[right])
+            keep = scores > threshold
+            similar.extend(zip(left[keep].tolist(), right[keep].tolist()))
+        result.similar_pairs += len(similar)
+        return similar
+
+    def _similar_pairs_python(
+        self,
+        vectors: List[Sequence[float]],
+        dimension: int,
+        threshold: float,
+        result: ConsolidationResult,
+    ) -> List[Tuple[int, int]]:
+        planes = self._planes_for(dimension)
+        norms = [math.sqrt(sum(x * x for x in vector)) for vector in vectors]
+        mask = (1 << self.rows) - 1
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for index, vector in enumerate(vectors):
+            signature = 0
+            for bit, plane in enumerate(planes):
+                if sum(a * b for a, b in zip(vector, plane)) > 0:
+                    signature |= 1 << bit
+            for band in range(self.bands):
+                key = (band, (signature >> (band * self.rows)) & mask)
+                buckets.setdefault(key, []).append(index)
+
+        candidates: Set[Tuple[int, int]] = set()
+        for members in buckets.values():
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    candidates.add((a, b))
+        result.candidate_pairs += len(candidates)
+
+        similar = []
+        for a, b in sorted(candidates):
+            if norms[a] == 0 or norms[b] == 0:
+                continue
+            dot = sum(x * y for x, y in zip(vectors[a], vectors[b]))
+            if dot / (norms[a] * norms[b]) > threshold:
+                similar.append((a, b))
+        result.similar_pairs += len(similar)
+        return similar
+
+
+__all__ = ["LSHConsolidator", "ConsolidationResult"]
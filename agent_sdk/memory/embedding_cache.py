@@ -0,0 +1,291 @@
+"""Content-addressed cache for embedding vectors."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from agent_sdk.memory.embeddings import EmbeddingProvider
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text before hashing so trivially different inputs share a key.
+
+    Args:
+        text: Raw text.
+
+    Returns:
+        NFC-normalized text with collapsed whitespace.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def embedding_cache_key(namespace: str, text: str) -> str:
+    """Build the cache key for a text within a provider namespace.
+
+    Args:
+        namespace: Provider and model identifier.
+        text: Text to embed.
+
+    Returns:
+        Key of the form ``namespace:sha256(normalized text)``.
+    """
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: in-memory LRU plus optional SQLite file.
+
+    Vectors are stored as float32. The memory tier evicts least recently
+    used entries once ``max_bytes`` is exceeded; the disk tier keeps every
+    vector written to it and repopulates the memory tier on read.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, path: Optional[str] = None):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Byte budget for the in-memory tier.
+            path: Optional SQLite file for the on-disk tier.
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        self.max_bytes = max_bytes
+        self.path = path
+        self._entries: "OrderedDict[str, array]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get_many(self, namespace: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Look up vectors for texts, returning None for misses.
+
+        Args:
+            namespace: Provider and model identifier.
+            texts: Texts to look up.
+
+        Returns:
+            Cached vectors (or None) in input order.
+        """
+        keys = [embedding_cache_key(namespace, text) for text in texts]
+        found: Dict[str, array] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+            pending = [key for key in dict.fromkeys(keys) if key not in found]
+            if pending and self._conn is not None:
+                for key, vector in self._read_disk(pending):
+                    found[key] = vector
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+
+            results: List[Optional[List[float]]] = []
+            for key in keys:
+                vector = found.get(key)
+                if vector is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self.hits += 1
+                    results.append(vector.tolist())
+            return results
+
+    def get(self, namespace: str, text: str) -> Optional[List[float]]:
+        """Look up a single vector."""
+        return self.get_many(namespace, [text])[0]
+
+    def put_many(
+        self,
+        namespace: str,
+        texts: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+    ) -> None:
+        """Store vectors for texts in both tiers.
+
+        Args:
+            namespace: Provider and model identifier.
+            texts: Texts that were embedded.
+            vectors: Their embedding vectors.
+        """
+        rows: List[Tuple[str, bytes]] = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = embedding_cache_key(namespace, text)
+                packed = array("f", vector)
+                self._remember(key, packed)
+                rows.append((key, packed.tobytes()))
+            if rows and self._conn is not None:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+                )
+                self._conn.commit()
+
+    def put(self, namespace: str, text: str, vector: Sequence[float]) -> None:
+        """Store a single vector."""
+        self.put_many(namespace, [text], [vector])
+
+    def clear(self) -> None:
+        """Drop the memory tier and, if configured, the disk tier."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embeddings")
+                self._conn.commit()
+
+    def close(self) -> None:
+        """Close the disk tier connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and memory-tier usage."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _remember(self, key: str, vector: array) -> None:
+        size = vector.itemsize * len(vector)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.itemsize * len(previous)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = vector
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.itemsize * len(evicted)
+            self.evictions += 1
+
+    def _read_disk(self, keys: List[str]) -> List[Tuple[str, array]]:
+        rows: List[Tuple[str, array]] = []
+        # Stay under SQLite's default bound-parameter limit.
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" for _ in chunk)
+            cursor = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+            )
+            for key, blob in cursor.fetchall():
+                vector = array("f")
+                vector.frombytes(blob)
+                rows.append((key, vector))
+        return rows
+
+
+class CachedEmbeddings(EmbeddingProvider):
+    """Embedding provider wrapper that serves repeated texts from a cache.
+
+    Only texts missing from the cache are sent to the wrapped provider,
+    de-duplicated and in a single ``embed_batch`` call. Freshly computed
+    vectors are rounded to float32 like cached ones, so a text embeds to
+    the same values whether or not it was a cache hit.
+    """
+
+    def __init__(self, provider: EmbeddingProvider, cache: Optional[EmbeddingCache] = None):
+        """Initialize the wrapper.
+
+        Args:
+            provider: Provider that computes embeddings on a miss.
+            cache: Cache to use (default: the process-wide shared cache).
+        """
+        self.provider = provider
+        self.cache = cache or get_default_embedding_cache()
+
+    @property
+    def embedding_dimension(self) -> int:
+        """Get embedding dimension."""
+        return self.provider.embedding_dimension
+
+    @property
+    def max_batch_size(self) -> int:
+        """Batch size preferred by the wrapped provider."""
+        return self.provider.max_batch_size
+
+    @property
+    def max_batch_tokens(self) -> int:
+        """Token cap preferred by the wrapped provider."""
+        return self.provider.max_batch_tokens
+
+    @property
+    def cache_namespace(self) -> str:
+        """Namespace of the wrapped provider."""
+        return self.provider.cache_namespace
+
+    async def embed_text(self, text: str) -> List[float]:
+        """Generate embedding for text, using the cache when possible."""
+        return (await self.embed_batch([text]))[0]
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings, computing only cache misses."""
+        namespace = self.cache_namespace
+        results = self.cache.get_many(namespace, texts)
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, results) if vector is None))
+        if missing:
+            computed = await self.provider.embed_batch(missing)
+            self.cache.put_many(namespace, missing, computed)
+            by_text = {text: array("f", vector).tolist() for text, vector in zip(missing, computed)}
+            results = [
+                vector if vector is not None else list(by_text[text])
+                for text, vector in zip(texts, results)
+            ]
+        return results
+
+
+_default_cache: Optional[EmbeddingCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_embedding_cache() -> EmbeddingCache:
+    """Return the process-wide embedding cache.
+
+    The disk tier is enabled when ``AGENT_SDK_EMBEDDING_CACHE_PATH`` is set and
+    the memory budget can be set with ``AGENT_SDK_EMBEDDING_CACHE_MAX_BYTES``.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            max_bytes = int(os.getenv("AGENT_SDK_EMBEDDING_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+            path = os.getenv("AGENT_SDK_EMBEDDING_CACHE_PATH") or None
+            _default_cache = EmbeddingCache(max_bytes=max_bytes, path=path)
+        return _default_cache
+
+
+__all__ = [
+    "EmbeddingCache",
+    "CachedEmbeddings",
+    "embedding_cache_key",
+    "get_default_embedding_cache",
+    "normalize_text",
+]
@@ -0,0 +1,199 @@
+"""Batched, concurrent embedding pipeline for bulk ingestion."""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from agent_sdk.core.retry import RetryConfig, retry_with_backoff
+from agent_sdk.memory.embeddings import EmbeddingProvider
+
+
+TextSource = Union[Iterable[str], AsyncIterable[str]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+@dataclass
+class EmbeddingResult:
+    """A single embedded text and its position in the input stream."""
+
+    index: int
+    text: str
+    embedding: List[float]
+
+
+class EmbeddingPipeline:
+    """Coalesce texts into micro-batches and embed them concurrently.
+
+    Texts are grouped until a batch reaches ``max_batch_size`` items or
+    ``max_batch_tokens`` estimated tokens. At most ``max_concurrency``
+    batches are in flight; the input is not read further until the oldest
+    batch completes, which bounds memory regardless of input size. Results
+    are yielded in input order. Failed batches are retried with
+    ``retry_with_backoff``.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        max_batch_size: Optional[int] = None,
+        max_batch_tokens: Optional[int] = None,
+        max_concurrency: int = 4,
+        retry_config: Optional[RetryConfig] = None,
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            provider: Provider used to embed each batch.
+            max_batch_size: Texts per batch (default: provider.max_batch_size).
+            max_batch_tokens: Estimated tokens per batch (default: provider.max_batch_tokens).
+            max_concurrency: Maximum batches embedding at once.
+            retry_config: Retry settings for failed batches.
+        """
+        self.provider = provider
+        self.max_batch_size = max_batch_size or provider.max_batch_size
+        self.max_batch_tokens = max_batch_tokens or provider.max_batch_tokens
+        if self.max_batch_size < 1 or self.max_batch_tokens < 1:
+            raise ValueError("batch limits must be positive")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.retry_config = retry_config or RetryConfig(max_retries=3, base_delay=0.5, max_delay=10.0)
+        self.batches = 0
+        self.texts = 0
+        self.failed_batches = 0
+
+    async def stream(self, texts: TextSource) -> AsyncIterator[EmbeddingResult]:
+        """Embed texts and yield results in input order.
+
+        Args:
+            texts: Sync or async iterable of texts.
+
+        Yields:
+            EmbeddingResult for every input text.
+        """
+        in_flight: Deque[Tuple[int, List[str], "asyncio.Task[List[List[float]]]"]] = deque()
+        try:
+            async for start, batch in self._batches(texts):
+                if len(in_flight) >= self.max_concurrency:
+                    for result in await self._complete(in_flight.popleft()):
+                        yield result
+                task = asyncio.ensure_future(self._embed(batch))
+                in_flight.append((start, batch, task))
+            while in_flight:
+                for result in await self._complete(in_flight.popleft()):
+                    yield result
+        finally:
+            for _, _, task in in_flight:
+                task.cancel()
+
+    async def embed_all(self, texts: TextSource) -> List[List[float]]:
+        """Embed every text and return vectors in input order.
+
+        Args:
+            texts: Sync or async iterable of texts.
+
+        Returns:
+            List of embedding vectors.
+        """
+        return [result.embedding async for result in self.stream(texts)]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batch and text counters."""
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "failed_batches": self.failed_batches,
+            "max_batch_size": self.max_batch_size,
+            "max_batch_tokens": self.max_batch_tokens,
+            "max_concurrency": self.max_concurrency,
+        }
+
+    async def _batches(self, texts: TextSource) -> AsyncIterator[Tuple[int, List[str]]]:
+        batch: List[str] = []
+        batch_tokens = 0
+        start = 0
+        index = 0
+        async for text in self._iterate(texts):
+            tokens = estimate_tokens(text)
+            if batch and (
+                len(batch) >= self.max_batch_size
+                or batch_tokens + tokens > self.max_batch_tokens
+            ):
+                yield start, batch
+                start = index
+                batch = []
+                batch_tokens = 0
+            batch.append(text)
+            batch_tokens += tokens
+            index += 1
+        if batch:
+            yield start, batch
+
+    @staticmethod
+    async def _iterate(texts: TextSource) -> AsyncIterator[str]:
+        if hasattr(texts, "__aiter__"):
+            async for text in texts:
+                yield text
+        else:
+            for text in texts:
+                yield text
+
+    async def _embed(self, batch: List[str]) -> List[List[float]]:
+        config = self.retry_config
+
+        async def _call() -> List[List[float]]:
+            return await self.provider.embed_batch(batch)
+
+        try:
+            embeddings = await retry_with_backoff(
+                _call,
+                max_retries=config.max_retries,
+                base_delay=config.base_delay,
+                max_delay=config.max_delay,
+                exponential_base=config.exponential_base,
+            )
+        except Exception:
+            self.failed_batches += 1
+            raise
+        if len(embeddings) != len(batch):
+            self.failed_batches += 1
+            raise RuntimeError(
+                f"Provider returned {len(embeddings)} embeddings for {len(batch)} texts"
+            )
+        self.batches += 1
+        self.texts += len(batch)
+        return embeddings
+
+    @staticmethod
+    async def _complete(
+        entry: Tuple[int, List[str], "asyncio.Task[List[List[float]]]"]
+    ) -> List[EmbeddingResult]:
+        start, batch, task = entry
+        embeddings = await task
+        return [
+            EmbeddingResult(index=start + offset, text=text, embedding=embedding)
+            for offset, (text, embedding) in enumerate(zip(batch, embeddings))
+        ]
+
+
+__all__ = [
+    "EmbeddingPipeline",
+    "EmbeddingResult",
+    "estimate_tokens",
+]
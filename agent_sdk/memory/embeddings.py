@@ -8,6 +8,10 @@ import os
 class EmbeddingProvider(ABC):
     """Base class for embedding providers."""
     
+    # Preferred request size for batched embedding pipelines.
+    max_batch_size: int = 64
+    max_batch_tokens: int = 8192
+    
     @property
     @abstractmethod
     def embedding_dimension(self) -> int:
@@ -42,6 +46,28 @@ class EmbeddingProvider(ABC):
         """
         pass
     
+    @property
+    def cache_namespace(self) -> str:
+        """Identify provider and model for embedding cache keys.
+        
+        Returns:
+            Namespace string such as ``OpenAIEmbeddings:text-embedding-3-small``.
+        """
+        model = getattr(self, "model", None) or getattr(self, "model_name", "")
+        return f"{type(self).__name__}:{model}"
+    
+    def cached(self, cache=None) -> "EmbeddingProvider":
+        """Wrap this provider so repeated texts are served from a cache.
+        
+        Args:
+            cache: EmbeddingCache to use (default: the shared process cache).
+            
+        Returns:
+            CachedEmbeddings wrapping this provider.
+        """
+        from agent_sdk.memory.embedding_cache import CachedEmbeddings
+        return CachedEmbeddings(self, cache)
+    
     def embed_text_sync(self, text: str) -> List[float]:
         """Synchronous wrapper for embed_text.
         
@@ -78,6 +104,9 @@ class EmbeddingProvider(ABC):
 class OpenAIEmbeddings(EmbeddingProvider):
     """OpenAI embedding model (text-embedding-3-small)."""
     
+    max_batch_size = 2048
+    max_batch_tokens = 300_000
+    
     def __init__(self, api_key: Optional[str] = None, model: str = "text-embedding-3-small"):
         """Initialize OpenAI embeddings.
         
@@ -153,6 +182,8 @@ class OpenAIEmbeddings(EmbeddingProvider):
 class HuggingFaceEmbeddings(EmbeddingProvider):
     """HuggingFace embedding models (all-MiniLM-L6-v2 by default)."""
     
+    max_batch_size = 32
+    
     def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
         """Initialize HuggingFace embeddings.
         
@@ -232,6 +263,11 @@ class LocalEmbeddings(EmbeddingProvider):
         """Get embedding dimension."""
         return self.hf.embedding_dimension
     
+    @property
+    def cache_namespace(self) -> str:
+        """Share cache entries with the delegated HuggingFace model."""
+        return self.hf.cache_namespace
+    
     async def embed_text(self, text: str) -> List[float]:
         """Generate embedding for text.
         
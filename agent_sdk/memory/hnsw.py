@@ -0,0 +1,313 @@
+"""Hierarchical Navigable Small World (HNSW) approximate nearest neighbour index."""
+
+import heapq
+import json
+import math
+import random
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from agent_sdk.memory.vector_index import VectorIndex
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+class HNSWIndex(VectorIndex):
+    """Approximate cosine index using a multi-layer proximity graph.
+
+    Queries greedily descend the sparse upper layers and run a best-first
+    beam search of width ``ef_search`` on the bottom layer, so search cost
+    grows roughly logarithmically with the number of items. Deleted items
+    are tombstoned: they are skipped in results but still used for graph
+    traversal until ``rebuild`` is called.
+    """
+
+    def __init__(
+        self,
+        dimension: Optional[int] = None,
+        M: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 50,
+        seed: Optional[int] = None,
+        initial_capacity: int = 1024,
+    ):
+        """Initialize the index.
+
+        Args:
+            dimension: Vector dimension (inferred from the first add if omitted).
+            M: Maximum neighbours per node on upper layers (2*M on layer 0).
+            ef_construction: Beam width used while inserting.
+            ef_search: Beam width used while querying.
+            seed: Random seed for level assignment.
+            initial_capacity: Rows to preallocate.
+        """
+        if np is None:
+            raise RuntimeError("numpy is required for HNSWIndex")
+        if M < 2:
+            raise ValueError("M must be at least 2")
+        if ef_construction < 1 or ef_search < 1:
+            raise ValueError("ef_construction and ef_search must be positive")
+        self.dimension = dimension
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.seed = seed
+        self._level_mult = 1 / math.log(M)
+        self._rng = random.Random(seed)
+        self._initial_capacity = max(1, initial_capacity)
+        self._vectors = None
+        self._row_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._deleted: Set[int] = set()
+        self._graph: List[List[List[int]]] = []
+        self._entry: Optional[int] = None
+        self._max_level = -1
+        if dimension is not None:
+            self._vectors = np.zeros((self._initial_capacity, dimension), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._rows
+
+    @property
+    def deleted_count(self) -> int:
+        """Number of tombstoned nodes still present in the graph."""
+        return len(self._deleted)
+
+    def add(self, item_id: str, vector: Sequence[float]) -> None:
+        """Insert an item, replacing any previous vector for the same ID."""
+        query = self._normalize(vector)
+        if item_id in self._rows:
+            self.remove(item_id)
+
+        node = len(self._row_ids)
+        if node == self._vectors.shape[0]:
+            grown = np.zeros((node * 2, self.dimension), dtype=np.float32)
+            grown[:node] = self._vectors
+            self._vectors = grown
+        self._vectors[node] = query
+        self._row_ids.append(item_id)
+        self._rows[item_id] = node
+
+        level = int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+        self._graph.append([[] for _ in range(level + 1)])
+
+        if self._entry is None:
+            self._entry = node
+            self._max_level = level
+            return
+
+        entry = self._entry
+        for layer in range(self._max_level, level, -1):
+            entry = self._search_layer(query, [entry], 1, layer)[0][1]
+
+        entry_points = [entry]
+        for layer in range(min(level, self._max_level), -1, -1):
+            candidates = self._search_layer(query, entry_points, self.ef_construction, layer)
+            neighbours = [n for _, n in candidates[: self.M]]
+            self._graph[node][layer] = neighbours
+            max_links = self._max_links(layer)
+            for neighbour in neighbours:
+                links = self._graph[neighbour][layer]
+                links.append(node)
+                if len(links) > max_links:
+                    self._graph[neighbour][layer] = self._closest(neighbour, links, max_links)
+            entry_points = [n for _, n in candidates]
+
+        if level > self._max_level:
+            self._entry = node
+            self._max_level = level
+
+    def remove(self, item_id: str) -> bool:
+        """Tombstone an item so it is no longer returned."""
+        node = self._rows.pop(item_id, None)
+        if node is None:
+            return False
+        self._deleted.add(node)
+        return True
+
+    def clear(self) -> None:
+        """Remove every item and reset the graph."""
+        self._row_ids = []
+        self._rows = {}
+        self._deleted = set()
+        self._graph = []
+        self._entry = None
+        self._max_level = -1
+        self._rng = random.Random(self.seed)
+
+    def rebuild(self) -> None:
+        """Re-insert live items to drop tombstoned nodes from the graph."""
+        live = [(item_id, self._vectors[node].copy()) for item_id, node in self._rows.items()]
+        live.sort(key=lambda pair: self._rows[pair[0]])
+        self.clear()
+        for item_id, vector in live:
+            self.add(item_id, vector)
+
+    def search(
+        self,
+        query: Sequence[float],
+        top_k: int = 5,
+        ef_search: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """Return approximately the top-k items by cosine similarity.
+
+        Args:
+            query: Query embedding vector.
+            top_k: Number of results to return.
+            ef_search: Override the configured beam width.
+
+        Returns:
+            List of (item_id, similarity) tuples, most similar first.
+        """
+        if not self._rows or top_k <= 0:
+            return []
+        query_vector = np.asarray(query, dtype=np.float32)
+        if query_vector.shape != (self.dimension,):
+            return []
+        norm = float(np.linalg.norm(query_vector))
+        if norm > 0.0:
+            query_vector = query_vector / norm
+
+        entry = self._entry
+        for layer in range(self._max_level, 0, -1):
+            entry = self._search_layer(query_vector, [entry], 1, layer)[0][1]
+
+        top_k = min(top_k, len(self._rows))
+        ef = max(ef_search or self.ef_search, top_k)
+        while True:
+            candidates = self._search_layer(query_vector, [entry], ef, 0)
+            results = [
+                (self._row_ids[node], 1.0 - distance)
+                for distance, node in candidates
+                if node not in self._deleted
+            ][:top_k]
+            # Tombstones can crowd live nodes out of the beam; widen and retry.
+            if len(results) == top_k or ef >= len(self._row_ids):
+                return results
+            ef *= 2
+
+    def save(self, path: str) -> None:
+        """Write the index to a ``.npz`` file.
+
+        Args:
+            path: Destination file path.
+        """
+        count = len(self._row_ids)
+        meta = {
+            "dimension": self.dimension,
+            "M": self.M,
+            "ef_construction": self.ef_construction,
+            "ef_search": self.ef_search,
+            "seed": self.seed,
+            "ids": self._row_ids,
+            "deleted": sorted(self._deleted),
+            "graph": self._graph,
+            "entry": self._entry,
+            "max_level": self._max_level,
+        }
+        vectors = self._vectors[:count] if self._vectors is not None else np.zeros((0, 0), dtype=np.float32)
+        with open(path, "wb") as handle:
+            np.savez(handle, vectors=vectors, meta=np.array(json.dumps(meta)))
+
+    @classmethod
+    def load(cls, path: str) -> "HNSWIndex":
+        """Load an index previously written by ``save``.
+
+        Args:
+            path: Source file path.
+
+        Returns:
+            Restored HNSWIndex.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            vectors = data["vectors"]
+        index = cls(
+            dimension=meta["dimension"],
+            M=meta["M"],
+            ef_construction=meta["ef_construction"],
+            ef_search=meta["ef_search"],
+            seed=meta["seed"],
+            initial_capacity=max(1, len(meta["ids"])),
+        )
+        if meta["dimension"] is not None:
+            index._vectors[: len(vectors)] = vectors
+        index._row_ids = list(meta["ids"])
+        index._deleted = set(meta["deleted"])
+        index._rows = {
+            item_id: node
+            for node, item_id in enumerate(index._row_ids)
+            if node not in index._deleted
+        }
+        index._graph = meta["graph"]
+        index._entry = meta["entry"]
+        index._max_level = meta["max_level"]
+        return index
+
+    def _max_links(self, layer: int) -> int:
+        return self.M * 2 if layer == 0 else self.M
+
+    def _closest(self, node: int, links: List[int], limit: int) -> List[int]:
+        distances = 1.0 - self._vectors[links] @ self._vectors[node]
+        order = np.argsort(distances, kind="stable")[:limit]
+        return [links[i] for i in order]
+
+    def _search_layer(
+        self, query, entry_points: List[int], ef: int, layer: int
+    ) -> List[Tuple[float, int]]:
+        """Best-first beam search on one layer, returning (distance, node) pairs."""
+        vectors = self._vectors
+        visited = set(entry_points)
+        entry_distances = 1.0 - vectors[entry_points] @ query
+        candidates = [(float(d), n) for d, n in zip(entry_distances, entry_points)]
+        heapq.heapify(candidates)
+        # Max-heap of the best ef results via negated distances.
+        best = [(-d, n) for d, n in candidates]
+        heapq.heapify(best)
+        while len(best) > ef:
+            heapq.heappop(best)
+
+        while candidates:
+            distance, node = heapq.heappop(candidates)
+            if distance > -best[0][0] and len(best) >= ef:
+                break
+            links = self._graph[node]
+            if layer >= len(links):
+                continue
+            fresh = [n for n in links[layer] if n not in visited]
+            if not fresh:
+                continue
+            visited.update(fresh)
+            distances = 1.0 - vectors[fresh] @ query
+            for neighbour_distance, neighbour in zip(distances.tolist(), fresh):
+                if len(best) < ef or neighbour_distance < -best[0][0]:
+                    heapq.heappush(candidates, (neighbour_distance, neighbour))
+                    heapq.heappush(best, (-neighbour_distance, neighbour))
+                    if len(best) > ef:
+                        heapq.heappop(best)
+
+        return sorted((-d, n) for d, n in best)
+
+    def _normalize(self, vector: Sequence[float]):
+        row_vector = np.asarray(vector, dtype=np.float32)
+        if row_vector.ndim != 1:
+            raise ValueError("vector must be one-dimensional")
+        if self._vectors is None:
+            self.dimension = len(row_vector)
+            self._vectors = np.zeros((self._initial_capacity, self.dimension), dtype=np.float32)
+        if row_vector.shape[0] != self.dimension:
+            raise ValueError(
+                f"vector dimension {row_vector.shape[0]} does not match index dimension {self.dimension}"
+            )
+        norm = float(np.linalg.norm(row_vector))
+        if norm == 0.0:
+            return np.zeros(self.dimension, dtype=np.float32)
+        return row_vector / norm
+
+
+__all__ = ["HNSWIndex"]
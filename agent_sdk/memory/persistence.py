@@ -1,13 +1,22 @@
 """Persistence layer for storing vector embeddings and documents."""
 
+import heapq
 import json
+import math
 import os
 import pickle
 import sqlite3
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from array import array
+from typing import List, Dict, Any, Optional, Tuple
 from agent_sdk.data_connectors.document import Document, Chunk
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
 
 class MemoryStore(ABC):
     """Abstract base class for vector memory persistence."""
@@ -171,75 +180,273 @@ class FileSystemStore(MemoryStore):
 
 
 class SQLiteVectorStore(MemoryStore):
-    """SQLite-backed vector memory storage."""
+    """SQLite-backed vector memory storage.
+
+    Embeddings are stored as float32 BLOBs and read through a single
+    persistent WAL-mode connection. ``search`` streams rows in chunks and
+    scores each chunk with vectorized math, so querying a local store does
+    not decode a JSON document per row.
+    """
+
+    SCHEMA_VERSION = 2
+
+    def __init__(self, path: str = "vector_store.db", chunk_size: int = 1024):
+        """Initialize SQLite vector store.
 
-    def __init__(self, path: str = "vector_store.db"):
+        Args:
+            path: Database file path.
+            chunk_size: Rows scored per chunk during search.
+        """
         self.path = path
+        self.chunk_size = chunk_size
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
         self._init_db()
 
     def _init_db(self) -> None:
-        with sqlite3.connect(self.path) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS vector_store (
-                    doc_id TEXT PRIMARY KEY,
-                    document_json TEXT NOT NULL,
-                    embedding_json TEXT NOT NULL
+        with self._lock:
+            conn = self._conn
+            columns = {
+                row[1] for row in conn.execute("PRAGMA table_info(vector_store)").fetchall()
+            }
+            if "embedding_json" in columns:
+                self._migrate_json_embeddings()
+            else:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS vector_store (
+                        doc_id TEXT PRIMARY KEY,
+                        document_json TEXT NOT NULL,
+                        dimension INTEGER NOT NULL,
+                        embedding BLOB NOT NULL
+                    )
+                    """
                 )
-                """
-            )
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
             conn.commit()
 
+    def _migrate_json_embeddings(self) -> None:
+        """Convert the original JSON-text embedding column to float32 BLOBs."""
+        conn = self._conn
+        conn.execute("BEGIN")
+        conn.execute(
+            """
+            CREATE TABLE vector_store_v2 (
+                doc_id TEXT PRIMARY KEY,
+                document_json TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                embedding BLOB NOT NULL
+            )
+            """
+        )
+        cursor = conn.execute("SELECT doc_id, document_json, embedding_json FROM vector_store")
+        while True:
+            rows = cursor.fetchmany(self.chunk_size)
+            if not rows:
+                break
+            converted = []
+            for doc_id, document_json, embedding_json in rows:
+                embedding = json.loads(embedding_json)
+                converted.append(
+                    (doc_id, document_json, len(embedding), _pack_embedding(embedding))
+                )
+            conn.executemany(
+                "INSERT INTO vector_store_v2 (doc_id, document_json, dimension, embedding) "
+                "VALUES (?, ?, ?, ?)",
+                converted,
+            )
+        conn.execute("DROP TABLE vector_store")
+        conn.execute("ALTER TABLE vector_store_v2 RENAME TO vector_store")
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
+
     async def save(self, document: Document, embedding: List[float]) -> None:
-        payload = json.dumps(document.to_dict(), default=str)
-        embedding_json = json.dumps(embedding)
-        with sqlite3.connect(self.path) as conn:
-            conn.execute(
+        await self.save_many([(document, embedding)])
+
+    async def save_many(self, items: List[Tuple[Document, List[float]]]) -> None:
+        """Save several documents in one transaction.
+
+        Args:
+            items: (document, embedding) pairs.
+        """
+        rows = [
+            (
+                document.doc_id,
+                json.dumps(document.to_dict(), default=str),
+                len(embedding),
+                _pack_embedding(embedding),
+            )
+            for document, embedding in items
+        ]
+        with self._lock:
+            self._conn.executemany(
                 """
-                INSERT INTO vector_store (doc_id, document_json, embedding_json)
-                VALUES (?, ?, ?)
+                INSERT INTO vector_store (doc_id, document_json, dimension, embedding)
+                VALUES (?, ?, ?, ?)
                 ON CONFLICT(doc_id) DO UPDATE SET
                     document_json = excluded.document_json,
-                    embedding_json = excluded.embedding_json
+                    dimension = excluded.dimension,
+                    embedding = excluded.embedding
                 """,
-                (document.doc_id, payload, embedding_json),
+                rows,
             )
-            conn.commit()
+            self._conn.commit()
 
     async def load(self, doc_id: str) -> Optional[tuple]:
-        with sqlite3.connect(self.path) as conn:
-            cur = conn.execute(
-                "SELECT document_json, embedding_json FROM vector_store WHERE doc_id = ?",
-                (doc_id,),
-            )
-            row = cur.fetchone()
-            if row is None:
-                return None
-            doc_json, embedding_json = row
-            doc_data = json.loads(doc_json)
-            document = Document(
-                content=doc_data["content"],
-                metadata=doc_data.get("metadata", {}),
-                source=doc_data.get("source"),
-                doc_id=doc_data.get("doc_id", doc_id),
-            )
-            embedding = json.loads(embedding_json)
-            return (document, embedding)
+        return (await self.load_many([doc_id]))[0]
+
+    async def load_many(self, doc_ids: List[str]) -> List[Optional[tuple]]:
+        """Load several documents by ID.
+
+        Args:
+            doc_ids: Document IDs.
+
+        Returns:
+            (document, embedding) tuples or None, aligned with ``doc_ids``.
+        """
+        found: Dict[str, tuple] = {}
+        unique_ids = list(dict.fromkeys(doc_ids))
+        with self._lock:
+            for start in range(0, len(unique_ids), 500):
+                chunk = unique_ids[start:start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                cursor = self._conn.execute(
+                    f"SELECT doc_id, document_json, embedding FROM vector_store "
+                    f"WHERE doc_id IN ({placeholders})",
+                    chunk,
+                )
+                for doc_id, document_json, blob in cursor.fetchall():
+                    found[doc_id] = (
+                        _document_from_json(document_json, doc_id),
+                        _unpack_embedding(blob),
+                    )
+        return [found.get(doc_id) for doc_id in doc_ids]
 
     async def delete(self, doc_id: str) -> bool:
-        with sqlite3.connect(self.path) as conn:
-            cur = conn.execute(
+        with self._lock:
+            cur = self._conn.execute(
                 "DELETE FROM vector_store WHERE doc_id = ?",
                 (doc_id,),
             )
-            conn.commit()
+            self._conn.commit()
             return cur.rowcount > 0
 
     async def list_all(self) -> List[str]:
-        with sqlite3.connect(self.path) as conn:
-            cur = conn.execute("SELECT doc_id FROM vector_store ORDER BY doc_id")
+        with self._lock:
+            cur = self._conn.execute("SELECT doc_id FROM vector_store ORDER BY doc_id")
             return [row[0] for row in cur.fetchall()]
 
+    async def search(
+        self,
+        query_vector: List[float],
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[Document, float]]:
+        """Find the stored documents most similar to a query vector.
+
+        Rows are streamed ``chunk_size`` at a time and scored by cosine
+        similarity; only the winning documents are decoded. Rows whose
+        dimension differs from the query are skipped.
+
+        Args:
+            query_vector: Query embedding.
+            top_k: Number of results to return.
+            metadata_filter: Exact-match metadata criteria with scalar values,
+                evaluated in SQL.
+
+        Returns:
+            List of (document, similarity_score) tuples, best first.
+        """
+        if top_k <= 0 or not query_vector:
+            return []
+        sql = "SELECT doc_id, embedding FROM vector_store WHERE dimension = ?"
+        params: List[Any] = [len(query_vector)]
+        for key, value in (metadata_filter or {}).items():
+            if value is not None and not isinstance(value, (str, int, float)):
+                raise ValueError(
+                    f"metadata_filter value for {key!r} must be a string, number, bool or None"
+                )
+            # Matching on json_each's key column avoids building a JSON path from the key.
+            sql += (
+                " AND (SELECT value FROM json_each(document_json, '$.metadata')"
+                " WHERE key = ?) IS ?"
+            )
+            params.extend([key, value])
+
+        best: List[Tuple[float, int, str]] = []
+        seen = 0
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                scores = _score_chunk(query_vector, [blob for _, blob in rows])
+                for (doc_id, _), score in zip(rows, scores):
+                    # Sequence number keeps ties in row order.
+                    entry = (score, -seen, doc_id)
+                    seen += 1
+                    if len(best) < top_k:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        heapq.heapreplace(best, entry)
+
+        ranked = sorted(best, reverse=True)
+        loaded = await self.load_many([doc_id for _, _, doc_id in ranked])
+        return [
+            (item[0], score)
+            for (score, _, _), item in zip(ranked, loaded)
+            if item is not None
+        ]
+
+
+def _pack_embedding(embedding: List[float]) -> bytes:
+    return array("f", embedding).tobytes()
+
+
+def _unpack_embedding(blob: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+def _document_from_json(document_json: str, doc_id: str) -> Document:
+    doc_data = json.loads(document_json)
+    return Document(
+        content=doc_data["content"],
+        metadata=doc_data.get("metadata", {}),
+        source=doc_data.get("source"),
+        doc_id=doc_data.get("doc_id", doc_id),
+    )
+
+
+def _score_chunk(query_vector: List[float], blobs: List[bytes]) -> List[float]:
+    """Cosine similarity between a query and a chunk of float32 BLOBs."""
+    if np is not None:
+        matrix = np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(len(blobs), -1)
+        query = np.asarray(query_vector, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        dots = matrix @ query
+        scores = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+        return scores.tolist()
+
+    query_norm = math.sqrt(sum(q * q for q in query_vector))
+    scores = []
+    for blob in blobs:
+        vector = array("f")
+        vector.frombytes(blob)
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0 or query_norm == 0:
+            scores.append(0.0)
+        else:
+            scores.append(sum(a * b for a, b in zip(query_vector, vector)) / (norm * query_norm))
+    return scores
+
 
 class PostgresVectorStore(MemoryStore):
     """PostgreSQL with pgvector extension for vector storage."""
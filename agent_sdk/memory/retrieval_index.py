@@ -0,0 +1,243 @@
+"""Incrementally maintained indexes used to narrow and score retrieval candidates."""
+
+import json
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokenization shared by keyword scoring."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _index_key(value: Any) -> Hashable:
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return ("__json__", json.dumps(value, sort_keys=True, default=str))
+
+
+class MetadataIndex:
+    """Inverted index of metadata values: field -> value -> document IDs."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._postings: Dict[str, Dict[Hashable, Set[str]]] = {}
+        self._fields: Dict[str, Set[str]] = {}
+        self._documents: Dict[str, Dict[str, Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, doc_id: str, metadata: Dict[str, Any]) -> None:
+        """Index (or re-index) a document's metadata.
+
+        Args:
+            doc_id: Document ID.
+            metadata: Document metadata.
+        """
+        self.remove(doc_id)
+        keys = {field: _index_key(value) for field, value in metadata.items()}
+        for field, key in keys.items():
+            self._postings.setdefault(field, {}).setdefault(key, set()).add(doc_id)
+            self._fields.setdefault(field, set()).add(doc_id)
+        self._documents[doc_id] = keys
+
+    def remove(self, doc_id: str) -> bool:
+        """Drop a document from the index.
+
+        Args:
+            doc_id: Document ID.
+
+        Returns:
+            True if the document was indexed.
+        """
+        keys = self._documents.pop(doc_id, None)
+        if keys is None:
+            return False
+        for field, key in keys.items():
+            values = self._postings[field]
+            values[key].discard(doc_id)
+            if not values[key]:
+                del values[key]
+            self._fields[field].discard(doc_id)
+        return True
+
+    def clear(self) -> None:
+        """Remove every document."""
+        self._postings.clear()
+        self._fields.clear()
+        self._documents.clear()
+
+    def candidates(self, metadata_filter: Dict[str, Any]) -> Set[str]:
+        """Return IDs of documents whose metadata equals every filter value.
+
+        A ``None`` filter value also matches documents without the field,
+        mirroring ``Document.get_metadata``.
+
+        Args:
+            metadata_filter: Field/value pairs that must all match.
+
+        Returns:
+            Set of matching document IDs.
+        """
+        result: Optional[Set[str]] = None
+        # Intersect the most selective fields first.
+        for field, value in sorted(
+            metadata_filter.items(), key=lambda item: len(self._match(*item))
+        ):
+            matches = self._match(field, value)
+            result = set(matches) if result is None else result & matches
+            if not result:
+                return set()
+        return set(self._documents) if result is None else result
+
+    def _match(self, field: str, value: Any) -> Set[str]:
+        matches = self._postings.get(field, {}).get(_index_key(value), set())
+        if value is None:
+            missing = set(self._documents) - self._fields.get(field, set())
+            return matches | missing
+        return matches
+
+
+class BM25Index:
+    """Okapi BM25 keyword index with incremental add and remove."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """Initialize an empty index.
+
+        Args:
+            k1: Term-frequency saturation.
+            b: Length normalization strength.
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, Counter] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._lengths
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index (or re-index) a document's text.
+
+        Args:
+            doc_id: Document ID.
+            text: Document text.
+        """
+        self.remove(doc_id)
+        counts = Counter(tokenize(text))
+        for term, count in counts.items():
+            self._postings.setdefault(term, {})[doc_id] = count
+        length = sum(counts.values())
+        self._terms[doc_id] = counts
+        self._lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id: str) -> bool:
+        """Drop a document from the index.
+
+        Args:
+            doc_id: Document ID.
+
+        Returns:
+            True if the document was indexed.
+        """
+        counts = self._terms.pop(doc_id, None)
+        if counts is None:
+            return False
+        for term in counts:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+        return True
+
+    def clear(self) -> None:
+        """Remove every document."""
+        self._postings.clear()
+        self._lengths.clear()
+        self._terms.clear()
+        self._total_length = 0
+
+    def document_frequency(self, term: str) -> int:
+        """Number of documents containing a term."""
+        return len(self._postings.get(term, {}))
+
+    def score(self, query: str, candidates: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Score documents that share at least one term with the query.
+
+        Only postings of the query terms are visited, so cost depends on how
+        many documents contain those terms, not on corpus size.
+
+        Args:
+            query: Query text.
+            candidates: Optional set of document IDs to restrict scoring to.
+
+        Returns:
+            Mapping of document ID to BM25 score.
+        """
+        total = len(self._lengths)
+        if total == 0:
+            return {}
+        allowed = set(candidates) if candidates is not None else None
+        average_length = self._total_length / total or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            if allowed is not None and len(allowed) < df:
+                items = ((doc_id, postings[doc_id]) for doc_id in allowed if doc_id in postings)
+            else:
+                items = (
+                    (doc_id, tf) for doc_id, tf in postings.items()
+                    if allowed is None or doc_id in allowed
+                )
+            for doc_id, tf in items:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the index (term counts per document)."""
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "documents": {doc_id: dict(counts) for doc_id, counts in self._terms.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BM25Index":
+        """Restore an index produced by ``to_dict``."""
+        index = cls(k1=data.get("k1", 1.5), b=data.get("b", 0.75))
+        for doc_id, counts in data.get("documents", {}).items():
+            counter = Counter(counts)
+            for term, count in counter.items():
+                index._postings.setdefault(term, {})[doc_id] = count
+            length = sum(counter.values())
+            index._terms[doc_id] = counter
+            index._lengths[doc_id] = length
+            index._total_length += length
+        return index
+
+
+__all__ = [
+    "MetadataIndex",
+    "BM25Index",
+    "tokenize",
+]
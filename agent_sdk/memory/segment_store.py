@@ -0,0 +1,451 @@
+"""Append-only, memory-mapped segment store for documents and embeddings."""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from array import array
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from agent_sdk.data_connectors.document import Document
+from agent_sdk.memory.persistence import MemoryStore
+
+
+_RECORD_HEADER = struct.Struct("<I")
+_INDEX_HEADER = struct.Struct("<BH")
+_INDEX_PUT = struct.Struct("<QQI")
+_OP_PUT = 1
+_OP_DELETE = 2
+
+
+class SegmentStore(MemoryStore):
+    """Vector memory storage in a handful of append-only files.
+
+    A generation of the store is three files:
+
+    - ``vectors-<gen>.f32``: fixed-width float32 rows, memory-mapped for reads
+    - ``records-<gen>.log``: length-prefixed JSON records (content, metadata)
+    - ``index-<gen>.log``: put/delete entries mapping doc IDs to row and
+      record offsets, replayed on open
+
+    ``meta.json`` names the live generation. Overwrites and deletes only
+    append, leaving dead rows behind; once they exceed ``compaction_ratio``
+    of all rows a background thread copies live data into a new generation
+    and switches ``meta.json`` atomically. The copy runs without holding the
+    store lock; writes made meanwhile are replayed into the new generation
+    just before the switch. Opening, listing and bulk loads therefore scale
+    with bytes read rather than with the number of files. A write torn by a
+    crash is cut off on open, so later appends start on a clean boundary.
+    """
+
+    def __init__(
+        self,
+        base_dir: str = "./vector_segments",
+        compaction_ratio: float = 0.5,
+        min_compaction_rows: int = 128,
+        background_compaction: bool = True,
+    ):
+        """Initialize the segment store.
+
+        Args:
+            base_dir: Directory holding the segment files.
+            compaction_ratio: Dead-row fraction that triggers compaction.
+            min_compaction_rows: Rows required before compaction is considered.
+            background_compaction: Compact on a background thread when True,
+                otherwise inline.
+        """
+        if not 0 < compaction_ratio <= 1:
+            raise ValueError("compaction_ratio must be in (0, 1]")
+        self.base_dir = base_dir
+        self.compaction_ratio = compaction_ratio
+        self.min_compaction_rows = min_compaction_rows
+        self.background_compaction = background_compaction
+        os.makedirs(base_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._entries: Dict[str, Tuple[int, int, int]] = {}
+        self._rows = 0
+        self._maps: Dict[str, Optional[mmap.mmap]] = {"vectors": None, "records": None}
+        self.dimension: Optional[int] = None
+        self.generation = 0
+        self.compactions = 0
+
+        meta_path = os.path.join(base_dir, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            self.generation = meta["generation"]
+            self.dimension = meta.get("dimension")
+        self._replay_index()
+        self._open_files()
+
+    @property
+    def dead_rows(self) -> int:
+        """Rows no longer referenced by any live document."""
+        return self._rows - len(self._entries)
+
+    def _path(self, kind: str, generation: Optional[int] = None) -> str:
+        gen = self.generation if generation is None else generation
+        suffix = "f32" if kind == "vectors" else "log"
+        return os.path.join(self.base_dir, f"{kind}-{gen}.{suffix}")
+
+    def _open_files(self) -> None:
+        self._files = {
+            kind: open(self._path(kind), "ab")
+            for kind in ("vectors", "records", "index")
+        }
+
+    def _close_files(self) -> None:
+        for handle in self._files.values():
+            handle.close()
+        for kind, mapped in self._maps.items():
+            if mapped is not None:
+                mapped.close()
+            self._maps[kind] = None
+
+    def _write_meta(self) -> None:
+        meta_path = os.path.join(self.base_dir, "meta.json")
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"generation": self.generation, "dimension": self.dimension}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, meta_path)
+
+    @staticmethod
+    def _iter_index(data: bytes):
+        """Yield ``(op, doc_id, location, end)`` for each complete entry in ``data``."""
+        position = 0
+        while position + _INDEX_HEADER.size <= len(data):
+            op, id_length = _INDEX_HEADER.unpack_from(data, position)
+            if op not in (_OP_PUT, _OP_DELETE):
+                return
+            start = position + _INDEX_HEADER.size
+            end = start + id_length + (_INDEX_PUT.size if op == _OP_PUT else 0)
+            if end > len(data):
+                return  # Torn trailing write.
+            try:
+                doc_id = data[start:start + id_length].decode("utf-8")
+            except UnicodeDecodeError:
+                return
+            location = _INDEX_PUT.unpack_from(data, start + id_length) if op == _OP_PUT else None
+            yield op, doc_id, location, end
+            position = end
+
+    def _replay_index(self) -> None:
+        """Rebuild the in-memory index, truncating anything a crash left half-written."""
+        for kind in ("vectors", "records", "index"):
+            open(self._path(kind), "ab").close()
+        with open(self._path("index"), "rb") as f:
+            data = f.read()
+        row_bytes = 4 * self.dimension if self.dimension else 0
+        vector_size = os.path.getsize(self._path("vectors"))
+        rows = vector_size // row_bytes if row_bytes else 0
+        records_size = os.path.getsize(self._path("records"))
+        entries: Dict[str, Tuple[int, int, int]] = {}
+        valid_end = 0
+        for op, doc_id, location, end in self._iter_index(data):
+            if op == _OP_PUT:
+                row, offset, length = location
+                if row >= rows or offset + length > records_size:
+                    break  # Index entry outlived the data it points at.
+                entries[doc_id] = location
+            else:
+                entries.pop(doc_id, None)
+            valid_end = end
+        if valid_end < len(data):
+            os.truncate(self._path("index"), valid_end)
+        if row_bytes and vector_size != rows * row_bytes:
+            os.truncate(self._path("vectors"), rows * row_bytes)
+        self._entries = entries
+        self._rows = rows
+
+    def _append_index(self, op: int, doc_id: str, location: Optional[Tuple[int, int, int]] = None) -> None:
+        encoded = doc_id.encode("utf-8")
+        payload = _INDEX_HEADER.pack(op, len(encoded)) + encoded
+        if location is not None:
+            payload += _INDEX_PUT.pack(*location)
+        self._files["index"].write(payload)
+
+    def _flush(self) -> None:
+        for handle in self._files.values():
+            handle.flush()
+
+    def _mapped(self, kind: str, required: int) -> mmap.mmap:
+        """Return a read-only map of a file that covers ``required`` bytes."""
+        mapped = self._maps[kind]
+        if mapped is None or len(mapped) < required:
+            if mapped is not None:
+                mapped.close()
+            with open(self._path(kind), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[kind] = mapped
+        return mapped
+
+    def _read_embedding(self, row: int) -> List[float]:
+        row_bytes = 4 * self.dimension
+        start = row * row_bytes
+        mapped = self._mapped("vectors", start + row_bytes)
+        vector = array("f")
+        vector.frombytes(mapped[start:start + row_bytes])
+        return vector.tolist()
+
+    def _read_document(self, offset: int, length: int, doc_id: str) -> Document:
+        mapped = self._mapped("records", offset + length)
+        data = json.loads(mapped[offset + _RECORD_HEADER.size:offset + length])
+        return Document(
+            content=data["content"],
+            metadata=data.get("metadata", {}),
+            source=data.get("source"),
+            doc_id=data.get("doc_id", doc_id),
+        )
+
+    def _append(self, document: Document, embedding: List[float]) -> None:
+        if self.dimension is None:
+            self.dimension = len(embedding)
+            self._write_meta()
+        if len(embedding) != self.dimension:
+            raise ValueError(
+                f"embedding dimension {len(embedding)} does not match store dimension {self.dimension}"
+            )
+        record = json.dumps(document.to_dict(), default=str).encode("utf-8")
+        records = self._files["records"]
+        offset = records.tell()
+        records.write(_RECORD_HEADER.pack(len(record)) + record)
+        self._files["vectors"].write(array("f", embedding).tobytes())
+        location = (self._rows, offset, _RECORD_HEADER.size + len(record))
+        self._append_index(_OP_PUT, document.doc_id, location)
+        self._entries[document.doc_id] = location
+        self._rows += 1
+
+    async def save(self, document: Document, embedding: List[float]) -> None:
+        """Append a document and its embedding.
+
+        Args:
+            document: Document to save.
+            embedding: Vector embedding.
+        """
+        await self.save_many([(document, embedding)])
+
+    async def save_many(self, items: List[Tuple[Document, List[float]]]) -> None:
+        """Append several documents with a single flush.
+
+        Args:
+            items: (document, embedding) pairs.
+        """
+        with self._lock:
+            for document, embedding in items:
+                self._append(document, embedding)
+            self._flush()
+        self._maybe_compact()
+
+    async def load(self, doc_id: str) -> Optional[tuple]:
+        """Load document and embedding by ID.
+
+        Args:
+            doc_id: Document ID.
+
+        Returns:
+            Tuple of (document, embedding) or None.
+        """
+        with self._lock:
+            location = self._entries.get(doc_id)
+            if location is None:
+                return None
+            row, offset, length = location
+            return (self._read_document(offset, length, doc_id), self._read_embedding(row))
+
+    async def load_all(self) -> List[tuple]:
+        """Load every live document in storage order.
+
+        Returns:
+            List of (document, embedding) tuples.
+        """
+        with self._lock:
+            locations = sorted((loc, doc_id) for doc_id, loc in self._entries.items())
+            return [
+                (self._read_document(offset, length, doc_id), self._read_embedding(row))
+                for (row, offset, length), doc_id in locations
+            ]
+
+    async def delete(self, doc_id: str) -> bool:
+        """Delete document by ID.
+
+        Args:
+            doc_id: Document ID.
+
+        Returns:
+            True if deleted.
+        """
+        with self._lock:
+            if doc_id not in self._entries:
+                return False
+            self._append_index(_OP_DELETE, doc_id)
+            del self._entries[doc_id]
+            self._flush()
+        self._maybe_compact()
+        return True
+
+    async def list_all(self) -> List[str]:
+        """List all document IDs.
+
+        Returns:
+            Sorted list of document IDs.
+        """
+        with self._lock:
+            return sorted(self._entries)
+
+    async def import_from(self, source: MemoryStore, batch_size: int = 500) -> int:
+        """Copy every document from another store (e.g. a FileSystemStore).
+
+        Args:
+            source: Store to read from.
+            batch_size: Documents appended per flush.
+
+        Returns:
+            Number of documents imported.
+        """
+        imported = 0
+        batch: List[Tuple[Document, List[float]]] = []
+        for doc_id in await source.list_all():
+            loaded = await source.load(doc_id)
+            if loaded is None:
+                continue
+            batch.append(loaded)
+            if len(batch) >= batch_size:
+                await self.save_many(batch)
+                imported += len(batch)
+                batch = []
+        if batch:
+            await self.save_many(batch)
+            imported += len(batch)
+        return imported
+
+    def compact(self) -> None:
+        """Rewrite live rows into a new generation and drop the old files.
+
+        Live data is copied without holding the store lock, so reads and
+        writes continue meanwhile; the lock is only taken to snapshot the
+        index and, at the end, to copy what changed since and switch over.
+        """
+        with self._compaction_lock:
+            with self._lock:
+                if self.dead_rows == 0:
+                    return
+                self._flush()
+                old_generation = self.generation
+                index_mark = self._files["index"].tell()
+                live = [
+                    (_OP_PUT, doc_id, location)
+                    for location, doc_id in sorted((loc, doc_id) for doc_id, loc in self._entries.items())
+                ]
+            new_generation = old_generation + 1
+            new_files = {
+                kind: open(self._path(kind, new_generation), "wb")
+                for kind in ("vectors", "records", "index")
+            }
+            try:
+                entries: Dict[str, Tuple[int, int, int]] = {}
+                self._copy_into(old_generation, new_files, live, entries)
+                with self._lock:
+                    # Writes that landed in the old generation during the copy.
+                    self._flush()
+                    with open(self._path("index", old_generation), "rb") as f:
+                        f.seek(index_mark)
+                        tail = f.read()
+                    changes = [(op, doc_id, location) for op, doc_id, location, _ in self._iter_index(tail)]
+                    self._copy_into(old_generation, new_files, changes, entries)
+                    rows = new_files["vectors"].tell() // (4 * self.dimension)
+                    for handle in new_files.values():
+                        handle.flush()
+                        os.fsync(handle.fileno())
+                        handle.close()
+
+                    self._close_files()
+                    self.generation = new_generation
+                    self._write_meta()
+                    self._open_files()
+                    self._entries = entries
+                    self._rows = rows
+                    self.compactions += 1
+            finally:
+                for handle in new_files.values():
+                    handle.close()
+            for kind in ("vectors", "records", "index"):
+                try:
+                    os.remove(self._path(kind, old_generation))
+                except OSError:
+                    pass
+
+    def _copy_into(
+        self,
+        generation: int,
+        new_files: Dict[str, BinaryIO],
+        ops: List[Tuple[int, str, Optional[Tuple[int, int, int]]]],
+        entries: Dict[str, Tuple[int, int, int]],
+    ) -> None:
+        """Apply index ``ops`` read from ``generation`` to a new generation's files, in order."""
+        if not ops:
+            return
+        row_bytes = 4 * self.dimension
+        vectors, records, index = new_files["vectors"], new_files["records"], new_files["index"]
+        with open(self._path("vectors", generation), "rb") as vf, \
+                open(self._path("records", generation), "rb") as rf:
+            vector_map, record_map = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else None
+                for f in (vf, rf)
+            )
+            try:
+                for op, doc_id, location in ops:
+                    encoded = doc_id.encode("utf-8")
+                    if op == _OP_DELETE:
+                        if entries.pop(doc_id, None) is not None:
+                            index.write(_INDEX_HEADER.pack(_OP_DELETE, len(encoded)) + encoded)
+                        continue
+                    row, offset, length = location
+                    new_location = (vectors.tell() // row_bytes, records.tell(), length)
+                    vectors.write(vector_map[row * row_bytes:(row + 1) * row_bytes])
+                    records.write(record_map[offset:offset + length])
+                    index.write(
+                        _INDEX_HEADER.pack(_OP_PUT, len(encoded)) + encoded + _INDEX_PUT.pack(*new_location)
+                    )
+                    entries[doc_id] = new_location
+            finally:
+                for mapped in (vector_map, record_map):
+                    if mapped is not None:
+                        mapped.close()
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        """Block until a running background compaction finishes."""
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def close(self) -> None:
+        """Flush and close all files."""
+        self.wait_for_compaction()
+        with self._lock:
+            self._flush()
+            self._close_files()
+
+    def _maybe_compact(self) -> None:
+        with self._lock:
+            if self._rows < self.min_compaction_rows:
+                return
+            if self.dead_rows <= self.compaction_ratio * self._rows:
+                return
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                return
+            if not self.background_compaction:
+                self.compact()
+                return
+            self._compaction_thread = threading.Thread(
+                target=self.compact, name="segment-store-compaction", daemon=True
+            )
+            self._compaction_thread.start()
+
+
+__all__ = ["SegmentStore"]
@@ -18,15 +18,21 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple, Union
+import heapq
 import json
 import logging
 import hashlib
+import threading
+import time
 from abc import ABC, abstractmethod
 
 from agent_sdk.data_connectors.document import Document
+from agent_sdk.memory.consolidation import LSHConsolidator
 from agent_sdk.memory.embeddings import EmbeddingProvider
+from agent_sdk.memory.embedding_pipeline import EmbeddingPipeline
 from agent_sdk.memory.semantic_search import SemanticSearchEngine, SimilaritySearch
 from agent_sdk.memory.persistence import MemoryStore
+from agent_sdk.memory.vector_index import VectorIndex, default_vector_index
 
 
 logger = logging.getLogger(__name__)
@@ -255,6 +261,9 @@ class SemanticMemory:
         retention_policy: RetentionPolicy = RetentionPolicy.ADAPTIVE,
         max_size: int = 10000,
         similarity_threshold: float = 0.5,
+        vector_index: Optional[VectorIndex] = None,
+        use_vector_index: bool = True,
+        consolidator: Optional[LSHConsolidator] = None,
     ):
         """
         Initialize semantic memory.
@@ -264,16 +273,39 @@ class SemanticMemory:
             retention_policy: How to manage memory size
             max_size: Maximum number of memories to keep
             similarity_threshold: Minimum similarity for search results
+            vector_index: Index used for top-k search (defaults to a
+                NumpyVectorIndex when numpy is installed)
+            use_vector_index: Set False to always use a linear scan
+            consolidator: LSH engine used by consolidate_memory
         """
         self.embedding_provider = embedding_provider or MockEmbeddingProvider()
         self.retention_policy = retention_policy
         self.max_size = max_size
         self.similarity_threshold = similarity_threshold
+        self.vector_index: Optional[VectorIndex] = None
+        if use_vector_index:
+            self.vector_index = vector_index or default_vector_index()
+        self.consolidator = consolidator or LSHConsolidator()
 
         self.memories: Dict[str, MemoryItem] = {}
         self.created_at = datetime.now()
         self.consolidation_count = 0
 
+        # Retention heap of (key, ordinal, item_id); entries are validated
+        # lazily when they reach the top.
+        self._lock = threading.RLock()
+        self._retention_heap: List[Tuple[Tuple[float, ...], int, str]] = []
+        self._heap_policy: Optional[RetentionPolicy] = None
+        self._ordinals: Dict[str, int] = {}
+        self._next_ordinal = 0
+
+        # Running statistics
+        self._type_counts: Dict[str, int] = {}
+        self._item_sizes: Dict[str, int] = {}
+        self._size_bytes = 0
+        self._created_sum = 0.0
+        self._total_accesses = 0
+
     def add_memory(
         self,
         content: str,
@@ -305,7 +337,8 @@ class SemanticMemory:
         )
 
         # Store memory
-        self.memories[item.item_id] = item
+        with self._lock:
+            self._store_item(item)
         logger.info(f"Added memory: {item.item_id}")
 
         # Check retention policy
@@ -330,20 +363,22 @@ class SemanticMemory:
         # Generate query embedding
         query_embedding = self.embedding_provider.embed(query)
 
-        # Calculate similarities
-        similarities = []
-        for item_id, item in self.memories.items():
-            similarity = self._cosine_similarity(query_embedding, item.embedding)
-            if similarity >= min_similarity:
-                similarities.append((item, similarity))
-
-        # Sort by similarity and limit
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        results = similarities[:top_k]
-
-        # Update access counts
-        for item, _ in results:
-            item.refresh_access()
+        if self.vector_index is not None:
+            results = [
+                (self.memories[item_id], similarity)
+                for item_id, similarity in self.vector_index.search(query_embedding, top_k)
+                if similarity >= min_similarity and item_id in self.memories
+            ]
+        else:
+            results = self._scan(query_embedding, top_k, min_similarity)
+
+        # Update access counts; only items still stored feed the running total,
+        # so _forget_item subtracts exactly what was added here.
+        with self._lock:
+            for item, _ in results:
+                item.refresh_access()
+                if self.memories.get(item.item_id) is item:
+                    self._total_accesses += 1
 
         return SemanticSearch(
             query=query,
@@ -352,6 +387,19 @@ class SemanticMemory:
             threshold=self.similarity_threshold,
         )
 
+    def _scan(
+        self, query_embedding: List[float], top_k: int, min_similarity: float
+    ) -> List[Tuple[MemoryItem, float]]:
+        """Score every memory against the query (fallback without an index)."""
+        similarities = []
+        for item in self.memories.values():
+            similarity = self._cosine_similarity(query_embedding, item.embedding)
+            if similarity >= min_similarity:
+                similarities.append((item, similarity))
+
+        similarities.sort(key=lambda x: x[1], reverse=True)
+        return similarities[:top_k]
+
     def search_by_tag(
         self, tag: str, memory_type: Optional[MemoryType] = None
     ) -> List[MemoryItem]:
@@ -373,12 +421,55 @@ class SemanticMemory:
         ]
         return sorted(results, key=lambda x: x.access_count, reverse=True)
 
-    def consolidate_memory(self, similarity_threshold: float = 0.85) -> Dict[str, Any]:
+    def update_memory(
+        self,
+        item_id: str,
+        content: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        relevance_score: Optional[float] = None,
+    ) -> Optional[MemoryItem]:
+        """
+        Update a memory in place.
+
+        Args:
+            item_id: ID of the memory to update
+            content: New content (re-embedded when changed)
+            tags: Replacement tags
+            relevance_score: New relevance score
+
+        Returns:
+            The updated MemoryItem, or None if it does not exist
+        """
+        with self._lock:
+            item = self.memories.get(item_id)
+            if item is None:
+                return None
+            if content is not None and content != item.content:
+                item.content = content
+                item.embedding = self.embedding_provider.embed(content)
+                if self.vector_index is not None:
+                    self.vector_index.add(item_id, item.embedding)
+            if tags is not None:
+                item.tags = list(tags)
+            if relevance_score is not None:
+                item.relevance_score = relevance_score
+            item.updated_at = datetime.now()
+            self._resize(item)
+            self._push_retention(item)
+        return item
+
+    def consolidate_memory(
+        self, similarity_threshold: float = 0.85, use_lsh: bool = True
+    ) -> Dict[str, Any]:
         """
         Consolidate similar memories by creating summaries.
 
+        Near-duplicates are found with the LSH consolidator and merged
+        transitively; each cluster keeps its oldest item.
+
         Args:
             similarity_threshold: Similarity for considering memories similar
+            use_lsh: Set False to compare every pair of memories instead
 
         Returns:
             Consolidation statistics
@@ -386,17 +477,68 @@ class SemanticMemory:
         consolidated_count = 0
         merged_groups = 0
         original_count = len(self.memories)
+        start = time.perf_counter()
 
         # Find similar memory clusters
+        if use_lsh:
+            item_ids = list(self.memories)
+            result = self.consolidator.find_clusters(
+                item_ids,
+                [self.memories[item_id].embedding for item_id in item_ids],
+                similarity_threshold,
+            )
+            clusters = [
+                [self.memories[item_id] for item_id in cluster]
+                for cluster in result.clusters
+            ]
+            candidate_pairs = result.candidate_pairs
+        else:
+            clusters, candidate_pairs = self._pairwise_clusters(similarity_threshold)
+
+        for similar_items in clusters:
+            item = similar_items[0]
+            # Create summary
+            summary = self._create_summary(similar_items)
+            item.summary = summary
+            item.related_items = [i.item_id for i in similar_items[1:]]
+            self._resize(item)
+
+            # Remove redundant items
+            for other_item in similar_items[1:]:
+                self._remove_item(other_item.item_id)
+                consolidated_count += 1
+
+            merged_groups += 1
+
+        self.consolidation_count += 1
+        stats = {
+            "original_count": original_count,
+            "final_count": len(self.memories),
+            "consolidated_count": consolidated_count,
+            "merged_groups": merged_groups,
+            "consolidation_number": self.consolidation_count,
+            "method": "lsh" if use_lsh else "pairwise",
+            "candidate_pairs": candidate_pairs,
+            "elapsed_seconds": time.perf_counter() - start,
+        }
+        logger.info(f"Memory consolidation: {stats}")
+        return stats
+
+    def _pairwise_clusters(
+        self, similarity_threshold: float
+    ) -> Tuple[List[List[MemoryItem]], int]:
+        """Greedy all-pairs clustering; returns clusters and pairs compared."""
+        clusters = []
+        compared = 0
         processed = set()
-        for item_id, item in list(self.memories.items()):
+        for item_id, item in self.memories.items():
             if item_id in processed:
                 continue
 
-            # Find similar items
             similar_items = [item]
             for other_id, other_item in self.memories.items():
                 if other_id != item_id and other_id not in processed:
+                    compared += 1
                     similarity = self._cosine_similarity(
                         item.embedding, other_item.embedding
                     )
@@ -404,31 +546,10 @@ class SemanticMemory:
                         similar_items.append(other_item)
                         processed.add(other_id)
 
-            # Consolidate if multiple similar items found
             if len(similar_items) > 1:
-                # Create summary
-                summary = self._create_summary(similar_items)
-                item.summary = summary
-                item.related_items = [i.item_id for i in similar_items[1:]]
-
-                # Remove redundant items
-                for other_item in similar_items[1:]:
-                    del self.memories[other_item.item_id]
-                    consolidated_count += 1
-
-                merged_groups += 1
+                clusters.append(similar_items)
                 processed.add(item_id)
-
-        self.consolidation_count += 1
-        stats = {
-            "original_count": original_count,
-            "final_count": len(self.memories),
-            "consolidated_count": consolidated_count,
-            "merged_groups": merged_groups,
-            "consolidation_number": self.consolidation_count,
-        }
-        logger.info(f"Memory consolidation: {stats}")
-        return stats
+        return clusters, compared
 
     def decay_all_relevance(self, decay_factor: float = 0.98) -> None:
         """
@@ -437,48 +558,40 @@ class SemanticMemory:
         Args:
             decay_factor: Multiplication factor (0-1)
         """
-        for item in self.memories.values():
-            item.decay_relevance(decay_factor)
+        with self._lock:
+            for item in self.memories.values():
+                item.decay_relevance(decay_factor)
+            # Scores only moved down; rebuild rather than leave stale keys.
+            self._rebuild_retention_heap()
 
     def get_statistics(self) -> Dict[str, Any]:
-        """Get memory system statistics."""
-        if not self.memories:
+        """
+        Get memory system statistics.
+
+        Reads running counters only, so the cost does not depend on the
+        number of memories.
+        """
+        with self._lock:
+            count = len(self.memories)
+            if not count:
+                return {
+                    "total_memories": 0,
+                    "memory_types": {},
+                    "avg_age": None,
+                    "avg_access_count": 0,
+                    "total_size_bytes": 0,
+                }
+            now = datetime.now().timestamp()
             return {
-                "total_memories": 0,
-                "memory_types": {},
-                "avg_age": None,
-                "avg_access_count": 0,
-                "total_size_bytes": 0,
+                "total_memories": count,
+                "memory_types": dict(self._type_counts),
+                "avg_age_seconds": now - self._created_sum / count,
+                "avg_access_count": self._total_accesses / count,
+                "total_size_bytes": self._size_bytes,
+                "embedding_dimension": self.embedding_provider.get_dimension(),
+                "retention_policy": self.retention_policy.value,
             }
 
-        memory_types = {}
-        total_accesses = 0
-        total_age = 0
-
-        for item in self.memories.values():
-            memory_types[item.memory_type.value] = (
-                memory_types.get(item.memory_type.value, 0) + 1
-            )
-            total_accesses += item.access_count
-            age = (datetime.now() - item.created_at).total_seconds()
-            total_age += age
-
-        avg_age = total_age / len(self.memories) if self.memories else 0
-        avg_access = total_accesses / len(self.memories) if self.memories else 0
-
-        # Estimate size
-        size_bytes = sum(len(item.to_dict().__str__().encode()) for item in self.memories.values())
-
-        return {
-            "total_memories": len(self.memories),
-            "memory_types": memory_types,
-            "avg_age_seconds": avg_age,
-            "avg_access_count": avg_access,
-            "total_size_bytes": size_bytes,
-            "embedding_dimension": self.embedding_provider.get_dimension(),
-            "retention_policy": self.retention_policy.value,
-        }
-
     def to_json(self) -> str:
         """Export memory to JSON."""
         memories_data = [item.to_dict() for item in self.memories.values()]
@@ -514,33 +627,125 @@ class SemanticMemory:
 
         if self.retention_policy == RetentionPolicy.INDEFINITE:
             return
-        elif self.retention_policy == RetentionPolicy.SIZE_LIMITED:
-            # Remove least relevant items
-            items = sorted(
-                self.memories.values(),
-                key=lambda x: (x.relevance_score, x.access_count),
-            )
-            for item in items[: len(self.memories) - self.max_size]:
-                del self.memories[item.item_id]
-        elif self.retention_policy == RetentionPolicy.TIME_BASED:
-            # Remove oldest items
-            cutoff_age = timedelta(days=30)
-            now = datetime.now()
-            for item_id in list(self.memories.keys()):
-                item = self.memories[item_id]
-                if now - item.created_at > cutoff_age:
-                    del self.memories[item_id]
-        elif self.retention_policy == RetentionPolicy.ADAPTIVE:
-            # Remove low-relevance, old, and infrequently accessed items
-            items = sorted(
-                self.memories.values(),
-                key=lambda x: (
-                    x.relevance_score * (x.access_count + 1),
-                    (datetime.now() - x.created_at).total_seconds(),
-                ),
-            )
-            for item in items[: max(1, len(self.memories) - self.max_size)]:
-                del self.memories[item.item_id]
+
+        with self._lock:
+            if self._heap_policy != self.retention_policy:
+                self._rebuild_retention_heap()
+            if self.retention_policy == RetentionPolicy.TIME_BASED:
+                # Remove items older than the cutoff, oldest first
+                cutoff = (datetime.now() - timedelta(days=30)).timestamp()
+                while True:
+                    item_id = self._peek_retention()
+                    if item_id is None or self.memories[item_id].created_at.timestamp() >= cutoff:
+                        break
+                    self._remove_item(item_id)
+            else:
+                # SIZE_LIMITED and ADAPTIVE evict the lowest retention keys
+                for _ in range(len(self.memories) - self.max_size):
+                    item_id = self._peek_retention()
+                    if item_id is None:
+                        break
+                    self._remove_item(item_id)
+
+    def _retention_key(self, item: MemoryItem) -> Tuple[float, ...]:
+        """Eviction order for the current policy (lowest is evicted first)."""
+        if self.retention_policy == RetentionPolicy.SIZE_LIMITED:
+            return (item.relevance_score, item.access_count)
+        if self.retention_policy == RetentionPolicy.TIME_BASED:
+            return (item.created_at.timestamp(),)
+        # ADAPTIVE: low relevance and rarely accessed first, newest on ties
+        return (
+            item.relevance_score * (item.access_count + 1),
+            -item.created_at.timestamp(),
+        )
+
+    def _push_retention(self, item: MemoryItem) -> None:
+        if self._heap_policy != self.retention_policy:
+            return
+        heapq.heappush(
+            self._retention_heap,
+            (self._retention_key(item), self._ordinals[item.item_id], item.item_id),
+        )
+        if len(self._retention_heap) > 2 * len(self.memories) + 64:
+            self._rebuild_retention_heap()
+
+    def _rebuild_retention_heap(self) -> None:
+        self._heap_policy = self.retention_policy
+        self._retention_heap = [
+            (self._retention_key(item), self._ordinals[item_id], item_id)
+            for item_id, item in self.memories.items()
+            if item_id in self._ordinals
+        ]
+        heapq.heapify(self._retention_heap)
+
+    def _peek_retention(self) -> Optional[str]:
+        """Return the next eviction candidate, discarding stale entries.
+
+        Entries of removed items are dropped. Entries whose key no longer
+        matches the item (e.g. after refresh_access) are re-keyed and
+        pushed back before the top is trusted.
+        """
+        heap = self._retention_heap
+        while heap:
+            key, ordinal, item_id = heap[0]
+            item = self.memories.get(item_id)
+            if item is None or self._ordinals.get(item_id) != ordinal:
+                heapq.heappop(heap)
+                continue
+            current = self._retention_key(item)
+            if current != key:
+                heapq.heapreplace(heap, (current, ordinal, item_id))
+                continue
+            return item_id
+        return None
+
+    def _store_item(self, item: MemoryItem) -> None:
+        """Insert a memory and update indexes and counters."""
+        item_id = item.item_id
+        if item_id in self.memories:
+            self._forget_item(self.memories[item_id])
+        self.memories[item_id] = item
+        self._ordinals[item_id] = self._next_ordinal
+        self._next_ordinal += 1
+        if self.vector_index is not None:
+            self.vector_index.add(item_id, item.embedding)
+
+        memory_type = item.memory_type.value
+        self._type_counts[memory_type] = self._type_counts.get(memory_type, 0) + 1
+        self._created_sum += item.created_at.timestamp()
+        self._total_accesses += item.access_count
+        self._resize(item)
+        self._push_retention(item)
+
+    def _forget_item(self, item: MemoryItem) -> None:
+        """Reverse the counter updates made by _store_item.
+
+        Items written straight into ``memories`` were never counted, so they
+        are skipped rather than driving the counters negative.
+        """
+        if self._ordinals.pop(item.item_id, None) is None:
+            return
+        memory_type = item.memory_type.value
+        self._type_counts[memory_type] -= 1
+        if not self._type_counts[memory_type]:
+            del self._type_counts[memory_type]
+        self._created_sum -= item.created_at.timestamp()
+        self._total_accesses -= item.access_count
+        self._size_bytes -= self._item_sizes.pop(item.item_id, 0)
+
+    def _resize(self, item: MemoryItem) -> None:
+        """Re-measure the estimated serialized size of a memory."""
+        size = len(item.to_dict().__str__().encode())
+        self._size_bytes += size - self._item_sizes.get(item.item_id, 0)
+        self._item_sizes[item.item_id] = size
+
+    def _remove_item(self, item_id: str) -> None:
+        """Delete a memory and drop it from the vector index."""
+        with self._lock:
+            item = self.memories.pop(item_id)
+            self._forget_item(item)
+            if self.vector_index is not None:
+                self.vector_index.remove(item_id)
 
     @staticmethod
     def _create_summary(items: List[MemoryItem]) -> str:
@@ -581,7 +786,8 @@ class SemanticMemoryManager:
         self,
         embedding_provider: EmbeddingProvider,
         memory_store: MemoryStore,
-        similarity_threshold: float = 0.7
+        similarity_threshold: float = 0.7,
+        embedding_pipeline: Optional[EmbeddingPipeline] = None
     ):
         """Initialize memory manager.
         
@@ -589,10 +795,12 @@ class SemanticMemoryManager:
             embedding_provider: Provider for generating embeddings.
             memory_store: Storage backend for documents and embeddings.
             similarity_threshold: Minimum similarity for retrieval.
+            embedding_pipeline: Batching pipeline used for bulk ingestion.
         """
         self.embedding_provider = embedding_provider
         self.memory_store = memory_store
         self.similarity_threshold = similarity_threshold
+        self.embedding_pipeline = embedding_pipeline or EmbeddingPipeline(embedding_provider)
         
         # Initialize search engine
         self.search_engine = SemanticSearchEngine(
@@ -612,15 +820,15 @@ class SemanticMemoryManager:
             self.documents[doc.doc_id] = doc
         
         # Generate embeddings and persist
-        embeddings = await self.embedding_provider.embed_batch(
-            [doc.content for doc in documents]
+        embeddings = await self.embedding_pipeline.embed_all(
+            doc.content for doc in documents
         )
         
         for doc, embedding in zip(documents, embeddings):
             await self.memory_store.save(doc, embedding)
         
-        # Reindex for search
-        await self.search_engine.index(documents)
+        # Update the search index in place
+        await self.search_engine.upsert(documents, embeddings)
     
     async def retrieve(
         self,
@@ -713,8 +921,8 @@ class SemanticMemoryManager:
         # Update internal state
         self.documents[doc_id] = updated_doc
         
-        # Reindex
-        await self.search_engine.index(list(self.documents.values()))
+        # Reindex only this document
+        await self.search_engine.upsert([updated_doc], [embedding])
         
         return True
     
@@ -736,8 +944,8 @@ class SemanticMemoryManager:
         # Update internal state
         del self.documents[doc_id]
         
-        # Reindex
-        await self.search_engine.index(list(self.documents.values()))
+        # Drop from the search index
+        self.search_engine.remove([doc_id])
         
         return True
     
@@ -1,10 +1,53 @@
 """Semantic search engine for similarity-based document retrieval."""
 
+import base64
+import heapq
+import json
+import math
+import os
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Tuple
+from array import array
+from typing import List, Dict, Any, Optional, Set, Tuple
 from agent_sdk.data_connectors.document import Document, Chunk
+from agent_sdk.memory.embedding_cache import embedding_cache_key
 from agent_sdk.memory.embeddings import EmbeddingProvider
-import math
+from agent_sdk.memory.retrieval_index import BM25Index, MetadataIndex
+from agent_sdk.memory.vector_index import VectorIndex
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+
+MANIFEST_VERSION = 1
+
+def _vectorizable(query: List[float], embeddings: List[List[float]]) -> bool:
+    return np is not None and all(len(emb) == len(query) for emb in embeddings)
+
+
+def _unit_rows(embeddings: List[List[float]]) -> "np.ndarray":
+    matrix = np.asarray(embeddings, dtype=np.float64)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def _cosine_scores(query: List[float], embeddings: List[List[float]]) -> List[float]:
+    """Cosine similarity of a query against many embeddings in one pass."""
+    if not embeddings:
+        return []
+    if not _vectorizable(query, embeddings):
+        return [SimilaritySearch._cosine_similarity(query, emb) for emb in embeddings]
+    query_vector = np.asarray(query, dtype=np.float64)
+    query_norm = np.linalg.norm(query_vector)
+    if query_norm == 0:
+        return [0.0] * len(embeddings)
+    return (_unit_rows(embeddings) @ (query_vector / query_norm)).tolist()
+
+
+def _top_indices(scores: List[float], top_k: int) -> List[int]:
+    """Indices of the highest scores, ties broken by position."""
+    return heapq.nlargest(top_k, range(len(scores)), key=scores.__getitem__)
 
 
 class RetrievalStrategy(ABC):
@@ -49,16 +92,8 @@ class SimilaritySearch(RetrievalStrategy):
         Returns:
             Top-k most similar documents with scores.
         """
-        scores = []
-        
-        for doc, embedding in documents:
-            similarity = self._cosine_similarity(query_embedding, embedding)
-            scores.append((doc, similarity))
-        
-        # Sort by similarity descending
-        scores.sort(key=lambda x: x[1], reverse=True)
-        
-        return scores[:top_k]
+        scores = _cosine_scores(query_embedding, [emb for _, emb in documents])
+        return [(documents[i][0], scores[i]) for i in _top_indices(scores, top_k)]
     
     @staticmethod
     def _cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
@@ -85,19 +120,26 @@ class SimilaritySearch(RetrievalStrategy):
 
 
 class HybridSearch(RetrievalStrategy):
-    """Hybrid search combining semantic similarity and metadata filtering."""
+    """Hybrid search combining semantic similarity, keyword scores and
+    metadata filtering.
+    """
     
-    def __init__(self, semantic_weight: float = 0.8):
+    def __init__(self, semantic_weight: float = 0.8, keyword_weight: float = 0.0):
         """Initialize hybrid search.
         
         Args:
             semantic_weight: Weight for semantic similarity (0-1).
+            keyword_weight: Weight for keyword (BM25) scores (0-1). The
+                default of 0 ranks by semantic similarity alone.
         """
         if not 0 <= semantic_weight <= 1:
             raise ValueError("semantic_weight must be between 0 and 1")
+        if not 0 <= keyword_weight <= 1:
+            raise ValueError("keyword_weight must be between 0 and 1")
         
         self.semantic_weight = semantic_weight
         self.metadata_weight = 1 - semantic_weight
+        self.keyword_weight = keyword_weight
         self._similarity = SimilaritySearch()
     
     def retrieve(
@@ -105,34 +147,42 @@ class HybridSearch(RetrievalStrategy):
         query_embedding: List[float],
         documents: List[Tuple[Document, List[float]]],
         top_k: int = 5,
-        metadata_filter: Optional[Dict[str, Any]] = None
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        keyword_scores: Optional[Dict[str, float]] = None
     ) -> List[Tuple[Document, float]]:
         """Retrieve using hybrid scoring.
         
+        Documents are filtered before any scoring, so only candidates that
+        can be returned are embedded-compared.
+        
         Args:
             query_embedding: Query embedding vector.
             documents: List of (document, embedding) tuples.
             top_k: Number of results to return.
             metadata_filter: Optional metadata filtering criteria.
-            
+            keyword_scores: Optional keyword scores by doc ID (e.g. from
+                BM25Index), normalized by their maximum and blended in with
+                weight ``keyword_weight``.
+        
         Returns:
             Top-k documents with hybrid scores.
         """
-        # Get semantic scores
-        semantic_results = self._similarity.retrieve(
-            query_embedding,
-            documents,
-            top_k=len(documents)  # Get all for scoring
-        )
-        
-        # Apply metadata filter if provided
         if metadata_filter:
-            semantic_results = [
-                (doc, score) for doc, score in semantic_results
-                if self._matches_filter(doc, metadata_filter)
+            documents = [
+                item for item in documents
+                if self._matches_filter(item[0], metadata_filter)
+            ]
+        
+        scores = _cosine_scores(query_embedding, [emb for _, emb in documents])
+        top_keyword = max(keyword_scores.values(), default=0.0) if keyword_scores else 0.0
+        if top_keyword > 0 and self.keyword_weight > 0:
+            scores = [
+                (1 - self.keyword_weight) * score
+                + self.keyword_weight * keyword_scores.get(doc.doc_id, 0.0) / top_keyword
+                for (doc, _), score in zip(documents, scores)
             ]
         
-        return semantic_results[:top_k]
+        return [(documents[i][0], scores[i]) for i in _top_indices(scores, top_k)]
     
     @staticmethod
     def _matches_filter(doc: Document, filter_dict: Dict[str, Any]) -> bool:
@@ -154,16 +204,21 @@ class HybridSearch(RetrievalStrategy):
 class MMRSearch(RetrievalStrategy):
     """Maximize Marginal Relevance search to reduce redundancy."""
     
-    def __init__(self, diversity_penalty: float = 0.5):
+    def __init__(self, diversity_penalty: float = 0.5, fetch_k: Optional[int] = None):
         """Initialize MMR search.
         
         Args:
             diversity_penalty: Penalty for similar results (0-1).
+            fetch_k: Most relevant candidates considered for diversification
+                (at least top_k); None, the default, considers every document.
         """
         if not 0 <= diversity_penalty <= 1:
             raise ValueError("diversity_penalty must be between 0 and 1")
+        if fetch_k is not None and fetch_k < 1:
+            raise ValueError("fetch_k must be at least 1")
         
         self.diversity_penalty = diversity_penalty
+        self.fetch_k = fetch_k
         self._similarity = SimilaritySearch()
     
     def retrieve(
@@ -174,64 +229,82 @@ class MMRSearch(RetrievalStrategy):
     ) -> List[Tuple[Document, float]]:
         """Retrieve using Maximal Marginal Relevance.
         
+        The pairwise similarities of the candidate pool are computed once up
+        front; each greedy step then only folds the newest selection into a
+        running max-redundancy vector.
+        
         Args:
             query_embedding: Query embedding vector.
             documents: List of (document, embedding) tuples.
             top_k: Number of results to return.
             
         Returns:
-            Top-k diverse documents with MMR scores.
+            Top-k diverse documents with their relevance scores.
         """
-        if not documents:
+        if not documents or top_k <= 0:
             return []
         
-        # Calculate initial relevance scores
-        relevance_scores = {
-            i: self._similarity._cosine_similarity(query_embedding, emb)
-            for i, (_, emb) in enumerate(documents)
-        }
-        
-        # Start with most relevant
-        selected = []
-        remaining = set(range(len(documents)))
+        relevance = _cosine_scores(query_embedding, [emb for _, emb in documents])
+        pool_size = len(documents) if self.fetch_k is None else max(self.fetch_k, top_k)
+        pool = _top_indices(relevance, pool_size)
+        embeddings = [documents[i][1] for i in pool]
+        pool_relevance = [relevance[i] for i in pool]
         
-        # Select first document
-        first_idx = max(remaining, key=lambda i: relevance_scores[i])
-        selected.append(first_idx)
-        remaining.remove(first_idx)
+        if _vectorizable(embeddings[0], embeddings):
+            selected = self._select_vectorized(pool_relevance, embeddings, top_k)
+        else:
+            selected = self._select(pool_relevance, embeddings, top_k)
         
-        # Greedily select remaining documents
+        return [(documents[pool[i]][0], pool_relevance[i]) for i in selected]
+    
+    def _select_vectorized(
+        self,
+        relevance: List[float],
+        embeddings: List[List[float]],
+        top_k: int
+    ) -> List[int]:
+        """Greedy MMR over a precomputed similarity matrix."""
+        unit = _unit_rows(embeddings)
+        similarity = unit @ unit.T
+        scores = np.asarray(relevance, dtype=np.float64)
+        max_redundancy = np.zeros(len(relevance))
+        available = np.ones(len(relevance), dtype=bool)
+        
+        selected = [int(np.argmax(scores))]
+        available[selected[0]] = False
+        while len(selected) < top_k and available.any():
+            np.maximum(max_redundancy, similarity[selected[-1]], out=max_redundancy)
+            mmr = scores - self.diversity_penalty * max_redundancy
+            mmr[~available] = -np.inf
+            best = int(np.argmax(mmr))
+            selected.append(best)
+            available[best] = False
+        return selected
+    
+    def _select(
+        self,
+        relevance: List[float],
+        embeddings: List[List[float]],
+        top_k: int
+    ) -> List[int]:
+        """Pure-Python greedy MMR used when numpy is unavailable."""
+        max_redundancy = [0.0] * len(relevance)
+        remaining = list(range(len(relevance)))
+        selected = [max(remaining, key=lambda i: relevance[i])]
+        remaining.remove(selected[0])
         while len(selected) < top_k and remaining:
-            best_idx = None
-            best_mmr = -1
-            
+            last = embeddings[selected[-1]]
             for idx in remaining:
-                relevance = relevance_scores[idx]
-                
-                # Calculate maximum redundancy with selected items
-                max_redundancy = 0
-                for selected_idx in selected:
-                    _, sel_emb = documents[selected_idx]
-                    _, cand_emb = documents[idx]
-                    redundancy = self._similarity._cosine_similarity(sel_emb, cand_emb)
-                    max_redundancy = max(max_redundancy, redundancy)
-                
-                # MMR score = relevance - diversity_penalty * redundancy
-                mmr_score = relevance - self.diversity_penalty * max_redundancy
-                
-                if mmr_score > best_mmr:
-                    best_mmr = mmr_score
-                    best_idx = idx
-            
-            if best_idx is not None:
-                selected.append(best_idx)
-                remaining.remove(best_idx)
-        
-        # Return selected documents with scores
-        return [
-            (documents[idx][0], relevance_scores[idx])
-            for idx in selected
-        ]
+                redundancy = self._similarity._cosine_similarity(last, embeddings[idx])
+                if redundancy > max_redundancy[idx]:
+                    max_redundancy[idx] = redundancy
+            best = max(
+                remaining,
+                key=lambda i: relevance[i] - self.diversity_penalty * max_redundancy[i]
+            )
+            selected.append(best)
+            remaining.remove(best)
+        return selected
 
 
 class SemanticSearchEngine:
@@ -240,35 +313,222 @@ class SemanticSearchEngine:
     def __init__(
         self,
         embedding_provider: EmbeddingProvider,
-        strategy: Optional[RetrievalStrategy] = None
+        strategy: Optional[RetrievalStrategy] = None,
+        vector_index: Optional[VectorIndex] = None,
+        candidate_multiplier: int = 4
     ):
         """Initialize search engine.
         
         Args:
             embedding_provider: Provider for generating embeddings.
             strategy: Retrieval strategy (default: SimilaritySearch).
+            vector_index: Optional index backend (e.g. HNSWIndex). When set,
+                queries read candidates from the index instead of scoring
+                every document.
+            candidate_multiplier: Candidates fetched per requested result
+                when a non-similarity strategy re-ranks index output.
         """
+        if candidate_multiplier < 1:
+            raise ValueError("candidate_multiplier must be at least 1")
         self.embedding_provider = embedding_provider
         self.strategy = strategy or SimilaritySearch()
+        self.vector_index = vector_index
+        self.candidate_multiplier = candidate_multiplier
         
-        self.documents: List[Document] = []
         self.embeddings: Dict[str, List[float]] = {}
+        self._documents_by_id: Dict[str, Document] = {}
+        self._content_hashes: Dict[str, str] = {}
+        self._positions: Dict[str, int] = {}
+        self._next_position = 0
+        self.metadata_index = MetadataIndex()
+        self.keyword_index = BM25Index()
+    
+    @property
+    def documents(self) -> List[Document]:
+        """Indexed documents in insertion order."""
+        return list(self._documents_by_id.values())
+    
+    @property
+    def _namespace(self) -> str:
+        provider = self.embedding_provider
+        return getattr(provider, "cache_namespace", type(provider).__name__)
+    
+    def _content_hash(self, document: Document) -> str:
+        return embedding_cache_key(self._namespace, document.content)
     
-    async def index(self, documents: List[Document]) -> None:
-        """Index documents for semantic search.
+    async def index(
+        self,
+        documents: List[Document],
+        embeddings: Optional[List[List[float]]] = None
+    ) -> None:
+        """Replace the indexed corpus with ``documents``.
+        
+        Documents whose content is unchanged keep their stored embedding;
+        only new or edited documents are embedded, and documents missing
+        from ``documents`` are removed.
         
         Args:
             documents: Documents to index.
+            embeddings: Precomputed embeddings aligned with documents
+                (computed with the provider when omitted).
+        """
+        if embeddings is not None and len(embeddings) != len(documents):
+            raise ValueError("embeddings must align with documents")
+        keep = {doc.doc_id for doc in documents}
+        self.remove([doc_id for doc_id in self._documents_by_id if doc_id not in keep])
+        await self.upsert(documents, embeddings)
+    
+    async def upsert(
+        self,
+        documents: List[Document],
+        embeddings: Optional[List[List[float]]] = None
+    ) -> int:
+        """Add or update documents in place.
+        
+        Content hashes decide which documents need embedding; metadata-only
+        changes are applied without calling the provider.
+        
+        Args:
+            documents: Documents to add or replace (matched by doc_id).
+            embeddings: Precomputed embeddings aligned with documents.
+            
+        Returns:
+            Number of documents whose embedding changed.
+        """
+        if embeddings is not None and len(embeddings) != len(documents):
+            raise ValueError("embeddings must align with documents")
+        
+        hashes = [self._content_hash(doc) for doc in documents]
+        if embeddings is None:
+            pending = [
+                i for i, (doc, content_hash) in enumerate(zip(documents, hashes))
+                if self._content_hashes.get(doc.doc_id) != content_hash
+                or doc.doc_id not in self.embeddings
+            ]
+            vectors: Dict[int, List[float]] = {}
+            if pending:
+                embedded = await self.embedding_provider.embed_batch(
+                    [documents[i].content for i in pending]
+                )
+                vectors = dict(zip(pending, embedded))
+        else:
+            vectors = dict(enumerate(embeddings))
+        
+        for i, (doc, content_hash) in enumerate(zip(documents, hashes)):
+            doc_id = doc.doc_id
+            if doc_id not in self._positions:
+                self._positions[doc_id] = self._next_position
+                self._next_position += 1
+            self._documents_by_id[doc_id] = doc
+            self.metadata_index.add(doc_id, doc.metadata)
+            if i not in vectors:
+                continue
+            self.embeddings[doc_id] = vectors[i]
+            if self._content_hashes.get(doc_id) != content_hash:
+                self._content_hashes[doc_id] = content_hash
+                self.keyword_index.add(doc_id, doc.content)
+            if self.vector_index is not None:
+                self.vector_index.add(doc_id, vectors[i])
+        return len(vectors)
+    
+    def remove(self, doc_ids: List[str]) -> int:
+        """Remove documents from every index.
+        
+        Args:
+            doc_ids: IDs of documents to remove.
+            
+        Returns:
+            Number of documents removed.
+        """
+        removed = 0
+        for doc_id in doc_ids:
+            if self._documents_by_id.pop(doc_id, None) is None:
+                continue
+            self._positions.pop(doc_id, None)
+            self._content_hashes.pop(doc_id, None)
+            self.embeddings.pop(doc_id, None)
+            self.metadata_index.remove(doc_id)
+            self.keyword_index.remove(doc_id)
+            if self.vector_index is not None:
+                self.vector_index.remove(doc_id)
+            removed += 1
+        return removed
+    
+    def save_manifest(self, path: str) -> None:
+        """Persist documents, content hashes, embeddings and BM25 statistics.
+        
+        Args:
+            path: Destination file (written atomically).
         """
-        self.documents = documents
+        entries = [
+            {
+                "document": doc.to_dict(),
+                "hash": self._content_hashes.get(doc.doc_id),
+                "embedding": base64.b64encode(
+                    array("f", self.embeddings[doc.doc_id]).tobytes()
+                ).decode("ascii"),
+            }
+            for doc in self._documents_by_id.values()
+            if doc.doc_id in self.embeddings
+        ]
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "namespace": self._namespace,
+            "documents": entries,
+            "keyword_index": self.keyword_index.to_dict(),
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, default=str)
+        os.replace(tmp_path, path)
+    
+    def load_manifest(self, path: str) -> int:
+        """Restore state written by ``save_manifest`` without re-embedding.
         
-        # Generate embeddings
-        texts = [doc.content for doc in documents]
-        embeddings = await self.embedding_provider.embed_batch(texts)
+        Args:
+            path: Manifest file.
+            
+        Returns:
+            Number of documents restored.
+            
+        Raises:
+            ValueError: If the manifest was produced by a different
+                embedding provider or manifest version.
+        """
+        with open(path, "r") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"unsupported manifest version: {manifest.get('version')}")
+        namespace = self._namespace
+        if manifest.get("namespace") != namespace:
+            raise ValueError(
+                f"manifest was built with {manifest.get('namespace')}, not {namespace}"
+            )
         
-        # Store embeddings
-        for doc, embedding in zip(documents, embeddings):
+        self.remove(list(self._documents_by_id))
+        self.keyword_index = BM25Index.from_dict(manifest["keyword_index"])
+        for entry in manifest["documents"]:
+            data = entry["document"]
+            doc = Document(
+                content=data["content"],
+                metadata=data.get("metadata", {}),
+                source=data.get("source"),
+                doc_id=data["doc_id"],
+            )
+            vector = array("f")
+            vector.frombytes(base64.b64decode(entry["embedding"]))
+            embedding = vector.tolist()
+            self._positions[doc.doc_id] = self._next_position
+            self._next_position += 1
+            self._documents_by_id[doc.doc_id] = doc
+            self._content_hashes[doc.doc_id] = entry.get("hash") or self._content_hash(doc)
             self.embeddings[doc.doc_id] = embedding
+            self.metadata_index.add(doc.doc_id, doc.metadata)
+            if doc.doc_id not in self.keyword_index:
+                self.keyword_index.add(doc.doc_id, doc.content)
+            if self.vector_index is not None:
+                self.vector_index.add(doc.doc_id, embedding)
+        return len(manifest["documents"])
     
     async def search(
         self,
@@ -278,43 +538,111 @@ class SemanticSearchEngine:
     ) -> List[Tuple[Document, float]]:
         """Search for documents similar to query.
         
+        A metadata filter is resolved against the inverted metadata index
+        first, so scoring only touches documents that can be returned.
+        
         Args:
             query: Search query.
             top_k: Number of results to return.
-            metadata_filter: Optional metadata filter.
+            metadata_filter: Optional metadata filter (applies to every
+                strategy).
             
         Returns:
             List of (document, similarity_score) tuples.
         """
-        if not self.documents:
+        if not self._documents_by_id:
             return []
         
+        candidate_ids: Optional[Set[str]] = None
+        if metadata_filter:
+            candidate_ids = self.metadata_index.candidates(metadata_filter)
+            if not candidate_ids:
+                return []
+        
         # Generate query embedding
         query_embedding = await self.embedding_provider.embed_text(query)
+        keyword_scores = self._keyword_scores(query, candidate_ids)
+        
+        if candidate_ids is None and self.vector_index is not None and len(self.vector_index):
+            return self._search_index(query_embedding, top_k, keyword_scores)
         
         # Get document embeddings
+        if candidate_ids is None:
+            documents = self.documents
+        else:
+            documents = [
+                self._documents_by_id[doc_id]
+                for doc_id in sorted(candidate_ids, key=self._positions.__getitem__)
+            ]
         doc_embeddings = [
             (doc, self.embeddings[doc.doc_id])
-            for doc in self.documents
+            for doc in documents
             if doc.doc_id in self.embeddings
         ]
         
-        # Retrieve using strategy
+        return self._retrieve(query_embedding, doc_embeddings, top_k, keyword_scores)
+    
+    def _keyword_scores(
+        self,
+        query: str,
+        candidate_ids: Optional[Set[str]]
+    ) -> Optional[Dict[str, float]]:
+        """BM25 scores for hybrid strategies that give keywords any weight."""
+        if not isinstance(self.strategy, HybridSearch) or self.strategy.keyword_weight == 0:
+            return None
+        return self.keyword_index.score(query, candidate_ids)
+    
+    def _retrieve(
+        self,
+        query_embedding: List[float],
+        candidates: List[Tuple[Document, List[float]]],
+        top_k: int,
+        keyword_scores: Optional[Dict[str, float]]
+    ) -> List[Tuple[Document, float]]:
         if isinstance(self.strategy, HybridSearch):
-            results = self.strategy.retrieve(
+            return self.strategy.retrieve(
                 query_embedding,
-                doc_embeddings,
+                candidates,
                 top_k=top_k,
-                metadata_filter=metadata_filter
-            )
-        else:
-            results = self.strategy.retrieve(
-                query_embedding,
-                doc_embeddings,
-                top_k=top_k
+                keyword_scores=keyword_scores
             )
+        return self.strategy.retrieve(query_embedding, candidates, top_k=top_k)
+    
+    def _search_index(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        keyword_scores: Optional[Dict[str, float]]
+    ) -> List[Tuple[Document, float]]:
+        """Answer an unfiltered query from the vector index.
         
-        return results
+        Plain similarity search returns the index hits directly; other
+        strategies re-rank an enlarged candidate set, which for hybrid
+        search also includes the strongest keyword matches.
+        """
+        exact = type(self.strategy) is SimilaritySearch
+        pool = top_k if exact else top_k * self.candidate_multiplier
+        hits = [
+            (self._documents_by_id[doc_id], score)
+            for doc_id, score in self.vector_index.search(query_embedding, pool)
+            if doc_id in self._documents_by_id
+        ]
+        if exact:
+            return hits
+        
+        candidate_ids = [doc.doc_id for doc, _ in hits]
+        if keyword_scores:
+            seen = set(candidate_ids)
+            candidate_ids.extend(
+                doc_id
+                for doc_id in heapq.nlargest(pool, keyword_scores, key=keyword_scores.__getitem__)
+                if doc_id not in seen and doc_id in self._documents_by_id
+            )
+        candidates = [
+            (self._documents_by_id[doc_id], self.embeddings[doc_id])
+            for doc_id in candidate_ids
+        ]
+        return self._retrieve(query_embedding, candidates, top_k, keyword_scores)
     
     def search_sync(
         self,
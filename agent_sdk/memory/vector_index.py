@@ -0,0 +1,244 @@
+"""In-process vector indexes for fast top-k similarity lookups."""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+class VectorIndex(ABC):
+    """Base class for vector indexes keyed by item ID."""
+
+    @abstractmethod
+    def add(self, item_id: str, vector: Sequence[float]) -> None:
+        """Insert or replace the vector stored for an item.
+
+        Args:
+            item_id: Item identifier.
+            vector: Embedding vector.
+        """
+        pass
+
+    @abstractmethod
+    def remove(self, item_id: str) -> bool:
+        """Remove an item from the index.
+
+        Args:
+            item_id: Item identifier.
+
+        Returns:
+            True if the item was present.
+        """
+        pass
+
+    @abstractmethod
+    def search(self, query: Sequence[float], top_k: int = 5) -> List[Tuple[str, float]]:
+        """Return the top-k items by cosine similarity.
+
+        Args:
+            query: Query embedding vector.
+            top_k: Number of results to return.
+
+        Returns:
+            List of (item_id, similarity) tuples, most similar first.
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every item from the index."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def __contains__(self, item_id: object) -> bool:
+        pass
+
+
+class NumpyVectorIndex(VectorIndex):
+    """Exact cosine index backed by a contiguous float32 matrix.
+
+    Vectors are L2-normalized on insert so a query is a single
+    matrix-vector product followed by ``argpartition``. Removed rows are
+    tombstoned and reclaimed by compaction once they exceed
+    ``compaction_ratio`` of the used rows.
+    """
+
+    def __init__(
+        self,
+        dimension: Optional[int] = None,
+        initial_capacity: int = 1024,
+        compaction_ratio: float = 0.25,
+    ):
+        """Initialize the index.
+
+        Args:
+            dimension: Vector dimension (inferred from the first add if omitted).
+            initial_capacity: Rows to preallocate.
+            compaction_ratio: Fraction of tombstoned rows that triggers compaction.
+        """
+        if np is None:
+            raise RuntimeError("numpy is required for NumpyVectorIndex")
+        if not 0 < compaction_ratio <= 1:
+            raise ValueError("compaction_ratio must be in (0, 1]")
+        self.dimension = dimension
+        self.compaction_ratio = compaction_ratio
+        self._initial_capacity = max(1, initial_capacity)
+        self._matrix = None
+        self._alive = None
+        self._row_ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._used = 0
+        self._tombstones = 0
+        self.compactions = 0
+        if dimension is not None:
+            self._allocate(dimension, self._initial_capacity)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._rows
+
+    @property
+    def capacity(self) -> int:
+        """Number of preallocated rows."""
+        return 0 if self._matrix is None else self._matrix.shape[0]
+
+    @property
+    def tombstones(self) -> int:
+        """Number of removed rows awaiting compaction."""
+        return self._tombstones
+
+    def add(self, item_id: str, vector: Sequence[float]) -> None:
+        """Insert or replace the vector stored for an item."""
+        row_vector = self._normalize(vector)
+        row = self._rows.get(item_id)
+        if row is not None:
+            self._matrix[row] = row_vector
+            return
+        if self._used == self.capacity:
+            self._grow()
+        row = self._used
+        self._matrix[row] = row_vector
+        self._alive[row] = True
+        self._row_ids.append(item_id)
+        self._rows[item_id] = row
+        self._used += 1
+
+    def remove(self, item_id: str) -> bool:
+        """Tombstone an item's row, compacting when tombstones pile up."""
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        self._matrix[row] = 0.0
+        self._row_ids[row] = None
+        self._tombstones += 1
+        if self._tombstones > self.compaction_ratio * self._used:
+            self.compact()
+        return True
+
+    def clear(self) -> None:
+        """Remove every item, keeping the allocated matrix."""
+        if self._alive is not None:
+            self._alive[:] = False
+        self._row_ids = []
+        self._rows = {}
+        self._used = 0
+        self._tombstones = 0
+
+    def compact(self) -> None:
+        """Drop tombstoned rows, preserving insertion order of live rows."""
+        if self._tombstones == 0:
+            return
+        live = np.flatnonzero(self._alive[: self._used])
+        count = len(live)
+        self._matrix[:count] = self._matrix[live]
+        self._alive[:count] = True
+        self._alive[count:] = False
+        self._row_ids = [self._row_ids[row] for row in live]
+        self._rows = {item_id: row for row, item_id in enumerate(self._row_ids)}
+        self._used = count
+        self._tombstones = 0
+        self.compactions += 1
+
+    def search(self, query: Sequence[float], top_k: int = 5) -> List[Tuple[str, float]]:
+        """Return the top-k items by cosine similarity."""
+        if not self._rows or top_k <= 0:
+            return []
+        query_vector = np.asarray(query, dtype=np.float32)
+        if query_vector.shape != (self.dimension,):
+            return []
+        norm = float(np.linalg.norm(query_vector))
+        if norm > 0.0:
+            query_vector = query_vector / norm
+
+        scores = self._matrix[: self._used] @ query_vector
+        if self._tombstones:
+            scores[~self._alive[: self._used]] = -np.inf
+
+        k = min(top_k, len(self._rows))
+        if k < len(scores):
+            candidates = np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = np.arange(len(scores))
+        # Sort by score, then by row so ties keep insertion order.
+        order = np.lexsort((candidates, -scores[candidates]))
+        return [
+            (self._row_ids[row], float(scores[row]))
+            for row in candidates[order][:k]
+        ]
+
+    def _allocate(self, dimension: int, capacity: int) -> None:
+        self.dimension = dimension
+        self._matrix = np.zeros((capacity, dimension), dtype=np.float32)
+        self._alive = np.zeros(capacity, dtype=bool)
+
+    def _grow(self) -> None:
+        if self._tombstones:
+            self.compact()
+            if self._used < self.capacity:
+                return
+        new_capacity = max(self._initial_capacity, self.capacity * 2)
+        matrix = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+        alive = np.zeros(new_capacity, dtype=bool)
+        matrix[: self._used] = self._matrix[: self._used]
+        alive[: self._used] = self._alive[: self._used]
+        self._matrix = matrix
+        self._alive = alive
+
+    def _normalize(self, vector: Sequence[float]):
+        row_vector = np.asarray(vector, dtype=np.float32)
+        if row_vector.ndim != 1:
+            raise ValueError("vector must be one-dimensional")
+        if self._matrix is None:
+            self._allocate(len(row_vector), self._initial_capacity)
+        if row_vector.shape[0] != self.dimension:
+            raise ValueError(
+                f"vector dimension {row_vector.shape[0]} does not match index dimension {self.dimension}"
+            )
+        norm = float(np.linalg.norm(row_vector))
+        if norm == 0.0:
+            return np.zeros(self.dimension, dtype=np.float32)
+        return row_vector / norm
+
+
+def default_vector_index() -> Optional[VectorIndex]:
+    """Return a NumpyVectorIndex when numpy is installed, otherwise None."""
+    if np is None:
+        return None
+    return NumpyVectorIndex()
+
+
+__all__ = [
+    "VectorIndex",
+    "NumpyVectorIndex",
+    "default_vector_index",
+]
@@ -41,6 +41,18 @@ class ObsMetricsSink(EventSink):
             unit="tokens",
             description="Total token usage per LLM request",
         )
+        self.collector.register_metric(
+            "executor_summary_tokens",
+            MetricType.HISTOGRAM,
+            unit="tokens",
+            description="LLM tokens spent summarizing one plan, by summary mode",
+        )
+        self.collector.register_metric(
+            "executor_summary_latency_ms",
+            MetricType.HISTOGRAM,
+            unit="ms",
+            description="LLM latency spent summarizing one plan, by summary mode",
+        )
         self.collector.register_metric(
             "tool_latency_ms",
             MetricType.HISTOGRAM,
@@ -87,6 +99,20 @@ class ObsMetricsSink(EventSink):
             )
             return
 
+        if event_type == "executor.summary":
+            labels = {"mode": data.get("mode", "unknown")}
+            self.collector.record_metric(
+                "executor_summary_tokens",
+                float(data.get("total_tokens", 0)),
+                labels=labels,
+            )
+            self.collector.record_metric(
+                "executor_summary_latency_ms",
+                float(data.get("latency_ms", 0)),
+                labels=labels,
+            )
+            return
+
         if event_type == "tool.latency":
             tool = data.get("tool", "unknown")
             success = bool(data.get("success", True))
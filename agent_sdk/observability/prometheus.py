@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
 
-from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.core import GaugeMetricFamily, HistogramMetricFamily
 
 from agent_sdk import __version__
 from agent_sdk.observability.otel import ObservabilityManager
 
+if TYPE_CHECKING:
+    from agent_sdk.storage.async_facade import AsyncStorageBackend
+
 
 def _attributes_label(attributes: Optional[Dict[str, Any]]) -> str:
     if not attributes:
@@ -150,3 +153,23 @@ class ObservabilityPrometheusCollector:
         yield latency_family
         yield latency_p95_family
         yield latency_count_family
+
+
+class StorageLatencyPrometheusCollector:
+    """Expose AsyncStorageBackend per-method latency histograms."""
+
+    def __init__(self, storages: Dict[str, "AsyncStorageBackend"]) -> None:
+        self._storages = storages
+
+    def collect(self) -> Iterable[HistogramMetricFamily]:
+        family = HistogramMetricFamily(
+            "agent_sdk_storage_call_latency_ms",
+            "Storage call latency in milliseconds, including executor queueing",
+            labels=["backend", "method"],
+        )
+        for backend, storage in self._storages.items():
+            for method, stats in storage.latency_stats().items():
+                buckets = [(f"{bound:g}", float(count)) for bound, count in stats["buckets"]]
+                buckets.append(("+Inf", float(stats["count"])))
+                family.add_metric([backend, method], buckets, stats["sum_ms"])
+        yield family
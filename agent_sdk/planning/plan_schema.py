@@ -8,8 +8,41 @@ class PlanStep:
     tool: Optional[str] = None
     inputs: Optional[Dict[str, Any]] = None
     notes: Optional[str] = None
+    depends_on: Optional[List[int]] = None
 
 @dataclass
 class Plan:
     task: str
     steps: List[PlanStep] = field(default_factory=list)
+
+    def dependencies(self) -> Dict[Any, List[Any]]:
+        """Map each step id to the ids of the steps it must wait for.
+
+        A step without ``depends_on`` waits for the step before it, so plans
+        written as a plain ordered list keep their sequential meaning; an
+        empty list marks a step that can start right away. Raises
+        ``ValueError`` for duplicate ids, unknown dependencies, or cycles.
+        """
+        ids = [step.id for step in self.steps]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Plan step ids must be unique to resolve dependencies")
+        deps: Dict[Any, List[Any]] = {}
+        for index, step in enumerate(self.steps):
+            if step.depends_on is None:
+                deps[step.id] = [ids[index - 1]] if index else []
+                continue
+            unknown = [dep for dep in step.depends_on if dep not in ids]
+            if unknown:
+                raise ValueError(f"Step {step.id} depends on unknown steps {unknown}")
+            deps[step.id] = list(dict.fromkeys(step.depends_on))
+
+        resolved: set = set()
+        remaining = dict(deps)
+        while remaining:
+            ready = [step_id for step_id, waits in remaining.items() if set(waits) <= resolved]
+            if not ready:
+                raise ValueError(f"Plan has a dependency cycle among steps {sorted(map(str, remaining))}")
+            for step_id in ready:
+                resolved.add(step_id)
+                del remaining[step_id]
+        return deps
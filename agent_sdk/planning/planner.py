@@ -19,7 +19,8 @@ Respond ONLY with valid JSON:
 {
   "task": "...",
   "steps": [
-    {"id": 1, "description": "...", "tool": "optional_or_null", "inputs": {...}, "notes": "optional"}
+    {"id": 1, "description": "...", "tool": "optional_or_null", "inputs": {...}, "notes": "optional",
+     "depends_on": [ids of earlier steps this step needs, or [] if none]}
   ]
 }
 """
@@ -91,6 +92,7 @@ class PlannerAgent(Agent):
                             tool=s.get("tool"),
                             inputs=s.get("inputs"),
                             notes=s.get("notes"),
+                            depends_on=s.get("depends_on"),
                         )
                         for i, s in enumerate(data.get("steps", []))
                     ],
@@ -120,6 +122,7 @@ class PlannerAgent(Agent):
                         "tool": s.tool,
                         "inputs": s.inputs,
                         "notes": s.notes,
+                        "depends_on": s.depends_on,
                     }
                     for s in plan.steps
                 ],
@@ -194,6 +197,7 @@ class PlannerAgent(Agent):
                         tool=s.get("tool"),
                         inputs=s.get("inputs"),
                         notes=s.get("notes"),
+                        depends_on=s.get("depends_on"),
                     )
                     for i, s in enumerate(data.get("steps", []))
                 ],
@@ -222,6 +226,7 @@ class PlannerAgent(Agent):
                         "tool": s.tool,
                         "inputs": s.inputs,
                         "notes": s.notes,
+                        "depends_on": s.depends_on,
                     }
                     for s in plan.steps
                 ],
@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Callable, Dict, Optional
+from threading import Lock
 import time
 
 from agent_sdk.core.retry import retry_with_backoff, sync_retry_with_backoff
@@ -32,36 +33,43 @@ class CircuitBreaker:
         self._policy = policy
         self._failures = 0
         self._opened_at: Optional[float] = None
+        self._lock = Lock()  # Thread safety for concurrent access
 
     def allow(self) -> bool:
-        if self._opened_at is None:
-            return True
-        elapsed = time.time() - self._opened_at
-        if elapsed >= self._policy.reset_timeout_seconds:
-            self._opened_at = None
-            self._failures = 0
-            return True
-        return False
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            elapsed = time.time() - self._opened_at
+            if elapsed >= self._policy.reset_timeout_seconds:
+                self._opened_at = None
+                self._failures = 0
+                return True
+            return False
 
     def record_success(self) -> None:
-        self._failures = 0
-        self._opened_at = None
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
 
     def record_failure(self) -> None:
-        self._failures += 1
-        if self._failures >= self._policy.failure_threshold:
-            self._opened_at = time.time()
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self._policy.failure_threshold:
+                self._opened_at = time.time()
 
 
 class ReplayStore:
     def __init__(self, data: Optional[Dict[str, Any]] = None) -> None:
         self._data = data or {}
+        self._lock = Lock()
 
     def get(self, key: str) -> Optional[Any]:
-        return self._data.get(key)
+        with self._lock:
+            return self._data.get(key)
 
     def record(self, key: str, value: Any) -> None:
-        self._data[key] = value
+        with self._lock:
+            self._data[key] = value
 
 
 class ReliabilityManager:
@@ -73,11 +81,13 @@ class ReliabilityManager:
         self.retry_policy = retry_policy or RetryPolicy()
         self.breaker_policy = breaker_policy or CircuitBreakerPolicy()
         self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = Lock()
 
     def _breaker_for(self, key: str) -> CircuitBreaker:
-        if key not in self._breakers:
-            self._breakers[key] = CircuitBreaker(self.breaker_policy)
-        return self._breakers[key]
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(self.breaker_policy)
+            return self._breakers[key]
 
     def execute(self, key: str, fn: Callable[[], Any]) -> Any:
         breaker = self._breaker_for(key)
@@ -5,7 +5,7 @@ import csv
 import io
 import json
 import hashlib
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 import secrets
 from dataclasses import asdict
 from typing import Optional, Dict, Any
@@ -80,13 +80,17 @@ from agent_sdk.observability.event_retention import EventRetentionPolicy
 from agent_sdk.observability.audit_logs import AuditLogEntry, AuditHashChain, create_audit_loggers
 from agent_sdk.observability.redaction import RedactionPolicy, Redactor
 from agent_sdk.observability.otel import ObservabilityManager
-from agent_sdk.observability.prometheus import ObservabilityPrometheusCollector
+from agent_sdk.observability.prometheus import (
+    ObservabilityPrometheusCollector,
+    StorageLatencyPrometheusCollector,
+)
 from prometheus_client import CollectorRegistry, CONTENT_TYPE_LATEST, generate_latest
 from agent_sdk.core.streaming import TokenCounter
 from agent_sdk.core.retry import RetryConfig, retry_with_backoff
 from agent_sdk.privacy import PrivacyExporter
 from agent_sdk.secrets_rotation import find_due_policies, emit_rotation_due
 from agent_sdk.execution.queue import ExecutionQueue
+from agent_sdk.execution.fair_share import FairShareScheduler, TenantShare
 from agent_sdk.execution.durable_queue import (
     DurableExecutionQueue,
     SQLiteQueueBackend,
@@ -94,16 +98,20 @@ from agent_sdk.execution.durable_queue import (
     SQSQueueBackend,
     KafkaQueueBackend,
 )
+from agent_sdk.execution.queue_notify import PostgresNotifier
 from agent_sdk.policy.engine import PolicyEngine, safety_preset, validate_policy_content
 from agent_sdk.policy.types import PolicyApprovalStatus
 from agent_sdk.policies.prompt_registry import PromptPolicyRegistry
 from agent_sdk.server.idempotency import IdempotencyStore
 from agent_sdk.server.run_store import RunEventStore
+from agent_sdk.server.retention import RetentionWorker
 from agent_sdk.reliability.policy import ReliabilityManager, RetryPolicy, CircuitBreakerPolicy, ReplayStore
 from agent_sdk.webhooks import WebhookDispatcher, WebhookSubscription, WebhookAuditExporter
 from agent_sdk.archival import LocalArchiveBackend
 from agent_sdk.llm.health import ProviderHealthMonitor
 from agent_sdk.storage import SQLiteStorage, PostgresStorage
+from agent_sdk.storage.async_facade import AsyncStorageBackend
+from agent_sdk.storage.write_behind import EventWriteBuffer
 from agent_sdk.server.gateway import GatewayServer
 from agent_sdk.server.device_registry import DeviceRegistry
 from agent_sdk.server.multi_tenant import MultiTenantStore, QuotaLimits, RetentionPolicyConfig
@@ -126,6 +134,11 @@ def _hinted_detail(message: str, hint: str) -> str:
     return f"{message} Hint: {hint}"
 
 
+def _check_page_limit(limit: int) -> None:
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be a positive integer")
+
+
 def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = None):
     """Create and configure FastAPI application
     
@@ -161,6 +174,10 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         if sandbox:
             planner.context.config["tool_sandbox"] = sandbox
             executor.context.config["tool_sandbox"] = sandbox
+        executor.context.config["max_parallel_steps"] = int(
+            os.getenv("AGENT_SDK_MAX_PARALLEL_STEPS", "1")
+        )
+        executor.context.config["summary_mode"] = os.getenv("AGENT_SDK_SUMMARY_MODE", "per_step").lower()
         prometheus_enabled = os.getenv("AGENT_SDK_PROMETHEUS_ENABLED", "").lower() in {
             "1",
             "true",
@@ -200,10 +217,23 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                 raise ConfigError("AGENT_SDK_POSTGRES_DSN is required for postgres storage")
             if PostgresStorage is None:
                 raise ConfigError("psycopg is required for postgres storage")
-            storage = PostgresStorage(dsn)
+            statement_timeout_ms = int(os.getenv("AGENT_SDK_POSTGRES_STATEMENT_TIMEOUT_MS", "30000"))
+            storage = PostgresStorage(
+                dsn,
+                min_size=int(os.getenv("AGENT_SDK_POSTGRES_POOL_MIN", "1")),
+                max_size=int(os.getenv("AGENT_SDK_POSTGRES_POOL_MAX", "10")),
+                statement_timeout_ms=statement_timeout_ms or None,
+                pool_timeout=float(os.getenv("AGENT_SDK_POSTGRES_POOL_TIMEOUT", "30")),
+            )
         else:
             db_path = storage_path or os.getenv("AGENT_SDK_DB_PATH", "agent_sdk.db")
             storage = SQLiteStorage(db_path)
+        async_storage = AsyncStorageBackend(
+            storage,
+            max_workers=int(os.getenv("AGENT_SDK_STORAGE_IO_WORKERS", "8")),
+        )
+        if prometheus_registry is not None:
+            prometheus_registry.register(StorageLatencyPrometheusCollector({"storage": async_storage}))
         archive_backend = LocalArchiveBackend(os.getenv("AGENT_SDK_ARCHIVE_PATH", "archives"))
         privacy_exporter = PrivacyExporter(os.getenv("AGENT_SDK_PRIVACY_EXPORT_PATH", "privacy_exports"))
         secret_rotation_enabled = os.getenv("AGENT_SDK_SECRET_ROTATION_AUTOMATION", "").lower() in {
@@ -288,6 +318,30 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
             executor.context.config["replay_store"] = replay_store
             executor.context.config["replay_mode"] = replay_mode
             executor.context.config["replay_strict"] = os.getenv("AGENT_SDK_REPLAY_STRICT", "").lower() in {"1", "true", "yes", "on"}
+        run_store_storage = storage if storage_backend == "postgres" else None
+        write_buffer = None
+        write_behind_enabled = os.getenv("AGENT_SDK_EVENT_WRITE_BEHIND", "").lower() in {
+            "1",
+            "true",
+            "yes",
+            "on",
+        }
+        if run_store_storage is not None and write_behind_enabled:
+            write_buffer = EventWriteBuffer(
+                run_store_storage,
+                flush_interval=float(os.getenv("AGENT_SDK_EVENT_WRITE_BEHIND_INTERVAL_MS", "5")) / 1000,
+                max_batch_size=int(os.getenv("AGENT_SDK_EVENT_WRITE_BEHIND_BATCH", "256")),
+            )
+        retention_worker = RetentionWorker(
+            storage,
+            tenant_store=tenant_store,
+            event_policy=retention_policy,
+            interval=float(os.getenv("AGENT_SDK_RETENTION_INTERVAL_SECONDS", "60")),
+            batch_size=int(os.getenv("AGENT_SDK_RETENTION_BATCH_SIZE", "500")),
+            batch_pause=float(os.getenv("AGENT_SDK_RETENTION_BATCH_PAUSE_MS", "10")) / 1000,
+            checkpoint_path=os.getenv("AGENT_SDK_RETENTION_CHECKPOINT_PATH"),
+            write_buffer=write_buffer,
+        )
         run_store = RunEventStore(
             max_events=stream_max_events,
             queue_size=stream_queue_size,
@@ -295,10 +349,13 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                 path=log_path,
                 emit_stdout=log_stdout,
             ),
-            storage=storage if storage_backend == "postgres" else None,
+            storage=run_store_storage,
             retention_policy=retention_policy,
             redactor=redactor,
             tenant_store=tenant_store,
+            write_buffer=write_buffer,
+            retention_worker=retention_worker,
+            async_storage=async_storage,
         )
         prompt_registry = PromptPolicyRegistry()
         idp_provider = os.getenv("AGENT_SDK_IDP_PROVIDER", "mock").lower()
@@ -313,10 +370,18 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         durable_queue = None
         execution_queue = None
         if execution_mode == "queue":
+            queue_notifier = None
+            if os.getenv("AGENT_SDK_QUEUE_NOTIFIER", "").lower() == "postgres":
+                queue_notifier = PostgresNotifier(
+                    os.getenv("AGENT_SDK_QUEUE_NOTIFY_DSN") or os.getenv("AGENT_SDK_POSTGRES_DSN")
+                )
             if queue_backend == "sqlite":
                 queue_path = os.getenv("AGENT_SDK_QUEUE_DB_PATH", "queue.db")
                 durable_queue = DurableExecutionQueue(
-                    backend=SQLiteQueueBackend(queue_path),
+                    backend=SQLiteQueueBackend(
+                        queue_path,
+                        visibility_timeout=float(os.getenv("AGENT_SDK_QUEUE_VISIBILITY_TIMEOUT", "300")),
+                    ),
                     handler=lambda payload: runtime.run_async(
                         payload["task"],
                         session_id=payload["session_id"],
@@ -325,11 +390,16 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                     ),
                     poll_interval=float(os.getenv("AGENT_SDK_QUEUE_POLL_INTERVAL", "0.2")),
                     max_attempts=int(os.getenv("AGENT_SDK_QUEUE_MAX_ATTEMPTS", "3")),
+                    notifier=queue_notifier,
+                    io_executor=async_storage,
                 )
             elif queue_backend == "redis":
                 redis_url = os.getenv("AGENT_SDK_REDIS_URL", "redis://localhost:6379/0")
                 durable_queue = DurableExecutionQueue(
-                    backend=RedisQueueBackend(redis_url),
+                    backend=RedisQueueBackend(
+                        redis_url,
+                        lease_timeout=float(os.getenv("AGENT_SDK_QUEUE_VISIBILITY_TIMEOUT", "300")),
+                    ),
                     handler=lambda payload: runtime.run_async(
                         payload["task"],
                         session_id=payload["session_id"],
@@ -345,7 +415,12 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                     raise ConfigError("AGENT_SDK_SQS_QUEUE_URL is required for SQS backend")
                 dlq_url = os.getenv("AGENT_SDK_SQS_DLQ_URL")
                 durable_queue = DurableExecutionQueue(
-                    backend=SQSQueueBackend(queue_url, dlq_url=dlq_url),
+                    backend=SQSQueueBackend(
+                        queue_url,
+                        dlq_url=dlq_url,
+                        wait_time_seconds=int(os.getenv("AGENT_SDK_SQS_WAIT_TIME_SECONDS", "20")),
+                        visibility_timeout=int(os.getenv("AGENT_SDK_QUEUE_VISIBILITY_TIMEOUT", "300")),
+                    ),
                     handler=lambda payload: runtime.run_async(
                         payload["task"],
                         session_id=payload["session_id"],
@@ -367,9 +442,17 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                     ),
                     poll_interval=float(os.getenv("AGENT_SDK_QUEUE_POLL_INTERVAL", "0.2")),
                     max_attempts=int(os.getenv("AGENT_SDK_QUEUE_MAX_ATTEMPTS", "3")),
+                    notifier=queue_notifier,
+                    io_executor=async_storage,
                 )
             else:
-                execution_queue = ExecutionQueue(worker_count=int(os.getenv("AGENT_SDK_WORKER_COUNT", "2")))
+                tenant_cap = os.getenv("AGENT_SDK_TENANT_MAX_CONCURRENCY")
+                execution_queue = ExecutionQueue(
+                    worker_count=int(os.getenv("AGENT_SDK_WORKER_COUNT", "2")),
+                    scheduler=FairShareScheduler(
+                        TenantShare(max_concurrency=int(tenant_cap) if tenant_cap else None)
+                    ),
+                )
         retry_config = RetryConfig(
             max_retries=int(os.getenv("AGENT_SDK_RETRY_MAX", "1")),
             base_delay=float(os.getenv("AGENT_SDK_RETRY_BASE_DELAY", "0.5")),
@@ -516,7 +599,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                 {"task": task, "session_id": session_id, "run_id": run_id, "org_id": org_id}
             )
         if execution_queue is not None:
-            return await execution_queue.submit(_invoke_with_retry)
+            return await execution_queue.submit_for(org_id or "default", _invoke_with_retry)
         return await _invoke_with_retry()
 
     def _assert_residency(org_id: str) -> None:
@@ -528,16 +611,6 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                 detail=f"Data residency mismatch: org requires {required}, server region {server_region}",
             )
 
-    def _apply_retention(org_id: str) -> None:
-        policy = tenant_store.get_retention_policy(org_id)
-        now = datetime.now(timezone.utc)
-        if policy.max_run_age_days:
-            cutoff = now - timedelta(days=policy.max_run_age_days)
-            storage.prune_runs(org_id, cutoff.isoformat())
-        if policy.max_session_age_days:
-            cutoff = now - timedelta(days=policy.max_session_age_days)
-            storage.prune_sessions(org_id, cutoff.isoformat())
-
     def _load_audit_entries(path: Optional[str], org_id: Optional[str], limit: Optional[int]) -> list[dict]:
         if not path or not os.path.exists(path):
             return []
@@ -573,7 +646,6 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
     async def _submit_scheduled(entry):
         org_id = entry.org_id
         _assert_residency(org_id)
-        _apply_retention(org_id)
         allowed, reason = tenant_store.check_quota(
             org_id, new_session=True, new_run=True, project_id=project_id, key=key_info.key
         )
@@ -583,7 +655,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         session_id = new_session_id()
         run_id = new_run_id()
         session = SessionMetadata(session_id=session_id, org_id=org_id)
-        storage.create_session(session)
+        await async_storage.create_session(session)
         tenant_store.record_session(org_id, project_id=project_id, key=key_info.key)
         requested_model = planner.context.model_config.model_id if planner.context.model_config else None
         resolved_model = tenant_store.resolve_model(org_id, requested_model)
@@ -610,7 +682,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
             model=resolved_model,
             metadata=scheduled_metadata,
         )
-        storage.create_run(run_meta)
+        await async_storage.create_run(run_meta)
         tenant_store.record_run(org_id)
         try:
             msgs = await _run_with_policies(entry.task, session_id=session_id, run_id=run_id, org_id=org_id)
@@ -624,7 +696,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                 model=resolved_model,
                 metadata={**scheduled_metadata, "token_count": token_count},
             )
-            storage.update_run(run_meta)
+            await async_storage.update_run(run_meta)
             tenant_store.record_tokens(org_id, token_count)
         except Exception as exc:
             logger.error("Scheduled run failed: %s", exc, exc_info=True)
@@ -637,7 +709,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                 model=resolved_model,
                 metadata={**scheduled_metadata, "error": str(exc)},
             )
-            storage.update_run(run_meta)
+            await async_storage.update_run(run_meta)
 
     scheduler_store = None
     scheduler_db = os.getenv("AGENT_SDK_SCHEDULER_DB_PATH")
@@ -737,7 +809,9 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         await gateway.handle_connection(websocket)
     app.state.run_store = run_store
     app.state.storage = storage
-    app.state.event_storage = storage if storage_backend == "postgres" else None
+    app.state.async_storage = async_storage
+    app.state.retention_worker = retention_worker
+    app.state.event_storage = async_storage if storage_backend == "postgres" else None
     app.state.archive_backend = archive_backend
     app.state.privacy_exporter = privacy_exporter
     app.state.tenant_store = tenant_store
@@ -777,6 +851,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         if durable_queue is not None:
             await durable_queue.start()
         await scheduler.start()
+        await retention_worker.start()
         if secret_rotation_enabled:
             app.state.secret_rotation_task = asyncio.create_task(_secret_rotation_loop())
 
@@ -792,10 +867,17 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         if durable_queue is not None:
             await durable_queue.stop()
         await scheduler.stop()
+        await retention_worker.stop()
+        await asyncio.to_thread(run_store.close)
+        async_storage.close()
+        close_storage = getattr(storage, "close", None)
+        if close_storage is not None:
+            close_storage()
     gateway = GatewayServer(
         runtime=runtime,
         run_store=run_store,
         storage=storage,
+        async_storage=async_storage,
         api_key_manager=get_api_key_manager(),
         send_queue_size=int(os.getenv("AGENT_SDK_GATEWAY_QUEUE", "100")),
         tenant_store=tenant_store,
@@ -888,7 +970,6 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                 if not project or project.org_id != org_id:
                     raise HTTPException(status_code=404, detail="Project not found")
             _assert_residency(org_id)
-            _apply_retention(org_id)
             idempotency_key = request.headers.get("Idempotency-Key")
             if idempotency_key:
                 cached = idempotency_store.get(idempotency_key)
@@ -905,7 +986,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
             run_id = new_run_id()
 
             session = SessionMetadata(session_id=session_id, org_id=org_id)
-            storage.create_session(session)
+            await async_storage.create_session(session)
             webhook_dispatcher.dispatch(
                 "session.created",
                 {"session_id": session_id, "org_id": org_id, "project_id": project_id},
@@ -938,7 +1019,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                 tags=run_tags,
                 metadata=run_metadata,
             )
-            storage.create_run(run_meta)
+            await async_storage.create_run(run_meta)
             tenant_store.record_run(org_id, project_id=project_id, key=key_info.key)
 
             msgs = await _run_with_policies(req.task, session_id=session_id, run_id=run_id, org_id=org_id)
@@ -954,7 +1035,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                 tags=run_tags,
                 metadata=run_metadata,
             )
-            storage.update_run(run_meta)
+            await async_storage.update_run(run_meta)
             tenant_store.record_tokens(org_id, token_count, project_id=project_id, key=key_info.key)
             webhook_dispatcher.dispatch(
                 "run.completed",
@@ -1061,12 +1142,12 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                     seq=seq,
                     metadata={"org_id": org_id},
                 )
-                run_store.append_event(run_id, start_event)
+                await run_store.append_event_async(run_id, start_event)
                 seq += 1
 
                 msgs = await _run_with_policies(req.task, session_id=session_id, run_id=run_id, org_id=org_id)
                 for msg in msgs:
-                    run_store.append_event(
+                    await run_store.append_event_async(
                         run_id,
                         StreamEnvelope(
                             run_id=run_id,
@@ -1095,11 +1176,11 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                     seq=seq,
                     metadata={"org_id": org_id},
                 )
-                run_store.append_event(run_id, end_event)
+                await run_store.append_event_async(run_id, end_event)
                 token_count = sum(TokenCounter.count_tokens(m.content) for m in msgs)
                 completed_metadata = dict(run_metadata)
                 completed_metadata["token_count"] = token_count
-                storage.update_run(
+                await async_storage.update_run(
                     RunMetadata(
                         run_id=run_id,
                         session_id=session_id,
@@ -1123,7 +1204,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                 )
             except Exception as e:
                 logger.error(f"Error during streaming execution: {e}", exc_info=True)
-                run_store.append_event(
+                await run_store.append_event_async(
                     run_id,
                     StreamEnvelope(
                         run_id=run_id,
@@ -1136,7 +1217,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                         metadata={"org_id": org_id},
                     ),
                 )
-                storage.update_run(
+                await async_storage.update_run(
                     RunMetadata(
                         run_id=run_id,
                         session_id=session_id,
@@ -1186,7 +1267,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
             raise HTTPException(status_code=429, detail=f"Quota exceeded: {reason}")
         run_id = new_run_id()
         session_id = new_session_id()
-        storage.create_session(SessionMetadata(session_id=session_id, org_id=org_id))
+        await async_storage.create_session(SessionMetadata(session_id=session_id, org_id=org_id))
         webhook_dispatcher.dispatch(
             "session.created",
             {"session_id": session_id, "org_id": org_id, "project_id": project_id},
@@ -1211,7 +1292,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         }
         if req.lineage:
             run_metadata["lineage"] = req.lineage
-        storage.create_run(
+        await async_storage.create_run(
             RunMetadata(
                 run_id=run_id,
                 session_id=session_id,
@@ -1247,7 +1328,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         if not run_store.has_run(run_id):
             if app.state.event_storage is None:
                 raise HTTPException(status_code=404, detail="Run not found")
-        run = storage.get_run(run_id)
+        run = await async_storage.get_run(run_id)
         if not run:
             raise HTTPException(status_code=404, detail="Run not found")
         if run.org_id != _org_id_from_request(request):
@@ -1258,9 +1339,14 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                 async for event in run_store.stream(run_id):
                     yield event.to_sse()
                 return
-            events = app.state.event_storage.list_events(run_id)  # type: ignore[union-attr]
-            for event in events:
-                yield event.to_sse()
+            cursor = None
+            while True:
+                page = await app.state.event_storage.list_events_page(run_id, cursor=cursor)  # type: ignore[union-attr]
+                for event in page.items:
+                    yield event.to_sse()
+                cursor = page.next_cursor
+                if cursor is None:
+                    break
 
         return StreamingResponse(
             event_generator(),
@@ -1278,18 +1364,33 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         dependencies=[Depends(verify_api_key), Depends(require_scopes([SCOPE_RUN_READ]))],
         tags=["Tasks"],
     )
-    async def replay_run_events(run_id: str, request: Request, from_seq: Optional[int] = None, limit: int = 1000):
-        run = storage.get_run(run_id)
+    async def replay_run_events(
+        run_id: str,
+        request: Request,
+        from_seq: Optional[int] = None,
+        limit: int = 1000,
+        cursor: Optional[str] = None,
+    ):
+        run = await async_storage.get_run(run_id)
         if not run:
             raise HTTPException(status_code=404, detail="Run not found")
         if run.org_id != _org_id_from_request(request):
             raise HTTPException(status_code=403, detail="Forbidden")
+        _check_page_limit(limit)
+        next_cursor = None
         if app.state.event_storage is None:
-            events = run_store.list_events_from(run_id, from_seq)
+            events = run_store.list_events_from(run_id, from_seq)[:limit]
         else:
-            events = app.state.event_storage.list_events_from(run_id, from_seq, limit=limit)
-        payload = [event.to_dict() for event in events[:limit]]
-        return ReplayEventsResponse(events=payload, count=len(payload))
+            try:
+                page = await app.state.event_storage.list_events_page(
+                    run_id, limit=limit, cursor=cursor, from_seq=from_seq
+                )
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc)) from exc
+            events = page.items
+            next_cursor = page.next_cursor
+        payload = [event.to_dict() for event in events]
+        return ReplayEventsResponse(events=payload, count=len(payload), next_cursor=next_cursor)
 
     @app.get(
         "/run/{run_id}",
@@ -1297,7 +1398,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         tags=["Tasks"]
     )
     async def get_run(run_id: str, request: Request):
-        run = storage.get_run(run_id)
+        run = await async_storage.get_run(run_id)
         if not run:
             raise HTTPException(status_code=404, detail="Run not found")
         if run.org_id != _org_id_from_request(request):
@@ -1306,15 +1407,51 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         data["status"] = run.status.value
         return data
 
+    @app.get(
+        "/runs",
+        dependencies=[Depends(verify_api_key), Depends(require_scopes([SCOPE_RUN_READ]))],
+        tags=["Tasks"]
+    )
+    async def list_runs(
+        request: Request,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        session_id: Optional[str] = None,
+    ):
+        _check_page_limit(limit)
+        try:
+            page = await async_storage.list_runs_page(
+                org_id=_org_id_from_request(request),
+                limit=limit,
+                cursor=cursor,
+                session_id=session_id,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        runs = []
+        for run in page.items:
+            data = asdict(run)
+            data["status"] = run.status.value
+            runs.append(data)
+        return {"runs": runs, "next_cursor": page.next_cursor}
+
     @app.get(
         "/sessions",
         dependencies=[Depends(verify_api_key), Depends(require_scopes([SCOPE_SESSION_READ]))],
         tags=["Tasks"]
     )
-    async def list_sessions(request: Request, limit: int = 100):
-        sessions = storage.list_sessions(limit=limit)
-        org_id = _org_id_from_request(request)
-        return [asdict(session) for session in sessions if session.org_id == org_id]
+    async def list_sessions(request: Request, response: Response, limit: int = 100, cursor: Optional[str] = None):
+        # The body stays a plain list for existing callers; the cursor travels in a header.
+        _check_page_limit(limit)
+        try:
+            page = await async_storage.list_sessions_page(
+                org_id=_org_id_from_request(request), limit=limit, cursor=cursor
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        if page.next_cursor:
+            response.headers["X-Next-Cursor"] = page.next_cursor
+        return [asdict(session) for session in page.items]
 
     @app.get(
         "/sessions/{session_id}",
@@ -1322,7 +1459,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         tags=["Tasks"]
     )
     async def get_session(session_id: str, request: Request):
-        session = storage.get_session(session_id)
+        session = await async_storage.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
         if session.org_id != _org_id_from_request(request):
@@ -1347,7 +1484,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
             project = tenant_store.get_project(project_id)
             if not project or project.org_id != org_id:
                 raise HTTPException(status_code=404, detail="Project not found")
-        if req.session_id is None or storage.get_session(req.session_id) is None:
+        if req.session_id is None or await async_storage.get_session(req.session_id) is None:
             tenant_store.record_session(org_id, project_id=project_id, key=key_info.key)
         tenant_store.record_run(org_id, project_id=project_id, key=key_info.key)
         return await handle_web_channel(
@@ -1843,7 +1980,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
             )
         )
         group_fields = [field.strip() for field in group_by.split(",") if field.strip()]
-        runs = storage.list_runs(org_id=org_id, limit=limit)
+        runs = await async_storage.list_runs(org_id=org_id, limit=limit)
         aggregate: Dict[tuple, Dict[str, Any]] = {}
         session_sets: Dict[tuple, set] = {}
         for run in runs:
@@ -1900,7 +2037,9 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
             raise HTTPException(status_code=400, detail="provide only one of run_id or session_id")
         actor, audit_org = _audit_actor(request)
         if run_id:
-            path = archive_backend.export_run(storage, run_id)
+            path = await async_storage.run(
+                "archive_export_run", archive_backend.export_run, storage, run_id
+            )
             audit_logger.emit(
                 AuditLogEntry(
                     action="admin.archive.export_run",
@@ -1912,7 +2051,9 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
                 )
             )
             return {"path": path}
-        path = archive_backend.export_session(storage, session_id)  # type: ignore[arg-type]
+        path = await async_storage.run(
+            "archive_export_session", archive_backend.export_session, storage, session_id
+        )
         audit_logger.emit(
             AuditLogEntry(
                 action="admin.archive.export_session",
@@ -1933,7 +2074,7 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
     async def restore_archive(request: Request, path: str):
         if not path:
             raise HTTPException(status_code=400, detail="path required")
-        archive_backend.restore(storage, path)
+        await async_storage.run("archive_restore", archive_backend.restore, storage, path)
         actor, audit_org = _audit_actor(request)
         audit_logger.emit(
             AuditLogEntry(
@@ -1952,7 +2093,9 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         tags=["Admin"],
     )
     async def export_privacy_bundle(req: PrivacyExportRequest, request: Request):
-        path = privacy_exporter.export_org_bundle(
+        path = await async_storage.run(
+            "privacy_export",
+            privacy_exporter.export_org_bundle,
             storage,
             req.org_id,
             user_id=req.user_id,
@@ -2311,6 +2454,42 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
             "max_session_age_days": policy.max_session_age_days,
         }
 
+    @app.get(
+        "/admin/retention/status",
+        dependencies=[Depends(verify_api_key), Depends(require_scopes([SCOPE_ADMIN]))],
+        tags=["Admin"],
+    )
+    async def get_retention_status(request: Request):
+        actor, audit_org = _audit_actor(request)
+        audit_logger.emit(
+            AuditLogEntry(
+                action="admin.retention.status",
+                actor=actor,
+                org_id=audit_org,
+                target_type="retention",
+            )
+        )
+        return retention_worker.stats()
+
+    @app.post(
+        "/admin/retention/run",
+        dependencies=[Depends(verify_api_key), Depends(require_scopes([SCOPE_ADMIN]))],
+        tags=["Admin"],
+    )
+    async def run_retention_pass(request: Request):
+        report = await asyncio.to_thread(retention_worker.run_once)
+        actor, audit_org = _audit_actor(request)
+        audit_logger.emit(
+            AuditLogEntry(
+                action="admin.retention.run",
+                actor=actor,
+                org_id=audit_org,
+                target_type="retention",
+                metadata=asdict(report),
+            )
+        )
+        return asdict(report)
+
     @app.get(
         "/admin/residency",
         dependencies=[Depends(verify_api_key), Depends(require_scopes([SCOPE_ADMIN]))],
@@ -2903,12 +3082,12 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         tags=["Admin"],
     )
     async def purge_run_events(run_id: str, request: Request, body: RunEventsDeleteRequest):
-        run = storage.get_run(run_id)
+        run = await async_storage.get_run(run_id)
         if not run:
             raise HTTPException(status_code=404, detail="Run not found")
         if run.org_id != _org_id_from_request(request):
             raise HTTPException(status_code=403, detail="Forbidden")
-        deleted = storage.delete_events(run_id, before_seq=body.before_seq)
+        deleted = await async_storage.delete_events(run_id, before_seq=body.before_seq)
         actor, org_id = _audit_actor(request)
         audit_logger.emit(
             AuditLogEntry(
@@ -2928,12 +3107,12 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         tags=["Admin"],
     )
     async def delete_run(run_id: str, request: Request):
-        run = storage.get_run(run_id)
+        run = await async_storage.get_run(run_id)
         if not run:
             raise HTTPException(status_code=404, detail="Run not found")
         if run.org_id != _org_id_from_request(request):
             raise HTTPException(status_code=403, detail="Forbidden")
-        deleted = storage.delete_run(run_id)
+        deleted = await async_storage.delete_run(run_id)
         actor, org_id = _audit_actor(request)
         audit_logger.emit(
             AuditLogEntry(
@@ -2953,12 +3132,12 @@ def create_app(config_path: str = "config.yaml", storage_path: Optional[str] = N
         tags=["Admin"],
     )
     async def delete_session(session_id: str, request: Request):
-        session = storage.get_session(session_id)
+        session = await async_storage.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
         if session.org_id != _org_id_from_request(request):
             raise HTTPException(status_code=403, detail="Forbidden")
-        deleted = storage.delete_session(session_id)
+        deleted = await async_storage.delete_session(session_id)
         actor, org_id = _audit_actor(request)
         audit_logger.emit(
             AuditLogEntry(
@@ -23,6 +23,7 @@ from agent_sdk.observability.stream_envelope import (
 )
 from agent_sdk.server.run_store import RunEventStore
 from agent_sdk.security import APIKeyManager
+from agent_sdk.storage.async_facade import AsyncStorageBackend
 
 logger = logging.getLogger(__name__)
 
@@ -105,10 +106,12 @@ class GatewayServer:
         send_queue_size: int = 100,
         tenant_store=None,
         default_org_id: str = "default",
+        async_storage: Optional[AsyncStorageBackend] = None,
     ):
         self.runtime = runtime
         self.run_store = run_store
         self.storage = storage
+        self.async_storage = async_storage
         self.api_key_manager = api_key_manager
         self.send_queue_size = send_queue_size
         self.tenant_store = tenant_store
@@ -253,17 +256,17 @@ class GatewayServer:
         run_id = new_run_id()
         if session_id is None:
             session_id = new_session_id()
-            self.storage.create_session(
+            await self._storage_call("create_session",
                 SessionMetadata(session_id=session_id, org_id=self.default_org_id)
             )
             if self.tenant_store is not None:
                 self.tenant_store.record_session(self.default_org_id)
         else:
-            if self.storage.get_session(session_id) is None:
-                self.storage.create_session(
+            if await self._storage_call("get_session", session_id) is None:
+                await self._storage_call("create_session",
                     SessionMetadata(session_id=session_id, org_id=self.default_org_id)
                 )
-        self.storage.create_run(
+        await self._storage_call("create_run",
             RunMetadata(
                 run_id=run_id,
                 session_id=session_id,
@@ -291,12 +294,12 @@ class GatewayServer:
                 seq=seq,
                 metadata={"org_id": self.default_org_id},
             )
-            self.run_store.append_event(run_id, start_event)
+            await self.run_store.append_event_async(run_id, start_event)
             seq += 1
 
             msgs = await self.runtime.run_async(task, session_id=session_id, run_id=run_id)
             for msg in msgs:
-                self.run_store.append_event(
+                await self.run_store.append_event_async(
                     run_id,
                     StreamEnvelope(
                         run_id=run_id,
@@ -325,8 +328,8 @@ class GatewayServer:
                 seq=seq,
                 metadata={"org_id": self.default_org_id},
             )
-            self.run_store.append_event(run_id, end_event)
-            self.storage.update_run(
+            await self.run_store.append_event_async(run_id, end_event)
+            await self._storage_call("update_run",
                 RunMetadata(
                     run_id=run_id,
                     session_id=session_id,
@@ -337,7 +340,7 @@ class GatewayServer:
             )
         except Exception as exc:
             logger.error("Gateway run failed: %s", exc, exc_info=True)
-            self.run_store.append_event(
+            await self.run_store.append_event_async(
                 run_id,
                 StreamEnvelope(
                     run_id=run_id,
@@ -350,7 +353,7 @@ class GatewayServer:
                     metadata={"org_id": self.default_org_id},
                 ),
             )
-            self.storage.update_run(
+            await self._storage_call("update_run",
                 RunMetadata(
                     run_id=run_id,
                     session_id=session_id,
@@ -360,6 +363,12 @@ class GatewayServer:
                 )
             )
 
+    async def _storage_call(self, name: str, *args: Any) -> Any:
+        """Run a storage method off the event loop, on the async facade's pool when given."""
+        if self.async_storage is not None:
+            return await getattr(self.async_storage, name)(*args)
+        return await asyncio.to_thread(getattr(self.storage, name), *args)
+
     async def _send_ack(self, connection: GatewayConnection, request_id: Optional[str], payload: Dict[str, Any]) -> None:
         connection.enqueue(
             GatewayEnvelope(type="ack", request_id=request_id, timestamp=_now_iso(), payload=payload)
@@ -0,0 +1,294 @@
+"""
+Background retention worker for persisted runs, sessions and events.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from agent_sdk.observability.event_retention import EventRetentionPolicy
+from agent_sdk.storage.base import StorageBackend
+from agent_sdk.storage.write_behind import EventWriteBuffer
+
+if TYPE_CHECKING:
+    from agent_sdk.server.multi_tenant import MultiTenantStore
+
+logger = logging.getLogger(__name__)
+
+# Trim floors remembered for runs with no trimming pending; the oldest are forgotten first.
+MAX_TRIM_FLOORS = 10_000
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class RunTrimState:
+    """Event-trimming progress for one run: events below ``trimmed_before`` are gone."""
+
+    org_id: str
+    last_seq: int
+    trimmed_before: int = 0
+
+
+@dataclass
+class RetentionReport:
+    """Outcome of one retention pass."""
+
+    started_at: str
+    runs_removed: int = 0
+    sessions_removed: int = 0
+    events_removed: int = 0
+    batches: int = 0
+    duration_seconds: float = 0.0
+    complete: bool = True
+
+
+@dataclass
+class RetentionCheckpoint:
+    """Persisted worker progress: cumulative totals and per-run event-trimming state.
+
+    ``pending_runs`` holds runs still awaiting trimming. Once a run catches up
+    its floor moves to ``trimmed_floors``, so the next trim for it resumes
+    there instead of sweeping already-deleted ``seq`` windows from zero.
+    """
+
+    runs_removed: int = 0
+    sessions_removed: int = 0
+    events_removed: int = 0
+    passes: int = 0
+    last_pass: Optional[Dict[str, object]] = None
+    pending_runs: Dict[str, RunTrimState] = field(default_factory=dict)
+    trimmed_floors: Dict[str, int] = field(default_factory=dict)
+
+
+class RetentionWorker:
+    """Apply retention policies off the request path.
+
+    Run/session age limits come from the tenant store's per-org
+    ``RetentionPolicyConfig``; event caps come from the org's ``max_events``
+    or, failing that, the global ``EventRetentionPolicy``. ``RunEventStore``
+    reports appended events through :meth:`note_event` and the worker trims
+    those runs later, so streaming never waits on deletes.
+
+    Every delete is bounded by ``batch_size`` rows (runs, sessions, or a
+    window of event ``seq`` values) and followed by a ``batch_pause`` sleep so
+    cleanup yields to foreground writers. A pass stops after
+    ``max_batches_per_pass`` batches and resumes from the checkpoint, which
+    is written to ``checkpoint_path`` after each pass when one is given.
+    When events are written through an ``EventWriteBuffer`` it is flushed
+    before trimming so no buffered event lands behind a delete.
+    """
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        tenant_store: Optional["MultiTenantStore"] = None,
+        event_policy: Optional[EventRetentionPolicy] = None,
+        interval: float = 60.0,
+        batch_size: int = 500,
+        batch_pause: float = 0.01,
+        max_batches_per_pass: int = 200,
+        checkpoint_path: Optional[str] = None,
+        write_buffer: Optional[EventWriteBuffer] = None,
+    ):
+        self._storage = storage
+        self._write_buffer = write_buffer
+        self._tenant_store = tenant_store
+        self._event_policy = event_policy or EventRetentionPolicy()
+        self.interval = interval
+        self.batch_size = max(1, batch_size)
+        self.batch_pause = batch_pause
+        self.max_batches_per_pass = max(1, max_batches_per_pass)
+        self._checkpoint_path = checkpoint_path
+        self._lock = threading.Lock()
+        self._pass_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.checkpoint = self._load_checkpoint()
+
+    def event_policy_for(self, org_id: str) -> EventRetentionPolicy:
+        if self._tenant_store is not None:
+            org_policy = self._tenant_store.get_retention_policy(org_id)
+            if org_policy.max_events:
+                return EventRetentionPolicy(max_events=org_policy.max_events, enabled=True)
+        return self._event_policy
+
+    def note_event(self, run_id: str, org_id: str, seq: Optional[int]) -> None:
+        """Record that ``run_id`` reached ``seq``; trimming happens on the next pass."""
+        if seq is None:
+            return
+        with self._lock:
+            state = self.checkpoint.pending_runs.get(run_id)
+            if state is None:
+                self.checkpoint.pending_runs[run_id] = RunTrimState(
+                    org_id=org_id,
+                    last_seq=seq,
+                    trimmed_before=self.checkpoint.trimmed_floors.pop(run_id, 0),
+                )
+            elif seq > state.last_seq:
+                state.last_seq = seq
+
+    def run_once(self) -> RetentionReport:
+        """Run one bounded retention pass and return what it removed."""
+        with self._pass_lock:
+            report = RetentionReport(started_at=_now_iso())
+            start = time.perf_counter()
+            try:
+                self._trim_events(report)
+                for org_id in self._org_ids():
+                    if not self._prune_org(org_id, report):
+                        break
+            finally:
+                report.duration_seconds = time.perf_counter() - start
+                with self._lock:
+                    self.checkpoint.runs_removed += report.runs_removed
+                    self.checkpoint.sessions_removed += report.sessions_removed
+                    self.checkpoint.events_removed += report.events_removed
+                    self.checkpoint.passes += 1
+                    self.checkpoint.last_pass = asdict(report)
+                self._save_checkpoint()
+            return report
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "runs_removed": self.checkpoint.runs_removed,
+                "sessions_removed": self.checkpoint.sessions_removed,
+                "events_removed": self.checkpoint.events_removed,
+                "passes": self.checkpoint.passes,
+                "pending_runs": len(self.checkpoint.pending_runs),
+                "last_pass": self.checkpoint.last_pass,
+                "running": self._task is not None and not self._task.done(),
+            }
+
+    async def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._stop.clear()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Retention pass failed")
+            await asyncio.sleep(self.interval)
+
+    def _org_ids(self) -> List[str]:
+        if self._tenant_store is None:
+            return []
+        return [org.org_id for org in self._tenant_store.list_orgs()]
+
+    def _budget_left(self, report: RetentionReport) -> bool:
+        if self._stop.is_set() or report.batches >= self.max_batches_per_pass:
+            report.complete = False
+            return False
+        return True
+
+    def _finish_batch(self, report: RetentionReport) -> None:
+        report.batches += 1
+        if self.batch_pause > 0:
+            self._stop.wait(self.batch_pause)
+
+    def _trim_events(self, report: RetentionReport) -> None:
+        with self._lock:
+            pending = list(self.checkpoint.pending_runs.items())
+        if pending and self._write_buffer is not None:
+            self._write_buffer.flush()
+        for run_id, state in pending:
+            cutoff = self.event_policy_for(state.org_id).cutoff_seq(state.last_seq)
+            while cutoff is not None and state.trimmed_before < cutoff:
+                if not self._budget_left(report):
+                    return
+                upper = min(cutoff, state.trimmed_before + self.batch_size)
+                report.events_removed += self._storage.delete_events(run_id, before_seq=upper)
+                state.trimmed_before = upper
+                self._finish_batch(report)
+            with self._lock:
+                # note_event may have advanced last_seq while this run was trimmed.
+                latest = self.event_policy_for(state.org_id).cutoff_seq(state.last_seq)
+                if latest is None or state.trimmed_before >= latest:
+                    self.checkpoint.pending_runs.pop(run_id, None)
+                    self._remember_floor(run_id, state.trimmed_before)
+
+    def _remember_floor(self, run_id: str, trimmed_before: int) -> None:
+        if not trimmed_before:
+            return
+        floors = self.checkpoint.trimmed_floors
+        floors[run_id] = trimmed_before
+        while len(floors) > MAX_TRIM_FLOORS:
+            floors.pop(next(iter(floors)))
+
+    def _prune_org(self, org_id: str, report: RetentionReport) -> bool:
+        policy = self._tenant_store.get_retention_policy(org_id) if self._tenant_store else None
+        if policy is None:
+            return True
+        now = datetime.now(timezone.utc)
+        steps = []
+        if policy.max_run_age_days:
+            cutoff = (now - timedelta(days=policy.max_run_age_days)).isoformat()
+            steps.append(("runs_removed", self._storage.prune_runs, cutoff))
+        if policy.max_session_age_days:
+            cutoff = (now - timedelta(days=policy.max_session_age_days)).isoformat()
+            steps.append(("sessions_removed", self._storage.prune_sessions, cutoff))
+        for counter, prune, cutoff in steps:
+            while True:
+                if not self._budget_left(report):
+                    return False
+                removed = prune(org_id, cutoff, limit=self.batch_size)
+                setattr(report, counter, getattr(report, counter) + removed)
+                self._finish_batch(report)
+                if removed < self.batch_size:
+                    break
+        return True
+
+    def _load_checkpoint(self) -> RetentionCheckpoint:
+        if not self._checkpoint_path or not os.path.exists(self._checkpoint_path):
+            return RetentionCheckpoint()
+        try:
+            with open(self._checkpoint_path, "r", encoding="utf-8") as handle:
+                raw = json.load(handle)
+            pending = {
+                run_id: RunTrimState(**state) for run_id, state in raw.pop("pending_runs", {}).items()
+            }
+            return RetentionCheckpoint(**raw, pending_runs=pending)
+        except (OSError, ValueError, TypeError):
+            logger.exception("Ignoring unreadable retention checkpoint %s", self._checkpoint_path)
+            return RetentionCheckpoint()
+
+    def _save_checkpoint(self) -> None:
+        if not self._checkpoint_path:
+            return
+        with self._lock:
+            payload = asdict(self.checkpoint)
+        tmp_path = f"{self._checkpoint_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle)
+            os.replace(tmp_path, self._checkpoint_path)
+        except OSError:
+            logger.exception("Failed to write retention checkpoint %s", self._checkpoint_path)
@@ -10,14 +10,19 @@ from dataclasses import dataclass
 from typing import Deque, Dict, List, Optional, TYPE_CHECKING
 
 from agent_sdk.observability.stream_envelope import StreamEnvelope, StreamChannel
+from agent_sdk.storage.async_facade import AsyncStorageBackend
 from agent_sdk.storage.base import StorageBackend
+from agent_sdk.storage.write_behind import EventWriteBuffer
 from agent_sdk.observability.run_logs import RunLogExporter
 from agent_sdk.observability.event_retention import EventRetentionPolicy
+from agent_sdk.server.retention import RetentionWorker
 from agent_sdk.observability.redaction import Redactor
 
 if TYPE_CHECKING:
     from agent_sdk.server.multi_tenant import MultiTenantStore
 
+TERMINAL_EVENTS = {"end", "error", "timeout", "canceled"}
+
 
 @dataclass
 class RunBuffer:
@@ -36,15 +41,23 @@ class RunEventStore:
         retention_policy: Optional[EventRetentionPolicy] = None,
         redactor: Optional[Redactor] = None,
         tenant_store: Optional["MultiTenantStore"] = None,
+        write_buffer: Optional[EventWriteBuffer] = None,
+        retention_worker: Optional[RetentionWorker] = None,
+        async_storage: Optional[AsyncStorageBackend] = None,
     ):
         self._runs: Dict[str, RunBuffer] = {}
         self._max_events = max_events
         self._queue_size = queue_size
         self._exporters = exporters or []
         self._storage = storage
-        self._retention_policy = retention_policy or EventRetentionPolicy()
         self._redactor = redactor
+        self._write_buffer = write_buffer
+        self._async_storage = async_storage
+        self._retention_policy = retention_policy or EventRetentionPolicy()
         self._tenant_store = tenant_store
+        # With a worker, event caps are enforced by its background passes;
+        # without one they are still applied inline on every append.
+        self.retention_worker = retention_worker
 
     def create_run(self, run_id: str) -> None:
         if run_id in self._runs:
@@ -59,30 +72,85 @@ class RunEventStore:
         return run_id in self._runs
 
     def append_event(self, run_id: str, event: StreamEnvelope) -> None:
+        redacted_event = self._redact(event)
+        self._persist(run_id, redacted_event)
+        self._publish(run_id, redacted_event)
+
+    async def append_event_async(self, run_id: str, event: StreamEnvelope) -> None:
+        """Like :meth:`append_event`, but keeps synchronous storage writes off the event loop.
+
+        The event goes to the write buffer when it has room. Otherwise (no
+        buffer, or a full one) the write runs on ``async_storage``'s pool (or a
+        worker thread), and the event is published to subscribers once stored.
+        """
+        redacted_event = self._redact(event)
+        if self._write_buffer is not None and self._storage is not None:
+            if self._write_buffer.try_append(redacted_event):
+                try:
+                    self._after_persist(run_id, redacted_event, block=False)
+                except Exception:
+                    pass
+                self._publish(run_id, redacted_event)
+                return
+        if self._storage is not None:
+            if self._async_storage is not None:
+                await self._async_storage.run("append_event", self._persist, run_id, redacted_event)
+            else:
+                await asyncio.to_thread(self._persist, run_id, redacted_event)
+        self._publish(run_id, redacted_event)
+
+    def _redact(self, event: StreamEnvelope) -> StreamEnvelope:
+        if self._redactor and self._redactor.enabled:
+            return self._redactor.redact_event(event)
+        return event
+
+    def _persist(self, run_id: str, redacted_event: StreamEnvelope) -> None:
+        if self._storage is None:
+            return
+        try:
+            if self._write_buffer is not None:
+                self._write_buffer.append(redacted_event)
+            else:
+                self._storage.append_event(redacted_event)
+            self._after_persist(run_id, redacted_event)
+        except Exception:
+            pass
+
+    def _after_persist(self, run_id: str, redacted_event: StreamEnvelope, block: bool = True) -> None:
+        if self.retention_worker is not None:
+            self.retention_worker.note_event(
+                run_id,
+                redacted_event.metadata.get("org_id", "default"),
+                redacted_event.seq,
+            )
+        else:
+            self._enforce_retention(run_id, redacted_event, block)
+        if self._write_buffer is not None and _is_terminal(redacted_event):
+            # Called from the event loop: start the write now, but never wait on it.
+            self._write_buffer.request_flush()
+
+    def _enforce_retention(
+        self, run_id: str, redacted_event: StreamEnvelope, block: bool = True
+    ) -> None:
+        retention = self._retention_policy
+        if self._tenant_store is not None:
+            org_id = redacted_event.metadata.get("org_id", "default")
+            org_policy = self._tenant_store.get_retention_policy(org_id)
+            if org_policy.max_events:
+                retention = EventRetentionPolicy(max_events=org_policy.max_events, enabled=True)
+        cutoff = retention.cutoff_seq(redacted_event.seq)
+        if cutoff is None:
+            return
+        if self._write_buffer is not None:
+            self._write_buffer.delete_events(run_id, before_seq=cutoff, block=block)
+        else:
+            self._storage.delete_events(run_id, before_seq=cutoff)
+
+    def _publish(self, run_id: str, redacted_event: StreamEnvelope) -> None:
         if run_id not in self._runs:
             self.create_run(run_id)
         buffer = self._runs[run_id]
-        redacted_event = event
-        if self._redactor and self._redactor.enabled:
-            redacted_event = self._redactor.redact_event(event)
         buffer.history.append(redacted_event)
-        if self._storage is not None:
-            try:
-                self._storage.append_event(redacted_event)
-                retention = self._retention_policy
-                if self._tenant_store is not None:
-                    org_id = redacted_event.metadata.get("org_id", "default")
-                    org_policy = self._tenant_store.get_retention_policy(org_id)
-                    if org_policy.max_events:
-                        retention = EventRetentionPolicy(
-                            max_events=org_policy.max_events,
-                            enabled=True,
-                        )
-                cutoff = retention.cutoff_seq(redacted_event.seq)
-                if cutoff is not None:
-                    self._storage.delete_events(run_id, before_seq=cutoff)
-            except Exception:
-                pass
         for exporter in self._exporters:
             try:
                 exporter.emit(redacted_event)
@@ -100,6 +168,23 @@ class RunEventStore:
                 pass
             buffer.queue.put_nowait(redacted_event)
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until buffered events have been written to storage."""
+        if self._write_buffer is None:
+            return True
+        return self._write_buffer.flush(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush buffered events and stop the write-behind thread."""
+        if self._write_buffer is not None:
+            self._write_buffer.close(timeout)
+
+    def storage_metrics(self) -> Dict[str, float]:
+        """Write-behind queue depth and flush latency; empty when writes are synchronous."""
+        if self._write_buffer is None:
+            return {}
+        return self._write_buffer.metrics()
+
     def list_events(self, run_id: str) -> List[StreamEnvelope]:
         if run_id not in self._runs:
             return []
@@ -124,7 +209,7 @@ class RunEventStore:
             yield event
         if history:
             last = history[-1]
-            if last.stream == StreamChannel.LIFECYCLE and last.event in {"end", "error", "timeout", "canceled"}:
+            if last.stream == StreamChannel.LIFECYCLE and last.event in TERMINAL_EVENTS:
                 return
         # Drain any existing queued events to avoid duplicates of history.
         while not buffer.queue.empty():
@@ -135,7 +220,7 @@ class RunEventStore:
         while True:
             event = await buffer.queue.get()
             yield event
-            if event.stream == StreamChannel.LIFECYCLE and event.event in {"end", "error", "timeout", "canceled"}:
+            if event.stream == StreamChannel.LIFECYCLE and event.event in TERMINAL_EVENTS:
                 break
 
     async def stream_from(self, run_id: str, from_seq: Optional[int]):
@@ -151,7 +236,7 @@ class RunEventStore:
             yield event
         if history:
             last = history[-1]
-            if last.stream == StreamChannel.LIFECYCLE and last.event in {"end", "error", "timeout", "canceled"}:
+            if last.stream == StreamChannel.LIFECYCLE and last.event in TERMINAL_EVENTS:
                 return
         while not buffer.queue.empty():
             try:
@@ -161,5 +246,9 @@ class RunEventStore:
         while True:
             event = await buffer.queue.get()
             yield event
-            if event.stream == StreamChannel.LIFECYCLE and event.event in {"end", "error", "timeout", "canceled"}:
+            if event.stream == StreamChannel.LIFECYCLE and event.event in TERMINAL_EVENTS:
                 break
+
+
+def _is_terminal(event: StreamEnvelope) -> bool:
+    return event.stream == StreamChannel.LIFECYCLE and event.event in TERMINAL_EVENTS
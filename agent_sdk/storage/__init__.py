@@ -3,7 +3,10 @@ Storage backends for runs, sessions, and streaming events.
 """
 
 from agent_sdk.storage.base import StorageBackend
+from agent_sdk.storage.async_facade import AsyncStorageBackend
 from agent_sdk.storage.sqlite import SQLiteStorage
+from agent_sdk.storage.sqlite_pool import SQLiteConnectionManager
+from agent_sdk.storage.write_behind import EventWriteBuffer
 
 try:  # optional dependency
     from agent_sdk.storage.postgres import PostgresStorage
@@ -12,6 +15,9 @@ except Exception:  # pragma: no cover - optional dependency
 
 __all__ = [
     "StorageBackend",
+    "AsyncStorageBackend",
     "SQLiteStorage",
+    "SQLiteConnectionManager",
+    "EventWriteBuffer",
     "PostgresStorage",
 ]
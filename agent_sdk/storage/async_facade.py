@@ -0,0 +1,133 @@
+"""
+Awaitable facade that keeps blocking storage calls off the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+DEFAULT_LATENCY_BUCKETS_MS: Tuple[float, ...] = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS_MS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets = []
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            buckets.append((bound, cumulative))
+        return {
+            "count": self.count,
+            "sum_ms": self.sum_ms,
+            "avg_ms": self.sum_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "p50_ms": self.quantile(0.5),
+            "p99_ms": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+class AsyncStorageBackend:
+    """Run a synchronous backend's methods on a dedicated, bounded thread pool.
+
+    Any public method of the wrapped object (a ``StorageBackend``, a
+    ``ControlPlaneBackend``, ...) is available as a coroutine with the same
+    signature, e.g. ``await async_storage.get_run(run_id)``. At most
+    ``max_workers`` calls run at once; further calls wait for a free worker
+    without holding the event loop. Latency per method is recorded in a
+    :class:`LatencyHistogram`, measured from submission so that time spent
+    waiting for a worker is included.
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        max_workers: int = 8,
+        thread_name_prefix: str = "storage-io",
+        buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS_MS,
+    ):
+        self.backend = backend
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=thread_name_prefix,
+        )
+        self._buckets = buckets
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self.backend, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self.run(name, attr, *args, **kwargs)
+
+        return call
+
+    async def run(self, name: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``func`` on the storage pool, recording its latency under ``name``."""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+        finally:
+            self._observe(name, (time.perf_counter() - start) * 1000)
+
+    def latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-method latency snapshot: count, avg/max/p50/p99 and cumulative buckets."""
+        with self._lock:
+            return {name: hist.snapshot() for name, hist in sorted(self._histograms.items())}
+
+    def close(self, wait: bool = True) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._executor.shutdown(wait=wait)
+
+    def _observe(self, name: str, elapsed_ms: float) -> None:
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = LatencyHistogram(self._buckets)
+            hist.observe(elapsed_ms)
@@ -8,6 +8,7 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Callable
 
 from agent_sdk.observability.stream_envelope import RunMetadata, SessionMetadata, StreamEnvelope
+from agent_sdk.storage.pagination import Page, decode_cursor, encode_cursor
 
 
 class StorageBackend(ABC):
@@ -49,6 +50,11 @@ class StorageBackend(ABC):
     def append_event(self, event: StreamEnvelope) -> None:
         raise NotImplementedError
 
+    def append_events(self, events: List[StreamEnvelope]) -> None:
+        """Persist several events, in order. Backends should use one transaction."""
+        for event in events:
+            self.append_event(event)
+
     @abstractmethod
     def list_events(self, run_id: str, limit: int = 1000) -> List[StreamEnvelope]:
         raise NotImplementedError
@@ -81,14 +87,92 @@ class StorageBackend(ABC):
         """Delete a session and all of its runs/events."""
         raise NotImplementedError
 
+    def list_sessions_page(
+        self,
+        org_id: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Page[SessionMetadata]:
+        """Sessions newest first, keyed on ``(created_at, session_id)``.
+
+        This fallback filters ``list_sessions`` in Python; backends should
+        override it with an indexed keyset query.
+        """
+        if limit < 1:
+            return Page()
+        after = decode_cursor(cursor, "session", 2) if cursor else None
+        sessions = sorted(
+            (s for s in self.list_sessions(limit=1_000_000) if org_id is None or s.org_id == org_id),
+            key=lambda s: (s.created_at or "", s.session_id),
+            reverse=True,
+        )
+        if after is not None:
+            sessions = [s for s in sessions if [s.created_at or "", s.session_id] < after]
+        next_cursor = None
+        if len(sessions) > limit:
+            last = sessions[limit - 1]
+            next_cursor = encode_cursor("session", last.created_at or "", last.session_id)
+        return Page(items=sessions[:limit], next_cursor=next_cursor)
+
+    def list_runs_page(
+        self,
+        org_id: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        session_id: Optional[str] = None,
+    ) -> Page[RunMetadata]:
+        """Runs newest first, keyed on ``(created_at, run_id)``.
+
+        This fallback filters ``list_runs`` in Python; backends should
+        override it with an indexed keyset query.
+        """
+        if limit < 1:
+            return Page()
+        after = decode_cursor(cursor, "run", 2) if cursor else None
+        runs = sorted(
+            (
+                r
+                for r in self.list_runs(org_id=org_id, limit=1_000_000)
+                if session_id is None or r.session_id == session_id
+            ),
+            key=lambda r: (r.created_at or "", r.run_id),
+            reverse=True,
+        )
+        if after is not None:
+            runs = [r for r in runs if [r.created_at or "", r.run_id] < after]
+        next_cursor = None
+        if len(runs) > limit:
+            last = runs[limit - 1]
+            next_cursor = encode_cursor("run", last.created_at or "", last.run_id)
+        return Page(items=runs[:limit], next_cursor=next_cursor)
+
+    def list_events_page(
+        self,
+        run_id: str,
+        limit: int = 1000,
+        cursor: Optional[str] = None,
+        from_seq: Optional[int] = None,
+    ) -> Page[StreamEnvelope]:
+        """Events of one run in append order.
+
+        This fallback pages by position over ``list_events_from``; backends
+        should override it with an indexed keyset query.
+        """
+        if limit < 1:
+            return Page()
+        offset = decode_cursor(cursor, "event_offset", 1)[0] if cursor else 0
+        events = self.list_events_from(run_id, from_seq, limit=offset + limit + 1)[offset:]
+        next_cursor = encode_cursor("event_offset", offset + limit) if len(events) > limit else None
+        return Page(items=events[:limit], next_cursor=next_cursor)
+
     def set_encryption_resolver(self, resolver: Optional[Callable[[str], Optional[str]]]) -> None:
         """Optional hook to supply per-org encryption keys."""
         return None
 
-    def prune_runs(self, org_id: str, before_timestamp: str) -> int:
-        """Optional retention helper for runs."""
+    def prune_runs(self, org_id: str, before_timestamp: str, limit: Optional[int] = None) -> int:
+        """Optional retention helper: delete up to ``limit`` of the oldest runs created before the timestamp."""
         return 0
 
-    def prune_sessions(self, org_id: str, before_timestamp: str) -> int:
-        """Optional retention helper for sessions."""
+    def prune_sessions(self, org_id: str, before_timestamp: str, limit: Optional[int] = None) -> int:
+        """Optional retention helper: delete up to ``limit`` of the oldest sessions created before the timestamp."""
         return 0
@@ -20,6 +20,7 @@ from agent_sdk.server.multi_tenant import (
 )
 from agent_sdk.webhooks import WebhookSubscription
 from agent_sdk.policy.types import PolicyAssignment, PolicyBundle, PolicyApproval
+from agent_sdk.storage.sqlite_migrations import CONTROL_PLANE_MIGRATIONS, apply_migrations
 
 try:
     import psycopg
@@ -348,6 +349,7 @@ class SQLiteControlPlane(ControlPlaneBackend):
             self._ensure_column(conn, "orgs", "policy_bundle_id", "TEXT")
             self._ensure_column(conn, "orgs", "policy_bundle_version", "INTEGER")
             self._ensure_column(conn, "orgs", "policy_overrides_json", "TEXT")
+            apply_migrations(conn, "control_plane", CONTROL_PLANE_MIGRATIONS)
 
     @staticmethod
     def _ensure_column(conn: sqlite3.Connection, table: str, column: str, col_type: str) -> None:
@@ -0,0 +1,58 @@
+"""
+Opaque keyset cursors for storage listings.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generic, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a listing; pass ``next_cursor`` back to fetch the next one."""
+
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(kind: str, *key: Any) -> str:
+    """Encode the sort key of the last row returned as an opaque cursor."""
+    raw = json.dumps([kind, *key], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str, size: int) -> List[Any]:
+    """Decode a cursor made by :func:`encode_cursor`; raise ValueError if it is not a ``kind`` cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+    if not isinstance(values, list) or len(values) != size + 1 or values[0] != kind:
+        raise ValueError("Invalid pagination cursor")
+    return values[1:]
+
+
+def decode_event_cursor(cursor: str, run_id: str) -> int:
+    """Return the event row id encoded in an event cursor issued for ``run_id``."""
+    cursor_run_id, event_id = decode_cursor(cursor, "event", 2)
+    if cursor_run_id != run_id or not isinstance(event_id, int):
+        raise ValueError("Invalid pagination cursor")
+    return event_id
+
+
+def page_from_rows(
+    rows: Sequence[Any],
+    limit: int,
+    convert: Callable[[Any], T],
+    cursor_for: Callable[[Any], str],
+) -> Page[T]:
+    """Build a page from up to ``limit + 1`` rows; the extra row only signals that more exist."""
+    kept = rows[:limit]
+    next_cursor = cursor_for(kept[-1]) if len(rows) > limit and kept else None
+    return Page(items=[convert(row) for row in kept], next_cursor=next_cursor)
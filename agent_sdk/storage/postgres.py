@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import List, Optional, Callable
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from agent_sdk.observability.stream_envelope import (
     RunMetadata,
@@ -15,6 +17,13 @@ from agent_sdk.observability.stream_envelope import (
     is_valid_run_transition,
 )
 from agent_sdk.storage.base import StorageBackend
+from agent_sdk.storage.pagination import (
+    Page,
+    decode_cursor,
+    decode_event_cursor,
+    encode_cursor,
+    page_from_rows,
+)
 from agent_sdk.encryption import maybe_encrypt, maybe_decrypt
 
 try:
@@ -22,22 +31,133 @@ try:
 except ImportError:  # pragma: no cover - optional dependency
     psycopg = None
 
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:  # pragma: no cover - optional dependency
+    ConnectionPool = None
+
+_EVENT_COLUMNS = (
+    "run_id, session_id, org_id, stream, event, payload_json, "
+    "timestamp, seq, status, metadata_json"
+)
+
+
+class _SingleConnection:
+    """Pool-shaped wrapper around one connection, used when psycopg_pool is missing.
+
+    Calls are serialized on a lock, and a connection left broken by a
+    failed transaction is replaced on the next checkout.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        configure: Callable[[Any], None],
+        prepare_threshold: Optional[int],
+    ):
+        self._dsn = dsn
+        self._configure = configure
+        self._prepare_threshold = prepare_threshold
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    def _connect(self) -> Any:
+        conn = psycopg.connect(self._dsn, prepare_threshold=self._prepare_threshold)
+        self._configure(conn)
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        with self._lock:
+            if self._conn.closed or self._conn.broken:
+                self._conn = self._connect()
+            try:
+                yield self._conn
+            except BaseException:
+                if not self._conn.closed:
+                    self._conn.rollback()
+                raise
+            else:
+                self._conn.commit()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"pool_size": 1, "pool_available": 0 if self._lock.locked() else 1}
+
+    def close(self) -> None:
+        self._conn.close()
+
 
 class PostgresStorage(StorageBackend):
+    """Postgres backend served from a psycopg connection pool.
+
+    Each call checks a connection out of the pool for one transaction, so
+    concurrent callers run in parallel up to ``max_size`` and a connection
+    that breaks mid-transaction is discarded instead of poisoning later
+    calls. Connections are health-checked on checkout, get
+    ``statement_timeout_ms`` applied when opened, and prepare hot queries
+    server-side after ``prepare_threshold`` executions (0 prepares on first
+    use, ``None`` never prepares, e.g. behind PgBouncer in transaction
+    mode). Event batches of at least ``copy_threshold`` rows are written with
+    ``COPY`` instead of INSERTs. Without ``psycopg_pool`` installed (the
+    ``postgres`` extra pulls it in) calls share one serialized connection.
+    """
+
     def __init__(
         self,
         dsn: str,
         initialize_schema: bool = True,
         encryption_resolver: Optional[Callable[[str], Optional[str]]] = None,
+        min_size: int = 1,
+        max_size: int = 10,
+        statement_timeout_ms: Optional[int] = 30000,
+        pool_timeout: float = 30.0,
+        max_idle: float = 600.0,
+        prepare_threshold: Optional[int] = 0,
+        copy_threshold: int = 32,
     ):
         if psycopg is None:
             raise RuntimeError("psycopg is required for PostgresStorage")
         self.dsn = dsn
-        self._conn = psycopg.connect(dsn)
+        self.statement_timeout_ms = statement_timeout_ms
+        self.copy_threshold = max(1, copy_threshold)
+        self._prepare: Dict[str, Any] = {} if prepare_threshold is None else {"prepare": True}
+        if ConnectionPool is None:
+            self._pool: Any = _SingleConnection(dsn, self._configure_connection, prepare_threshold)
+        else:
+            self._pool = ConnectionPool(
+                dsn,
+                min_size=min_size,
+                max_size=max(min_size, max_size),
+                timeout=pool_timeout,
+                max_idle=max_idle,
+                kwargs={"prepare_threshold": prepare_threshold},
+                configure=self._configure_connection,
+                check=ConnectionPool.check_connection,
+                name="agent-sdk-storage",
+                open=True,
+            )
         self._encryption_resolver = encryption_resolver
         if initialize_schema:
             self._init_db()
 
+    def _configure_connection(self, conn: Any) -> None:
+        if self.statement_timeout_ms is not None:
+            conn.execute(f"SET statement_timeout = {int(self.statement_timeout_ms)}")
+        conn.commit()
+
+    @contextmanager
+    def _cursor(self) -> Iterator[Any]:
+        """Cursor on a pooled connection; commits on success, rolls back on error."""
+        with self._pool.connection() as conn:
+            with conn.cursor() as cur:
+                yield cur
+
+    def pool_stats(self) -> Dict[str, int]:
+        return dict(self._pool.get_stats())
+
+    def close(self) -> None:
+        self._pool.close()
+
     def set_encryption_resolver(self, resolver: Optional[Callable[[str], Optional[str]]]) -> None:
         self._encryption_resolver = resolver
 
@@ -47,7 +167,7 @@ class PostgresStorage(StorageBackend):
         return self._encryption_resolver(org_id or "default")
 
     def _init_db(self) -> None:
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(
                 """
                 CREATE TABLE IF NOT EXISTS sessions (
@@ -95,11 +215,19 @@ class PostgresStorage(StorageBackend):
                 );
                 """
             )
-        self._conn.commit()
+            for statement in (
+                "CREATE INDEX IF NOT EXISTS idx_runs_org_created_id ON runs (org_id, created_at, run_id)",
+                "CREATE INDEX IF NOT EXISTS idx_runs_created_id ON runs (created_at, run_id)",
+                "CREATE INDEX IF NOT EXISTS idx_runs_session_created_id ON runs (session_id, created_at, run_id)",
+                "CREATE INDEX IF NOT EXISTS idx_sessions_org_created_id ON sessions (org_id, created_at, session_id)",
+                "CREATE INDEX IF NOT EXISTS idx_sessions_created_id ON sessions (created_at, session_id)",
+                "CREATE INDEX IF NOT EXISTS idx_events_run_id_id ON events (run_id, id)",
+            ):
+                cur.execute(statement)
 
     def create_session(self, session: SessionMetadata) -> None:
         key = self._key_for_org(session.org_id)
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(
                 """
                 INSERT INTO sessions (
@@ -116,11 +244,10 @@ class PostgresStorage(StorageBackend):
                     json.dumps(maybe_encrypt(session.metadata, key)),
                 ),
             )
-        self._conn.commit()
 
     def update_session(self, session: SessionMetadata) -> None:
         key = self._key_for_org(session.org_id)
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(
                 """
                 UPDATE sessions SET
@@ -142,11 +269,10 @@ class PostgresStorage(StorageBackend):
                     session.session_id,
                 ),
             )
-        self._conn.commit()
 
     def get_session(self, session_id: str) -> Optional[SessionMetadata]:
-        with self._conn.cursor() as cur:
-            cur.execute("SELECT * FROM sessions WHERE session_id = %s", (session_id,))
+        with self._cursor() as cur:
+            cur.execute("SELECT * FROM sessions WHERE session_id = %s", (session_id,), **self._prepare)
             row = cur.fetchone()
             if not row:
                 return None
@@ -161,32 +287,55 @@ class PostgresStorage(StorageBackend):
                 metadata=maybe_decrypt(json.loads(row[6] or "{}"), key),
             )
 
+    def _session_from_row(self, row: tuple) -> SessionMetadata:
+        key = self._key_for_org(row[1] or "default")
+        return SessionMetadata(
+            session_id=row[0],
+            org_id=row[1] or "default",
+            user_id=row[2],
+            created_at=row[3],
+            updated_at=row[4],
+            tags=maybe_decrypt(json.loads(row[5] or "{}"), key),
+            metadata=maybe_decrypt(json.loads(row[6] or "{}"), key),
+        )
+
     def list_sessions(self, limit: int = 100) -> List[SessionMetadata]:
-        with self._conn.cursor() as cur:
+        return self.list_sessions_page(limit=limit).items
+
+    def list_sessions_page(
+        self,
+        org_id: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Page[SessionMetadata]:
+        if limit < 1:
+            return Page()
+        clauses: List[str] = []
+        params: List[Any] = []
+        if org_id:
+            clauses.append("org_id = %s")
+            params.append(org_id)
+        if cursor:
+            clauses.append("(created_at, session_id) < (%s, %s)")
+            params.extend(decode_cursor(cursor, "session", 2))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._cursor() as cur:
             cur.execute(
-                "SELECT * FROM sessions ORDER BY created_at DESC LIMIT %s",
-                (limit,),
+                f"SELECT * FROM sessions {where} ORDER BY created_at DESC, session_id DESC LIMIT %s",
+                (*params, limit + 1),
+                **self._prepare,
             )
             rows = cur.fetchall()
-            sessions = []
-            for row in rows:
-                key = self._key_for_org(row[1] or "default")
-                sessions.append(
-                    SessionMetadata(
-                        session_id=row[0],
-                        org_id=row[1] or "default",
-                        user_id=row[2],
-                        created_at=row[3],
-                        updated_at=row[4],
-                        tags=maybe_decrypt(json.loads(row[5] or "{}"), key),
-                        metadata=maybe_decrypt(json.loads(row[6] or "{}"), key),
-                    )
-                )
-            return sessions
+        return page_from_rows(
+            rows,
+            limit,
+            self._session_from_row,
+            lambda row: encode_cursor("session", row[3], row[0]),
+        )
 
     def create_run(self, run: RunMetadata) -> None:
         key = self._key_for_org(run.org_id)
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(
                 """
                 INSERT INTO runs (
@@ -208,12 +357,11 @@ class PostgresStorage(StorageBackend):
                     json.dumps(maybe_encrypt(run.metadata, key)),
                 ),
             )
-        self._conn.commit()
 
     def update_run(self, run: RunMetadata) -> None:
         key = self._key_for_org(run.org_id)
-        with self._conn.cursor() as cur:
-            cur.execute("SELECT status FROM runs WHERE run_id = %s", (run.run_id,))
+        with self._cursor() as cur:
+            cur.execute("SELECT status FROM runs WHERE run_id = %s", (run.run_id,), **self._prepare)
             row = cur.fetchone()
             if row:
                 current_status = RunStatus(row[0])
@@ -250,11 +398,10 @@ class PostgresStorage(StorageBackend):
                     run.run_id,
                 ),
             )
-        self._conn.commit()
 
     def get_run(self, run_id: str) -> Optional[RunMetadata]:
-        with self._conn.cursor() as cur:
-            cur.execute("SELECT * FROM runs WHERE run_id = %s", (run_id,))
+        with self._cursor() as cur:
+            cur.execute("SELECT * FROM runs WHERE run_id = %s", (run_id,), **self._prepare)
             row = cur.fetchone()
             if not row:
                 return None
@@ -273,100 +420,109 @@ class PostgresStorage(StorageBackend):
                 metadata=maybe_decrypt(json.loads(row[10] or "{}"), key),
             )
 
+    def _run_from_row(self, row: tuple) -> RunMetadata:
+        key = self._key_for_org(row[3] or "default")
+        return RunMetadata(
+            run_id=row[0],
+            session_id=row[1],
+            agent_id=row[2],
+            org_id=row[3] or "default",
+            status=RunStatus(row[4]),
+            model=row[5],
+            created_at=row[6],
+            started_at=row[7],
+            ended_at=row[8],
+            tags=maybe_decrypt(json.loads(row[9] or "{}"), key),
+            metadata=maybe_decrypt(json.loads(row[10] or "{}"), key),
+        )
+
     def list_runs(self, org_id: Optional[str] = None, limit: int = 1000) -> List[RunMetadata]:
-        with self._conn.cursor() as cur:
-            if org_id:
-                cur.execute(
-                    """
-                    SELECT * FROM runs
-                    WHERE org_id = %s
-                    ORDER BY created_at DESC
-                    LIMIT %s
-                    """,
-                    (org_id, limit),
-                )
-            else:
-                cur.execute(
-                    """
-                    SELECT * FROM runs
-                    ORDER BY created_at DESC
-                    LIMIT %s
-                    """,
-                    (limit,),
-                )
+        return self.list_runs_page(org_id=org_id, limit=limit).items
+
+    def list_runs_page(
+        self,
+        org_id: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        session_id: Optional[str] = None,
+    ) -> Page[RunMetadata]:
+        if limit < 1:
+            return Page()
+        clauses: List[str] = []
+        params: List[Any] = []
+        if org_id:
+            clauses.append("org_id = %s")
+            params.append(org_id)
+        if session_id:
+            clauses.append("session_id = %s")
+            params.append(session_id)
+        if cursor:
+            clauses.append("(created_at, run_id) < (%s, %s)")
+            params.extend(decode_cursor(cursor, "run", 2))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._cursor() as cur:
+            cur.execute(
+                f"SELECT * FROM runs {where} ORDER BY created_at DESC, run_id DESC LIMIT %s",
+                (*params, limit + 1),
+                **self._prepare,
+            )
             rows = cur.fetchall()
-            runs = []
-            for row in rows:
-                key = self._key_for_org(row[3] or "default")
-                runs.append(
-                    RunMetadata(
-                        run_id=row[0],
-                        session_id=row[1],
-                        agent_id=row[2],
-                        org_id=row[3] or "default",
-                        status=RunStatus(row[4]),
-                        model=row[5],
-                        created_at=row[6],
-                        started_at=row[7],
-                        ended_at=row[8],
-                        tags=maybe_decrypt(json.loads(row[9] or "{}"), key),
-                        metadata=maybe_decrypt(json.loads(row[10] or "{}"), key),
-                    )
-                )
-            return runs
+        return page_from_rows(
+            rows,
+            limit,
+            self._run_from_row,
+            lambda row: encode_cursor("run", row[6], row[0]),
+        )
 
-    def append_event(self, event: StreamEnvelope) -> None:
+    def _event_row(self, event: StreamEnvelope) -> tuple:
         key = self._key_for_org(event.metadata.get("org_id", "default"))
-        with self._conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO events (
-                    run_id, session_id, org_id, stream, event, payload_json,
-                    timestamp, seq, status, metadata_json
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    event.run_id,
-                    event.session_id,
-                    event.metadata.get("org_id", "default"),
-                    event.stream.value,
-                    event.event,
-                    json.dumps(maybe_encrypt(event.payload, key)),
-                    event.timestamp,
-                    event.seq,
-                    event.status,
-                    json.dumps(maybe_encrypt(event.metadata, key)),
-                ),
+        return (
+            event.run_id,
+            event.session_id,
+            event.metadata.get("org_id", "default"),
+            event.stream.value,
+            event.event,
+            json.dumps(maybe_encrypt(event.payload, key)),
+            event.timestamp,
+            event.seq,
+            event.status,
+            json.dumps(maybe_encrypt(event.metadata, key)),
+        )
+
+    def append_event(self, event: StreamEnvelope) -> None:
+        self.append_events([event])
+
+    def append_events(self, events: List[StreamEnvelope]) -> None:
+        if not events:
+            return
+        rows = [self._event_row(event) for event in events]
+        with self._cursor() as cur:
+            if len(rows) >= self.copy_threshold:
+                with cur.copy(f"COPY events ({_EVENT_COLUMNS}) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row(row)
+                return
+            cur.executemany(
+                f"INSERT INTO events ({_EVENT_COLUMNS}) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                rows,
             )
-        self._conn.commit()
+
+    def _event_from_row(self, row: tuple) -> StreamEnvelope:
+        key = self._key_for_org(row[3] or "default")
+        return StreamEnvelope(
+            run_id=row[1],
+            session_id=row[2],
+            stream=StreamChannel(row[4]),
+            event=row[5],
+            payload=maybe_decrypt(json.loads(row[6] or "{}"), key),
+            timestamp=row[7],
+            seq=row[8],
+            status=row[9],
+            metadata=maybe_decrypt(json.loads(row[10] or "{}"), key),
+        )
 
     def list_events(self, run_id: str, limit: int = 1000) -> List[StreamEnvelope]:
-        with self._conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT run_id, session_id, org_id, stream, event, payload_json, timestamp, seq, status, metadata_json
-                FROM events WHERE run_id = %s ORDER BY id ASC LIMIT %s
-                """,
-                (run_id, limit),
-            )
-            rows = cur.fetchall()
-            events = []
-            for row in rows:
-                key = self._key_for_org(row[2] or "default")
-                events.append(
-                    StreamEnvelope(
-                        run_id=row[0],
-                        session_id=row[1],
-                        stream=StreamChannel(row[3]),
-                        event=row[4],
-                        payload=maybe_decrypt(json.loads(row[5] or "{}"), key),
-                        timestamp=row[6],
-                        seq=row[7],
-                        status=row[8],
-                        metadata=maybe_decrypt(json.loads(row[9] or "{}"), key),
-                    )
-                )
-            return events
+        return self.list_events_page(run_id, limit=limit).items
 
     def list_events_from(
         self,
@@ -374,38 +530,42 @@ class PostgresStorage(StorageBackend):
         from_seq: Optional[int] = None,
         limit: int = 1000,
     ) -> List[StreamEnvelope]:
-        if from_seq is None:
-            return self.list_events(run_id, limit=limit)
-        with self._conn.cursor() as cur:
+        return self.list_events_page(run_id, limit=limit, from_seq=from_seq).items
+
+    def list_events_page(
+        self,
+        run_id: str,
+        limit: int = 1000,
+        cursor: Optional[str] = None,
+        from_seq: Optional[int] = None,
+    ) -> Page[StreamEnvelope]:
+        if limit < 1:
+            return Page()
+        clauses = ["run_id = %s"]
+        params: List[Any] = [run_id]
+        if from_seq is not None:
+            clauses.append("(seq IS NULL OR seq >= %s)")
+            params.append(from_seq)
+        if cursor:
+            clauses.append("id > %s")
+            params.append(decode_event_cursor(cursor, run_id))
+        with self._cursor() as cur:
             cur.execute(
-                """
-                SELECT run_id, session_id, org_id, stream, event, payload_json, timestamp, seq, status, metadata_json
-                FROM events WHERE run_id = %s AND (seq IS NULL OR seq >= %s)
-                ORDER BY id ASC LIMIT %s
-                """,
-                (run_id, from_seq, limit),
+                f"SELECT id, {_EVENT_COLUMNS} FROM events WHERE {' AND '.join(clauses)} "
+                "ORDER BY id ASC LIMIT %s",
+                (*params, limit + 1),
+                **self._prepare,
             )
             rows = cur.fetchall()
-            events = []
-            for row in rows:
-                key = self._key_for_org(row[2] or "default")
-                events.append(
-                    StreamEnvelope(
-                        run_id=row[0],
-                        session_id=row[1],
-                        stream=StreamChannel(row[3]),
-                        event=row[4],
-                        payload=maybe_decrypt(json.loads(row[5] or "{}"), key),
-                        timestamp=row[6],
-                        seq=row[7],
-                        status=row[8],
-                        metadata=maybe_decrypt(json.loads(row[9] or "{}"), key),
-                    )
-                )
-            return events
+        return page_from_rows(
+            rows,
+            limit,
+            self._event_from_row,
+            lambda row: encode_cursor("event", run_id, row[0]),
+        )
 
     def delete_events(self, run_id: str, before_seq: Optional[int] = None) -> int:
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             if before_seq is None:
                 cur.execute("DELETE FROM events WHERE run_id = %s", (run_id,))
             else:
@@ -417,12 +577,11 @@ class PostgresStorage(StorageBackend):
                     (run_id, before_seq),
                 )
             deleted = cur.rowcount
-        self._conn.commit()
         return deleted
 
     def recover_in_flight_runs(self) -> int:
         now = datetime.now(timezone.utc).isoformat()
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(
                 """
                 SELECT run_id, session_id, agent_id, org_id, model, created_at, started_at,
@@ -469,46 +628,38 @@ class PostgresStorage(StorageBackend):
                     ),
                 )
                 count += 1
-            self._conn.commit()
             return count
 
-    def prune_runs(self, org_id: str, before_timestamp: str) -> int:
-        with self._conn.cursor() as cur:
+    def prune_runs(self, org_id: str, before_timestamp: str, limit: Optional[int] = None) -> int:
+        with self._cursor() as cur:
             cur.execute(
-                "SELECT run_id FROM runs WHERE org_id = %s AND created_at < %s",
-                (org_id, before_timestamp),
+                "SELECT run_id FROM runs WHERE org_id = %s AND created_at < %s ORDER BY created_at LIMIT %s",
+                (org_id, before_timestamp, limit),
             )
-            rows = cur.fetchall()
-            count = 0
-            for row in rows:
-                count += self.delete_run(row[0])
-            return count
+            run_ids = [row[0] for row in cur.fetchall()]
+        return sum(self.delete_run(run_id) for run_id in run_ids)
 
-    def prune_sessions(self, org_id: str, before_timestamp: str) -> int:
-        with self._conn.cursor() as cur:
+    def prune_sessions(self, org_id: str, before_timestamp: str, limit: Optional[int] = None) -> int:
+        with self._cursor() as cur:
             cur.execute(
-                "SELECT session_id FROM sessions WHERE org_id = %s AND created_at < %s",
-                (org_id, before_timestamp),
+                "SELECT session_id FROM sessions WHERE org_id = %s AND created_at < %s "
+                "ORDER BY created_at LIMIT %s",
+                (org_id, before_timestamp, limit),
             )
-            rows = cur.fetchall()
-            count = 0
-            for row in rows:
-                count += self.delete_session(row[0])
-            return count
+            session_ids = [row[0] for row in cur.fetchall()]
+        return sum(self.delete_session(session_id) for session_id in session_ids)
 
     def delete_run(self, run_id: str) -> int:
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute("DELETE FROM events WHERE run_id = %s", (run_id,))
             cur.execute("DELETE FROM runs WHERE run_id = %s", (run_id,))
             deleted = cur.rowcount
-        self._conn.commit()
         return deleted
 
     def delete_session(self, session_id: str) -> int:
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute("DELETE FROM events WHERE session_id = %s", (session_id,))
             cur.execute("DELETE FROM runs WHERE session_id = %s", (session_id,))
             cur.execute("DELETE FROM sessions WHERE session_id = %s", (session_id,))
             deleted = cur.rowcount
-        self._conn.commit()
         return deleted
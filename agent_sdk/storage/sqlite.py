@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import json
 import sqlite3
-from typing import List, Optional, Callable
+from typing import Any, List, Optional, Callable
 
 from datetime import datetime, timezone
 
@@ -19,6 +19,15 @@ from agent_sdk.observability.stream_envelope import (
     is_valid_run_transition,
 )
 from agent_sdk.storage.base import StorageBackend
+from agent_sdk.storage.pagination import (
+    Page,
+    decode_cursor,
+    decode_event_cursor,
+    encode_cursor,
+    page_from_rows,
+)
+from agent_sdk.storage.sqlite_pool import SQLiteConnectionManager
+from agent_sdk.storage.sqlite_migrations import STORAGE_MIGRATIONS, apply_migrations
 from agent_sdk.encryption import maybe_encrypt, maybe_decrypt
 
 
@@ -26,8 +35,12 @@ class SQLiteStorage(StorageBackend):
     def __init__(self, path: str, encryption_resolver: Optional[Callable[[str], Optional[str]]] = None):
         self.path = path
         self._encryption_resolver = encryption_resolver
+        self._pool = SQLiteConnectionManager(path)
         self._init_db()
 
+    def close(self) -> None:
+        self._pool.close()
+
     def set_encryption_resolver(self, resolver: Optional[Callable[[str], Optional[str]]]) -> None:
         self._encryption_resolver = resolver
 
@@ -36,13 +49,8 @@ class SQLiteStorage(StorageBackend):
             return None
         return self._encryption_resolver(org_id or "default")
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
     def _init_db(self) -> None:
-        with self._connect() as conn:
+        with self._pool.writer() as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS sessions (
@@ -93,6 +101,7 @@ class SQLiteStorage(StorageBackend):
             self._ensure_column(conn, "sessions", "org_id", "TEXT")
             self._ensure_column(conn, "runs", "org_id", "TEXT")
             self._ensure_column(conn, "events", "org_id", "TEXT")
+            apply_migrations(conn, "storage", STORAGE_MIGRATIONS)
 
     @staticmethod
     def _ensure_column(conn: sqlite3.Connection, table: str, column: str, col_type: str) -> None:
@@ -104,7 +113,7 @@ class SQLiteStorage(StorageBackend):
 
     def create_session(self, session: SessionMetadata) -> None:
         key = self._key_for_org(session.org_id)
-        with self._connect() as conn:
+        with self._pool.writer() as conn:
             conn.execute(
                 """
                 INSERT INTO sessions (
@@ -124,7 +133,7 @@ class SQLiteStorage(StorageBackend):
 
     def update_session(self, session: SessionMetadata) -> None:
         key = self._key_for_org(session.org_id)
-        with self._connect() as conn:
+        with self._pool.writer() as conn:
             conn.execute(
                 """
                 UPDATE sessions SET
@@ -148,7 +157,7 @@ class SQLiteStorage(StorageBackend):
             )
 
     def get_session(self, session_id: str) -> Optional[SessionMetadata]:
-        with self._connect() as conn:
+        with self._pool.reader() as conn:
             row = conn.execute(
                 "SELECT * FROM sessions WHERE session_id = ?",
                 (session_id,),
@@ -166,31 +175,53 @@ class SQLiteStorage(StorageBackend):
                 metadata=maybe_decrypt(json.loads(row["metadata_json"] or "{}"), key),
             )
 
+    def _session_from_row(self, row: sqlite3.Row) -> SessionMetadata:
+        key = self._key_for_org(row["org_id"] or "default")
+        return SessionMetadata(
+            session_id=row["session_id"],
+            org_id=row["org_id"] or "default",
+            user_id=row["user_id"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            tags=maybe_decrypt(json.loads(row["tags_json"] or "{}"), key),
+            metadata=maybe_decrypt(json.loads(row["metadata_json"] or "{}"), key),
+        )
+
     def list_sessions(self, limit: int = 100) -> List[SessionMetadata]:
-        with self._connect() as conn:
+        return self.list_sessions_page(limit=limit).items
+
+    def list_sessions_page(
+        self,
+        org_id: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Page[SessionMetadata]:
+        if limit < 1:
+            return Page()
+        clauses: List[str] = []
+        params: List[Any] = []
+        if org_id:
+            clauses.append("org_id = ?")
+            params.append(org_id)
+        if cursor:
+            clauses.append("(created_at, session_id) < (?, ?)")
+            params.extend(decode_cursor(cursor, "session", 2))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._pool.reader() as conn:
             rows = conn.execute(
-                "SELECT * FROM sessions ORDER BY created_at DESC LIMIT ?",
-                (limit,),
+                f"SELECT * FROM sessions {where} ORDER BY created_at DESC, session_id DESC LIMIT ?",
+                (*params, limit + 1),
             ).fetchall()
-            sessions = []
-            for row in rows:
-                key = self._key_for_org(row["org_id"] or "default")
-                sessions.append(
-                    SessionMetadata(
-                        session_id=row["session_id"],
-                        org_id=row["org_id"] or "default",
-                        user_id=row["user_id"],
-                        created_at=row["created_at"],
-                        updated_at=row["updated_at"],
-                        tags=maybe_decrypt(json.loads(row["tags_json"] or "{}"), key),
-                        metadata=maybe_decrypt(json.loads(row["metadata_json"] or "{}"), key),
-                    )
-                )
-            return sessions
+            return page_from_rows(
+                rows,
+                limit,
+                self._session_from_row,
+                lambda row: encode_cursor("session", row["created_at"], row["session_id"]),
+            )
 
     def create_run(self, run: RunMetadata) -> None:
         key = self._key_for_org(run.org_id)
-        with self._connect() as conn:
+        with self._pool.writer() as conn:
             conn.execute(
                 """
                 INSERT INTO runs (
@@ -215,7 +246,7 @@ class SQLiteStorage(StorageBackend):
 
     def update_run(self, run: RunMetadata) -> None:
         key = self._key_for_org(run.org_id)
-        with self._connect() as conn:
+        with self._pool.writer() as conn:
             current = conn.execute(
                 "SELECT status FROM runs WHERE run_id = ?",
                 (run.run_id,),
@@ -257,7 +288,7 @@ class SQLiteStorage(StorageBackend):
             )
 
     def get_run(self, run_id: str) -> Optional[RunMetadata]:
-        with self._connect() as conn:
+        with self._pool.reader() as conn:
             row = conn.execute(
                 "SELECT * FROM runs WHERE run_id = ?",
                 (run_id,),
@@ -279,99 +310,107 @@ class SQLiteStorage(StorageBackend):
                 metadata=maybe_decrypt(json.loads(row["metadata_json"] or "{}"), key),
             )
 
+    def _run_from_row(self, row: sqlite3.Row) -> RunMetadata:
+        key = self._key_for_org(row["org_id"] or "default")
+        return RunMetadata(
+            run_id=row["run_id"],
+            session_id=row["session_id"],
+            agent_id=row["agent_id"],
+            org_id=row["org_id"] or "default",
+            status=RunStatus(row["status"]),
+            model=row["model"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            ended_at=row["ended_at"],
+            tags=maybe_decrypt(json.loads(row["tags_json"] or "{}"), key),
+            metadata=maybe_decrypt(json.loads(row["metadata_json"] or "{}"), key),
+        )
+
     def list_runs(self, org_id: Optional[str] = None, limit: int = 1000) -> List[RunMetadata]:
-        with self._connect() as conn:
-            if org_id:
-                rows = conn.execute(
-                    """
-                    SELECT * FROM runs
-                    WHERE org_id = ?
-                    ORDER BY created_at DESC
-                    LIMIT ?
-                    """,
-                    (org_id, limit),
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    """
-                    SELECT * FROM runs
-                    ORDER BY created_at DESC
-                    LIMIT ?
-                    """,
-                    (limit,),
-                ).fetchall()
-            runs = []
-            for row in rows:
-                key = self._key_for_org(row["org_id"] or "default")
-                runs.append(
-                    RunMetadata(
-                        run_id=row["run_id"],
-                        session_id=row["session_id"],
-                        agent_id=row["agent_id"],
-                        org_id=row["org_id"] or "default",
-                        status=RunStatus(row["status"]),
-                        model=row["model"],
-                        created_at=row["created_at"],
-                        started_at=row["started_at"],
-                        ended_at=row["ended_at"],
-                        tags=maybe_decrypt(json.loads(row["tags_json"] or "{}"), key),
-                        metadata=maybe_decrypt(json.loads(row["metadata_json"] or "{}"), key),
-                    )
-                )
-            return runs
+        return self.list_runs_page(org_id=org_id, limit=limit).items
 
-    def append_event(self, event: StreamEnvelope) -> None:
+    def list_runs_page(
+        self,
+        org_id: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        session_id: Optional[str] = None,
+    ) -> Page[RunMetadata]:
+        if limit < 1:
+            return Page()
+        clauses: List[str] = []
+        params: List[Any] = []
+        if org_id:
+            clauses.append("org_id = ?")
+            params.append(org_id)
+        if session_id:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        if cursor:
+            clauses.append("(created_at, run_id) < (?, ?)")
+            params.extend(decode_cursor(cursor, "run", 2))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._pool.reader() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM runs {where} ORDER BY created_at DESC, run_id DESC LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+            return page_from_rows(
+                rows,
+                limit,
+                self._run_from_row,
+                lambda row: encode_cursor("run", row["created_at"], row["run_id"]),
+            )
+
+    def _event_row(self, event: StreamEnvelope) -> tuple:
         key = self._key_for_org(event.metadata.get("org_id", "default"))
-        with self._connect() as conn:
-            conn.execute(
+        return (
+            event.run_id,
+            event.session_id,
+            event.metadata.get("org_id", "default"),
+            event.stream.value,
+            event.event,
+            json.dumps(maybe_encrypt(event.payload, key)),
+            event.timestamp,
+            event.seq,
+            event.status,
+            json.dumps(maybe_encrypt(event.metadata, key)),
+        )
+
+    def append_event(self, event: StreamEnvelope) -> None:
+        self.append_events([event])
+
+    def append_events(self, events: List[StreamEnvelope]) -> None:
+        if not events:
+            return
+        rows = [self._event_row(event) for event in events]
+        with self._pool.writer() as conn:
+            conn.executemany(
                 """
                 INSERT INTO events (
                     run_id, session_id, org_id, stream, event, payload_json,
                     timestamp, seq, status, metadata_json
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    event.run_id,
-                    event.session_id,
-                    event.metadata.get("org_id", "default"),
-                    event.stream.value,
-                    event.event,
-                    json.dumps(maybe_encrypt(event.payload, key)),
-                    event.timestamp,
-                    event.seq,
-                    event.status,
-                    json.dumps(maybe_encrypt(event.metadata, key)),
-                ),
+                rows,
             )
 
+    def _event_from_row(self, row: sqlite3.Row) -> StreamEnvelope:
+        key = self._key_for_org(row["org_id"] or "default")
+        return StreamEnvelope(
+            run_id=row["run_id"],
+            session_id=row["session_id"],
+            stream=StreamChannel(row["stream"]),
+            event=row["event"],
+            payload=maybe_decrypt(json.loads(row["payload_json"] or "{}"), key),
+            timestamp=row["timestamp"],
+            seq=row["seq"],
+            status=row["status"],
+            metadata=maybe_decrypt(json.loads(row["metadata_json"] or "{}"), key),
+        )
+
     def list_events(self, run_id: str, limit: int = 1000) -> List[StreamEnvelope]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT * FROM events
-                WHERE run_id = ?
-                ORDER BY id ASC
-                LIMIT ?
-                """,
-                (run_id, limit),
-            ).fetchall()
-            events = []
-            for row in rows:
-                key = self._key_for_org(row["org_id"] or "default")
-                events.append(
-                    StreamEnvelope(
-                        run_id=row["run_id"],
-                        session_id=row["session_id"],
-                        stream=StreamChannel(row["stream"]),
-                        event=row["event"],
-                        payload=maybe_decrypt(json.loads(row["payload_json"] or "{}"), key),
-                        timestamp=row["timestamp"],
-                        seq=row["seq"],
-                        status=row["status"],
-                        metadata=maybe_decrypt(json.loads(row["metadata_json"] or "{}"), key),
-                    )
-                )
-            return events
+        return self.list_events_page(run_id, limit=limit).items
 
     def list_events_from(
         self,
@@ -379,38 +418,39 @@ class SQLiteStorage(StorageBackend):
         from_seq: Optional[int] = None,
         limit: int = 1000,
     ) -> List[StreamEnvelope]:
-        if from_seq is None:
-            return self.list_events(run_id, limit=limit)
-        with self._connect() as conn:
+        return self.list_events_page(run_id, limit=limit, from_seq=from_seq).items
+
+    def list_events_page(
+        self,
+        run_id: str,
+        limit: int = 1000,
+        cursor: Optional[str] = None,
+        from_seq: Optional[int] = None,
+    ) -> Page[StreamEnvelope]:
+        if limit < 1:
+            return Page()
+        clauses = ["run_id = ?"]
+        params: List[Any] = [run_id]
+        if from_seq is not None:
+            clauses.append("(seq IS NULL OR seq >= ?)")
+            params.append(from_seq)
+        if cursor:
+            clauses.append("id > ?")
+            params.append(decode_event_cursor(cursor, run_id))
+        with self._pool.reader() as conn:
             rows = conn.execute(
-                """
-                SELECT * FROM events
-                WHERE run_id = ? AND (seq IS NULL OR seq >= ?)
-                ORDER BY id ASC
-                LIMIT ?
-                """,
-                (run_id, from_seq, limit),
+                f"SELECT * FROM events WHERE {' AND '.join(clauses)} ORDER BY id ASC LIMIT ?",
+                (*params, limit + 1),
             ).fetchall()
-            events = []
-            for row in rows:
-                key = self._key_for_org(row["org_id"] or "default")
-                events.append(
-                    StreamEnvelope(
-                        run_id=row["run_id"],
-                        session_id=row["session_id"],
-                        stream=StreamChannel(row["stream"]),
-                        event=row["event"],
-                        payload=maybe_decrypt(json.loads(row["payload_json"] or "{}"), key),
-                        timestamp=row["timestamp"],
-                        seq=row["seq"],
-                        status=row["status"],
-                        metadata=maybe_decrypt(json.loads(row["metadata_json"] or "{}"), key),
-                    )
-                )
-            return events
+            return page_from_rows(
+                rows,
+                limit,
+                self._event_from_row,
+                lambda row: encode_cursor("event", run_id, row["id"]),
+            )
 
     def delete_events(self, run_id: str, before_seq: Optional[int] = None) -> int:
-        with self._connect() as conn:
+        with self._pool.writer() as conn:
             if before_seq is None:
                 cur = conn.execute("DELETE FROM events WHERE run_id = ?", (run_id,))
                 return cur.rowcount
@@ -423,22 +463,22 @@ class SQLiteStorage(StorageBackend):
             )
             return cur.rowcount
 
-    def prune_runs(self, org_id: str, before_timestamp: str) -> int:
-        with self._connect() as conn:
+    def prune_runs(self, org_id: str, before_timestamp: str, limit: Optional[int] = None) -> int:
+        with self._pool.reader() as conn:
             rows = conn.execute(
-                "SELECT run_id FROM runs WHERE org_id = ? AND created_at < ?",
-                (org_id, before_timestamp),
+                "SELECT run_id FROM runs WHERE org_id = ? AND created_at < ? ORDER BY created_at LIMIT ?",
+                (org_id, before_timestamp, -1 if limit is None else limit),
             ).fetchall()
             count = 0
             for row in rows:
                 count += self.delete_run(row["run_id"])
             return count
 
-    def prune_sessions(self, org_id: str, before_timestamp: str) -> int:
-        with self._connect() as conn:
+    def prune_sessions(self, org_id: str, before_timestamp: str, limit: Optional[int] = None) -> int:
+        with self._pool.reader() as conn:
             rows = conn.execute(
-                "SELECT session_id FROM sessions WHERE org_id = ? AND created_at < ?",
-                (org_id, before_timestamp),
+                "SELECT session_id FROM sessions WHERE org_id = ? AND created_at < ? ORDER BY created_at LIMIT ?",
+                (org_id, before_timestamp, -1 if limit is None else limit),
             ).fetchall()
             count = 0
             for row in rows:
@@ -447,7 +487,7 @@ class SQLiteStorage(StorageBackend):
 
     def recover_in_flight_runs(self) -> int:
         now = datetime.now(timezone.utc).isoformat()
-        with self._connect() as conn:
+        with self._pool.writer() as conn:
             rows = conn.execute(
                 """
                 SELECT run_id, session_id, agent_id, org_id, model, created_at, started_at,
@@ -498,14 +538,15 @@ class SQLiteStorage(StorageBackend):
             return count
 
     def delete_run(self, run_id: str) -> int:
-        with self._connect() as conn:
+        with self._pool.writer() as conn:
             conn.execute("DELETE FROM events WHERE run_id = ?", (run_id,))
             cur = conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
             return cur.rowcount
 
     def delete_session(self, session_id: str) -> int:
-        with self._connect() as conn:
+        with self._pool.writer() as conn:
             conn.execute("DELETE FROM events WHERE session_id = ?", (session_id,))
             conn.execute("DELETE FROM runs WHERE session_id = ?", (session_id,))
             cur = conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
             return cur.rowcount
+
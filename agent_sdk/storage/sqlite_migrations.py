@@ -0,0 +1,141 @@
+"""
+Versioned schema migrations for the SQLite backends.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A numbered, named set of statements applied exactly once per database."""
+
+    version: int
+    name: str
+    statements: Tuple[str, ...]
+
+
+STORAGE_MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(
+        version=1,
+        name="hot_query_indexes",
+        statements=(
+            # list_events / list_events_from: WHERE run_id ORDER BY id (the rowid
+            # trails every index entry, so this index also yields id order).
+            "CREATE INDEX IF NOT EXISTS idx_events_run_id ON events (run_id)",
+            # MAX(seq) in recover_in_flight_runs and delete_events(before_seq).
+            "CREATE INDEX IF NOT EXISTS idx_events_run_seq ON events (run_id, seq)",
+            "CREATE INDEX IF NOT EXISTS idx_events_session ON events (session_id)",
+            "CREATE INDEX IF NOT EXISTS idx_runs_org_created ON runs (org_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_runs_created ON runs (created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_runs_session ON runs (session_id)",
+            "CREATE INDEX IF NOT EXISTS idx_runs_status ON runs (status)",
+            "CREATE INDEX IF NOT EXISTS idx_sessions_org_created ON sessions (org_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_sessions_created ON sessions (created_at)",
+        ),
+    ),
+    Migration(
+        version=2,
+        name="keyset_pagination_indexes",
+        statements=(
+            # list_*_page order by (created_at, <primary key>) and seek past the
+            # cursor with a row-value comparison; these indexes supersede the
+            # created_at-only ones from version 1.
+            "DROP INDEX IF EXISTS idx_runs_org_created",
+            "DROP INDEX IF EXISTS idx_runs_created",
+            "DROP INDEX IF EXISTS idx_runs_session",
+            "DROP INDEX IF EXISTS idx_sessions_org_created",
+            "DROP INDEX IF EXISTS idx_sessions_created",
+            "CREATE INDEX IF NOT EXISTS idx_runs_org_created_id ON runs (org_id, created_at, run_id)",
+            "CREATE INDEX IF NOT EXISTS idx_runs_created_id ON runs (created_at, run_id)",
+            "CREATE INDEX IF NOT EXISTS idx_runs_session_created_id "
+            "ON runs (session_id, created_at, run_id)",
+            "CREATE INDEX IF NOT EXISTS idx_sessions_org_created_id "
+            "ON sessions (org_id, created_at, session_id)",
+            "CREATE INDEX IF NOT EXISTS idx_sessions_created_id ON sessions (created_at, session_id)",
+        ),
+    ),
+)
+
+CONTROL_PLANE_MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(
+        version=1,
+        name="hot_query_indexes",
+        statements=(
+            "CREATE INDEX IF NOT EXISTS idx_orgs_created ON orgs (created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_users_org ON users (org_id)",
+            "CREATE INDEX IF NOT EXISTS idx_projects_org ON projects (org_id)",
+            "CREATE INDEX IF NOT EXISTS idx_api_keys_org ON api_keys (org_id)",
+            "CREATE INDEX IF NOT EXISTS idx_api_keys_key ON api_keys (key)",
+            "CREATE INDEX IF NOT EXISTS idx_policy_approvals_status "
+            "ON policy_approvals (status, submitted_at)",
+            "CREATE INDEX IF NOT EXISTS idx_policy_approvals_org "
+            "ON policy_approvals (org_id, submitted_at)",
+            "CREATE INDEX IF NOT EXISTS idx_policy_approvals_submitted "
+            "ON policy_approvals (submitted_at)",
+            "CREATE INDEX IF NOT EXISTS idx_backups_created ON backups (created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_webhook_subscriptions_org "
+            "ON webhook_subscriptions (org_id)",
+            "CREATE INDEX IF NOT EXISTS idx_secret_rotation_policies_org "
+            "ON secret_rotation_policies (org_id)",
+        ),
+    ),
+)
+
+
+def _ensure_migrations_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            component TEXT,
+            version INTEGER,
+            name TEXT,
+            applied_at TEXT,
+            PRIMARY KEY (component, version)
+        )
+        """
+    )
+
+
+def applied_versions(conn: sqlite3.Connection, component: str) -> List[int]:
+    """Return the migration versions already applied for ``component``."""
+    _ensure_migrations_table(conn)
+    rows = conn.execute(
+        "SELECT version FROM schema_migrations WHERE component = ? ORDER BY version",
+        (component,),
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def apply_migrations(
+    conn: sqlite3.Connection,
+    component: str,
+    migrations: Sequence[Migration],
+) -> List[int]:
+    """Apply pending migrations in version order and return the versions applied.
+
+    Versions are tracked per component in ``schema_migrations`` so that the
+    storage and control-plane schemas can live in the same database file.
+    """
+    done = set(applied_versions(conn, component))
+    applied: List[int] = []
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if migration.version in done:
+            continue
+        for statement in migration.statements:
+            conn.execute(statement)
+        conn.execute(
+            "INSERT INTO schema_migrations (component, version, name, applied_at) VALUES (?, ?, ?, ?)",
+            (
+                component,
+                migration.version,
+                migration.name,
+                datetime.now(timezone.utc).isoformat(),
+            ),
+        )
+        applied.append(migration.version)
+    return applied
@@ -0,0 +1,115 @@
+"""
+Connection management for SQLite-backed storage.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List
+
+
+class SQLiteConnectionManager:
+    """One writer connection plus one reader connection per thread.
+
+    Connections are opened once and reused, so the sqlite3 statement cache
+    (``cached_statements``) keeps hot queries prepared across calls. Files
+    run in WAL mode: readers never block the writer or each other, and the
+    writer lock only serializes writes within this process.
+
+    ``:memory:`` databases are private to a connection, so every reader
+    shares the writer connection in that case.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mmap_size: int = 256 * 1024 * 1024,
+        cache_size_kib: int = 16 * 1024,
+        busy_timeout_ms: int = 5000,
+        cached_statements: int = 256,
+    ):
+        self.path = path
+        self.mmap_size = mmap_size
+        self.cache_size_kib = cache_size_kib
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        self._in_memory = path == ":memory:" or path.startswith("file::memory:")
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._closed = False
+        self._writer = self._open(read_only=False)
+
+    def _open(self, read_only: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+            uri=self.path.startswith("file:"),
+        )
+        conn.row_factory = sqlite3.Row
+        if not self._in_memory:
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kib)}")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Yield the writer connection; commit on success, roll back on error."""
+        self._check_open()
+        with self._write_lock:
+            conn = self._writer
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Yield this thread's reader connection."""
+        self._check_open()
+        if self._in_memory:
+            with self._write_lock:
+                yield self._writer
+            return
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open(read_only=True)
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        yield conn
+
+    @property
+    def reader_count(self) -> int:
+        """Number of reader connections opened so far."""
+        return len(self._readers)
+
+    def close(self) -> None:
+        """Close every connection; the manager cannot be used afterwards."""
+        with self._write_lock:
+            if self._closed:
+                return
+            self._closed = True
+            with self._readers_lock:
+                for conn in self._readers:
+                    conn.close()
+                self._readers.clear()
+            self._writer.close()
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise sqlite3.ProgrammingError("connection manager is closed")
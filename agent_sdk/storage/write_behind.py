@@ -0,0 +1,222 @@
+"""
+Write-behind buffering for streamed run events.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from agent_sdk.observability.stream_envelope import StreamEnvelope
+from agent_sdk.storage.base import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+_APPEND = "append"
+_DELETE = "delete"
+
+
+class EventWriteBuffer:
+    """Batch event appends into one storage transaction per flush.
+
+    Operations are queued in arrival order and applied by a single background
+    thread, so events for a run reach storage in the order they were appended
+    (and therefore in ``seq`` order) and retention deletes never overtake the
+    appends queued before them. A batch is written once ``max_batch_size``
+    operations are waiting or ``flush_interval`` seconds after the oldest one
+    was queued, whichever comes first. ``append`` blocks while
+    ``max_queue_size`` operations are pending; callers on an event loop use
+    ``try_append`` instead, which never waits.
+    """
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        flush_interval: float = 0.005,
+        max_batch_size: int = 256,
+        max_queue_size: int = 10000,
+    ):
+        self._storage = storage
+        self.flush_interval = flush_interval
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_queue_size = max(self.max_batch_size, max_queue_size)
+        self._pending: Deque[Tuple[str, Any, float]] = deque()
+        self._cond = threading.Condition()
+        self._enqueued = 0
+        self._completed = 0
+        self._flush_target = 0
+        self._closed = False
+        self._events_written = 0
+        self._batches = 0
+        self._failures = 0
+        self._flush_seconds_total = 0.0
+        self._flush_seconds_last = 0.0
+        self._flush_seconds_max = 0.0
+        self._thread = threading.Thread(target=self._run, name="event-write-behind", daemon=True)
+        self._thread.start()
+
+    def append(self, event: StreamEnvelope) -> None:
+        """Queue an event for persistence."""
+        if not self._enqueue(_APPEND, event):
+            self._storage.append_events([event])
+
+    def try_append(self, event: StreamEnvelope) -> bool:
+        """Queue an event only if that needs no waiting.
+
+        Returns False, leaving the write to the caller, when the queue is
+        full or the buffer is closed.
+        """
+        return self._enqueue(_APPEND, event, block=False)
+
+    def delete_events(
+        self, run_id: str, before_seq: Optional[int] = None, block: bool = True
+    ) -> None:
+        """Queue a ``delete_events`` call behind the appends already queued.
+
+        With ``block=False`` the delete is dropped instead of waiting for room
+        or running inline; retention trims can afford that because the next
+        trim for the run covers the same rows.
+        """
+        if not self._enqueue(_DELETE, (run_id, before_seq), block) and block:
+            self._storage.delete_events(run_id, before_seq=before_seq)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything queued so far; return False if ``timeout`` expired."""
+        with self._cond:
+            target = self._request_flush()
+            return self._cond.wait_for(lambda: self._completed >= target, timeout)
+
+    def request_flush(self) -> None:
+        """Have the writer thread write everything queued so far, without waiting for it."""
+        with self._cond:
+            self._request_flush()
+
+    def _request_flush(self) -> int:
+        target = self._enqueued
+        self._flush_target = max(self._flush_target, target)
+        self._cond.notify_all()
+        return target
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush pending operations and stop the writer thread.
+
+        Operations submitted after close are written synchronously.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def metrics(self) -> Dict[str, float]:
+        """Queue depth, throughput counters and flush latency in milliseconds."""
+        with self._cond:
+            batches = self._batches
+            return {
+                "queue_depth": len(self._pending),
+                "events_written": self._events_written,
+                "batches": batches,
+                "failures": self._failures,
+                "flush_latency_last_ms": self._flush_seconds_last * 1000,
+                "flush_latency_avg_ms": (
+                    self._flush_seconds_total / batches * 1000 if batches else 0.0
+                ),
+                "flush_latency_max_ms": self._flush_seconds_max * 1000,
+            }
+
+    def _enqueue(self, kind: str, payload: Any, block: bool = True) -> bool:
+        with self._cond:
+            if self._closed:
+                return False
+            if not block and len(self._pending) >= self.max_queue_size:
+                return False
+            self._cond.wait_for(
+                lambda: len(self._pending) < self.max_queue_size or self._closed
+            )
+            if self._closed:
+                return False
+            self._pending.append((kind, payload, time.monotonic()))
+            self._enqueued += 1
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch_size:
+                self._cond.notify_all()
+            return True
+
+    def _batch_ready(self) -> bool:
+        if self._closed or len(self._pending) >= self.max_batch_size:
+            return True
+        if self._flush_target > self._completed:
+            return True
+        return time.monotonic() >= self._pending[0][2] + self.flush_interval
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                while not self._batch_ready():
+                    remaining = self._pending[0][2] + self.flush_interval - time.monotonic()
+                    self._cond.wait(max(0.0, remaining))
+                count = min(len(self._pending), self.max_batch_size)
+                batch = [self._pending.popleft() for _ in range(count)]
+                self._cond.notify_all()
+
+            start = time.perf_counter()
+            written, failures = self._write(batch)
+            elapsed = time.perf_counter() - start
+
+            with self._cond:
+                self._completed += len(batch)
+                self._events_written += written
+                self._failures += failures
+                self._batches += 1
+                self._flush_seconds_last = elapsed
+                self._flush_seconds_total += elapsed
+                self._flush_seconds_max = max(self._flush_seconds_max, elapsed)
+                self._cond.notify_all()
+
+    def _write(self, batch: List[Tuple[str, Any, float]]) -> Tuple[int, int]:
+        written = 0
+        failures = 0
+        events: List[StreamEnvelope] = []
+        for kind, payload, _ in batch:
+            if kind == _APPEND:
+                events.append(payload)
+                continue
+            ok, failed = self._write_events(events)
+            written += ok
+            failures += failed
+            events = []
+            run_id, before_seq = payload
+            try:
+                self._storage.delete_events(run_id, before_seq=before_seq)
+            except Exception:
+                failures += 1
+                logger.exception("Write-behind delete_events failed for run %s", run_id)
+        ok, failed = self._write_events(events)
+        return written + ok, failures + failed
+
+    def _write_events(self, events: List[StreamEnvelope]) -> Tuple[int, int]:
+        if not events:
+            return 0, 0
+        try:
+            self._storage.append_events(events)
+            return len(events), 0
+        except Exception:
+            logger.exception("Write-behind batch of %d events failed; retrying individually", len(events))
+        written = 0
+        for event in events:
+            try:
+                self._storage.append_event(event)
+                written += 1
+            except Exception:
+                logger.exception("Write-behind append failed for run %s seq %s", event.run_id, event.seq)
+        return written, len(events) - written
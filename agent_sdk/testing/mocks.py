@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional
 from agent_sdk.config.model_config import ModelConfig
 from agent_sdk.core.tools import Tool
 from agent_sdk.llm.base import LLMClient, LLMResponse
+from agent_sdk.storage.base import StorageBackend
 
 
 class DeterministicLLMClient(LLMClient):
@@ -111,6 +112,10 @@ class InMemoryStorage:
     def append_event(self, event: Any) -> None:
         self._events.setdefault(event.run_id, []).append(event)
 
+    def append_events(self, events: List[Any]) -> None:
+        for event in events:
+            self.append_event(event)
+
     def list_events(self, run_id: str, limit: int = 1000) -> List[Any]:
         return list(self._events.get(run_id, []))[:limit]
 
@@ -136,6 +141,11 @@ class InMemoryStorage:
         self._events[run_id] = remaining
         return deleted
 
+    # Keyset pagination reuses the generic list-and-filter fallbacks.
+    list_sessions_page = StorageBackend.list_sessions_page
+    list_runs_page = StorageBackend.list_runs_page
+    list_events_page = StorageBackend.list_events_page
+
     def recover_in_flight_runs(self) -> int:
         return 0
 
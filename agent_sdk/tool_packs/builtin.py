@@ -15,6 +15,7 @@ from urllib.parse import urlparse
 from agent_sdk.core.tools import Tool, ToolRegistry, GLOBAL_TOOL_REGISTRY
 from agent_sdk.data_connectors.document import Document
 from agent_sdk.memory.embeddings import LocalEmbeddings
+from agent_sdk.memory.embedding_cache import get_default_embedding_cache
 from agent_sdk.memory.semantic_memory import MockEmbeddingProvider
 from agent_sdk.memory.persistence import SQLiteVectorStore
 
@@ -138,6 +139,21 @@ def _select_embedder() -> Any:
     return MockEmbeddingProvider()
 
 
+def _embed_texts(embedder: Any, texts: List[str]) -> List[List[float]]:
+    if isinstance(embedder, LocalEmbeddings):
+        return embedder.cached().embed_batch_sync(texts)
+    cache = get_default_embedding_cache()
+    namespace = f"{type(embedder).__name__}:{embedder.get_dimension()}"
+    vectors = cache.get_many(namespace, texts)
+    missing = list(dict.fromkeys(text for text, vec in zip(texts, vectors) if vec is None))
+    if missing:
+        computed = embedder.embed_batch(missing)
+        cache.put_many(namespace, missing, computed)
+        by_text = dict(zip(missing, computed))
+        vectors = [vec if vec is not None else by_text[text] for text, vec in zip(texts, vectors)]
+    return vectors
+
+
 def _cosine_similarity(vec1, vec2) -> float:
     import math
     dot = sum(a * b for a, b in zip(vec1, vec2))
@@ -157,13 +173,10 @@ def _vector_search(inputs: Dict[str, Any]) -> Dict[str, Any]:
         raise ValueError("query is required")
 
     embedder = _select_embedder()
-    if isinstance(embedder, LocalEmbeddings):
-        query_vec = embedder.embed_text_sync(query)
-    else:
-        query_vec = embedder.embed(query)
+    query_vec = _embed_texts(embedder, [query])[0]
 
-    documents: List[Document] = []
     if documents_input:
+        documents: List[Document] = []
         for idx, item in enumerate(documents_input):
             documents.append(
                 Document(
@@ -173,26 +186,22 @@ def _vector_search(inputs: Dict[str, Any]) -> Dict[str, Any]:
                     doc_id=item.get("doc_id", f"doc_{idx}"),
                 )
             )
+        doc_vecs = _embed_texts(embedder, [doc.content for doc in documents])
+        matches = [
+            (doc, _cosine_similarity(query_vec, doc_vec))
+            for doc, doc_vec in zip(documents, doc_vecs)
+        ]
+        matches.sort(key=lambda item: item[1], reverse=True)
+        top_matches = matches[:top_k]
     else:
         store_path = os.getenv("AGENT_SDK_VECTOR_DB_PATH", "vector_store.db")
         store = SQLiteVectorStore(store_path)
-        doc_ids = _run_async(store.list_all())
-        for doc_id in doc_ids:
-            loaded = _run_async(store.load(doc_id))
-            if loaded:
-                documents.append(loaded[0])
-
-    matches = []
-    for doc in documents:
-        if isinstance(embedder, LocalEmbeddings):
-            doc_vec = embedder.embed_text_sync(doc.content)
-        else:
-            doc_vec = embedder.embed(doc.content)
-        score = _cosine_similarity(query_vec, doc_vec)
-        matches.append((doc, score))
-
-    matches.sort(key=lambda item: item[1], reverse=True)
-    top_matches = matches[:top_k]
+        try:
+            top_matches = _run_async(
+                store.search(query_vec, top_k, metadata_filter=inputs.get("metadata_filter"))
+            )
+        finally:
+            store.close()
 
     citations = []
     results = []
@@ -280,7 +289,12 @@ TOOL_DEFINITIONS: Dict[str, ToolDefinition] = {
         schema={
             "name": "vector.search",
             "version": SCHEMA_VERSION,
-            "inputs": {"query": "string", "top_k": "number", "documents": "array"},
+            "inputs": {
+                "query": "string",
+                "top_k": "number",
+                "documents": "array",
+                "metadata_filter": "object",
+            },
             "outputs": "object",
         },
     ),
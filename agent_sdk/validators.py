@@ -236,6 +236,7 @@ class ReplayEventsResponse(BaseModel):
 
     events: List[Dict[str, Any]]
     count: int
+    next_cursor: Optional[str] = None
 
 
 class RunEventsDeleteRequest(BaseModel):
@@ -10,7 +10,12 @@ class AgentSDKClient {
   }
 
   async request(method, path, body = null) {
-    const res = await this.fetchImpl(`${this.baseUrl}${path}`, {
+    const res = await this.send(method, path, body);
+    return res.json();
+  }
+
+  send(method, path, body = null) {
+    return this.fetchImpl(`${this.baseUrl}${path}`, {
       method,
       headers: {
         "Content-Type": "application/json",
@@ -20,13 +25,55 @@ class AgentSDKClient {
       },
       body: body ? JSON.stringify(body) : undefined,
     });
-    return res.json();
   }
 
   runTask(task) {
     return this.request("POST", "/run", { task });
   }
 
+  listRuns({ limit = 100, cursor = null, sessionId = null } = {}) {
+    const query = buildQuery({ limit, cursor, session_id: sessionId });
+    return this.request("GET", `/runs?${query}`);
+  }
+
+  async *iterRuns({ pageSize = 100, sessionId = null } = {}) {
+    let cursor = null;
+    do {
+      const page = await this.listRuns({ limit: pageSize, cursor, sessionId });
+      yield* page.runs || [];
+      cursor = page.next_cursor;
+    } while (cursor);
+  }
+
+  // /sessions returns a plain list; its cursor comes back in the X-Next-Cursor header.
+  async listSessions({ limit = 100, cursor = null } = {}) {
+    const res = await this.send("GET", `/sessions?${buildQuery({ limit, cursor })}`);
+    return { sessions: await res.json(), next_cursor: res.headers.get("X-Next-Cursor") };
+  }
+
+  async *iterSessions({ pageSize = 100 } = {}) {
+    let cursor = null;
+    do {
+      const page = await this.listSessions({ limit: pageSize, cursor });
+      yield* page.sessions;
+      cursor = page.next_cursor;
+    } while (cursor);
+  }
+
+  replayEvents(runId, { limit = 1000, cursor = null, fromSeq = null } = {}) {
+    const query = buildQuery({ limit, cursor, from_seq: fromSeq });
+    return this.request("GET", `/run/${encodeURIComponent(runId)}/events/replay?${query}`);
+  }
+
+  async *iterEvents(runId, { pageSize = 1000 } = {}) {
+    let cursor = null;
+    do {
+      const page = await this.replayEvents(runId, { limit: pageSize, cursor });
+      yield* page.events || [];
+      cursor = page.next_cursor;
+    } while (cursor);
+  }
+
   listOrgs() {
     return this.request("GET", "/admin/orgs");
   }
@@ -48,4 +95,14 @@ class AgentSDKClient {
   }
 }
 
+function buildQuery(params) {
+  const search = new URLSearchParams();
+  for (const [key, value] of Object.entries(params)) {
+    if (value !== null && value !== undefined) {
+      search.set(key, String(value));
+    }
+  }
+  return search.toString();
+}
+
 module.exports = { AgentSDKClient, CLIENT_SDK_VERSION };
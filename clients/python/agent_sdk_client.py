@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import json
+import urllib.parse
 import urllib.request
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 
 CLIENT_SDK_VERSION = "0.1.0"
@@ -25,7 +26,13 @@ class AgentSDKClient:
         self.client_version = client_version
         self._request = request_func or self._default_request
 
-    def _default_request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _default_request(
+        self,
+        method: str,
+        path: str,
+        payload: Optional[Dict[str, Any]] = None,
+        response_headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
         url = f"{self.base_url}{path}"
         data = json.dumps(payload).encode("utf-8") if payload else None
         req = urllib.request.Request(url, data=data, method=method)
@@ -34,11 +41,72 @@ class AgentSDKClient:
         req.add_header("X-Org-Id", self.org_id)
         req.add_header("X-Client-Version", self.client_version)
         with urllib.request.urlopen(req, timeout=30) as resp:
+            if response_headers is not None:
+                response_headers.update((name.lower(), value) for name, value in resp.headers.items())
             return json.loads(resp.read().decode("utf-8"))
 
     def run_task(self, task: str) -> Dict[str, Any]:
         return self._request("POST", "/run", {"task": task})
 
+    def list_runs(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        session_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Fetch one page of runs; pass the returned ``next_cursor`` to get the next page."""
+        query = _query(limit=limit, cursor=cursor, session_id=session_id)
+        return self._request("GET", f"/runs?{query}")
+
+    def iter_runs(self, page_size: int = 100, session_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        cursor = None
+        while True:
+            page = self.list_runs(limit=page_size, cursor=cursor, session_id=session_id)
+            yield from page.get("runs", [])
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return
+
+    def list_sessions(self, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Fetch one page of sessions as ``{"sessions": [...], "next_cursor": ...}``.
+
+        ``/sessions`` returns a plain list and sends the cursor in its
+        ``X-Next-Cursor`` header, so ``request_func`` is given a dict to fill
+        with the (lower-cased) response headers.
+        """
+        headers: Dict[str, str] = {}
+        query = _query(limit=limit, cursor=cursor)
+        sessions = self._request("GET", f"/sessions?{query}", None, headers)
+        return {"sessions": sessions, "next_cursor": headers.get("x-next-cursor")}
+
+    def iter_sessions(self, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        cursor = None
+        while True:
+            page = self.list_sessions(limit=page_size, cursor=cursor)
+            yield from page["sessions"]
+            cursor = page["next_cursor"]
+            if not cursor:
+                return
+
+    def replay_events(
+        self,
+        run_id: str,
+        limit: int = 1000,
+        cursor: Optional[str] = None,
+        from_seq: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        query = _query(limit=limit, cursor=cursor, from_seq=from_seq)
+        return self._request("GET", f"/run/{urllib.parse.quote(run_id)}/events/replay?{query}")
+
+    def iter_events(self, run_id: str, page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        cursor = None
+        while True:
+            page = self.replay_events(run_id, limit=page_size, cursor=cursor)
+            yield from page.get("events", [])
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return
+
     def list_orgs(self) -> Dict[str, Any]:
         return self._request("GET", "/admin/orgs")
 
@@ -58,6 +126,10 @@ class AgentSDKClient:
         }
 
 
+def _query(**params: Any) -> str:
+    return urllib.parse.urlencode({key: value for key, value in params.items() if value is not None})
+
+
 def _major_version(version: str) -> int:
     try:
         return int(version.split(".")[0])
@@ -0,0 +1,105 @@
+"""Measure event-loop lag while concurrent handlers hit SQLiteStorage.
+
+Compares calling the storage directly on the loop with routing calls through
+AsyncStorageBackend. Each simulated request creates a run, updates it and
+reads it back; a ticker coroutine records how late the loop wakes it.
+
+Usage: python scripts/bench_async_storage.py [--requests 400] [--concurrency 50] [--workers 8]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from agent_sdk.observability.stream_envelope import RunMetadata, RunStatus
+from agent_sdk.storage.async_facade import AsyncStorageBackend
+from agent_sdk.storage.sqlite import SQLiteStorage
+
+TICK = 0.005
+
+
+def _run(index: int, status: RunStatus) -> RunMetadata:
+    return RunMetadata(
+        run_id=f"run_{index}",
+        session_id="sess",
+        agent_id="bench",
+        status=status,
+    )
+
+
+async def _request_direct(storage: SQLiteStorage, index: int) -> None:
+    storage.create_run(_run(index, RunStatus.RUNNING))
+    await asyncio.sleep(0)
+    storage.update_run(_run(index, RunStatus.COMPLETED))
+    await asyncio.sleep(0)
+    storage.get_run(f"run_{index}")
+
+
+async def _request_async(storage: AsyncStorageBackend, index: int) -> None:
+    await storage.create_run(_run(index, RunStatus.RUNNING))
+    await storage.update_run(_run(index, RunStatus.COMPLETED))
+    await storage.get_run(f"run_{index}")
+
+
+async def _measure(request, storage, requests: int, concurrency: int) -> dict:
+    lags = []
+    done = False
+
+    async def ticker():
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(max(0.0, time.perf_counter() - start - TICK))
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(index: int) -> None:
+        async with semaphore:
+            await request(storage, index)
+
+    tick_task = asyncio.create_task(ticker())
+    wall = time.perf_counter()
+    await asyncio.gather(*(limited(index) for index in range(requests)))
+    wall = time.perf_counter() - wall
+    done = True
+    await tick_task
+    lags.sort()
+    return {
+        "wall": wall,
+        "lag_p50": statistics.median(lags) * 1000 if lags else 0.0,
+        "lag_p99": lags[int(0.99 * (len(lags) - 1))] * 1000 if lags else 0.0,
+        "lag_max": lags[-1] * 1000 if lags else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'mode':>6}  {'wall s':>7}  {'lag p50 ms':>10}  {'lag p99 ms':>10}  {'lag max ms':>10}")
+    for mode in ("direct", "async"):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = SQLiteStorage(os.path.join(tmpdir, "bench.db"))
+            if mode == "direct":
+                result = asyncio.run(_measure(_request_direct, storage, args.requests, args.concurrency))
+            else:
+                facade = AsyncStorageBackend(storage, max_workers=args.workers)
+                result = asyncio.run(_measure(_request_async, facade, args.requests, args.concurrency))
+                facade.close()
+            close = getattr(storage, "close", None)
+            if close:
+                close()
+        print(
+            f"{mode:>6}  {result['wall']:>7.2f}  {result['lag_p50']:>10.2f}  "
+            f"{result['lag_p99']:>10.2f}  {result['lag_max']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
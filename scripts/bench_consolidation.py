@@ -0,0 +1,77 @@
+"""Compare LSH consolidation against the pairwise scan in SemanticMemory.
+
+Usage: python scripts/bench_consolidation.py [--sizes 5000,50000] [--pairwise-limit 5000]
+
+The pairwise scan is quadratic in pure Python; above --pairwise-limit its
+time is extrapolated from the largest measured size instead of run.
+"""
+
+import argparse
+import random
+import time
+
+from agent_sdk.memory import LSHConsolidator, MemoryItem, MemoryType, SemanticMemory
+
+
+def _build(size: int, dimension: int, duplicate_ratio: float, seed: int) -> SemanticMemory:
+    rng = random.Random(seed)
+    memory = SemanticMemory(max_size=size, use_vector_index=False)
+    originals = []
+    for i in range(size):
+        if originals and rng.random() < duplicate_ratio:
+            base = rng.choice(originals)
+            embedding = [x + rng.gauss(0.0, 0.01) for x in base]
+        else:
+            embedding = [rng.gauss(0.0, 1.0) for _ in range(dimension)]
+            originals.append(embedding)
+        item = MemoryItem(
+            content=f"memory {i}", embedding=embedding, memory_type=MemoryType.SEMANTIC
+        )
+        memory._store_item(item)
+    return memory
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="5000,50000")
+    parser.add_argument("--dimension", type=int, default=128)
+    parser.add_argument("--duplicates", type=float, default=0.1)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--bands", type=int, default=48)
+    parser.add_argument("--rows", type=int, default=14)
+    parser.add_argument("--pairwise-limit", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"dim={args.dimension} duplicates={args.duplicates} threshold={args.threshold} "
+          f"bands={args.bands} rows={args.rows}")
+    print(f"{'items':>7}  {'method':>8}  {'seconds':>9}  {'pairs':>12}  {'merged':>7}  {'recall':>6}")
+    measured = None
+    for size in (int(value) for value in args.sizes.split(",")):
+        lsh_memory = _build(size, args.dimension, args.duplicates, seed=size)
+        lsh_memory.consolidator = LSHConsolidator(bands=args.bands, rows=args.rows)
+        lsh = lsh_memory.consolidate_memory(args.threshold)
+
+        if size <= args.pairwise_limit:
+            pairwise_memory = _build(size, args.dimension, args.duplicates, seed=size)
+            start = time.perf_counter()
+            pairwise = pairwise_memory.consolidate_memory(args.threshold, use_lsh=False)
+            seconds = time.perf_counter() - start
+            measured = (size, seconds)
+            recall = lsh["consolidated_count"] / max(1, pairwise["consolidated_count"])
+            print(f"{size:>7}  {'pairwise':>8}  {seconds:>9.2f}  "
+                  f"{pairwise['candidate_pairs']:>12}  {pairwise['consolidated_count']:>7}  {'':>6}")
+        else:
+            recall = None
+            if measured is not None:
+                base_size, base_seconds = measured
+                estimate = base_seconds * (size / base_size) ** 2
+                print(f"{size:>7}  {'pairwise':>8}  {'~' + format(estimate, '.0f'):>9}  "
+                      f"{size * (size - 1) // 2:>12}  {'':>7}  {'':>6}")
+
+        recall_text = f"{recall:.3f}" if recall is not None else ""
+        print(f"{size:>7}  {'lsh':>8}  {lsh['elapsed_seconds']:>9.2f}  "
+              f"{lsh['candidate_pairs']:>12}  {lsh['consolidated_count']:>7}  {recall_text:>6}")
+
+
+if __name__ == "__main__":
+    main()
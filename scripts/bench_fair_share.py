@@ -0,0 +1,82 @@
+"""Simulate skewed multi-tenant load on ExecutionQueue and report wait times.
+
+One tenant drops a large burst at t=0 while several small tenants submit a
+steady trickle. Runs the workload through a plain FIFO scheduler and
+through FairShareScheduler and prints p50/p99 queue wait per tenant.
+
+Usage: python scripts/bench_fair_share.py [--burst 2000] [--tenants 4] [--jobs 50] [--workers 8]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import defaultdict, deque
+
+from agent_sdk.execution.fair_share import FairShareScheduler
+from agent_sdk.execution.queue import ExecutionQueue
+
+JOB_SECONDS = 0.002
+
+
+class FifoScheduler:
+    """Baseline: one global FIFO, tenants ignored."""
+
+    def __init__(self):
+        self._jobs = deque()
+
+    def push(self, org_id, item, cost=1.0):
+        self._jobs.append((org_id, item))
+
+    def pop(self):
+        return self._jobs.popleft() if self._jobs else None
+
+    def release(self, org_id):
+        return None
+
+
+async def _simulate(scheduler, burst: int, tenants: int, jobs: int, workers: int) -> dict:
+    waits = defaultdict(list)
+
+    async def job(org_id: str, submitted: float) -> None:
+        waits[org_id].append(time.perf_counter() - submitted)
+        await asyncio.sleep(JOB_SECONDS)
+
+    queue = ExecutionQueue(worker_count=workers, scheduler=scheduler)
+    pending = [
+        asyncio.ensure_future(queue.submit_for("bulk", job, "bulk", time.perf_counter()))
+        for _ in range(burst)
+    ]
+    interval = JOB_SECONDS * 2
+    for _ in range(jobs):
+        for index in range(tenants):
+            org_id = f"tenant_{index}"
+            pending.append(asyncio.ensure_future(queue.submit_for(org_id, job, org_id, time.perf_counter())))
+        await asyncio.sleep(interval)
+    await asyncio.gather(*pending)
+    await queue.shutdown()
+    return waits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--burst", type=int, default=2000)
+    parser.add_argument("--tenants", type=int, default=4)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'scheduler':>9}  {'tenant':>9}  {'jobs':>5}  {'p50 ms':>8}  {'p99 ms':>8}")
+    for name, scheduler in (("fifo", FifoScheduler()), ("fair", FairShareScheduler())):
+        waits = asyncio.run(_simulate(scheduler, args.burst, args.tenants, args.jobs, args.workers))
+        for org_id in sorted(waits):
+            values = sorted(waits[org_id])
+            p99 = values[int(0.99 * (len(values) - 1))]
+            print(
+                f"{name:>9}  {org_id:>9}  {len(values):>5}  {statistics.median(values) * 1000:>8.1f}  "
+                f"{p99 * 1000:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
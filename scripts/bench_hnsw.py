@@ -0,0 +1,59 @@
+"""Report HNSW recall@k and query latency against exact vector search.
+
+Usage: python scripts/bench_hnsw.py [--items 20000] [--ef 16,32,64,128]
+"""
+
+import argparse
+import random
+import time
+
+from agent_sdk.memory import HNSWIndex, NumpyVectorIndex
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--dimension", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--M", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=200)
+    parser.add_argument("--ef", default="16,32,64,128")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vectors = [[rng.gauss(0.0, 1.0) for _ in range(args.dimension)] for _ in range(args.items)]
+    queries = [[rng.gauss(0.0, 1.0) for _ in range(args.dimension)] for _ in range(args.queries)]
+
+    exact = NumpyVectorIndex(args.dimension, initial_capacity=args.items)
+    approx = HNSWIndex(
+        args.dimension,
+        M=args.M,
+        ef_construction=args.ef_construction,
+        seed=0,
+        initial_capacity=args.items,
+    )
+    start = time.perf_counter()
+    for i, vector in enumerate(vectors):
+        approx.add(str(i), vector)
+    build_s = time.perf_counter() - start
+    for i, vector in enumerate(vectors):
+        exact.add(str(i), vector)
+
+    start = time.perf_counter()
+    truth = [{item_id for item_id, _ in exact.search(q, args.top_k)} for q in queries]
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    print(f"items={args.items} dim={args.dimension} M={args.M} build={build_s:.1f}s")
+    print(f"{'ef_search':>9}  {'recall@' + str(args.top_k):>10}  {'ms/query':>9}")
+    print(f"{'exact':>9}  {1.0:>10.3f}  {exact_ms:>9.3f}")
+    for ef in (int(value) for value in args.ef.split(",")):
+        start = time.perf_counter()
+        found = [{item_id for item_id, _ in approx.search(q, args.top_k, ef_search=ef)} for q in queries]
+        elapsed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        recall = sum(len(t & f) for t, f in zip(truth, found)) / (args.top_k * len(queries))
+        print(f"{ef:>9}  {recall:>10.3f}  {elapsed_ms:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
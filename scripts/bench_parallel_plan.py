@@ -0,0 +1,80 @@
+"""Compare sequential and parallel plan execution on a wide fan-out plan.
+
+Builds a plan of ``--width`` independent fetch-like steps (each sleeping
+``--latency-ms``) followed by one step that depends on all of them, then
+runs it with ``max_parallel_steps`` set to each value in ``--limits`` and
+prints wall time against the critical path.
+
+Usage: python scripts/bench_parallel_plan.py [--width 8] [--latency-ms 50] [--limits 1,4,8]
+"""
+
+import argparse
+import asyncio
+import time
+
+from agent_sdk.core.context import AgentContext
+from agent_sdk.core.tools import Tool
+from agent_sdk.execution.executor import ExecutorAgent
+from agent_sdk.llm.mock import MockLLMClient
+from agent_sdk.planning.plan_schema import Plan, PlanStep
+
+
+def _fetch(inputs):
+    time.sleep(inputs["latency"])
+    return inputs["url"]
+
+
+def _plan(width: int, latency: float) -> Plan:
+    steps = [
+        PlanStep(
+            id=index + 1,
+            description=f"fetch {index}",
+            tool="http.fetch",
+            inputs={"url": f"https://example.test/{index}", "latency": latency},
+            depends_on=[],
+        )
+        for index in range(width)
+    ]
+    steps.append(
+        PlanStep(
+            id=width + 1,
+            description="combine",
+            tool="http.fetch",
+            inputs={"url": "https://example.test/combine", "latency": latency},
+            depends_on=[step.id for step in steps],
+        )
+    )
+    return Plan(task="fan-out", steps=steps)
+
+
+def _executor(limit: int) -> ExecutorAgent:
+    context = AgentContext(tools={"http.fetch": Tool(name="http.fetch", description="fetch", func=_fetch)})
+    context.config["max_parallel_steps"] = limit
+    return ExecutorAgent("executor", context, MockLLMClient())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--limits", default="1,4,8")
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    critical_path = 2 * latency
+    print(f"{'mode':<8} {'limit':>5} {'wall ms':>10} {'x critical path':>16}")
+    for limit in [int(value) for value in args.limits.split(",")]:
+        for mode in ("sync", "async"):
+            executor = _executor(limit)
+            plan = _plan(args.width, latency)
+            start = time.perf_counter()
+            if mode == "sync":
+                executor.execute_plan(plan)
+            else:
+                asyncio.run(executor.execute_plan_async(plan))
+            wall = time.perf_counter() - start
+            print(f"{mode:<8} {limit:>5} {wall * 1000:>10.1f} {wall / critical_path:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
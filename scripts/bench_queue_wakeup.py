@@ -0,0 +1,83 @@
+"""Measure enqueue-to-start latency of DurableExecutionQueue on SQLite.
+
+Compares fixed-interval polling with the push notifiers: the in-process
+event (submit on the same loop) and SQLite ``data_version`` detection
+(enqueue through a second connection, as another process would).
+
+Usage: python scripts/bench_queue_wakeup.py [--jobs 200] [--poll-interval 0.2]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from agent_sdk.execution.durable_queue import DurableExecutionQueue, SQLiteQueueBackend
+from agent_sdk.execution.queue_notify import QueueNotifier
+
+
+class PollOnly(QueueNotifier):
+    """Never signals: workers fall back to sleeping ``poll_interval``."""
+
+    def notify(self) -> None:
+        return None
+
+    async def wait(self, timeout: float) -> bool:
+        await asyncio.sleep(timeout)
+        return False
+
+
+async def _measure(path: str, jobs: int, poll_interval: float, mode: str) -> list:
+    latencies = []
+    done = asyncio.Event()
+
+    async def handler(payload):
+        latencies.append(time.time() - payload["enqueued_at"])
+        if len(latencies) >= jobs:
+            done.set()
+
+    notifier = PollOnly() if mode == "poll" else None
+    queue = DurableExecutionQueue(
+        backend=SQLiteQueueBackend(path),
+        handler=handler,
+        poll_interval=poll_interval,
+        notifier=notifier,
+    )
+    producer = SQLiteQueueBackend(path)
+    await queue.start()
+    for _ in range(jobs):
+        # Space jobs out so each one finds an idle worker.
+        await asyncio.sleep(poll_interval / 3)
+        payload = {"enqueued_at": time.time()}
+        if mode == "external":
+            producer.enqueue(payload, max_attempts=1)
+        else:
+            asyncio.ensure_future(queue.submit(payload))
+    await asyncio.wait_for(done.wait(), timeout=jobs * poll_interval + 10)
+    await queue.stop()
+    producer.close()
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--poll-interval", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{'mode':>9}  {'p50 ms':>8}  {'p99 ms':>8}  {'max ms':>8}")
+    for mode in ("poll", "in-proc", "external"):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "queue.db")
+            latencies = sorted(asyncio.run(_measure(path, args.jobs, args.poll_interval, mode)))
+        p99 = latencies[int(0.99 * (len(latencies) - 1))]
+        print(
+            f"{mode:>9}  {statistics.median(latencies) * 1000:>8.2f}  {p99 * 1000:>8.2f}  "
+            f"{latencies[-1] * 1000:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
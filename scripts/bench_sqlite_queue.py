@@ -0,0 +1,78 @@
+"""Measure SQLiteQueueBackend claim throughput with several worker processes on one file.
+
+Every process opens its own backend on the shared database and drains the
+queue with ``claim_batch``; the script checks that no job was claimed twice.
+
+Usage: python scripts/bench_sqlite_queue.py [--jobs 5000] [--processes 1,4,8] [--batch 1,16]
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from agent_sdk.execution.durable_queue import SQLiteQueueBackend
+
+
+def _drain(path: str, batch: int, queue) -> None:
+    backend = SQLiteQueueBackend(path)
+    claimed = []
+    while True:
+        jobs = backend.claim_batch(batch)
+        if not jobs:
+            break
+        for job in jobs:
+            backend.mark_done(job.job_id)
+            claimed.append(job.job_id)
+    backend.close()
+    queue.put(claimed)
+
+
+def _measure(jobs: int, processes: int, batch: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "queue.db")
+        backend = SQLiteQueueBackend(path)
+        for index in range(jobs):
+            backend.enqueue({"index": index}, max_attempts=1)
+        backend.close()
+
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=_drain, args=(path, batch, results))
+            for _ in range(processes)
+        ]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        claimed = [job_id for _ in workers for job_id in results.get()]
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+    return {
+        "elapsed": elapsed,
+        "jobs_per_s": len(claimed) / elapsed if elapsed else 0.0,
+        "claimed": len(claimed),
+        "duplicates": len(claimed) - len(set(claimed)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--processes", default="1,4,8")
+    parser.add_argument("--batch", default="1,16")
+    args = parser.parse_args()
+
+    print(f"{'procs':>5}  {'batch':>5}  {'seconds':>8}  {'jobs/s':>9}  {'claimed':>7}  {'dupes':>5}")
+    for processes in [int(value) for value in args.processes.split(",")]:
+        for batch in [int(value) for value in args.batch.split(",")]:
+            result = _measure(args.jobs, processes, batch)
+            print(
+                f"{processes:>5}  {batch:>5}  {result['elapsed']:>8.2f}  {result['jobs_per_s']:>9.0f}  "
+                f"{result['claimed']:>7}  {result['duplicates']:>5}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Measure SQLiteStorage throughput for run creation, event appends and reads.
+
+Usage: python scripts/bench_sqlite_storage.py [--runs 200] [--events 20] [--threads 1,8]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agent_sdk.observability.stream_envelope import (
+    RunMetadata,
+    RunStatus,
+    StreamChannel,
+    StreamEnvelope,
+)
+from agent_sdk.storage.sqlite import SQLiteStorage
+
+
+def _run(worker: int, index: int) -> RunMetadata:
+    return RunMetadata(
+        run_id=f"run_{worker}_{index}",
+        session_id=f"sess_{worker}",
+        agent_id="bench",
+        status=RunStatus.RUNNING,
+    )
+
+
+def _event(run_id: str, seq: int) -> StreamEnvelope:
+    return StreamEnvelope(
+        run_id=run_id,
+        session_id="sess",
+        stream=StreamChannel.ASSISTANT,
+        event="delta",
+        payload={"text": "x" * 64},
+        seq=seq,
+        metadata={"org_id": "default"},
+    )
+
+
+def _bench(storage: SQLiteStorage, threads: int, runs: int, events: int) -> dict:
+    per_worker = max(1, runs // threads)
+    timings = {"create_run": 0.0, "append_event": 0.0, "list_events": 0.0}
+
+    def work(worker: int) -> dict:
+        local = dict.fromkeys(timings, 0.0)
+        for index in range(per_worker):
+            run = _run(worker, index)
+            start = time.perf_counter()
+            storage.create_run(run)
+            local["create_run"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            for seq in range(events):
+                storage.append_event(_event(run.run_id, seq))
+            local["append_event"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            storage.list_events(run.run_id)
+            local["list_events"] += time.perf_counter() - start
+        return local
+
+    wall = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(work, range(threads)))
+    wall = time.perf_counter() - wall
+
+    total_runs = per_worker * threads
+    counts = {
+        "create_run": total_runs,
+        "append_event": total_runs * events,
+        "list_events": total_runs,
+    }
+    return {
+        name: counts[name] / (sum(r[name] for r in results) / threads)
+        for name in timings
+    } | {"wall": wall}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--threads", default="1,8")
+    args = parser.parse_args()
+
+    print(f"{'threads':>7}  {'create_run/s':>12}  {'append_event/s':>14}  {'list_events/s':>13}  {'wall s':>7}")
+    for threads in (int(value) for value in args.threads.split(",")):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            storage = SQLiteStorage(os.path.join(tmpdir, "bench.db"))
+            result = _bench(storage, threads, args.runs, args.events)
+            close = getattr(storage, "close", None)
+            if close:
+                close()
+        print(
+            f"{threads:>7}  {result['create_run']:>12.0f}  {result['append_event']:>14.0f}  "
+            f"{result['list_events']:>13.0f}  {result['wall']:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compare LLM calls, tokens and wall time of the executor summary modes.
+
+Runs an ``--steps``-step plan through ExecutorAgent once per summary mode
+against a mock LLM that sleeps ``--llm-latency-ms`` per call, and prints
+the totals reported by the ``executor.summary`` event.
+
+Usage: python scripts/bench_summary_modes.py [--steps 8] [--llm-latency-ms 200]
+"""
+
+import argparse
+import time
+
+from agent_sdk.config.model_config import ModelConfig
+from agent_sdk.core.context import AgentContext
+from agent_sdk.core.tools import Tool
+from agent_sdk.execution.executor import ExecutorAgent
+from agent_sdk.llm.mock import MockLLMClient
+from agent_sdk.observability.bus import EventBus
+from agent_sdk.planning.plan_schema import Plan, PlanStep
+
+
+class SlowLLM(MockLLMClient):
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate(self, messages, model_config):
+        time.sleep(self.latency)
+        return super().generate(messages, model_config)
+
+
+class SummarySink:
+    def __init__(self):
+        self.summary = None
+
+    def emit(self, event):
+        if event.event_type == "executor.summary":
+            self.summary = event.data
+
+
+def _plan(steps: int) -> Plan:
+    return Plan(
+        task="collect facts",
+        steps=[
+            PlanStep(id=i, description=f"lookup {i}", tool="lookup", inputs={"key": f"fact-{i}"})
+            for i in range(1, steps + 1)
+        ],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=8)
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    lookup = Tool(name="lookup", description="lookup", func=lambda inputs: f"value of {inputs['key']}")
+    print(f"{'mode':<10} {'llm calls':>9} {'tokens':>8} {'llm ms':>9} {'wall ms':>9}")
+    for mode in ("per_step", "batched", "template"):
+        sink = SummarySink()
+        context = AgentContext(
+            tools={"lookup": lookup},
+            model_config=ModelConfig(name="mock", provider="mock", model_id="mock"),
+            events=EventBus([sink]),
+        )
+        context.config["summary_mode"] = mode
+        executor = ExecutorAgent("executor", context, SlowLLM(args.llm_latency_ms / 1000))
+        start = time.perf_counter()
+        executor.execute_plan(_plan(args.steps))
+        wall_ms = (time.perf_counter() - start) * 1000
+        usage = sink.summary
+        print(
+            f"{mode:<10} {usage['llm_calls']:>9} {usage['total_tokens']:>8} "
+            f"{usage['latency_ms']:>9.1f} {wall_ms:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Compare SemanticMemory linear-scan search with the NumPy vector index.
+
+Usage: python scripts/bench_vector_index.py [--sizes 1000,10000,100000]
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from agent_sdk.memory import NumpyVectorIndex, SemanticMemory, MemoryItem, MemoryType
+
+
+def _random_vectors(count: int, dimension: int, seed: int) -> List[List[float]]:
+    rng = random.Random(seed)
+    return [[rng.gauss(0.0, 1.0) for _ in range(dimension)] for _ in range(count)]
+
+
+def _populate(memory: SemanticMemory, vectors: List[List[float]]) -> None:
+    # Bypass embedding so both variants index identical vectors.
+    for i, vector in enumerate(vectors):
+        item = MemoryItem(content=f"item {i}", embedding=vector, memory_type=MemoryType.SEMANTIC)
+        memory._store_item(item)
+
+
+def _time_queries(memory: SemanticMemory, queries: List[List[float]], top_k: int) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        if memory.vector_index is not None:
+            memory.vector_index.search(query, top_k)
+        else:
+            memory._scan(query, top_k, 0.0)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    queries = _random_vectors(args.queries, args.dimension, seed=1)
+    print(f"{'items':>8}  {'scan ms/query':>14}  {'index ms/query':>15}  {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        vectors = _random_vectors(size, args.dimension, seed=size)
+        scan = SemanticMemory(max_size=size, use_vector_index=False)
+        indexed = SemanticMemory(max_size=size, vector_index=NumpyVectorIndex(args.dimension))
+        _populate(scan, vectors)
+        _populate(indexed, vectors)
+
+        scan_queries = queries[: max(1, min(len(queries), 200_000 // size))]
+        scan_s = _time_queries(scan, scan_queries, args.top_k)
+        index_s = _time_queries(indexed, queries, args.top_k)
+        print(
+            f"{size:>8}  {scan_s * 1000:>14.2f}  {index_s * 1000:>15.3f}  {scan_s / index_s:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Tests for the non-blocking storage facade.
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+from agent_sdk.observability.stream_envelope import RunMetadata, RunStatus
+from agent_sdk.storage.async_facade import AsyncStorageBackend, LatencyHistogram
+from agent_sdk.storage.sqlite import SQLiteStorage
+
+
+class SlowBackend:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.threads = set()
+        self.name = "slow"
+
+    def get_run(self, run_id):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return run_id
+
+    def fail(self):
+        raise ValueError("boom")
+
+
+async def _max_loop_lag(coro, interval: float = 0.01) -> float:
+    lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal lag
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag = max(lag, time.perf_counter() - start - interval)
+
+    task = asyncio.create_task(ticker())
+    try:
+        await coro
+    finally:
+        done = True
+        await task
+    return lag
+
+
+def test_async_storage_keeps_loop_responsive():
+    backend = SlowBackend(delay=0.2)
+    storage = AsyncStorageBackend(backend, max_workers=4, thread_name_prefix="test-io")
+
+    async def load():
+        results = await asyncio.gather(*(storage.get_run(f"run_{i}") for i in range(8)))
+        assert results == [f"run_{i}" for i in range(8)]
+
+    lag = asyncio.run(_max_loop_lag(load()))
+    storage.close()
+
+    assert lag < 0.1
+    assert backend.threads and all(name.startswith("test-io") for name in backend.threads)
+    assert len(backend.threads) <= 4
+
+
+def test_async_storage_records_latency_and_propagates_errors():
+    storage = AsyncStorageBackend(SlowBackend(delay=0.0))
+
+    async def calls():
+        await storage.get_run("run_1")
+        with pytest.raises(ValueError):
+            await storage.fail()
+
+    asyncio.run(calls())
+    stats = storage.latency_stats()
+    storage.close()
+
+    assert stats["get_run"]["count"] == 1
+    assert stats["fail"]["count"] == 1
+    assert storage.name == "slow"
+
+
+def test_async_storage_wraps_sqlite_storage():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = SQLiteStorage(os.path.join(tmpdir, "storage.db"))
+        storage = AsyncStorageBackend(backend)
+
+        async def roundtrip():
+            await storage.create_run(
+                RunMetadata(run_id="run_1", session_id="sess_1", agent_id="agent", status=RunStatus.RUNNING)
+            )
+            return await storage.get_run("run_1")
+
+        run = asyncio.run(roundtrip())
+        storage.close()
+
+    assert run is not None
+    assert run.status == RunStatus.RUNNING
+
+
+def test_latency_histogram_buckets_and_quantiles():
+    hist = LatencyHistogram(buckets=(1, 10, 100))
+    for value in (0.5, 5, 5, 50, 500):
+        hist.observe(value)
+
+    snapshot = hist.snapshot()
+    assert snapshot["count"] == 5
+    assert snapshot["buckets"] == [(1, 1), (10, 3), (100, 4)]
+    assert snapshot["p50_ms"] == 10
+    assert snapshot["p99_ms"] == 500
+
+
+def test_run_store_appends_events_off_the_loop():
+    from agent_sdk.observability.stream_envelope import StreamChannel, StreamEnvelope
+    from agent_sdk.server.run_store import RunEventStore
+    from agent_sdk.testing.mocks import InMemoryStorage
+
+    class SlowEventStorage(InMemoryStorage):
+        def append_event(self, event):
+            time.sleep(0.1)
+            super().append_event(event)
+
+    storage = SlowEventStorage()
+    async_storage = AsyncStorageBackend(storage, max_workers=2)
+    store = RunEventStore(storage=storage, async_storage=async_storage)
+
+    async def emit():
+        for seq in range(3):
+            event = StreamEnvelope(
+                run_id="run_1",
+                session_id="sess",
+                stream=StreamChannel.ASSISTANT,
+                event="token",
+                payload={"seq": seq},
+                seq=seq,
+            )
+            await store.append_event_async("run_1", event)
+
+    lag = asyncio.run(_max_loop_lag(emit()))
+    async_storage.close()
+
+    assert lag < 0.08
+    assert [event.seq for event in storage.list_events("run_1")] == [0, 1, 2]
+    assert [event.seq for event in store.list_events("run_1")] == [0, 1, 2]
+    assert async_storage.latency_stats()["append_event"]["count"] == 3
@@ -0,0 +1,113 @@
+"""Tests for LSH-based memory consolidation."""
+
+import random
+
+import pytest
+
+from agent_sdk.memory import consolidation
+from agent_sdk.memory.consolidation import LSHConsolidator
+from agent_sdk.memory.semantic_memory import SemanticMemory
+
+
+def _clustered(clusters=20, per_cluster=4, noise=0.02, dimension=32, seed=3):
+    """Groups of near-identical vectors around random centres."""
+    rng = random.Random(seed)
+    ids, vectors = [], []
+    for c in range(clusters):
+        centre = [rng.gauss(0, 1) for _ in range(dimension)]
+        for m in range(per_cluster):
+            ids.append(f"c{c}_{m}")
+            vectors.append([x + rng.gauss(0, noise) for x in centre])
+    return ids, vectors
+
+
+def _normalize(clusters):
+    return sorted(sorted(cluster) for cluster in clusters)
+
+
+class TestLSHConsolidator:
+    """Tests for LSHConsolidator."""
+
+    def test_finds_planted_clusters(self):
+        ids, vectors = _clustered()
+        result = LSHConsolidator().find_clusters(ids, vectors, threshold=0.9)
+        expected = [[f"c{c}_{m}" for m in range(4)] for c in range(20)]
+        assert _normalize(result.clusters) == _normalize(expected)
+        assert result.similar_pairs >= 20 * 3
+        assert result.elapsed_seconds >= 0
+
+    def test_candidate_pairs_far_below_all_pairs(self):
+        ids, vectors = _clustered(clusters=100, per_cluster=2)
+        result = LSHConsolidator().find_clusters(ids, vectors, threshold=0.9)
+        all_pairs = len(ids) * (len(ids) - 1) // 2
+        assert result.candidate_pairs < all_pairs // 20
+
+    def test_union_find_merges_transitively(self):
+        vectors = [[1.0, 0.0], [0.95, 0.31], [0.81, 0.59]]
+        result = LSHConsolidator(bands=64, rows=2).find_clusters(["a", "b", "c"], vectors, 0.93)
+        # a~b and b~c exceed the threshold; a~c does not.
+        assert result.clusters == [["a", "b", "c"]]
+
+    def test_python_fallback_matches_numpy(self, monkeypatch):
+        pytest.importorskip("numpy")
+        ids, vectors = _clustered(clusters=8, per_cluster=3, dimension=16)
+        expected = LSHConsolidator(bands=16, rows=8).find_clusters(ids, vectors, 0.9)
+
+        monkeypatch.setattr(consolidation, "np", None)
+        actual = LSHConsolidator(bands=16, rows=8).find_clusters(ids, vectors, 0.9)
+        assert _normalize(actual.clusters) == _normalize(expected.clusters)
+        assert actual.candidate_pairs == expected.candidate_pairs
+
+    def test_mixed_dimensions_and_empty_embeddings(self):
+        result = LSHConsolidator().find_clusters(
+            ["a", "b", "c", "d"], [[1.0, 0.0], [1.0, 0.0, 0.0], [], [1.0, 0.0]], 0.9
+        )
+        assert result.clusters == [["a", "d"]]
+
+    def test_candidate_probability(self):
+        lsh = LSHConsolidator(bands=48, rows=14)
+        assert lsh.candidate_probability(0.95) > 0.99
+        assert lsh.candidate_probability(0.0) < 0.01
+
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            LSHConsolidator(bands=0)
+        with pytest.raises(ValueError):
+            LSHConsolidator(rows=63)
+        with pytest.raises(ValueError):
+            LSHConsolidator().find_clusters(["a"], [], 0.9)
+
+
+class TestSemanticMemoryConsolidation:
+    """Tests for SemanticMemory.consolidate_memory with LSH."""
+
+    def test_lsh_matches_pairwise_on_duplicates(self):
+        contents = ["Python is a language", "Cats are animals", "Rust is fast"]
+        lsh_memory = SemanticMemory()
+        pairwise_memory = SemanticMemory()
+        for memory in (lsh_memory, pairwise_memory):
+            for content in contents * 3:
+                memory.add_memory(content)
+
+        lsh_stats = lsh_memory.consolidate_memory(similarity_threshold=0.95)
+        pairwise_stats = pairwise_memory.consolidate_memory(
+            similarity_threshold=0.95, use_lsh=False
+        )
+
+        assert lsh_stats["method"] == "lsh"
+        assert pairwise_stats["method"] == "pairwise"
+        for key in ("final_count", "consolidated_count", "merged_groups"):
+            assert lsh_stats[key] == pairwise_stats[key]
+        assert lsh_stats["candidate_pairs"] < pairwise_stats["candidate_pairs"]
+        assert "elapsed_seconds" in lsh_stats
+
+    def test_keeper_is_oldest_and_records_related(self):
+        memory = SemanticMemory()
+        first = memory.add_memory("repeated fact")
+        duplicate = memory.add_memory("repeated fact")
+
+        memory.consolidate_memory(similarity_threshold=0.95)
+
+        assert list(memory.memories) == [first.item_id]
+        assert first.related_items == [duplicate.item_id]
+        assert first.summary == "repeated fact | repeated fact"
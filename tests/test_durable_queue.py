@@ -3,8 +3,11 @@
 import os
 import tempfile
 import asyncio
+import threading
 
-from agent_sdk.execution.durable_queue import DurableExecutionQueue, SQLiteQueueBackend
+import pytest
+
+from agent_sdk.execution.durable_queue import DurableExecutionQueue, QueueJob, SQLiteQueueBackend
 
 
 async def _handler(payload):
@@ -51,9 +54,193 @@ def test_durable_queue_moves_to_dlq_on_failure():
             except RuntimeError:
                 pass
             await queue.stop()
-            with backend._connect() as conn:
+            with backend._pool.reader() as conn:
                 rows = conn.execute("SELECT * FROM dlq").fetchall()
                 return len(rows)
 
     dlq_count = asyncio.run(_run())
     assert dlq_count == 1
+
+
+def test_sqlite_queue_claim_batch_orders_by_priority(tmp_path):
+    backend = SQLiteQueueBackend(str(tmp_path / "queue.db"))
+    low = backend.enqueue({"name": "low"}, max_attempts=1, priority=5)
+    first = backend.enqueue({"name": "first"}, max_attempts=1)
+    second = backend.enqueue({"name": "second"}, max_attempts=1)
+
+    batch = backend.claim_batch(2)
+    assert [job.job_id for job in batch] == [first, second]
+    assert [job.job_id for job in backend.claim_batch(5)] == [low]
+    assert backend.claim_next() is None
+
+
+def test_sqlite_queue_claims_are_exclusive_across_connections(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    path = str(tmp_path / "queue.db")
+    producer = SQLiteQueueBackend(path)
+    job_ids = {producer.enqueue({"value": index}, max_attempts=1) for index in range(200)}
+    workers = [SQLiteQueueBackend(path) for _ in range(4)]
+
+    def drain(backend):
+        claimed = []
+        while True:
+            batch = backend.claim_batch(7)
+            if not batch:
+                return claimed
+            claimed.extend(job.job_id for job in batch)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(drain, workers))
+
+    claimed = [job_id for result in results for job_id in result]
+    assert len(claimed) == len(set(claimed)) == 200
+    assert set(claimed) == job_ids
+
+
+def test_sqlite_queue_expired_lease_is_retried_then_dead_lettered(tmp_path):
+    backend = SQLiteQueueBackend(str(tmp_path / "queue.db"))
+    job_id = backend.enqueue({"value": 1}, max_attempts=2)
+
+    assert backend.claim_batch(1, visibility_timeout=-1)[0].job_id == job_id
+    retried = backend.claim_batch(1, visibility_timeout=-1)
+    assert [job.job_id for job in retried] == [job_id]
+    assert retried[0].attempts == 1
+
+    assert backend.claim_batch(1) == []
+    with backend._pool.reader() as conn:
+        row = conn.execute("SELECT error, attempts FROM dlq WHERE job_id = ?", (job_id,)).fetchone()
+    assert row["error"] == "lease expired"
+    assert row["attempts"] == 2
+
+
+def test_sqlite_queue_extend_lease_keeps_job_claimed(tmp_path):
+    backend = SQLiteQueueBackend(str(tmp_path / "queue.db"))
+    job_id = backend.enqueue({"value": 1}, max_attempts=3)
+    backend.claim_batch(1, visibility_timeout=-1)
+
+    assert backend.extend_lease(job_id, visibility_timeout=60) is True
+    assert backend.claim_next() is None
+    backend.mark_done(job_id)
+    assert backend.extend_lease(job_id) is False
+
+
+
+@pytest.mark.parametrize(
+    "late_call",
+    [
+        lambda backend, job: backend.mark_done(job.job_id),
+        lambda backend, job: backend.requeue(job, "late retry"),
+        lambda backend, job: backend.mark_failed(job, "late failure"),
+    ],
+    ids=["mark_done", "requeue", "mark_failed"],
+)
+def test_sqlite_queue_stale_worker_cannot_touch_reclaimed_job(tmp_path, late_call):
+    path = str(tmp_path / "queue.db")
+    stale = SQLiteQueueBackend(path)
+    fresh = SQLiteQueueBackend(path)
+    job_id = stale.enqueue({"value": 1}, max_attempts=3)
+    (lost,) = stale.claim_batch(1, visibility_timeout=-1)
+    (owned,) = fresh.claim_batch(1, visibility_timeout=60)
+    assert owned.job_id == job_id
+    assert stale.extend_lease(job_id) is False
+
+    late_call(stale, lost)
+
+    with fresh._pool.reader() as conn:
+        row = conn.execute("SELECT status, attempts FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        assert conn.execute("SELECT COUNT(*) FROM dlq").fetchone()[0] == 0
+    assert (row["status"], row["attempts"]) == ("running", 1)
+    fresh.mark_done(job_id)
+    with fresh._pool.reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 0
+
+
+class _GatedBlockingBackend:
+    """Blocking-claim backend whose claim returns only once ``release`` is set."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.claims = 0
+        self.requeued = []
+
+    def enqueue(self, payload, max_attempts):
+        return "job_1"
+
+    def claim_blocking(self, timeout=None):
+        self.claims += 1
+        if self.claims > 1:
+            return None
+        self.release.wait(5)
+        return QueueJob(job_id="job_1", payload={"value": 1}, attempts=0, max_attempts=3)
+
+    def requeue(self, job, error):
+        self.requeued.append((job.job_id, job.attempts))
+
+
+def test_durable_queue_stop_requeues_job_claimed_after_stop():
+    backend = _GatedBlockingBackend()
+    handled = []
+
+    async def handler(payload):
+        handled.append(payload)
+
+    async def run():
+        queue = DurableExecutionQueue(backend, handler)
+        await queue.start()
+        await asyncio.sleep(0.05)
+        stopping = asyncio.create_task(queue.stop())
+        await asyncio.sleep(0.05)
+        assert not stopping.done()
+        backend.release.set()
+        await stopping
+
+    asyncio.run(run())
+
+    assert handled == []
+    assert backend.requeued == [("job_1", 0)]
+
+
+def test_durable_queue_keeps_backend_calls_off_the_loop(tmp_path):
+    calls = []
+
+    class RecordingBackend(SQLiteQueueBackend):
+        def _record(self, name):
+            calls.append((name, threading.get_ident()))
+
+        def claim_next(self):
+            self._record("claim_next")
+            return super().claim_next()
+
+        def mark_done(self, job_id):
+            self._record("mark_done")
+            super().mark_done(job_id)
+
+        def mark_failed(self, job, error):
+            self._record("mark_failed")
+            super().mark_failed(job, error)
+
+        def requeue(self, job, error):
+            self._record("requeue")
+            super().requeue(job, error)
+
+    async def handler(payload):
+        if payload["fail"]:
+            raise RuntimeError("boom")
+        return "ok"
+
+    async def run():
+        queue = DurableExecutionQueue(
+            RecordingBackend(str(tmp_path / "queue.db")), handler, poll_interval=0.01, max_attempts=2
+        )
+        await queue.start()
+        assert await queue.submit({"fail": False}) == "ok"
+        with pytest.raises(RuntimeError):
+            await queue.submit({"fail": True})
+        await queue.stop()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+
+    assert {name for name, _ in calls} == {"claim_next", "mark_done", "requeue", "mark_failed"}
+    assert all(thread != loop_thread for _, thread in calls)
@@ -0,0 +1,126 @@
+"""Tests for the embedding cache."""
+
+from typing import List
+
+import pytest
+
+from agent_sdk.memory.embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingCache,
+    embedding_cache_key,
+)
+from agent_sdk.memory.embeddings import EmbeddingProvider, HuggingFaceEmbeddings, LocalEmbeddings
+
+
+class CountingProvider(EmbeddingProvider):
+    """Provider that records every text it embeds."""
+
+    model = "counting-v1"
+
+    def __init__(self):
+        self.calls: List[List[str]] = []
+
+    @property
+    def embedding_dimension(self) -> int:
+        return 2
+
+    async def embed_text(self, text: str) -> List[float]:
+        return (await self.embed_batch([text]))[0]
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache."""
+
+    def test_key_normalizes_whitespace(self):
+        """Test equivalent texts share a key and namespaces are separate."""
+        assert embedding_cache_key("p:m", "hello  world\n") == embedding_cache_key("p:m", "hello world")
+        assert embedding_cache_key("p:a", "hello") != embedding_cache_key("p:b", "hello")
+
+    def test_hits_and_misses(self):
+        """Test hit/miss accounting."""
+        cache = EmbeddingCache()
+        assert cache.get("ns", "a") is None
+        cache.put("ns", "a", [0.5, 0.25])
+        assert cache.get("ns", "a") == [0.5, 0.25]
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["bytes"] == 8
+
+    def test_byte_budget_evicts_lru(self):
+        """Test the memory tier evicts least recently used vectors."""
+        cache = EmbeddingCache(max_bytes=16)
+        cache.put("ns", "a", [1.0, 1.0])
+        cache.put("ns", "b", [2.0, 2.0])
+        cache.get("ns", "a")
+        cache.put("ns", "c", [3.0, 3.0])
+        assert cache.get("ns", "b") is None
+        assert cache.get("ns", "a") == [1.0, 1.0]
+        assert cache.stats()["evictions"] == 1
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """Test vectors written to disk are served by a new cache instance."""
+        path = str(tmp_path / "embeddings.db")
+        first = EmbeddingCache(path=path)
+        first.put_many("ns", ["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+        first.close()
+
+        second = EmbeddingCache(path=path)
+        assert second.get_many("ns", ["b", "a", "c"]) == [[0.0, 1.0], [1.0, 0.0], None]
+        assert second.stats()["disk_hits"] == 2
+        second.close()
+
+    def test_invalid_budget(self):
+        """Test negative budgets are rejected."""
+        with pytest.raises(ValueError):
+            EmbeddingCache(max_bytes=-1)
+
+
+class TestCachedEmbeddings:
+    """Tests for CachedEmbeddings."""
+
+    @pytest.mark.asyncio
+    async def test_only_misses_are_embedded(self):
+        """Test repeated and duplicate texts are not re-embedded."""
+        provider = CountingProvider()
+        cached = provider.cached(EmbeddingCache())
+
+        first = await cached.embed_batch(["a", "bb", "a"])
+        second = await cached.embed_batch(["bb", "ccc"])
+
+        assert first == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+        assert second == [[2.0, 1.0], [3.0, 1.0]]
+        assert provider.calls == [["a", "bb"], ["ccc"]]
+        assert cached.embedding_dimension == 2
+        assert cached.cache_namespace == "CountingProvider:counting-v1"
+
+    @pytest.mark.asyncio
+    async def test_embed_text_uses_cache(self):
+        """Test single-text embedding goes through the cache."""
+        provider = CountingProvider()
+        cached = CachedEmbeddings(provider, EmbeddingCache())
+        await cached.embed_text("hello")
+        await cached.embed_text("hello")
+        assert provider.calls == [["hello"]]
+
+    @pytest.mark.asyncio
+    async def test_misses_and_hits_return_identical_vectors(self):
+        """Test a freshly computed vector matches the cached one exactly."""
+
+        class PreciseProvider(CountingProvider):
+            async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+                return [[0.1, 1 / 3] for _ in texts]
+
+        cached = CachedEmbeddings(PreciseProvider(), EmbeddingCache())
+        miss = await cached.embed_text("hello")
+        hit = await cached.embed_text("hello")
+        assert miss == hit
+        assert miss != [0.1, 1 / 3]
+
+    def test_local_embeddings_share_huggingface_namespace(self):
+        """Test LocalEmbeddings reuse HuggingFace cache entries."""
+        assert LocalEmbeddings("m").cache_namespace == HuggingFaceEmbeddings("m").cache_namespace
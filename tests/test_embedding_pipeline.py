@@ -0,0 +1,123 @@
+"""Tests for the batched embedding pipeline."""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from agent_sdk.core.retry import RetryConfig
+from agent_sdk.memory.embedding_pipeline import EmbeddingPipeline
+from agent_sdk.memory.embeddings import EmbeddingProvider
+
+
+class RecordingProvider(EmbeddingProvider):
+    """Provider that records batches and tracks concurrent calls."""
+
+    max_batch_size = 4
+
+    def __init__(self, delay: float = 0.0, failures: int = 0):
+        self.delay = delay
+        self.failures = failures
+        self.batches: List[List[str]] = []
+        self.active = 0
+        self.peak = 0
+
+    @property
+    def embedding_dimension(self) -> int:
+        return 1
+
+    async def embed_text(self, text: str) -> List[float]:
+        return (await self.embed_batch([text]))[0]
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("transient")
+            self.batches.append(list(texts))
+            return [[float(text)] for text in texts]
+        finally:
+            self.active -= 1
+
+
+def _texts(count):
+    return [str(i) for i in range(count)]
+
+
+class TestEmbeddingPipeline:
+    """Tests for EmbeddingPipeline."""
+
+    @pytest.mark.asyncio
+    async def test_results_in_input_order(self):
+        """Test results keep input order across concurrent batches."""
+        provider = RecordingProvider(delay=0.001)
+        pipeline = EmbeddingPipeline(provider, max_concurrency=3)
+        vectors = await pipeline.embed_all(_texts(19))
+        assert vectors == [[float(i)] for i in range(19)]
+        assert [len(batch) for batch in provider.batches] == [4, 4, 4, 4, 3]
+        assert pipeline.stats()["batches"] == 5
+        assert pipeline.stats()["texts"] == 19
+
+    @pytest.mark.asyncio
+    async def test_token_cap_splits_batches(self):
+        """Test batches close when the token estimate would be exceeded."""
+        provider = RecordingProvider()
+        pipeline = EmbeddingPipeline(provider, max_batch_size=100, max_batch_tokens=3)
+        await pipeline.embed_all(_texts(5))
+        assert [len(batch) for batch in provider.batches] == [3, 2]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """Test no more than max_concurrency batches run at once."""
+        provider = RecordingProvider(delay=0.01)
+        pipeline = EmbeddingPipeline(provider, max_batch_size=1, max_concurrency=2)
+        await pipeline.embed_all(_texts(8))
+        assert provider.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_input_is_consumed_lazily(self):
+        """Test the pipeline applies backpressure to its input."""
+        provider = RecordingProvider(delay=0.01)
+        pipeline = EmbeddingPipeline(provider, max_batch_size=1, max_concurrency=2)
+        consumed = []
+
+        async def source():
+            for i in range(10):
+                consumed.append(i)
+                yield str(i)
+
+        stream = pipeline.stream(source())
+        first = await stream.__anext__()
+        assert first.index == 0
+        assert len(consumed) <= 4
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_failed_batches_are_retried(self):
+        """Test transient failures are retried with backoff."""
+        provider = RecordingProvider(failures=2)
+        pipeline = EmbeddingPipeline(
+            provider,
+            retry_config=RetryConfig(max_retries=3, base_delay=0.0),
+        )
+        assert await pipeline.embed_all(["1", "2"]) == [[1.0], [2.0]]
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_raise(self):
+        """Test errors surface once retries are exhausted."""
+        provider = RecordingProvider(failures=5)
+        pipeline = EmbeddingPipeline(
+            provider,
+            retry_config=RetryConfig(max_retries=2, base_delay=0.0),
+        )
+        with pytest.raises(RuntimeError):
+            await pipeline.embed_all(["1"])
+        assert pipeline.stats()["failed_batches"] == 1
+
+    def test_invalid_limits(self):
+        """Test configuration validation."""
+        with pytest.raises(ValueError):
+            EmbeddingPipeline(RecordingProvider(), max_concurrency=0)
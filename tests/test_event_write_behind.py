@@ -0,0 +1,180 @@
+"""
+Tests for write-behind batched event appends.
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+from agent_sdk.observability.stream_envelope import StreamEnvelope, StreamChannel
+from agent_sdk.server.run_store import RunEventStore
+from agent_sdk.storage.sqlite import SQLiteStorage
+from agent_sdk.storage.write_behind import EventWriteBuffer
+from agent_sdk.testing.mocks import InMemoryStorage
+
+
+def _event(run_id: str, seq: int, event: str = "token", stream=StreamChannel.ASSISTANT) -> StreamEnvelope:
+    return StreamEnvelope(
+        run_id=run_id,
+        session_id="sess",
+        stream=stream,
+        event=event,
+        payload={"i": seq},
+        seq=seq,
+    )
+
+
+class RecordingStorage(InMemoryStorage):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def append_events(self, events):
+        self.batches.append(len(events))
+        super().append_events(events)
+
+
+def test_sqlite_append_events_batch():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = SQLiteStorage(os.path.join(tmpdir, "storage.db"))
+        storage.append_events([_event("run_1", seq) for seq in range(5)])
+        storage.append_events([])
+
+        events = storage.list_events("run_1")
+        assert [event.seq for event in events] == [0, 1, 2, 3, 4]
+        assert events[2].payload == {"i": 2}
+
+
+def test_write_buffer_batches_and_preserves_order():
+    storage = RecordingStorage()
+    buffer = EventWriteBuffer(storage, flush_interval=10.0, max_batch_size=4)
+    for seq in range(10):
+        buffer.append(_event("run_1", seq))
+    assert buffer.flush(timeout=5)
+
+    assert [event.seq for event in storage.list_events("run_1")] == list(range(10))
+    assert sum(storage.batches) == 10
+    assert max(storage.batches) <= 4
+    assert len(storage.batches) < 10
+
+    metrics = buffer.metrics()
+    assert metrics["queue_depth"] == 0
+    assert metrics["events_written"] == 10
+    assert metrics["flush_latency_max_ms"] >= 0.0
+    buffer.close()
+
+
+def test_write_buffer_delete_waits_for_queued_appends():
+    storage = InMemoryStorage()
+    buffer = EventWriteBuffer(storage, flush_interval=10.0)
+    for seq in range(6):
+        buffer.append(_event("run_1", seq))
+    buffer.delete_events("run_1", before_seq=4)
+    buffer.close()
+
+    assert [event.seq for event in storage.list_events("run_1")] == [4, 5]
+
+
+def test_write_buffer_writes_synchronously_after_close():
+    storage = InMemoryStorage()
+    buffer = EventWriteBuffer(storage)
+    buffer.close()
+    buffer.append(_event("run_1", 1))
+
+    assert [event.seq for event in storage.list_events("run_1")] == [1]
+
+
+def test_run_store_flushes_on_run_completion():
+    storage = InMemoryStorage()
+    buffer = EventWriteBuffer(storage, flush_interval=60.0)
+    store = RunEventStore(storage=storage, write_buffer=buffer)
+    store.append_event("run_1", _event("run_1", 0, "start", StreamChannel.LIFECYCLE))
+    store.append_event("run_1", _event("run_1", 1))
+    store.append_event("run_1", _event("run_1", 2, "end", StreamChannel.LIFECYCLE))
+
+    deadline = time.monotonic() + 5
+    while len(storage.list_events("run_1")) < 3 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert [event.seq for event in storage.list_events("run_1")] == [0, 1, 2]
+    assert store.storage_metrics()["queue_depth"] == 0
+    store.close()
+
+
+def test_run_store_does_not_block_on_terminal_flush():
+    release = threading.Event()
+
+    class SlowStorage(InMemoryStorage):
+        def append_events(self, events):
+            release.wait(5)
+            super().append_events(events)
+
+    storage = SlowStorage()
+    store = RunEventStore(storage=storage, write_buffer=EventWriteBuffer(storage, flush_interval=60.0))
+    start = time.perf_counter()
+    store.append_event("run_1", _event("run_1", 0, "end", StreamChannel.LIFECYCLE))
+    elapsed = time.perf_counter() - start
+
+    release.set()
+    assert elapsed < 1
+    assert store.flush(timeout=5)
+    assert [event.seq for event in storage.list_events("run_1")] == [0]
+    store.close()
+
+
+def test_write_buffer_try_append_never_waits():
+    release = threading.Event()
+
+    class SlowStorage(InMemoryStorage):
+        def append_events(self, events):
+            release.wait(5)
+            super().append_events(events)
+
+    storage = SlowStorage()
+    buffer = EventWriteBuffer(storage, flush_interval=0.0, max_batch_size=1, max_queue_size=1)
+    buffer.append(_event("run_1", 0))
+    deadline = time.monotonic() + 5
+    while buffer.queue_depth and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert buffer.try_append(_event("run_1", 1))
+
+    start = time.perf_counter()
+    assert not buffer.try_append(_event("run_1", 2))
+    buffer.delete_events("run_1", before_seq=1, block=False)
+    assert time.perf_counter() - start < 1
+
+    release.set()
+    buffer.close()
+    assert [event.seq for event in storage.list_events("run_1")] == [0, 1]
+
+
+def test_run_store_async_append_moves_off_the_loop_when_buffer_is_full():
+    release = threading.Event()
+
+    class SlowStorage(InMemoryStorage):
+        def append_events(self, events):
+            release.wait(5)
+            super().append_events(events)
+
+    storage = SlowStorage()
+    buffer = EventWriteBuffer(storage, flush_interval=0.0, max_batch_size=1, max_queue_size=1)
+    store = RunEventStore(storage=storage, write_buffer=buffer)
+
+    async def emit():
+        await store.append_event_async("run_1", _event("run_1", 0))
+        while buffer.queue_depth:
+            await asyncio.sleep(0.005)
+        await store.append_event_async("run_1", _event("run_1", 1))
+        blocked = asyncio.create_task(store.append_event_async("run_1", _event("run_1", 2)))
+        # The loop keeps running while the third append waits for room.
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+        release.set()
+        await asyncio.wait_for(blocked, 5)
+
+    asyncio.run(emit())
+    assert store.flush(timeout=5)
+    assert [event.seq for event in storage.list_events("run_1")] == [0, 1, 2]
+    assert [event.seq for event in store.list_events("run_1")] == [0, 1, 2]
+    store.close()
@@ -0,0 +1,112 @@
+"""Tests for per-tenant fair-share scheduling."""
+
+import asyncio
+
+from agent_sdk.execution.durable_queue import SQLiteQueueBackend
+from agent_sdk.execution.fair_share import FairShareScheduler, TenantShare
+from agent_sdk.execution.queue import ExecutionQueue
+
+
+def _drain(scheduler, count):
+    order = []
+    for _ in range(count):
+        org_id, _ = scheduler.pop()
+        scheduler.release(org_id)
+        order.append(org_id)
+    return order
+
+
+def test_scheduler_interleaves_backlogged_tenants():
+    scheduler = FairShareScheduler()
+    for index in range(100):
+        scheduler.push("heavy", index)
+    scheduler.push("light", "a")
+    scheduler.push("light", "b")
+
+    order = _drain(scheduler, 6)
+    assert order[:4].count("light") == 2
+    assert len(scheduler) == 96
+
+
+def test_scheduler_honours_weights_and_priority_classes():
+    scheduler = FairShareScheduler()
+    scheduler.set_share("gold", TenantShare(weight=3))
+    scheduler.set_share("batch", TenantShare(priority_class=1))
+    for index in range(40):
+        scheduler.push("gold", index)
+        scheduler.push("silver", index)
+        scheduler.push("batch", index)
+
+    order = _drain(scheduler, 40)
+    assert order.count("gold") == 30
+    assert order.count("silver") == 10
+    assert "batch" not in order
+
+
+def test_scheduler_enforces_concurrency_cap():
+    scheduler = FairShareScheduler(TenantShare(max_concurrency=2))
+    for index in range(5):
+        scheduler.push("org", index)
+
+    assert scheduler.pop() == ("org", 0)
+    assert scheduler.pop() == ("org", 1)
+    assert scheduler.pop() is None
+    scheduler.release("org")
+    assert scheduler.pop() == ("org", 2)
+    assert scheduler.running("org") == 2
+
+
+def test_scheduler_does_not_bank_credit_for_idle_tenants():
+    scheduler = FairShareScheduler()
+    for index in range(50):
+        scheduler.push("busy", index)
+    _drain(scheduler, 40)
+    for index in range(20):
+        scheduler.push("late", index)
+
+    order = _drain(scheduler, 10)
+    assert order.count("late") == 5
+
+
+def test_execution_queue_serves_light_tenant_during_heavy_backlog():
+    started = []
+
+    async def job(org_id):
+        started.append(org_id)
+        await asyncio.sleep(0.001)
+
+    async def run():
+        queue = ExecutionQueue(worker_count=2)
+        heavy = [asyncio.ensure_future(queue.submit_for("heavy", job, "heavy")) for _ in range(50)]
+        await asyncio.sleep(0)
+        light = [asyncio.ensure_future(queue.submit_for("light", job, "light")) for _ in range(3)]
+        await asyncio.gather(*heavy, *light)
+        await queue.shutdown()
+
+    asyncio.run(run())
+    assert max(index for index, org_id in enumerate(started) if org_id == "light") < 10
+
+
+def test_sqlite_queue_claims_fairly_and_respects_caps(tmp_path):
+    path = str(tmp_path / "queue.db")
+    backend = SQLiteQueueBackend(path)
+    backend.set_tenant_share("capped", TenantShare(max_concurrency=1))
+    for index in range(20):
+        backend.enqueue({"org_id": "heavy", "n": index}, max_attempts=1)
+    backend.enqueue({"org_id": "light", "n": 0}, max_attempts=1)
+    backend.enqueue({"org_id": "capped", "n": 0}, max_attempts=1)
+    backend.enqueue({"org_id": "capped", "n": 1}, max_attempts=1)
+
+    other = SQLiteQueueBackend(path)
+    first = backend.claim_batch(3)
+    second = other.claim_batch(3)
+    orgs = [job.payload["org_id"] for job in first + second]
+
+    assert orgs.count("light") == 1
+    assert orgs.count("capped") == 1
+    assert orgs.count("heavy") == 4
+    assert other.get_tenant_share("capped").max_concurrency == 1
+
+    capped = next(job for job in first + second if job.payload["org_id"] == "capped")
+    backend.mark_done(capped.job_id)
+    assert "capped" in [job.payload["org_id"] for job in other.claim_batch(3)]
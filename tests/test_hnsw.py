@@ -0,0 +1,144 @@
+"""Tests for the HNSW approximate nearest neighbour index."""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agent_sdk.data_connectors.document import Document
+from agent_sdk.memory.embeddings import HuggingFaceEmbeddings
+from agent_sdk.memory.hnsw import HNSWIndex
+from agent_sdk.memory.semantic_search import MMRSearch, SemanticSearchEngine
+from agent_sdk.memory.vector_index import NumpyVectorIndex
+
+
+def _vectors(count, dimension=32, seed=7):
+    rng = random.Random(seed)
+    return [[rng.gauss(0.0, 1.0) for _ in range(dimension)] for _ in range(count)]
+
+
+@pytest.fixture
+def populated():
+    """Build an HNSW index and an exact index over the same vectors."""
+    approx = HNSWIndex(M=8, ef_construction=100, ef_search=64, seed=1)
+    exact = NumpyVectorIndex()
+    for i, vector in enumerate(_vectors(300)):
+        approx.add(f"v{i}", vector)
+        exact.add(f"v{i}", vector)
+    return approx, exact
+
+
+class TestHNSWIndex:
+    """Tests for HNSWIndex."""
+
+    def test_recall_against_exact(self, populated):
+        """Test recall@10 stays high relative to exact search."""
+        approx, exact = populated
+        hits = 0
+        queries = _vectors(20, seed=99)
+        for query in queries:
+            truth = {item_id for item_id, _ in exact.search(query, 10)}
+            found = {item_id for item_id, _ in approx.search(query, 10)}
+            hits += len(truth & found)
+        assert hits / (10 * len(queries)) >= 0.9
+
+    def test_results_sorted_by_similarity(self, populated):
+        """Test results are ordered most similar first."""
+        approx, _ = populated
+        scores = [score for _, score in approx.search(_vectors(1, seed=3)[0], 10)]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_remove_and_replace(self, populated):
+        """Test deleted IDs are skipped and re-added IDs use the new vector."""
+        approx, _ = populated
+        target = _vectors(300)[5]
+        assert approx.search(target, 1)[0][0] == "v5"
+
+        assert approx.remove("v5") is True
+        assert "v5" not in approx
+        assert all(item_id != "v5" for item_id, _ in approx.search(target, 10))
+        assert approx.deleted_count == 1
+
+        approx.add("v5", target)
+        assert approx.search(target, 1)[0] == ("v5", pytest.approx(1.0, abs=1e-5))
+        assert len(approx) == 300
+
+    def test_rebuild_drops_tombstones(self, populated):
+        """Test rebuild removes deleted nodes."""
+        approx, _ = populated
+        for i in range(50):
+            approx.remove(f"v{i}")
+        approx.rebuild()
+        assert approx.deleted_count == 0
+        assert len(approx) == 250
+
+    def test_save_and_load(self, populated, tmp_path):
+        """Test an index round-trips through disk."""
+        approx, _ = populated
+        approx.remove("v0")
+        path = tmp_path / "index.npz"
+        approx.save(str(path))
+
+        restored = HNSWIndex.load(str(path))
+        query = _vectors(1, seed=11)[0]
+        assert restored.search(query, 10) == approx.search(query, 10)
+        assert len(restored) == len(approx)
+        assert "v0" not in restored
+
+    def test_invalid_parameters(self):
+        """Test parameter validation."""
+        with pytest.raises(ValueError):
+            HNSWIndex(M=1)
+        with pytest.raises(ValueError):
+            HNSWIndex(ef_search=0)
+
+
+class TestSemanticSearchEngineIndexBackend:
+    """Tests for SemanticSearchEngine with an index backend."""
+
+    @pytest.fixture
+    def documents(self):
+        texts = [
+            "Python is a programming language",
+            "JavaScript runs in web browsers",
+            "Cats are feline animals",
+            "Dogs are loyal pets",
+            "Rust programming language focuses on safety",
+        ]
+        return [
+            Document(content=text, metadata={}, source="test", doc_id=f"doc_{i}")
+            for i, text in enumerate(texts)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_hnsw_backend_matches_exact(self, documents):
+        """Test the HNSW backend returns the same top hit as a full scan."""
+        embeddings = HuggingFaceEmbeddings()
+        exact = SemanticSearchEngine(embeddings)
+        approx = SemanticSearchEngine(embeddings, vector_index=HNSWIndex(seed=0))
+        await exact.index(documents)
+        await approx.index(documents)
+
+        expected = await exact.search("programming language", top_k=2)
+        actual = await approx.search("programming language", top_k=2)
+        assert [doc.doc_id for doc, _ in actual] == [doc.doc_id for doc, _ in expected]
+        assert len(approx.vector_index) == len(documents)
+
+    @pytest.mark.asyncio
+    async def test_reranking_strategy_uses_index_candidates(self, documents):
+        """Test non-similarity strategies re-rank index candidates."""
+        engine = SemanticSearchEngine(
+            HuggingFaceEmbeddings(),
+            strategy=MMRSearch(diversity_penalty=0.5),
+            vector_index=HNSWIndex(seed=0),
+            candidate_multiplier=2,
+        )
+        await engine.index(documents)
+        results = await engine.search("programming", top_k=2)
+        assert len(results) == 2
+
+    def test_invalid_candidate_multiplier(self):
+        """Test candidate_multiplier validation."""
+        with pytest.raises(ValueError):
+            SemanticSearchEngine(HuggingFaceEmbeddings(), candidate_multiplier=0)
@@ -188,3 +188,82 @@ class TestMemoryCompressionManager:
         await manager.add_message(Message("this is a longer message", "user"))
 
         assert manager.should_compact() is True
+
+
+def _render(items):
+    return [
+        item.summary if isinstance(item, SummarizedMessage) else item.content
+        for item in items
+    ]
+
+
+class TestIncrementalCompression:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "strategy", [CompressionStrategy.SUMMARIZATION, CompressionStrategy.CLUSTERING]
+    )
+    async def test_incremental_matches_full_compression(self, strategy):
+        manager = MemoryCompressionManager(strategy=strategy, summarization_window_size=3)
+        for i in range(25):
+            await manager.add_message(Message(f"message {i} " * 5, "user", f"m{i}"))
+            incremental = await manager.compress_memory()
+            full = await manager.engine.compress(list(manager.messages))
+            assert _render(incremental) == _render(full)
+            context = await manager.get_compressed_context()
+            assert context == "\n".join(_render(full))
+
+    @pytest.mark.asyncio
+    async def test_only_new_windows_are_summarized(self):
+        manager = MemoryCompressionManager(summarization_window_size=4)
+        calls = []
+        original = manager.engine._create_summary
+
+        async def counting(messages):
+            calls.append(len(messages))
+            return await original(messages)
+
+        manager.engine._create_summary = counting
+        for i in range(40):
+            await manager.add_message(Message(f"message {i}", "user", f"m{i}"))
+        await manager.get_compressed_context()
+        assert calls == [4] * 9
+
+        calls.clear()
+        await manager.get_compressed_context()
+        assert calls == []
+
+        await manager.add_message(Message("one more", "user", "m40"))
+        await manager.get_compressed_context()
+        assert calls == [1]
+
+    @pytest.mark.asyncio
+    async def test_rewritten_history_is_recompressed(self):
+        manager = MemoryCompressionManager(summarization_window_size=2)
+        for i in range(8):
+            await manager.add_message(Message(f"message {i}", "user", f"m{i}"))
+        await manager.compress_memory()
+
+        manager.messages = manager.messages[:3]
+        compressed = await manager.compress_memory()
+        full = await manager.engine.compress(list(manager.messages))
+        assert _render(compressed) == _render(full)
+        assert manager.ledger.total_tokens == sum(m.token_count for m in manager.messages)
+
+    @pytest.mark.asyncio
+    async def test_token_ledger_tracks_appends(self):
+        manager = MemoryCompressionManager(policy=CompactionPolicy(max_tokens=10))
+        await manager.add_message(Message("a" * 20, "user"))
+        assert manager.ledger.total_tokens == 5
+        assert manager.should_compact() is False
+
+        manager.messages.append(Message("b" * 40, "assistant"))
+        assert manager.should_compact() is True
+        assert manager.ledger.total_tokens == 15
+
+        await manager.clear()
+        assert manager.ledger.total_tokens == 0
+
+    def test_policy_uses_precomputed_total(self):
+        policy = CompactionPolicy(max_tokens=10)
+        assert policy.should_compact([], total_tokens=11) is True
+        assert policy.should_compact([Message("x" * 100, "user")], total_tokens=1) is False
@@ -0,0 +1,222 @@
+"""Tests for dependency-aware parallel plan execution."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agent_sdk.config.model_config import ModelConfig
+from agent_sdk.config.rate_limit import RateLimiter
+from agent_sdk.core.context import AgentContext
+from agent_sdk.core.tools import Tool
+from agent_sdk.exceptions import RateLimitError
+from agent_sdk.execution.executor import ExecutorAgent
+from agent_sdk.llm.mock import MockLLMClient
+from agent_sdk.observability.bus import EventBus
+from agent_sdk.planning.plan_schema import Plan, PlanStep
+from agent_sdk.reliability.policy import CircuitBreakerPolicy, ReliabilityManager, ReplayStore, RetryPolicy
+
+
+class ListSink:
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event)
+
+
+class SleepTool:
+    """Sleeps for ``inputs["delay"]`` and records start/end times and peak concurrency."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.spans = {}
+
+    def __call__(self, inputs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        start = time.perf_counter()
+        time.sleep(inputs["delay"])
+        with self.lock:
+            self.active -= 1
+            self.spans[inputs["name"]] = (start, time.perf_counter())
+        return inputs["name"]
+
+
+def _executor(tool, max_parallel_steps, sink=None):
+    context = AgentContext(tools={"sleep": Tool(name="sleep", description="s", func=tool)})
+    context.config["max_parallel_steps"] = max_parallel_steps
+    if sink is not None:
+        context.events = EventBus([sink])
+    return ExecutorAgent("executor", context, MockLLMClient())
+
+
+def _step(step_id, delay, depends_on=None):
+    return PlanStep(
+        id=step_id,
+        description=f"step {step_id}",
+        tool="sleep",
+        inputs={"delay": delay, "name": step_id},
+        depends_on=depends_on,
+    )
+
+
+def test_plan_dependencies_default_to_previous_step():
+    plan = Plan(task="t", steps=[_step(1, 0), _step(2, 0), _step(3, 0, depends_on=[]), _step(4, 0, [1, 3])])
+    assert plan.dependencies() == {1: [], 2: [1], 3: [], 4: [1, 3]}
+
+
+def test_plan_dependencies_reject_cycles_and_unknown_steps():
+    with pytest.raises(ValueError, match="cycle"):
+        Plan(task="t", steps=[_step(1, 0, [2]), _step(2, 0, [1])]).dependencies()
+    with pytest.raises(ValueError, match="unknown"):
+        Plan(task="t", steps=[_step(1, 0, [9])]).dependencies()
+
+
+def test_independent_steps_run_concurrently_and_report_in_plan_order():
+    tool = SleepTool()
+    sink = ListSink()
+    executor = _executor(tool, max_parallel_steps=3, sink=sink)
+    plan = Plan(task="t", steps=[_step(1, 0.2, []), _step(2, 0.05, []), _step(3, 0.1, [])])
+
+    start = time.perf_counter()
+    messages = executor.execute_plan(plan)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.3
+    assert tool.peak == 3
+    assert [m.metadata["step_id"] for m in messages] == [1, 2, 3]
+    step_ids = [e.data["step_id"] for e in sink.events if e.event_type == "executor.step.start"]
+    complete_ids = [e.data["step_id"] for e in sink.events if e.event_type == "executor.step.complete"]
+    assert step_ids == complete_ids == [1, 2, 3]
+    # Every event of step 1 precedes the first event of step 2, though step 2 finished first.
+    starts = [i for i, e in enumerate(sink.events) if e.event_type == "executor.step.start"]
+    step_one = [e.event_type for e in sink.events[starts[0]:starts[1]]]
+    assert step_one[-1] == "executor.step.complete"
+
+
+def test_dependencies_and_concurrency_limit_are_respected():
+    tool = SleepTool()
+    executor = _executor(tool, max_parallel_steps=2)
+    plan = Plan(
+        task="t",
+        steps=[_step("a", 0.05, []), _step("b", 0.05, []), _step("c", 0.05, []), _step("d", 0.01, ["a", "c"])],
+    )
+
+    messages = executor.execute_plan(plan)
+
+    assert len(messages) == 4
+    assert tool.peak == 2
+    assert tool.spans["d"][0] >= max(tool.spans["a"][1], tool.spans["c"][1])
+
+
+def test_parallel_mode_keeps_replay_semantics():
+    tool = SleepTool()
+    executor = _executor(tool, max_parallel_steps=4)
+    executor.context.config["replay_store"] = ReplayStore({1: "cached"})
+    executor.context.config["replay_mode"] = True
+    plan = Plan(task="t", steps=[_step(1, 0.01, []), _step(2, 0.01, [])])
+
+    messages = executor.execute_plan(plan)
+
+    assert "cached" in messages[0].content
+    assert set(tool.spans) == {2}
+
+
+def test_async_parallel_execution_follows_critical_path():
+    tool = SleepTool()
+    sink = ListSink()
+    executor = _executor(tool, max_parallel_steps=4, sink=sink)
+    plan = Plan(
+        task="t",
+        steps=[_step(1, 0.1, []), _step(2, 0.1, []), _step(3, 0.1, []), _step(4, 0.1, [1, 2, 3])],
+    )
+
+    start = time.perf_counter()
+    messages = asyncio.run(executor.execute_plan_async(plan))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.35
+    assert [m.metadata["step_id"] for m in messages] == [1, 2, 3, 4]
+    assert tool.spans[4][0] >= max(tool.spans[i][1] for i in (1, 2, 3))
+    step_ids = [e.data["step_id"] for e in sink.events if e.event_type == "executor.step.start"]
+    assert step_ids == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("run_async", [False, True], ids=["sync", "async"])
+def test_plans_without_dependencies_stay_sequential(run_async):
+    tool = SleepTool()
+    executor = _executor(tool, max_parallel_steps=4)
+    plan = Plan(task="t", steps=[_step(1, 0.02), _step(2, 0.02), _step(3, 0.02)])
+
+    if run_async:
+        asyncio.run(executor.execute_plan_async(plan))
+    else:
+        executor.execute_plan(plan)
+
+    assert tool.peak == 1
+    assert tool.spans[2][0] >= tool.spans[1][1]
+    assert tool.spans[3][0] >= tool.spans[2][1]
+
+
+def test_step_without_dependencies_waits_for_the_previous_step_only():
+    tool = SleepTool()
+    executor = _executor(tool, max_parallel_steps=4)
+    plan = Plan(task="t", steps=[_step(1, 0.05, []), _step(2, 0.05, []), _step(3, 0.01)])
+
+    executor.execute_plan(plan)
+
+    assert tool.spans[3][0] >= tool.spans[2][1]
+    assert tool.spans[2][0] < tool.spans[1][1]
+
+
+def test_parallel_steps_share_a_real_reliability_manager():
+    barrier = threading.Barrier(8)
+
+    def flaky(inputs):
+        barrier.wait(5)
+        raise RuntimeError(f"down {inputs['name']}")
+
+    manager = ReliabilityManager(RetryPolicy(max_retries=0), CircuitBreakerPolicy(failure_threshold=100))
+    context = AgentContext(tools={"flaky": Tool(name="flaky", description="f", func=flaky)})
+    context.config["max_parallel_steps"] = 8
+    context.config["reliability_manager"] = manager
+    executor = ExecutorAgent("executor", context, MockLLMClient())
+    plan = Plan(
+        task="t",
+        steps=[PlanStep(id=i, description="d", tool="flaky", inputs={"name": i}, depends_on=[]) for i in range(8)],
+    )
+
+    messages = executor.execute_plan(plan)
+
+    assert [m.metadata["success"] for m in messages] == [False] * 8
+    assert list(manager._breakers) == ["flaky"]
+    assert manager._breakers["flaky"]._failures == 8
+
+
+def test_parallel_summaries_share_a_real_rate_limiter():
+    calls = []
+
+    class CountingLLM(MockLLMClient):
+        def generate(self, messages, model_config):
+            calls.append(threading.get_ident())
+            return super().generate(messages, model_config)
+
+    context = AgentContext(
+        tools={"sleep": Tool(name="sleep", description="s", func=SleepTool())},
+        model_config=ModelConfig(name="mock", provider="mock", model_id="mock"),
+        rate_limiter=RateLimiter(max_requests=4),
+    )
+    context.config["max_parallel_steps"] = 6
+    executor = ExecutorAgent("executor", context, CountingLLM())
+    plan = Plan(task="t", steps=[_step(i, 0.02, []) for i in range(6)])
+
+    with pytest.raises(RateLimitError):
+        executor.execute_plan(plan)
+
+    assert len(calls) == 4
+    assert context.rate_limiter.get_remaining(agent="executor", model="mock") == 0
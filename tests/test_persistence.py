@@ -204,7 +204,8 @@ class TestSQLiteVectorStore:
         assert loaded is not None
         loaded_doc, loaded_embedding = loaded
         assert loaded_doc.content == sample_document.content
-        assert loaded_embedding == sample_embedding
+        # Embeddings are stored as float32.
+        assert loaded_embedding == pytest.approx(sample_embedding, rel=1e-6)
 
         doc_ids = await store.list_all()
         assert doc_ids == [sample_document.doc_id]
@@ -213,6 +214,78 @@ class TestSQLiteVectorStore:
         assert deleted is True
         assert await store.load(sample_document.doc_id) is None
 
+    @pytest.mark.asyncio
+    async def test_sqlite_save_many_load_many(self, tmp_path):
+        store = SQLiteVectorStore(path=str(tmp_path / "vectors.db"))
+        docs = [Document(content=f"doc {i}", source="s", doc_id=f"d{i}") for i in range(3)]
+        await store.save_many([(doc, [float(i), 1.0]) for i, doc in enumerate(docs)])
+
+        loaded = await store.load_many(["d2", "missing", "d0"])
+        assert loaded[0][0].doc_id == "d2"
+        assert loaded[0][1] == [2.0, 1.0]
+        assert loaded[1] is None
+        assert loaded[2][0].content == "doc 0"
+
+    @pytest.mark.asyncio
+    async def test_sqlite_search_ranks_and_filters(self, tmp_path):
+        store = SQLiteVectorStore(path=str(tmp_path / "vectors.db"), chunk_size=2)
+        items = [
+            (Document(content="east", metadata={"kind": "a"}, doc_id="east"), [1.0, 0.0]),
+            (Document(content="north", metadata={"kind": "b"}, doc_id="north"), [0.0, 1.0]),
+            (Document(content="northeast", metadata={"kind": "a"}, doc_id="ne"), [1.0, 1.0]),
+            (Document(content="west", metadata={"kind": "b"}, doc_id="west"), [-1.0, 0.0]),
+            (Document(content="other", doc_id="other"), [1.0, 0.0, 0.0]),
+        ]
+        await store.save_many(items)
+
+        results = await store.search([1.0, 0.1], top_k=3)
+        assert [doc.doc_id for doc, _ in results] == ["east", "ne", "north"]
+        assert results[0][1] == pytest.approx(0.995, abs=1e-3)
+
+        filtered = await store.search([1.0, 0.1], top_k=3, metadata_filter={"kind": "b"})
+        assert [doc.doc_id for doc, _ in filtered] == ["north", "west"]
+
+    @pytest.mark.asyncio
+    async def test_sqlite_search_filters_on_awkward_keys_and_rejects_containers(self, tmp_path):
+        store = SQLiteVectorStore(path=str(tmp_path / "vectors.db"))
+        await store.save_many(
+            [
+                (Document(content="a", metadata={'say "hi"': 1, "back\\slash": True}, doc_id="a"), [1.0, 0.0]),
+                (Document(content="b", metadata={'say "hi"': 2}, doc_id="b"), [1.0, 0.0]),
+            ]
+        )
+
+        quoted = await store.search([1.0, 0.0], metadata_filter={'say "hi"': 2})
+        assert [doc.doc_id for doc, _ in quoted] == ["b"]
+        slashed = await store.search([1.0, 0.0], metadata_filter={"back\\slash": True})
+        assert [doc.doc_id for doc, _ in slashed] == ["a"]
+        missing = await store.search([1.0, 0.0], metadata_filter={"back\\slash": None})
+        assert [doc.doc_id for doc, _ in missing] == ["b"]
+        with pytest.raises(ValueError, match="metadata_filter"):
+            await store.search([1.0, 0.0], metadata_filter={"tags": ["x"]})
+
+    @pytest.mark.asyncio
+    async def test_sqlite_migrates_json_embeddings(self, tmp_path, sample_document):
+        import sqlite3
+
+        db_path = str(tmp_path / "legacy.db")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE vector_store (doc_id TEXT PRIMARY KEY, "
+                "document_json TEXT NOT NULL, embedding_json TEXT NOT NULL)"
+            )
+            conn.execute(
+                "INSERT INTO vector_store VALUES (?, ?, ?)",
+                (sample_document.doc_id, json.dumps(sample_document.to_dict()), "[0.5, 0.25]"),
+            )
+
+        store = SQLiteVectorStore(path=db_path)
+        loaded = await store.load(sample_document.doc_id)
+        assert loaded[1] == [0.5, 0.25]
+        results = await store.search([1.0, 0.5], top_k=1)
+        assert results[0][0].doc_id == sample_document.doc_id
+        store.close()
+
 
 class TestPineconeStore:
     """Tests for Pinecone vector store."""
@@ -12,3 +12,192 @@ def test_postgres_storage_requires_driver():
         pytest.skip("psycopg installed; integration test not configured")
     with pytest.raises(RuntimeError):
         PostgresStorage("postgresql://localhost/agent_sdk")
+
+
+class _FakeCopy:
+    def __init__(self, sink):
+        self._sink = sink
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write_row(self, row):
+        self._sink.append(row)
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self._conn = conn
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None, prepare=None):
+        self._conn.statements.append((sql, prepare))
+
+    def executemany(self, sql, rows):
+        self._conn.statements.append((sql, None))
+        self._conn.inserted.extend(rows)
+
+    def copy(self, sql):
+        self._conn.statements.append((sql, None))
+        return _FakeCopy(self._conn.copied)
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return []
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.statements = []
+        self.inserted = []
+        self.copied = []
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+
+class _FakePool:
+    instances = []
+
+    def __init__(self, conninfo, **kwargs):
+        self.conninfo = conninfo
+        self.kwargs = kwargs
+        self.conn = _FakeConnection()
+        self.closed = False
+        _FakePool.instances.append(self)
+
+    @staticmethod
+    def check_connection(conn):
+        return None
+
+    def connection(self):
+        pool = self
+
+        class _Checkout:
+            def __enter__(self):
+                return pool.conn
+
+            def __exit__(self, *exc):
+                return False
+
+        return _Checkout()
+
+    def get_stats(self):
+        return {"pool_size": self.kwargs["min_size"]}
+
+    def close(self):
+        self.closed = True
+
+
+def _pooled_storage(monkeypatch, **kwargs):
+    from agent_sdk.storage import postgres
+
+    monkeypatch.setattr(postgres, "psycopg", object())
+    monkeypatch.setattr(postgres, "ConnectionPool", _FakePool)
+    return postgres.PostgresStorage("postgresql://localhost/agent_sdk", **kwargs)
+
+
+def _event(seq):
+    from agent_sdk.observability.stream_envelope import StreamEnvelope, StreamChannel
+
+    return StreamEnvelope(
+        run_id="run_1",
+        session_id="sess_1",
+        stream=StreamChannel.ASSISTANT,
+        event="token",
+        payload={"seq": seq},
+        seq=seq,
+    )
+
+
+def test_postgres_storage_configures_pool(monkeypatch):
+    storage = _pooled_storage(monkeypatch, min_size=2, max_size=8, statement_timeout_ms=1500)
+    pool = _FakePool.instances[-1]
+
+    assert pool.kwargs["min_size"] == 2
+    assert pool.kwargs["max_size"] == 8
+    assert pool.kwargs["check"] is _FakePool.check_connection
+    assert pool.kwargs["kwargs"] == {"prepare_threshold": 0}
+    conn = _FakeConnection()
+    conn.execute = lambda sql: conn.statements.append((sql, None))
+    conn.commit = lambda: None
+    pool.kwargs["configure"](conn)
+    assert conn.statements == [("SET statement_timeout = 1500", None)]
+    assert storage.pool_stats() == {"pool_size": 2}
+    storage.close()
+    assert pool.closed
+
+
+def test_postgres_append_events_uses_copy_for_large_batches(monkeypatch):
+    storage = _pooled_storage(monkeypatch, initialize_schema=False, copy_threshold=4)
+    conn = _FakePool.instances[-1].conn
+
+    storage.append_events([_event(seq) for seq in range(3)])
+    assert len(conn.inserted) == 3
+    assert conn.copied == []
+
+    storage.append_events([_event(seq) for seq in range(5)])
+    assert [row[7] for row in conn.copied] == [0, 1, 2, 3, 4]
+    assert conn.statements[-1][0].startswith("COPY events (")
+
+
+def test_postgres_hot_reads_are_prepared(monkeypatch):
+    storage = _pooled_storage(monkeypatch, initialize_schema=False)
+    conn = _FakePool.instances[-1].conn
+
+    assert storage.get_run("run_1") is None
+    assert storage.list_events_from("run_1", from_seq=3) == []
+    assert all(prepare for _, prepare in conn.statements)
+
+
+def test_postgres_prepare_threshold_none_never_forces_prepare(monkeypatch):
+    storage = _pooled_storage(monkeypatch, initialize_schema=False, prepare_threshold=None)
+    conn = _FakePool.instances[-1].conn
+
+    storage.get_run("run_1")
+    storage.list_events_from("run_1", from_seq=3)
+
+    assert _FakePool.instances[-1].kwargs["kwargs"] == {"prepare_threshold": None}
+    assert all(prepare is None for _, prepare in conn.statements)
+
+
+def test_postgres_storage_falls_back_to_single_connection_without_pool(monkeypatch):
+    from agent_sdk.storage import postgres
+
+    conn = _FakeConnection()
+    conn.closed = conn.broken = False
+    conn.commits = conn.rollbacks = 0
+    conn.execute = lambda sql: conn.statements.append((sql, None))
+    conn.commit = lambda: setattr(conn, "commits", conn.commits + 1)
+    conn.rollback = lambda: setattr(conn, "rollbacks", conn.rollbacks + 1)
+    connects = []
+
+    class _FakePsycopg:
+        @staticmethod
+        def connect(dsn, **kwargs):
+            connects.append(kwargs)
+            return conn
+
+    monkeypatch.setattr(postgres, "psycopg", _FakePsycopg)
+    monkeypatch.setattr(postgres, "ConnectionPool", None)
+    storage = postgres.PostgresStorage("postgresql://localhost/agent_sdk", initialize_schema=False)
+
+    assert connects == [{"prepare_threshold": 0}]
+    assert storage.get_run("run_1") is None
+    assert conn.commits == 2
+    assert storage.pool_stats() == {"pool_size": 1, "pool_available": 1}
+    with pytest.raises(RuntimeError):
+        with storage._cursor():
+            raise RuntimeError("boom")
+    assert conn.rollbacks == 1
@@ -31,3 +31,41 @@ def test_client_headers_and_payload():
 
     compatibility = client.check_compatibility()
     assert compatibility["compatible"] is True
+
+
+def test_client_iterates_run_pages():
+    paths = []
+    pages = [
+        {"runs": [{"run_id": "run_2"}, {"run_id": "run_1"}], "next_cursor": "abc"},
+        {"runs": [{"run_id": "run_0"}], "next_cursor": None},
+    ]
+
+    def _request(method, path, payload=None):
+        paths.append(path)
+        return pages.pop(0)
+
+    client = AgentSDKClient("http://localhost:9000", api_key="key", request_func=_request)
+    run_ids = [run["run_id"] for run in client.iter_runs(page_size=2)]
+
+    assert run_ids == ["run_2", "run_1", "run_0"]
+    assert paths == ["/runs?limit=2", "/runs?limit=2&cursor=abc"]
+
+
+def test_client_iterates_session_pages_from_the_cursor_header():
+    paths = []
+    pages = [
+        ([{"session_id": "sess_1"}], {"x-next-cursor": "abc"}),
+        ([{"session_id": "sess_0"}], {}),
+    ]
+
+    def _request(method, path, payload=None, response_headers=None):
+        paths.append(path)
+        body, headers = pages.pop(0)
+        response_headers.update(headers)
+        return body
+
+    client = AgentSDKClient("http://localhost:9000", api_key="key", request_func=_request)
+    session_ids = [session["session_id"] for session in client.iter_sessions(page_size=1)]
+
+    assert session_ids == ["sess_1", "sess_0"]
+    assert paths == ["/sessions?limit=1", "/sessions?limit=1&cursor=abc"]
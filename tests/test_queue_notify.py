@@ -0,0 +1,200 @@
+"""Tests for durable queue wake-up notifiers."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+from agent_sdk.execution.durable_queue import DurableExecutionQueue, SQLiteQueueBackend
+from agent_sdk.execution.queue_notify import (
+    InProcessNotifier,
+    PostgresNotifier,
+    QueueNotifier,
+    SQLiteChangeNotifier,
+    notifier_for,
+)
+
+
+def test_in_process_notifier_wakes_and_times_out():
+    async def run():
+        notifier = InProcessNotifier()
+        assert await notifier.wait(0.01) is False
+        asyncio.get_running_loop().call_later(0.01, notifier.notify)
+        assert await notifier.wait(5) is True
+        assert await notifier.wait(0.01) is False
+
+    asyncio.run(run())
+
+
+def test_sqlite_change_notifier_sees_commits_from_other_connections(tmp_path):
+    path = str(tmp_path / "queue.db")
+    SQLiteQueueBackend(path)
+    notifier = SQLiteChangeNotifier(path, check_interval=0.005)
+
+    async def run():
+        assert await notifier.wait(0.02) is False
+        other = sqlite3.connect(path)
+        other.execute("INSERT INTO dlq (job_id) VALUES ('x')")
+        other.commit()
+        other.close()
+        return await notifier.wait(5)
+
+    assert asyncio.run(run()) is True
+    notifier.close()
+
+
+
+def test_sqlite_change_notifier_checks_data_version_off_the_loop(tmp_path):
+    path = str(tmp_path / "queue.db")
+    SQLiteQueueBackend(path)
+    checks = []
+
+    class RecordingNotifier(SQLiteChangeNotifier):
+        def _data_version(self):
+            checks.append(threading.get_ident())
+            return super()._data_version()
+
+    notifier = RecordingNotifier(path, check_interval=0.01)
+    checks.clear()
+
+    async def run():
+        loop_thread = threading.get_ident()
+        asyncio.get_running_loop().call_soon(notifier.notify)
+        assert await notifier.wait(5) is True
+        assert checks == []
+        assert await notifier.wait(0.05) is False
+        return loop_thread
+
+    loop_thread = asyncio.run(run())
+    notifier.close()
+    assert checks and loop_thread not in checks
+
+class FakePgConnection:
+    def __init__(self, bus):
+        self.bus = bus
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+        if sql.startswith("SELECT pg_notify"):
+            self.bus.append(params[0])
+
+    def notifies(self, timeout=None, stop_after=None):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.bus:
+                self.bus.pop(0)
+                yield object()
+                return
+            time.sleep(0.001)
+
+    def close(self):
+        pass
+
+
+def test_postgres_notifier_listens_and_notifies():
+    bus = []
+    notifier = PostgresNotifier("postgresql://unused", connect=lambda dsn, autocommit: FakePgConnection(bus))
+    assert notifier._listen_conn.statements[0][0] == 'LISTEN "agent_sdk_queue"'
+
+    async def run():
+        assert await notifier.wait(0.01) is False
+        notifier.notify()
+        return await notifier.wait(5)
+
+    assert asyncio.run(run()) is True
+
+
+def test_durable_queue_wakes_on_submit_without_polling(tmp_path):
+    async def handler(payload):
+        return payload["value"]
+
+    async def run():
+        backend = SQLiteQueueBackend(str(tmp_path / "queue.db"))
+        queue = DurableExecutionQueue(backend=backend, handler=handler, poll_interval=30)
+        await queue.start()
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        result = await asyncio.wait_for(queue.submit({"value": 7}), timeout=5)
+        elapsed = time.perf_counter() - start
+        await queue.stop()
+        return result, elapsed
+
+    result, elapsed = asyncio.run(run())
+    assert result == 7
+    assert elapsed < 1
+
+
+def test_durable_queue_runs_blocking_notify_off_the_loop(tmp_path):
+    from agent_sdk.storage.async_facade import AsyncStorageBackend
+
+    class RemoteNotifier(QueueNotifier):
+        blocking = True
+
+        def __init__(self):
+            self.threads = []
+
+        def notify(self):
+            self.threads.append(threading.current_thread().name)
+
+        async def wait(self, timeout):
+            await asyncio.sleep(timeout)
+            return False
+
+    async def handler(payload):
+        return payload["value"]
+
+    notifier = RemoteNotifier()
+    io_executor = AsyncStorageBackend(object(), thread_name_prefix="queue-io")
+
+    async def run():
+        backend = SQLiteQueueBackend(str(tmp_path / "queue.db"))
+        queue = DurableExecutionQueue(
+            backend=backend, handler=handler, poll_interval=0.02, notifier=notifier, io_executor=io_executor
+        )
+        await queue.start()
+        result = await asyncio.wait_for(queue.submit({"value": 3}), timeout=5)
+        await queue.stop()
+        return result
+
+    assert asyncio.run(run()) == 3
+    io_executor.close()
+    assert len(notifier.threads) == 1 and notifier.threads[0].startswith("queue-io")
+
+
+def test_durable_queue_wakes_on_enqueue_from_another_connection(tmp_path):
+    path = str(tmp_path / "queue.db")
+    started = []
+
+    async def handler(payload):
+        started.append(time.perf_counter())
+
+    async def run():
+        queue = DurableExecutionQueue(backend=SQLiteQueueBackend(path), handler=handler, poll_interval=30)
+        await queue.start()
+        await asyncio.sleep(0.05)
+        enqueued = time.perf_counter()
+        SQLiteQueueBackend(path).enqueue({"value": 1}, max_attempts=1)
+        for _ in range(500):
+            if started:
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return enqueued
+
+    enqueued = asyncio.run(run())
+    assert started and started[0] - enqueued < 1
+
+
+def test_notifier_for_picks_backend_specific_notifier(tmp_path):
+    backend = SQLiteQueueBackend(str(tmp_path / "queue.db"))
+    notifier = notifier_for(backend)
+    assert isinstance(notifier, SQLiteChangeNotifier)
+    notifier.close()
+
+    class Blocking:
+        def claim_blocking(self, timeout=None):
+            return None
+
+    assert notifier_for(Blocking()) is None
+    assert type(notifier_for(object())) is InProcessNotifier
@@ -1,42 +1,288 @@
 """Tests for Redis queue backend using a fake client."""
 
+import json
+import time
+
+import pytest
+
 from agent_sdk.execution.durable_queue import RedisQueueBackend
 
 
+def _b(value):
+    return value if isinstance(value, bytes) else str(value).encode("utf-8")
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return record
+
+    def execute(self):
+        calls, self._calls = self._calls, []
+        return [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in calls]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
 class FakeRedis:
+    """In-process stand-in for the Redis commands the queue backend uses."""
+
     def __init__(self):
-        self.hashes = {}
         self.lists = {}
+        self.sets = {}
+        self.strings = {}
+        self.hashes = {}
 
-    def hset(self, key, mapping):
-        self.hashes.setdefault(key, {}).update(mapping)
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def _live(self, key):
+        entry = self.strings.get(key)
+        if entry and entry[1] is not None and entry[1] <= time.monotonic():
+            del self.strings[key]
+        return key in self.strings
 
-    def hget(self, key, field):
-        value = self.hashes.get(key, {}).get(field)
-        if value is None:
+    def set(self, key, value, px=None, nx=False):
+        if nx and self._live(key):
             return None
-        if isinstance(value, str):
-            return value.encode("utf-8")
-        return value
+        expires = time.monotonic() + px / 1000 if px is not None else None
+        self.strings[key] = (_b(value), expires)
+        return True
+
+    def exists(self, key):
+        return int(self._live(key) or bool(self.lists.get(key)) or key in self.hashes)
 
-    def lpush(self, key, value):
-        self.lists.setdefault(key, []).insert(0, value)
+    def lpush(self, key, *values):
+        items = self.lists.setdefault(key, [])
+        for value in values:
+            items.insert(0, _b(value))
+        return len(items)
+
+    def rpush(self, key, *values):
+        items = self.lists.setdefault(key, [])
+        items.extend(_b(value) for value in values)
+        return len(items)
 
     def rpop(self, key):
         values = self.lists.get(key, [])
+        return values.pop() if values else None
+
+    def brpop(self, key, timeout=0):
+        value = self.rpop(key)
+        return (_b(key), value) if value is not None else None
+
+    def lmove(self, src, dst, wherefrom="LEFT", whereto="RIGHT"):
+        values = self.lists.get(src, [])
         if not values:
             return None
-        return values.pop()
+        value = values.pop() if wherefrom == "RIGHT" else values.pop(0)
+        if whereto == "LEFT":
+            self.lists.setdefault(dst, []).insert(0, value)
+        else:
+            self.lists.setdefault(dst, []).append(value)
+        return value
+
+    def blmove(self, src, dst, timeout, wherefrom="LEFT", whereto="RIGHT"):
+        return self.lmove(src, dst, wherefrom, whereto)
+
+    def lrem(self, key, count, value):
+        values = self.lists.get(key, [])
+        value = _b(value)
+        if value in values:
+            values.remove(value)
+            return 1
+        return 0
+
+    def lrange(self, key, start, end):
+        values = self.lists.get(key, [])
+        return list(values[start:] if end == -1 else values[start : end + 1])
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(_b(member) for member in members)
+
+    def srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(_b(member) for member in members)
+
+    def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update({field: _b(value) for field, value in mapping.items()})
+
+    def hmget(self, key, fields):
+        values = self.hashes.get(key, {})
+        return [values.get(field) for field in fields]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.lists.pop(key, None)
+            self.strings.pop(key, None)
+            self.hashes.pop(key, None)
+
+
+class CountingClient:
+    """Counts client calls; a pipeline counts once, however many commands it carries."""
 
-    def delete(self, key):
-        self.hashes.pop(key, None)
+    def __init__(self, inner):
+        self._inner = inner
+        self.calls = 0
 
+    def __getattr__(self, name):
+        self.calls += 1
+        return getattr(self._inner, name)
 
-def test_redis_queue_backend_enqueue_and_claim():
-    client = FakeRedis()
+
+def _clients():
+    yield pytest.param(FakeRedis, id="stand-in")
+    try:
+        import fakeredis
+    except ImportError:
+        return
+    yield pytest.param(fakeredis.FakeRedis, id="fakeredis")
+
+
+@pytest.fixture(params=list(_clients()))
+def client(request):
+    return request.param()
+
+
+def test_redis_queue_backend_enqueue_and_claim(client):
     backend = RedisQueueBackend(url="redis://unused", client=client)
     job_id = backend.enqueue({"task": "ping"}, max_attempts=2)
     job = backend.claim_next()
     assert job is not None
     assert job.job_id == job_id
     assert job.payload["task"] == "ping"
+
+
+def test_redis_queue_claimed_job_stays_in_processing_until_done(client):
+    backend = RedisQueueBackend(url="redis://unused", client=client, worker_id="w1")
+    job_ids = backend.enqueue_batch([{"n": 1}, {"n": 2}, {"n": 3}], max_attempts=2)
+
+    batch = backend.claim_batch(2)
+    assert [job.job_id for job in batch] == job_ids[:2]
+    assert len(client.lrange("agent_sdk:queue:processing:w1", 0, -1)) == 2
+
+    backend.mark_done(batch[0].job_id)
+    backend.requeue(batch[1], "retry")
+    assert len(client.lrange("agent_sdk:queue:processing:w1", 0, -1)) == 0
+
+    remaining = [backend.claim_blocking(timeout=0.01) for _ in range(2)]
+    assert [job.job_id for job in remaining] == [job_ids[2], job_ids[1]]
+    assert backend.claim_blocking(timeout=0.01) is None
+
+
+def test_redis_queue_reaper_requeues_jobs_of_dead_workers(client):
+    dead = RedisQueueBackend(url="redis://unused", client=client, worker_id="dead", lease_timeout=0.05)
+    retry_id, exhausted_id = dead.enqueue_batch([{"n": 1}, {"n": 2}], max_attempts=2)
+    exhausted = dead.claim_batch(2)[1]
+    exhausted.attempts = 1
+    dead.requeue(exhausted, "boom")
+    assert [job.job_id for job in dead.claim_batch(1)] == [exhausted_id]
+    time.sleep(0.1)
+
+    live = RedisQueueBackend(url="redis://unused", client=client, worker_id="live")
+    assert live.reap_expired() == 2
+    assert client.lrange("agent_sdk:queue:processing:dead", 0, -1) == []
+
+    job = live.claim_next()
+    assert job.job_id == retry_id
+    assert job.attempts == 1
+    assert len(client.lrange("agent_sdk:dlq", 0, -1)) == 1
+    assert live.claim_next() is None
+
+
+def test_redis_queue_claim_is_one_round_trip():
+    client = CountingClient(FakeRedis())
+    backend = RedisQueueBackend(url="redis://unused", client=client)
+    backend.enqueue_batch([{"n": index} for index in range(6)], max_attempts=1)
+    backend.claim_next()
+    client.calls = 0
+
+    assert len(backend.claim_batch(4)) == 4
+    assert client.calls == 1
+    client.calls = 0
+
+    backend.mark_done(backend.claim_next().job_id)
+    assert client.calls == 2
+
+
+def test_durable_queue_runs_jobs_from_redis_backend():
+    fakeredis = pytest.importorskip("fakeredis")
+    import asyncio
+
+    from agent_sdk.execution.durable_queue import DurableExecutionQueue
+
+    async def handler(payload):
+        return payload["value"] * 2
+
+    async def run():
+        backend = RedisQueueBackend(url="redis://unused", client=fakeredis.FakeRedis(), block_timeout=0.05)
+        queue = DurableExecutionQueue(backend=backend, handler=handler)
+        await queue.start()
+        result = await asyncio.wait_for(queue.submit({"value": 21}), timeout=2)
+        await queue.stop()
+        return result
+
+    assert asyncio.run(run()) == 42
+
+
+def _legacy_enqueue(client, job_id, payload, attempts=0, max_attempts=3):
+    client.hset(
+        f"agent_sdk:job:{job_id}",
+        mapping={"payload_json": json.dumps(payload), "attempts": attempts, "max_attempts": max_attempts},
+    )
+    client.lpush("agent_sdk:queue", job_id)
+
+
+def test_redis_queue_claims_jobs_left_in_the_legacy_format(client):
+    backend = RedisQueueBackend("redis://localhost", client=client)
+    _legacy_enqueue(client, "job_old", {"value": 1}, attempts=1)
+    _legacy_enqueue(client, "job_retry", {"value": 2})
+
+    done, retried = backend.claim_batch(2)
+    assert (done.job_id, done.payload, done.attempts, done.max_attempts) == ("job_old", {"value": 1}, 1, 3)
+    backend.mark_done(done.job_id)
+    retried.attempts += 1
+    backend.requeue(retried, "retry")
+
+    assert client.exists("agent_sdk:job:job_old") == 0
+    assert client.exists("agent_sdk:job:job_retry") == 0
+    again = backend.claim_next()
+    assert (again.job_id, again.payload, again.attempts) == ("job_retry", {"value": 2}, 1)
+    backend.mark_done(again.job_id)
+    assert client.lrange(backend._processing_key, 0, -1) == []
+
+
+def test_redis_queue_reaper_keeps_entries_pushed_while_it_runs(client):
+    dead = RedisQueueBackend(url="redis://unused", client=client, worker_id="dead", lease_timeout=0.05)
+    first_id, late_id = dead.enqueue_batch([{"n": 1}, {"n": 2}], max_attempts=3)
+    dead.claim_next()
+    time.sleep(0.1)
+
+    live = RedisQueueBackend(url="redis://unused", client=client, worker_id="live")
+    job_data = live._job_data
+    woke = []
+
+    def claim_during_reap(raw):
+        # The "dead" worker wakes up and claims another job mid-reap.
+        if not woke:
+            woke.append(client.lmove("agent_sdk:queue", "agent_sdk:queue:processing:dead"))
+        return job_data(raw)
+
+    live._job_data = claim_during_reap
+    assert live.reap_expired() == 2
+    assert client.lrange("agent_sdk:queue:processing:dead", 0, -1) == []
+    assert client.lrange("agent_sdk:queue:processing:live", 0, -1) == []
+    assert sorted(job.job_id for job in live.claim_batch(2)) == sorted([first_id, late_id])
@@ -60,3 +60,17 @@ def test_set_and_get_retention_policy(client):
     )
     assert fetched.status_code == 200
     assert fetched.json()["max_events"] == 50
+
+
+def test_retention_run_and_status(client):
+    response = client.post("/admin/retention/run", headers={"X-API-Key": "test-key"})
+    assert response.status_code == 200
+    report = response.json()
+    assert report["complete"] is True
+    assert report["runs_removed"] == 0
+
+    status = client.get("/admin/retention/status", headers={"X-API-Key": "test-key"})
+    assert status.status_code == 200
+    payload = status.json()
+    assert payload["passes"] == 1
+    assert payload["last_pass"]["batches"] == report["batches"]
@@ -0,0 +1,159 @@
+"""Tests for the background retention worker."""
+
+from datetime import datetime, timedelta, timezone
+
+from agent_sdk.observability.event_retention import EventRetentionPolicy
+from agent_sdk.observability.stream_envelope import (
+    RunMetadata,
+    RunStatus,
+    SessionMetadata,
+    StreamChannel,
+    StreamEnvelope,
+)
+from agent_sdk.server.multi_tenant import MultiTenantStore, RetentionPolicyConfig
+from agent_sdk.server.retention import RetentionWorker
+from agent_sdk.storage.sqlite import SQLiteStorage
+
+
+def _event(run_id: str, seq: int) -> StreamEnvelope:
+    return StreamEnvelope(
+        run_id=run_id,
+        session_id="sess_1",
+        stream=StreamChannel.ASSISTANT,
+        event="message",
+        payload={"text": f"msg-{seq}"},
+        seq=seq,
+        status=RunStatus.RUNNING.value,
+        metadata={"org_id": "default"},
+    )
+
+
+def _storage_with_events(tmp_path, run_id: str, count: int) -> SQLiteStorage:
+    storage = SQLiteStorage(str(tmp_path / "retention.db"))
+    storage.create_session(SessionMetadata(session_id="sess_1"))
+    storage.create_run(
+        RunMetadata(run_id=run_id, session_id="sess_1", agent_id="agent", status=RunStatus.RUNNING)
+    )
+    storage.append_events([_event(run_id, seq) for seq in range(count)])
+    return storage
+
+
+def test_worker_trims_events_in_bounded_batches(tmp_path):
+    storage = _storage_with_events(tmp_path, "run_1", 20)
+    worker = RetentionWorker(
+        storage,
+        event_policy=EventRetentionPolicy(max_events=5, enabled=True),
+        batch_size=4,
+        batch_pause=0,
+        max_batches_per_pass=2,
+    )
+    worker.note_event("run_1", "default", 19)
+
+    first = worker.run_once()
+    assert first.complete is False
+    assert first.batches == 2
+    assert first.events_removed == 8
+    assert worker.stats()["pending_runs"] == 1
+
+    worker.max_batches_per_pass = 10
+    second = worker.run_once()
+    assert second.complete is True
+    assert second.events_removed == 7
+    assert [event.seq for event in storage.list_events("run_1")] == [15, 16, 17, 18, 19]
+    stats = worker.stats()
+    assert stats["events_removed"] == 15
+    assert stats["passes"] == 2
+    assert stats["pending_runs"] == 0
+
+
+def test_worker_uses_tenant_event_cap(tmp_path):
+    storage = _storage_with_events(tmp_path, "run_1", 6)
+    tenant_store = MultiTenantStore()
+    tenant_store.set_retention_policy("default", RetentionPolicyConfig(max_events=2))
+    worker = RetentionWorker(storage, tenant_store=tenant_store, batch_pause=0)
+    worker.note_event("run_1", "default", 5)
+
+    report = worker.run_once()
+
+    assert report.events_removed == 4
+    assert [event.seq for event in storage.list_events("run_1")] == [4, 5]
+
+
+def test_worker_prunes_old_runs_and_sessions(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "retention.db"))
+    past = (datetime.now(timezone.utc) - timedelta(days=10)).isoformat()
+    for index in range(3):
+        storage.create_session(
+            SessionMetadata(session_id=f"sess_old_{index}", org_id="default", created_at=past, updated_at=past)
+        )
+        storage.create_run(
+            RunMetadata(
+                run_id=f"run_old_{index}",
+                session_id=f"sess_old_{index}",
+                agent_id="agent",
+                org_id="default",
+                status=RunStatus.COMPLETED,
+                created_at=past,
+            )
+        )
+    storage.create_session(SessionMetadata(session_id="sess_new", org_id="default"))
+    tenant_store = MultiTenantStore()
+    tenant_store.set_retention_policy(
+        "default", RetentionPolicyConfig(max_run_age_days=5, max_session_age_days=5)
+    )
+    worker = RetentionWorker(storage, tenant_store=tenant_store, batch_size=2, batch_pause=0)
+
+    report = worker.run_once()
+
+    assert report.runs_removed == 3
+    assert report.sessions_removed == 3
+    assert report.complete is True
+    assert [session.session_id for session in storage.list_sessions()] == ["sess_new"]
+
+
+def test_worker_checkpoint_survives_restart(tmp_path):
+    storage = _storage_with_events(tmp_path, "run_1", 10)
+    checkpoint_path = str(tmp_path / "retention.json")
+    policy = EventRetentionPolicy(max_events=2, enabled=True)
+    worker = RetentionWorker(
+        storage,
+        event_policy=policy,
+        batch_size=3,
+        batch_pause=0,
+        max_batches_per_pass=1,
+        checkpoint_path=checkpoint_path,
+    )
+    worker.note_event("run_1", "default", 9)
+    worker.run_once()
+
+    restarted = RetentionWorker(storage, event_policy=policy, batch_pause=0, checkpoint_path=checkpoint_path)
+    assert restarted.stats()["events_removed"] == 3
+    assert restarted.checkpoint.pending_runs["run_1"].trimmed_before == 3
+
+    restarted.run_once()
+    assert [event.seq for event in storage.list_events("run_1")] == [8, 9]
+    assert restarted.stats()["pending_runs"] == 0
+
+
+def test_worker_resumes_trimming_from_the_previous_floor(tmp_path):
+    storage = _storage_with_events(tmp_path, "run_1", 20)
+    worker = RetentionWorker(
+        storage,
+        event_policy=EventRetentionPolicy(max_events=5, enabled=True),
+        batch_size=4,
+        batch_pause=0,
+    )
+    worker.note_event("run_1", "default", 19)
+    assert worker.run_once().events_removed == 15
+    assert worker.stats()["pending_runs"] == 0
+    assert worker.checkpoint.trimmed_floors == {"run_1": 15}
+
+    storage.append_events([_event("run_1", seq) for seq in range(20, 22)])
+    worker.note_event("run_1", "default", 21)
+    report = worker.run_once()
+
+    # One window past the old floor, not a sweep of the already-trimmed range from zero.
+    assert report.batches == 1
+    assert report.events_removed == 2
+    assert [event.seq for event in storage.list_events("run_1")] == [17, 18, 19, 20, 21]
+    assert worker.checkpoint.trimmed_floors == {"run_1": 17}
@@ -0,0 +1,217 @@
+"""Tests for retrieval indexes and the vectorized retrieval strategies."""
+
+import random
+from typing import List
+
+import pytest
+
+from agent_sdk.data_connectors.document import Document
+from agent_sdk.memory import semantic_search
+from agent_sdk.memory.embeddings import EmbeddingProvider
+from agent_sdk.memory.retrieval_index import BM25Index, MetadataIndex
+from agent_sdk.memory.semantic_search import (
+    HybridSearch,
+    MMRSearch,
+    SemanticSearchEngine,
+)
+
+
+class CountingProvider(EmbeddingProvider):
+    """Deterministic bag-of-letters embeddings."""
+
+    def __init__(self):
+        self.calls = 0
+
+    @property
+    def embedding_dimension(self) -> int:
+        return 26
+
+    async def embed_text(self, text: str) -> List[float]:
+        self.calls += 1
+        vector = [0.0] * 26
+        for char in text.lower():
+            if "a" <= char <= "z":
+                vector[ord(char) - ord("a")] += 1.0
+        return vector
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return [await self.embed_text(text) for text in texts]
+
+
+def _doc(doc_id, content, **metadata):
+    return Document(content=content, metadata=metadata, source="test", doc_id=doc_id)
+
+
+class TestMetadataIndex:
+    """Tests for MetadataIndex."""
+
+    def test_candidates_intersect_fields(self):
+        index = MetadataIndex()
+        index.add("a", {"type": "fact", "lang": "en"})
+        index.add("b", {"type": "fact", "lang": "de"})
+        index.add("c", {"type": "tutorial", "lang": "en"})
+
+        assert index.candidates({"type": "fact"}) == {"a", "b"}
+        assert index.candidates({"type": "fact", "lang": "en"}) == {"a"}
+        assert index.candidates({"type": "missing"}) == set()
+        assert index.candidates({}) == {"a", "b", "c"}
+
+    def test_reindex_and_remove(self):
+        index = MetadataIndex()
+        index.add("a", {"type": "fact"})
+        index.add("a", {"type": "tutorial"})
+        assert index.candidates({"type": "fact"}) == set()
+        assert index.remove("a") is True
+        assert index.remove("a") is False
+        assert len(index) == 0
+
+    def test_none_matches_missing_field_and_unhashable_values(self):
+        index = MetadataIndex()
+        index.add("a", {"tags": ["x", "y"]})
+        index.add("b", {"tags": None})
+        assert index.candidates({"tags": ["x", "y"]}) == {"a"}
+        assert index.candidates({"other": None}) == {"a", "b"}
+
+
+class TestBM25Index:
+    """Tests for BM25Index."""
+
+    def test_rare_terms_score_higher(self):
+        index = BM25Index()
+        index.add("a", "python programming language")
+        index.add("b", "java programming language")
+        index.add("c", "cats are animals")
+
+        scores = index.score("python programming")
+        assert set(scores) == {"a", "b"}
+        assert scores["a"] > scores["b"]
+
+    def test_incremental_updates(self):
+        index = BM25Index()
+        index.add("a", "alpha beta")
+        index.add("b", "beta gamma")
+        assert index.document_frequency("beta") == 2
+
+        index.remove("b")
+        assert index.document_frequency("beta") == 1
+        assert "gamma" not in index.to_dict()["documents"]["a"]
+
+        index.add("a", "delta")
+        assert index.score("alpha") == {}
+        assert set(index.score("delta")) == {"a"}
+
+    def test_candidates_restrict_scoring(self):
+        index = BM25Index()
+        for i in range(10):
+            index.add(str(i), "shared term")
+        assert set(index.score("shared", candidates={"3", "7"})) == {"3", "7"}
+
+    def test_roundtrip(self):
+        index = BM25Index(k1=1.2)
+        index.add("a", "alpha beta beta")
+        index.add("b", "gamma")
+        restored = BM25Index.from_dict(index.to_dict())
+        assert restored.k1 == 1.2
+        assert restored.score("beta gamma") == pytest.approx(index.score("beta gamma"))
+
+
+class TestVectorizedStrategies:
+    """Tests for the numpy and pure-Python retrieval paths."""
+
+    def _items(self, count=40, dimension=8, seed=5):
+        rng = random.Random(seed)
+        return [
+            (_doc(f"d{i}", f"doc {i}"), [rng.gauss(0, 1) for _ in range(dimension)])
+            for i in range(count)
+        ]
+
+    def test_mmr_paths_agree(self, monkeypatch):
+        """Test the similarity-matrix MMR matches the pure-Python greedy loop."""
+        pytest.importorskip("numpy")
+        items = self._items()
+        query = items[0][1]
+        vectorized = MMRSearch(diversity_penalty=0.7, fetch_k=None).retrieve(query, items, top_k=6)
+
+        monkeypatch.setattr(semantic_search, "np", None)
+        fallback = MMRSearch(diversity_penalty=0.7, fetch_k=None).retrieve(query, items, top_k=6)
+
+        assert [doc.doc_id for doc, _ in vectorized] == [doc.doc_id for doc, _ in fallback]
+        assert [s for _, s in vectorized] == pytest.approx([s for _, s in fallback])
+
+    def test_mmr_penalizes_duplicates(self):
+        items = [
+            (_doc("a", "a"), [1.0, 0.0]),
+            (_doc("a2", "a2"), [1.0, 0.01]),
+            (_doc("b", "b"), [0.6, 0.8]),
+        ]
+        results = MMRSearch(diversity_penalty=1.0).retrieve([1.0, 0.1], items, top_k=2)
+        assert [doc.doc_id for doc, _ in results] == ["a2", "b"]
+
+    def test_mmr_invalid_fetch_k(self):
+        with pytest.raises(ValueError):
+            MMRSearch(fetch_k=0)
+
+    def test_hybrid_blends_keyword_scores(self):
+        items = [
+            (_doc("a", "a"), [1.0, 0.0]),
+            (_doc("b", "b"), [0.9, 0.1]),
+        ]
+        search = HybridSearch(keyword_weight=0.5)
+        results = search.retrieve([1.0, 0.0], items, top_k=2, keyword_scores={"b": 4.0})
+        assert [doc.doc_id for doc, _ in results] == ["b", "a"]
+        assert results[1][1] == pytest.approx(0.5)
+
+    def test_hybrid_ignores_keyword_scores_by_default(self):
+        items = [
+            (_doc("a", "a"), [1.0, 0.0]),
+            (_doc("b", "b"), [0.9, 0.1]),
+        ]
+        results = HybridSearch().retrieve([1.0, 0.0], items, top_k=2, keyword_scores={"b": 4.0})
+        assert [doc.doc_id for doc, _ in results] == ["a", "b"]
+        assert results[0][1] == pytest.approx(1.0)
+
+
+class TestFilteredEngineSearch:
+    """Tests for metadata pre-filtering in SemanticSearchEngine."""
+
+    @pytest.mark.asyncio
+    async def test_filter_restricts_candidates_before_scoring(self, monkeypatch):
+        engine = SemanticSearchEngine(CountingProvider(), strategy=HybridSearch(keyword_weight=0.5))
+        await engine.index([
+            _doc(f"d{i}", f"document number {i}", group="odd" if i % 2 else "even")
+            for i in range(20)
+        ])
+
+        scored = []
+        original = semantic_search._cosine_scores
+
+        def recording(query, embeddings):
+            scored.append(len(embeddings))
+            return original(query, embeddings)
+
+        monkeypatch.setattr(semantic_search, "_cosine_scores", recording)
+        results = await engine.search("document", top_k=3, metadata_filter={"group": "odd"})
+
+        assert scored == [10]
+        assert len(results) == 3
+        assert all(doc.get_metadata("group") == "odd" for doc, _ in results)
+
+    @pytest.mark.asyncio
+    async def test_empty_candidate_set_skips_embedding(self):
+        provider = CountingProvider()
+        engine = SemanticSearchEngine(provider)
+        await engine.index([_doc("a", "alpha", kind="x")])
+        calls = provider.calls
+
+        assert await engine.search("alpha", metadata_filter={"kind": "y"}) == []
+        assert provider.calls == calls
+
+    @pytest.mark.asyncio
+    async def test_keyword_match_wins_hybrid_ranking(self):
+        engine = SemanticSearchEngine(CountingProvider(), strategy=HybridSearch(keyword_weight=0.7))
+        await engine.index([
+            _doc("a", "zebra"),
+            _doc("b", "bears eat bread"),
+        ])
+        results = await engine.search("zebra", top_k=1)
+        assert results[0][0].doc_id == "a"
@@ -71,3 +71,52 @@ def test_run_and_session_endpoints(client):
     assert session_response.status_code == 200
     session_data = session_response.json()
     assert session_data["session_id"] == session_id
+
+
+def test_runs_and_sessions_paginate_with_cursor(client):
+    from agent_sdk.observability.stream_envelope import RunMetadata, RunStatus, SessionMetadata
+
+    headers = {"X-API-Key": "test-key"}
+    storage = client.app.state.storage
+    for index in range(5):
+        created_at = f"2026-01-01T00:00:0{index}+00:00"
+        storage.create_session(SessionMetadata(session_id=f"sess_{index}", created_at=created_at))
+        storage.create_run(
+            RunMetadata(
+                run_id=f"run_{index}",
+                session_id=f"sess_{index}",
+                agent_id="agent",
+                status=RunStatus.COMPLETED,
+                created_at=created_at,
+            )
+        )
+    storage.create_run(RunMetadata(run_id="run_other", session_id="sess_0", agent_id="agent", org_id="other"))
+
+    run_ids = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/runs", params=params, headers=headers)
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["runs"]) <= 2
+        run_ids.extend(run["run_id"] for run in body["runs"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert run_ids == ["run_4", "run_3", "run_2", "run_1", "run_0"]
+
+    first = client.get("/sessions", params={"limit": 3}, headers=headers)
+    assert [s["session_id"] for s in first.json()] == ["sess_4", "sess_3", "sess_2"]
+    second = client.get(
+        "/sessions",
+        params={"limit": 3, "cursor": first.headers["X-Next-Cursor"]},
+        headers=headers,
+    )
+    assert [s["session_id"] for s in second.json()] == ["sess_1", "sess_0"]
+    assert "X-Next-Cursor" not in second.headers
+
+    bad = client.get("/runs", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert bad.status_code == 400
+    for path in ("/runs", "/sessions", "/run/run_0/events/replay"):
+        assert client.get(path, params={"limit": 0}, headers=headers).status_code == 400
@@ -0,0 +1,171 @@
+"""Tests for the memory-mapped segment store."""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from agent_sdk.data_connectors.document import Document
+from agent_sdk.memory.persistence import FileSystemStore
+from agent_sdk.memory.segment_store import SegmentStore
+
+
+def _doc(i, **metadata):
+    return Document(content=f"content {i}", metadata=metadata, source="test", doc_id=f"doc_{i}")
+
+
+class TestSegmentStore:
+    """Tests for SegmentStore."""
+
+    @pytest.mark.asyncio
+    async def test_save_load_roundtrip(self, tmp_path):
+        store = SegmentStore(str(tmp_path))
+        await store.save(_doc(1, kind="a"), [0.5, 0.25, 1.0])
+
+        document, embedding = await store.load("doc_1")
+        assert document.content == "content 1"
+        assert document.metadata == {"kind": "a"}
+        assert embedding == [0.5, 0.25, 1.0]
+        assert await store.load("missing") is None
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_files_do_not_grow_per_document(self, tmp_path):
+        store = SegmentStore(str(tmp_path))
+        await store.save_many([(_doc(i), [float(i), 0.0]) for i in range(200)])
+        assert len(os.listdir(tmp_path)) == 4
+        assert len(await store.list_all()) == 200
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_reopen_replays_index(self, tmp_path):
+        store = SegmentStore(str(tmp_path))
+        await store.save_many([(_doc(i), [float(i), 1.0]) for i in range(5)])
+        await store.save(_doc(2), [9.0, 9.0])
+        await store.delete("doc_4")
+        store.close()
+
+        reopened = SegmentStore(str(tmp_path))
+        assert await reopened.list_all() == ["doc_0", "doc_1", "doc_2", "doc_3"]
+        assert (await reopened.load("doc_2"))[1] == [9.0, 9.0]
+        assert reopened.dead_rows == 2
+        loaded = await reopened.load_all()
+        assert [doc.doc_id for doc, _ in loaded] == ["doc_0", "doc_1", "doc_3", "doc_2"]
+        reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_delete(self, tmp_path):
+        store = SegmentStore(str(tmp_path))
+        await store.save(_doc(1), [1.0])
+        assert await store.delete("doc_1") is True
+        assert await store.delete("doc_1") is False
+        assert await store.load("doc_1") is None
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_dimension_mismatch(self, tmp_path):
+        store = SegmentStore(str(tmp_path))
+        await store.save(_doc(1), [1.0, 2.0])
+        with pytest.raises(ValueError):
+            await store.save(_doc(2), [1.0])
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_compaction_reclaims_dead_rows(self, tmp_path):
+        store = SegmentStore(str(tmp_path), compaction_ratio=0.3, min_compaction_rows=10)
+        await store.save_many([(_doc(i), [float(i), 1.0]) for i in range(10)])
+        for i in range(4):
+            await store.delete(f"doc_{i}")
+        store.wait_for_compaction(timeout=5)
+
+        assert store.compactions == 1
+        assert store.dead_rows == 0
+        assert store.generation == 1
+        assert not os.path.exists(tmp_path / "vectors-0.f32")
+        assert (await store.load("doc_7"))[1] == [7.0, 1.0]
+        store.close()
+
+        reopened = SegmentStore(str(tmp_path))
+        assert await reopened.list_all() == [f"doc_{i}" for i in range(4, 10)]
+        assert (await reopened.load("doc_9"))[0].content == "content 9"
+        reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_import_from_filesystem_store(self, tmp_path):
+        source = FileSystemStore(str(tmp_path / "files"))
+        for i in range(3):
+            await source.save(_doc(i), [float(i)])
+
+        store = SegmentStore(str(tmp_path / "segments"))
+        assert await store.import_from(source, batch_size=2) == 3
+        assert (await store.load("doc_2"))[1] == [2.0]
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_reopen_truncates_torn_writes(self, tmp_path):
+        store = SegmentStore(str(tmp_path))
+        await store.save_many([(_doc(i), [float(i), 1.0]) for i in range(3)])
+        store.close()
+        with open(tmp_path / "vectors-0.f32", "ab") as f:
+            f.write(b"\x01\x02\x03")
+        with open(tmp_path / "index-0.log", "ab") as f:
+            f.write(b"\x01\x05")
+
+        reopened = SegmentStore(str(tmp_path))
+        assert await reopened.list_all() == ["doc_0", "doc_1", "doc_2"]
+        await reopened.save(_doc(9), [9.0, 9.0])
+        reopened.close()
+
+        again = SegmentStore(str(tmp_path))
+        assert (await again.load("doc_9"))[1] == [9.0, 9.0]
+        assert (await again.load("doc_2"))[1] == [2.0, 1.0]
+        assert again.dead_rows == 0
+        again.close()
+
+
+def test_compaction_copies_without_the_lock_and_keeps_concurrent_writes(tmp_path):
+    class HookedStore(SegmentStore):
+        lock_was_free = None
+
+        def _copy_into(self, generation, new_files, ops, entries):
+            super()._copy_into(generation, new_files, ops, entries)
+            if self.lock_was_free is None:
+                probe = []
+
+                def try_lock():
+                    acquired = self._lock.acquire(blocking=False)
+                    if acquired:
+                        self._lock.release()
+                    probe.append(acquired)
+
+                thread = threading.Thread(target=try_lock)
+                thread.start()
+                thread.join()
+                self.lock_was_free = probe[0]
+                # Writes racing with the copy land in the old generation.
+                asyncio.run(self.save_many([(_doc(20), [20.0, 1.0]), (_doc(5), [55.0, 5.0])]))
+                asyncio.run(self.delete("doc_6"))
+                asyncio.run(self.save(_doc(21), [21.0, 1.0]))
+                asyncio.run(self.delete("doc_21"))
+
+    store = HookedStore(str(tmp_path), background_compaction=False, min_compaction_rows=10**6)
+    asyncio.run(store.save_many([(_doc(i), [float(i), 1.0]) for i in range(10)]))
+    for i in range(3):
+        asyncio.run(store.delete(f"doc_{i}"))
+
+    store.compact()
+
+    assert store.lock_was_free is True
+    assert store.generation == 1
+    expected = ["doc_20", "doc_3", "doc_4", "doc_5", "doc_7", "doc_8", "doc_9"]
+    assert asyncio.run(store.list_all()) == expected
+    assert asyncio.run(store.load("doc_5"))[1] == [55.0, 5.0]
+    assert asyncio.run(store.load("doc_20"))[1] == [20.0, 1.0]
+    store.close()
+
+    reopened = SegmentStore(str(tmp_path))
+    assert asyncio.run(reopened.list_all()) == expected
+    assert asyncio.run(reopened.load("doc_5"))[1] == [55.0, 5.0]
+    assert reopened.dead_rows == store.dead_rows == 3
+    reopened.close()
@@ -238,6 +238,120 @@ class TestSemanticMemory:
         assert '"total_memories": 2' in json_str or '"total_memories":2' in json_str
 
 
+class TestRetentionAndStatistics:
+    """Test heap-backed retention and running statistics."""
+
+    @pytest.mark.parametrize(
+        "policy", [RetentionPolicy.SIZE_LIMITED, RetentionPolicy.ADAPTIVE]
+    )
+    def test_eviction_matches_full_sort(self, policy):
+        """Test the heap evicts the same items a full sort would."""
+        import random
+
+        rng = random.Random(11)
+        memory = SemanticMemory(retention_policy=policy, max_size=10)
+        expected = {}
+        for i in range(40):
+            item = memory.add_memory(f"memory {i}", relevance_score=rng.random())
+            expected[item.item_id] = item
+
+            # Reference: what the sort-based policy keeps
+            items = list(expected.values())
+            if len(items) > 10:
+                if policy == RetentionPolicy.SIZE_LIMITED:
+                    ranked = sorted(items, key=lambda x: (x.relevance_score, x.access_count))
+                else:
+                    ranked = sorted(
+                        items,
+                        key=lambda x: (
+                            x.relevance_score * (x.access_count + 1),
+                            -x.created_at.timestamp(),
+                        ),
+                    )
+                for victim in ranked[: len(items) - 10]:
+                    del expected[victim.item_id]
+            assert set(memory.memories) == set(expected)
+
+            if i % 3 == 0:
+                memory.search(f"memory {rng.randrange(i + 1)}", top_k=2)
+            if i % 7 == 0:
+                memory.decay_all_relevance(0.9)
+
+    def test_time_based_keeps_recent_items(self):
+        """Test time-based retention only evicts items past the cutoff."""
+        memory = SemanticMemory(retention_policy=RetentionPolicy.TIME_BASED, max_size=2)
+        old = memory.add_memory("old")
+        old.created_at = datetime.now() - timedelta(days=40)
+        memory._rebuild_retention_heap()
+        memory.add_memory("new 1")
+        memory.add_memory("new 2")
+        assert old.item_id not in memory.memories
+        assert len(memory.memories) == 2
+
+    def test_statistics_track_add_update_delete(self):
+        """Test counters stay consistent with a full recomputation."""
+        memory = SemanticMemory(retention_policy=RetentionPolicy.INDEFINITE)
+        fact = memory.add_memory("Fact", memory_type=MemoryType.FACTUAL)
+        event = memory.add_memory("Event", memory_type=MemoryType.EPISODIC)
+        memory.search("Fact", top_k=1)
+        memory.update_memory(fact.item_id, content="Fact, revised", tags=["edited"])
+        memory._remove_item(event.item_id)
+
+        stats = memory.get_statistics()
+        assert stats["total_memories"] == 1
+        assert stats["memory_types"] == {"factual": 1}
+        assert stats["avg_access_count"] == fact.access_count
+        assert stats["total_size_bytes"] == len(str(fact.to_dict()).encode())
+        assert 0 <= stats["avg_age_seconds"] < 60
+
+        memory._remove_item(fact.item_id)
+        assert memory.get_statistics()["total_memories"] == 0
+
+    def test_access_counter_ignores_items_evicted_during_search(self):
+        """Test a hit removed before its access is recorded cannot skew the average."""
+        memory = SemanticMemory(retention_policy=RetentionPolicy.INDEFINITE)
+        kept = memory.add_memory("kept")
+        gone = memory.add_memory("gone")
+        memory.vector_index = None
+
+        def scan(query_embedding, top_k, min_similarity):
+            memory._remove_item(gone.item_id)
+            return [(kept, 1.0), (gone, 1.0)]
+
+        memory._scan = scan
+        memory.search("kept")
+
+        stats = memory.get_statistics()
+        assert stats["avg_access_count"] == kept.access_count == 1
+        memory._remove_item(kept.item_id)
+        assert memory._total_accesses == 0
+        assert memory.get_statistics()["avg_age"] is None
+
+    def test_remove_item_tolerates_items_added_directly(self):
+        """Test removing a memory written straight into the dict leaves counters intact."""
+        memory = SemanticMemory(retention_policy=RetentionPolicy.INDEFINITE)
+        tracked = memory.add_memory("tracked", memory_type=MemoryType.SEMANTIC)
+        direct = MemoryItem(content="direct", embedding=[0.0] * 4, memory_type=MemoryType.SEMANTIC)
+        memory.memories[direct.item_id] = direct
+
+        memory._remove_item(direct.item_id)
+
+        assert memory.get_statistics()["memory_types"] == {"semantic": 1}
+        memory._remove_item(tracked.item_id)
+        assert memory._type_counts == {}
+
+    def test_update_memory(self):
+        """Test updating content re-embeds and missing IDs return None."""
+        memory = SemanticMemory()
+        item = memory.add_memory("Python")
+        original = list(item.embedding)
+        assert memory.update_memory(item.item_id, content="Rust", relevance_score=0.3) is item
+        assert item.embedding != original
+        assert item.relevance_score == 0.3
+        assert memory.search("Rust", top_k=1).results[0][0] is item
+        assert memory.update_memory("missing", content="x") is None
+
+
 class TestSemanticSearch:
     """Test semantic search results."""
 
@@ -290,3 +290,116 @@ class TestSearchStrategies:
             
             assert len(results) > 0
             assert all(isinstance(doc, Document) for doc, _ in results)
+
+
+class CountingEmbeddings(HuggingFaceEmbeddings):
+    """HuggingFace fallback embeddings that count embedded texts."""
+    
+    def __init__(self):
+        super().__init__(model_name="sentence-transformers/all-MiniLM-L6-v2")
+        self.embedded = []
+    
+    async def embed_batch(self, texts):
+        self.embedded.extend(texts)
+        return await super().embed_batch(texts)
+
+
+class TestIncrementalIndexing:
+    """Tests for upsert/remove and the index manifest."""
+    
+    @pytest.mark.asyncio
+    async def test_upsert_embeds_only_new_or_changed(self, sample_documents):
+        """Test unchanged documents are not re-embedded."""
+        provider = CountingEmbeddings()
+        engine = SemanticSearchEngine(provider)
+        await engine.index(sample_documents)
+        provider.embedded.clear()
+        
+        changed = Document(
+            content="Dogs are loyal animals",
+            metadata={"type": "fact"},
+            source="test",
+            doc_id="doc_2"
+        )
+        added = Document(content="Rust is memory safe", source="test", doc_id="doc_new")
+        embedded = await engine.upsert(sample_documents[:2] + [changed, added])
+        
+        assert embedded == 2
+        assert provider.embedded == ["Dogs are loyal animals", "Rust is memory safe"]
+        assert len(engine.documents) == len(sample_documents) + 1
+        assert engine.keyword_index.score("cats") == {}
+        assert "doc_2" in engine.keyword_index.score("dogs")
+    
+    @pytest.mark.asyncio
+    async def test_metadata_only_change_skips_embedding(self, sample_documents):
+        """Test metadata edits update the filter index without embedding."""
+        provider = CountingEmbeddings()
+        engine = SemanticSearchEngine(provider)
+        await engine.index(sample_documents)
+        provider.embedded.clear()
+        
+        retagged = Document(
+            content=sample_documents[0].content,
+            metadata={"type": "fact"},
+            source="test",
+            doc_id="doc_0"
+        )
+        assert await engine.upsert([retagged]) == 0
+        assert provider.embedded == []
+        assert "doc_0" in engine.metadata_index.candidates({"type": "fact"})
+    
+    @pytest.mark.asyncio
+    async def test_reindex_reuses_unchanged_embeddings(self, sample_documents):
+        """Test index() only embeds the difference and drops missing docs."""
+        provider = CountingEmbeddings()
+        engine = SemanticSearchEngine(provider)
+        await engine.index(sample_documents)
+        provider.embedded.clear()
+        
+        await engine.index(sample_documents[1:])
+        assert provider.embedded == []
+        assert [doc.doc_id for doc in engine.documents] == [
+            doc.doc_id for doc in sample_documents[1:]
+        ]
+        assert "doc_0" not in engine.embeddings
+    
+    @pytest.mark.asyncio
+    async def test_remove(self, embeddings, sample_documents):
+        """Test removing documents from every index."""
+        engine = SemanticSearchEngine(embeddings)
+        await engine.index(sample_documents)
+        
+        assert engine.remove(["doc_2", "missing"]) == 1
+        assert "doc_2" not in engine.metadata_index.candidates({"type": "fact"})
+        results = await engine.search("cats animals", top_k=5)
+        assert all(doc.doc_id != "doc_2" for doc, _ in results)
+    
+    @pytest.mark.asyncio
+    async def test_manifest_roundtrip(self, sample_documents, tmp_path):
+        """Test a reloaded manifest answers queries without re-embedding."""
+        engine = SemanticSearchEngine(CountingEmbeddings())
+        await engine.index(sample_documents)
+        path = str(tmp_path / "manifest.json")
+        engine.save_manifest(path)
+        
+        provider = CountingEmbeddings()
+        restored = SemanticSearchEngine(provider)
+        assert restored.load_manifest(path) == len(sample_documents)
+        assert provider.embedded == []
+        
+        expected = await engine.search("programming", top_k=2)
+        actual = await restored.search("programming", top_k=2)
+        assert [doc.doc_id for doc, _ in actual] == [doc.doc_id for doc, _ in expected]
+        assert await restored.upsert(sample_documents) == 0
+    
+    @pytest.mark.asyncio
+    async def test_manifest_rejects_other_provider(self, sample_documents, tmp_path):
+        """Test a manifest from another embedding model is refused."""
+        engine = SemanticSearchEngine(HuggingFaceEmbeddings(model_name="model-a"))
+        await engine.index(sample_documents)
+        path = str(tmp_path / "manifest.json")
+        engine.save_manifest(path)
+        
+        other = SemanticSearchEngine(HuggingFaceEmbeddings(model_name="model-b"))
+        with pytest.raises(ValueError):
+            other.load_manifest(path)
@@ -0,0 +1,212 @@
+"""Tests for SQLite schema migrations and hot-query index coverage."""
+
+import re
+import sqlite3
+
+import pytest
+
+from agent_sdk.observability.stream_envelope import (
+    RunMetadata,
+    RunStatus,
+    SessionMetadata,
+    StreamChannel,
+    StreamEnvelope,
+)
+from agent_sdk.storage.control_plane import SQLiteControlPlane
+from agent_sdk.storage.sqlite import SQLiteStorage
+from agent_sdk.storage.sqlite_pool import SQLiteConnectionManager
+from agent_sdk.storage.sqlite_migrations import (
+    CONTROL_PLANE_MIGRATIONS,
+    STORAGE_MIGRATIONS,
+    Migration,
+    applied_versions,
+    apply_migrations,
+)
+
+# Statements that read or write rows; PRAGMAs, DDL and migration bookkeeping are skipped.
+_ROW_STATEMENT = re.compile(r"^\s*(SELECT|UPDATE|DELETE)\b.*\b(sessions|runs|events)\b", re.S)
+
+
+def _exercise_storage(storage):
+    """Call every SQLiteStorage query path, including the cursor and filter variants."""
+    session = SessionMetadata(session_id="s", org_id="o")
+    storage.create_session(session)
+    storage.create_session(SessionMetadata(session_id="s2", org_id="o"))
+    storage.update_session(session)
+    storage.get_session("s")
+    for org_id in (None, "o"):
+        page = storage.list_sessions_page(org_id=org_id, limit=1)
+        storage.list_sessions_page(org_id=org_id, limit=1, cursor=page.next_cursor)
+
+    for run_id in ("r", "r2"):
+        storage.create_run(RunMetadata(run_id=run_id, session_id="s", agent_id="a", org_id="o"))
+    storage.update_run(
+        RunMetadata(run_id="r", session_id="s", agent_id="a", org_id="o", status=RunStatus.RUNNING)
+    )
+    storage.get_run("r")
+    for filters in ({}, {"org_id": "o"}, {"session_id": "s"}):
+        page = storage.list_runs_page(limit=1, **filters)
+        storage.list_runs_page(limit=1, cursor=page.next_cursor, **filters)
+
+    storage.append_events(
+        [
+            StreamEnvelope(
+                run_id="r",
+                session_id="s",
+                stream=StreamChannel.LIFECYCLE,
+                event="tick",
+                payload={},
+                seq=seq,
+                metadata={"org_id": "o"},
+            )
+            for seq in range(3)
+        ]
+    )
+    for from_seq in (None, 1):
+        page = storage.list_events_page("r", limit=1, from_seq=from_seq)
+        storage.list_events_page("r", limit=1, from_seq=from_seq, cursor=page.next_cursor)
+    storage.delete_events("r", before_seq=1)
+    storage.recover_in_flight_runs()
+    storage.delete_events("r")
+    storage.prune_runs("o", "9999", limit=1)
+    storage.delete_run("r2")
+    storage.prune_sessions("o", "9999")
+    storage.delete_session("s")
+
+
+@pytest.fixture(scope="module")
+def storage_queries(tmp_path_factory):
+    """Every distinct row statement SQLiteStorage issues, as recorded by SQLite itself."""
+    statements = set()
+    original_open = SQLiteConnectionManager._open
+
+    def traced_open(manager, read_only):
+        conn = original_open(manager, read_only)
+        conn.set_trace_callback(statements.add)
+        return conn
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(SQLiteConnectionManager, "_open", traced_open)
+        storage = SQLiteStorage(str(tmp_path_factory.mktemp("trace") / "storage.db"))
+        try:
+            _exercise_storage(storage)
+        finally:
+            storage.close()
+    # The trace callback sees statements with their parameters already bound.
+    queries = [(sql, ()) for sql in sorted(statements) if _ROW_STATEMENT.match(sql)]
+    assert queries
+    return queries
+
+
+CONTROL_PLANE_QUERIES = [
+    ("SELECT * FROM orgs WHERE org_id = ?", ("o",)),
+    ("SELECT * FROM orgs ORDER BY created_at ASC", ()),
+    ("SELECT * FROM projects WHERE org_id = ?", ("o",)),
+    ("SELECT * FROM users WHERE org_id = ?", ("o",)),
+    ("SELECT * FROM api_keys WHERE org_id = ?", ("o",)),
+    ("SELECT org_id FROM api_keys WHERE key = ?", ("k",)),
+    ("SELECT key FROM api_keys WHERE key_id = ?", ("k",)),
+    ("SELECT max_runs FROM api_key_quotas WHERE key = ?", ("k",)),
+    ("SELECT max_runs FROM project_quotas WHERE project_id = ?", ("p",)),
+    ("SELECT MAX(version) AS max_version FROM policy_bundles WHERE bundle_id = ?", ("b",)),
+    (
+        "SELECT * FROM policy_approvals WHERE bundle_id = ? AND version = ? AND org_id IS ?",
+        ("b", 1, "o"),
+    ),
+    ("SELECT * FROM policy_approvals WHERE status = ? ORDER BY submitted_at DESC", ("pending",)),
+    ("SELECT * FROM policy_approvals WHERE org_id IS ? ORDER BY submitted_at DESC", ("o",)),
+    ("SELECT * FROM policy_approvals ORDER BY submitted_at DESC", ()),
+    ("SELECT * FROM backups ORDER BY created_at DESC", ()),
+    ("SELECT * FROM backups WHERE backup_id = ?", ("b",)),
+    ("SELECT * FROM webhook_subscriptions WHERE org_id = ?", ("o",)),
+    ("SELECT * FROM secret_rotation_policies WHERE org_id = ?", ("o",)),
+]
+
+_FULL_SCAN = re.compile(r"^SCAN \w+$")
+
+
+def _plan(conn, query, params):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+
+def _assert_indexed(conn, queries):
+    offenders = {}
+    for query, params in queries:
+        plan = _plan(conn, query, params)
+        if any(_FULL_SCAN.match(step) or "TEMP B-TREE" in step for step in plan):
+            offenders[query] = plan
+    assert offenders == {}
+
+
+def test_storage_hot_queries_use_indexes(tmp_path, storage_queries):
+    path = str(tmp_path / "storage.db")
+    SQLiteStorage(path).close()
+    with sqlite3.connect(path) as conn:
+        _assert_indexed(conn, storage_queries)
+
+
+def test_control_plane_hot_queries_use_indexes(tmp_path):
+    path = str(tmp_path / "control_plane.db")
+    SQLiteControlPlane(path)
+    with sqlite3.connect(path) as conn:
+        _assert_indexed(conn, CONTROL_PLANE_QUERIES)
+
+
+def test_unindexed_query_is_reported(tmp_path):
+    path = str(tmp_path / "storage.db")
+    SQLiteStorage(path).close()
+    with sqlite3.connect(path) as conn:
+        with pytest.raises(AssertionError):
+            _assert_indexed(conn, [("SELECT * FROM events WHERE stream = ?", ("assistant",))])
+
+
+def test_migrations_recorded_once_per_component(tmp_path):
+    path = str(tmp_path / "shared.db")
+    SQLiteStorage(path).close()
+    SQLiteStorage(path).close()
+    SQLiteControlPlane(path)
+    with sqlite3.connect(path) as conn:
+        assert applied_versions(conn, "storage") == [m.version for m in STORAGE_MIGRATIONS]
+        assert applied_versions(conn, "control_plane") == [
+            m.version for m in CONTROL_PLANE_MIGRATIONS
+        ]
+        assert conn.execute("SELECT COUNT(*) FROM schema_migrations").fetchone()[0] == len(
+            STORAGE_MIGRATIONS
+        ) + len(CONTROL_PLANE_MIGRATIONS)
+
+
+def test_legacy_database_is_upgraded(tmp_path, storage_queries):
+    path = str(tmp_path / "legacy.db")
+    with sqlite3.connect(path) as conn:
+        # Pre-org_id schema without any secondary indexes.
+        conn.execute(
+            "CREATE TABLE runs (run_id TEXT PRIMARY KEY, session_id TEXT, agent_id TEXT, "
+            "status TEXT, model TEXT, created_at TEXT, started_at TEXT, ended_at TEXT, "
+            "tags_json TEXT, metadata_json TEXT)"
+        )
+        conn.execute(
+            "CREATE TABLE events (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT, "
+            "session_id TEXT, stream TEXT, event TEXT, payload_json TEXT, timestamp TEXT, "
+            "seq INTEGER, status TEXT, metadata_json TEXT)"
+        )
+        conn.execute("INSERT INTO events (run_id, seq) VALUES ('run_1', 0)")
+
+    storage = SQLiteStorage(path)
+    storage.close()
+    with sqlite3.connect(path) as conn:
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(events)")}
+        assert {"idx_events_run_id", "idx_events_run_seq"} <= indexes
+        _assert_indexed(conn, storage_queries)
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 1
+
+
+def test_apply_migrations_runs_pending_in_order():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE items (value INTEGER)")
+    first = Migration(1, "index_value", ("CREATE INDEX idx_items_value ON items (value)",))
+    second = Migration(2, "add_label", ("ALTER TABLE items ADD COLUMN label TEXT",))
+
+    assert apply_migrations(conn, "test", [second, first]) == [1, 2]
+    assert apply_migrations(conn, "test", [first, second]) == []
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(items)")}
+    assert "label" in columns
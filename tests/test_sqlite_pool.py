@@ -0,0 +1,123 @@
+"""Tests for the SQLite connection manager."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from agent_sdk.observability.stream_envelope import StreamChannel, StreamEnvelope
+from agent_sdk.storage.sqlite import SQLiteStorage
+from agent_sdk.storage.sqlite_pool import SQLiteConnectionManager
+
+
+def _manager(tmp_path):
+    manager = SQLiteConnectionManager(str(tmp_path / "pool.db"))
+    with manager.writer() as conn:
+        conn.execute("CREATE TABLE items (value INTEGER)")
+    return manager
+
+
+def test_pragmas_applied(tmp_path):
+    manager = _manager(tmp_path)
+    with manager.writer() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -16 * 1024
+    with manager.reader() as conn:
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+    manager.close()
+
+
+def test_reader_connection_reused_per_thread(tmp_path):
+    manager = _manager(tmp_path)
+    with manager.reader() as first:
+        pass
+    with manager.reader() as second:
+        pass
+    assert first is second
+
+    seen = []
+
+    def read():
+        with manager.reader() as conn:
+            seen.append(conn)
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    thread.join()
+    assert seen[0] is not first
+    assert manager.reader_count == 2
+    manager.close()
+
+
+def test_writer_rolls_back_on_error(tmp_path):
+    manager = _manager(tmp_path)
+    with pytest.raises(RuntimeError):
+        with manager.writer() as conn:
+            conn.execute("INSERT INTO items VALUES (1)")
+            raise RuntimeError("boom")
+    with manager.writer() as conn:
+        conn.execute("INSERT INTO items VALUES (2)")
+    with manager.reader() as conn:
+        assert [row[0] for row in conn.execute("SELECT value FROM items")] == [2]
+    manager.close()
+
+
+def test_readers_cannot_write(tmp_path):
+    manager = _manager(tmp_path)
+    with manager.reader() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO items VALUES (1)")
+    manager.close()
+
+
+def test_in_memory_shares_writer():
+    manager = SQLiteConnectionManager(":memory:")
+    with manager.writer() as conn:
+        conn.execute("CREATE TABLE items (value INTEGER)")
+        conn.execute("INSERT INTO items VALUES (1)")
+    with manager.reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+    manager.close()
+
+
+def test_closed_manager_rejects_use(tmp_path):
+    manager = _manager(tmp_path)
+    manager.close()
+    manager.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        with manager.reader():
+            pass
+
+
+def test_storage_concurrent_writers_and_readers(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "storage.db"))
+    errors = []
+
+    def work(worker):
+        try:
+            for seq in range(25):
+                storage.append_event(
+                    StreamEnvelope(
+                        run_id=f"run_{worker}",
+                        session_id="sess",
+                        stream=StreamChannel.ASSISTANT,
+                        event="delta",
+                        payload={"seq": seq},
+                        seq=seq,
+                        metadata={"org_id": "default"},
+                    )
+                )
+                assert len(storage.list_events(f"run_{worker}")) == seq + 1
+        except Exception as exc:  # pragma: no cover - surfaced below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [e.payload["seq"] for e in storage.list_events("run_3")] == list(range(25))
+    storage.close()
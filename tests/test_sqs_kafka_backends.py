@@ -1,28 +1,58 @@
 """Tests for SQS and Kafka queue backends with fake clients."""
 
+import time
+from collections import Counter
 from types import SimpleNamespace
 
 from agent_sdk.execution.durable_queue import SQSQueueBackend, KafkaQueueBackend
 
 
 class FakeSQS:
+    """In-process SQS stand-in with visibility timeouts and per-call accounting."""
+
     def __init__(self):
         self.messages = []
+        self.calls = Counter()
+        self.deleted = []
 
     def send_message(self, QueueUrl, MessageBody):
+        self.calls["send_message"] += 1
         message_id = f"msg-{len(self.messages)}"
-        self.messages.append({"MessageId": message_id, "Body": MessageBody, "ReceiptHandle": message_id})
+        self.messages.append(
+            {"MessageId": message_id, "Body": MessageBody, "ReceiptHandle": message_id, "visible_at": 0.0}
+        )
         return {"MessageId": message_id}
 
-    def receive_message(self, QueueUrl, MaxNumberOfMessages=1, WaitTimeSeconds=0):
-        if not self.messages:
-            return {"Messages": []}
-        msg = self.messages.pop(0)
-        return {"Messages": [msg]}
+    def receive_message(self, QueueUrl, MaxNumberOfMessages=1, WaitTimeSeconds=0, VisibilityTimeout=30):
+        self.calls["receive_message"] += 1
+        now = time.monotonic()
+        batch = [msg for msg in self.messages if msg["visible_at"] <= now][:MaxNumberOfMessages]
+        for msg in batch:
+            msg["visible_at"] = now + VisibilityTimeout
+        return {"Messages": [{key: msg[key] for key in ("MessageId", "Body", "ReceiptHandle")} for msg in batch]}
+
+    def change_message_visibility(self, QueueUrl, ReceiptHandle, VisibilityTimeout):
+        self.calls["change_message_visibility"] += 1
+        for msg in self.messages:
+            if msg["ReceiptHandle"] == ReceiptHandle:
+                msg["visible_at"] = time.monotonic() + VisibilityTimeout
 
     def delete_message(self, QueueUrl, ReceiptHandle):
+        self.calls["delete_message"] += 1
+        self._delete(ReceiptHandle)
         return {}
 
+    def delete_message_batch(self, QueueUrl, Entries):
+        self.calls["delete_message_batch"] += 1
+        assert len(Entries) <= 10
+        for entry in Entries:
+            self._delete(entry["ReceiptHandle"])
+        return {"Successful": [{"Id": entry["Id"]} for entry in Entries], "Failed": []}
+
+    def _delete(self, receipt):
+        self.deleted.append(receipt)
+        self.messages = [msg for msg in self.messages if msg["ReceiptHandle"] != receipt]
+
 
 def test_sqs_queue_backend_roundtrip():
     client = FakeSQS()
@@ -33,6 +63,71 @@ def test_sqs_queue_backend_roundtrip():
     assert job.payload["task"] == "ping"
 
 
+def test_sqs_queue_backend_batches_receives_and_deletes():
+    client = FakeSQS()
+    backend = SQSQueueBackend(queue_url="queue-url", client=client)
+    for index in range(25):
+        backend.enqueue({"index": index}, max_attempts=1)
+
+    seen = []
+    while True:
+        job = backend.claim_blocking(timeout=0)
+        if job is None:
+            break
+        seen.append(job.payload["index"])
+        backend.mark_done(job.job_id)
+    backend.flush_acks()
+
+    assert seen == list(range(25))
+    assert client.calls["receive_message"] == 4
+    assert client.calls["delete_message_batch"] == 3
+    assert client.calls["delete_message"] == 0
+    assert client.messages == []
+
+
+def test_sqs_queue_backend_extends_and_drops_stale_prefetch():
+    client = FakeSQS()
+    backend = SQSQueueBackend(queue_url="queue-url", client=client, visibility_timeout=1)
+    for index in range(3):
+        backend.enqueue({"index": index}, max_attempts=1)
+
+    first = backend.claim_next()
+    assert backend.extend_lease(first.job_id) is True
+    assert client.calls["change_message_visibility"] == 1
+
+    time.sleep(0.6)
+    second = backend.claim_next()
+    assert second.payload["index"] == 1
+    assert client.calls["change_message_visibility"] == 2
+
+    time.sleep(1.0)
+    stale = backend.claim_next()
+    assert stale is not None
+    assert client.calls["receive_message"] == 2
+    backend.mark_done(first.job_id)
+    assert backend.extend_lease(first.job_id) is False
+
+
+def test_sqs_queue_backend_bounds_how_long_acks_wait():
+    client = FakeSQS()
+    backend = SQSQueueBackend(queue_url="queue-url", client=client, max_ack_delay=0.05)
+    for index in range(3):
+        backend.enqueue({"index": index}, max_attempts=1)
+
+    first = backend.claim_next()
+    backend.mark_done(first.job_id)
+    assert client.deleted == []
+
+    time.sleep(0.1)
+    # Served from the prefetch buffer, but the overdue ack goes out first.
+    second = backend.claim_next()
+    assert client.calls["receive_message"] == 1
+    assert client.deleted == [first.job_id]
+
+    backend.requeue(second, "retry")
+    assert client.deleted == [first.job_id, second.job_id]
+
+
 class FakeKafkaProducer:
     def __init__(self, store):
         self.store = store
@@ -0,0 +1,128 @@
+"""
+Tests for keyset pagination in storage backends.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from agent_sdk.observability.stream_envelope import (
+    RunMetadata,
+    RunStatus,
+    SessionMetadata,
+    StreamChannel,
+    StreamEnvelope,
+)
+from agent_sdk.storage.pagination import decode_cursor, encode_cursor
+from agent_sdk.storage.sqlite import SQLiteStorage
+from agent_sdk.testing.mocks import InMemoryStorage
+
+
+def _populate(storage):
+    for index in range(7):
+        created_at = "2026-01-01T00:00:00+00:00" if index < 4 else f"2026-01-0{index}T00:00:00+00:00"
+        org_id = "org_a" if index % 2 == 0 else "org_b"
+        storage.create_session(SessionMetadata(session_id=f"sess_{index}", org_id=org_id, created_at=created_at))
+        storage.create_run(
+            RunMetadata(
+                run_id=f"run_{index}",
+                session_id="sess_shared" if index < 3 else f"sess_{index}",
+                agent_id="agent",
+                org_id=org_id,
+                status=RunStatus.RUNNING,
+                created_at=created_at,
+            )
+        )
+    for seq in range(9):
+        storage.append_event(
+            StreamEnvelope(
+                run_id="run_0",
+                session_id="sess_shared",
+                stream=StreamChannel.ASSISTANT,
+                event="token",
+                payload={"seq": seq},
+                seq=seq,
+            )
+        )
+
+
+def _drain(fetch, limit):
+    items, cursor = [], None
+    while True:
+        page = fetch(limit=limit, cursor=cursor)
+        assert len(page.items) <= limit
+        items.extend(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            return items
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def storage(request):
+    if request.param == "memory":
+        backend = InMemoryStorage()
+        _populate(backend)
+        yield backend
+        return
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = SQLiteStorage(os.path.join(tmpdir, "storage.db"))
+        _populate(backend)
+        yield backend
+        backend.close()
+
+
+def test_runs_pages_cover_all_rows_once_newest_first(storage):
+    runs = _drain(storage.list_runs_page, limit=3)
+    assert [run.run_id for run in runs] == ["run_6", "run_5", "run_4", "run_3", "run_2", "run_1", "run_0"]
+
+    org_runs = _drain(lambda **kw: storage.list_runs_page(org_id="org_a", **kw), limit=2)
+    assert [run.run_id for run in org_runs] == ["run_6", "run_4", "run_2", "run_0"]
+
+    session_runs = _drain(lambda **kw: storage.list_runs_page(session_id="sess_shared", **kw), limit=1)
+    assert [run.run_id for run in session_runs] == ["run_2", "run_1", "run_0"]
+
+
+def test_sessions_pages_filter_by_org(storage):
+    sessions = _drain(lambda **kw: storage.list_sessions_page(org_id="org_b", **kw), limit=2)
+    assert [session.session_id for session in sessions] == ["sess_5", "sess_3", "sess_1"]
+
+
+def test_events_pages_follow_append_order(storage):
+    events = _drain(lambda **kw: storage.list_events_page("run_0", **kw), limit=4)
+    assert [event.seq for event in events] == list(range(9))
+
+    tail = _drain(lambda **kw: storage.list_events_page("run_0", from_seq=5, **kw), limit=3)
+    assert [event.seq for event in tail] == [5, 6, 7, 8]
+
+
+def test_non_positive_limit_returns_an_empty_page():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = SQLiteStorage(os.path.join(tmpdir, "storage.db"))
+        _populate(storage)
+        for limit in (0, -1):
+            assert storage.list_runs_page(limit=limit).items == []
+            assert storage.list_sessions_page(limit=limit).items == []
+            assert storage.list_events_page("run_0", limit=limit).items == []
+        storage.close()
+
+
+def test_sqlite_event_cursor_is_bound_to_run():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = SQLiteStorage(os.path.join(tmpdir, "storage.db"))
+        _populate(storage)
+        page = storage.list_events_page("run_0", limit=2)
+        with pytest.raises(ValueError):
+            storage.list_events_page("run_1", cursor=page.next_cursor)
+        with pytest.raises(ValueError):
+            storage.list_runs_page(cursor=page.next_cursor)
+        storage.close()
+
+
+def test_cursor_roundtrip_and_rejects_garbage():
+    cursor = encode_cursor("run", "2026-01-01T00:00:00+00:00", "run_1")
+    assert decode_cursor(cursor, "run", 2) == ["2026-01-01T00:00:00+00:00", "run_1"]
+    with pytest.raises(ValueError):
+        decode_cursor("%%%", "run", 2)
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "session", 2)
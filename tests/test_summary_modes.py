@@ -0,0 +1,157 @@
+"""Tests for executor step summarization modes."""
+
+import asyncio
+import json
+
+import pytest
+
+from agent_sdk.config.model_config import ModelConfig
+from agent_sdk.core.context import AgentContext
+from agent_sdk.core.messages import make_message
+from agent_sdk.core.tools import Tool
+from agent_sdk.execution.executor import ExecutorAgent
+from agent_sdk.llm.mock import MockLLMClient
+from agent_sdk.observability.bus import EventBus
+from agent_sdk.observability.events import ObsEvent
+from agent_sdk.observability.metrics import MetricsCollector
+from agent_sdk.observability.metrics_pipeline import ObsMetricsSink
+from agent_sdk.planning.plan_schema import Plan, PlanStep
+
+
+class ListSink:
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event)
+
+    def of_type(self, event_type):
+        return [e for e in self.events if e.event_type == event_type]
+
+
+class CountingLLM(MockLLMClient):
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, messages, model_config):
+        self.calls += 1
+        return super().generate(messages, model_config)
+
+
+def _executor(mode, max_parallel_steps=1):
+    sink = ListSink()
+    context = AgentContext(
+        tools={"echo": Tool(name="echo", description="e", func=lambda inputs: inputs["text"])},
+        model_config=ModelConfig(name="mock", provider="mock", model_id="mock"),
+        events=EventBus([sink]),
+    )
+    context.config["summary_mode"] = mode
+    context.config["max_parallel_steps"] = max_parallel_steps
+    llm = CountingLLM()
+    return ExecutorAgent("executor", context, llm), llm, sink
+
+
+def _plan(width=3):
+    return Plan(
+        task="echo things",
+        steps=[
+            PlanStep(id=i, description=f"echo {i}", tool="echo", inputs={"text": f"out-{i}"}, depends_on=[])
+            for i in range(1, width + 1)
+        ],
+    )
+
+
+def test_per_step_mode_calls_llm_for_every_step():
+    executor, llm, sink = _executor("per_step")
+
+    messages = executor.execute_plan(_plan())
+
+    assert llm.calls == 3
+    assert len(messages) == 3
+    (summary,) = sink.of_type("executor.summary")
+    usage = sink.of_type("llm.usage")
+    assert summary.data["mode"] == "per_step"
+    assert summary.data["llm_calls"] == 3
+    assert summary.data["total_tokens"] == sum(e.data["total_tokens"] for e in usage)
+
+
+def test_batched_mode_makes_one_llm_call_after_all_steps():
+    executor, llm, sink = _executor("batched")
+
+    messages = executor.execute_plan(_plan())
+
+    assert llm.calls == 1
+    assert [m.metadata["type"] for m in messages] == ["execution_step"] * 3 + ["execution_summary"]
+    assert "Step 2 succeeded: out-2" in messages[1].content
+    assert all(f"out-{i}" in messages[-1].content for i in (1, 2, 3))
+    assert executor.context.short_term[-1] is messages[-1]
+    (summary,) = sink.of_type("executor.summary")
+    assert summary.data["llm_calls"] == 1
+    assert summary.data["total_tokens"] > 0
+    types = [e.event_type for e in sink.events]
+    assert types.index("llm.usage") > max(i for i, t in enumerate(types) if t == "executor.step.complete")
+
+
+def test_template_mode_makes_no_llm_calls():
+    executor, llm, sink = _executor("template", max_parallel_steps=3)
+
+    messages = executor.execute_plan(_plan())
+
+    assert llm.calls == 0
+    assert [m.content.splitlines()[-1] for m in messages] == [
+        f"Result: Step {i} succeeded: out-{i}" for i in (1, 2, 3)
+    ]
+    (summary,) = sink.of_type("executor.summary")
+    assert summary.data == {
+        "mode": "template",
+        "llm_calls": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "total_tokens": 0,
+        "latency_ms": 0.0,
+        "steps": 3,
+    }
+
+
+def test_batched_mode_async_and_parallel():
+    executor, _, sink = _executor("batched", max_parallel_steps=3)
+
+    messages = asyncio.run(executor.execute_plan_async(_plan()))
+
+    assert len(messages) == 4
+    assert messages[-1].metadata["type"] == "execution_summary"
+    assert len(sink.of_type("llm.usage")) == 1
+    assert sink.of_type("executor.summary")[0].data["llm_calls"] == 1
+
+
+@pytest.mark.parametrize("mode", ["sometimes", "none"])
+def test_unknown_summary_mode_is_rejected(mode):
+    executor, _, _ = _executor(mode)
+    with pytest.raises(ValueError, match="summary_mode"):
+        executor.execute_plan(_plan())
+
+
+def test_metrics_sink_records_summary_usage_by_mode():
+    collector = MetricsCollector()
+    sink = ObsMetricsSink(collector)
+
+    sink.emit(ObsEvent("executor.summary", "executor", {"mode": "batched", "total_tokens": 42, "latency_ms": 3.0}))
+
+    assert collector.get_metric("executor_summary_tokens").get_latest_value() == 42
+    assert collector.get_metric("executor_summary_latency_ms").get_count() == 1
+
+
+def test_step_returns_last_step_message_in_batched_mode():
+    executor, _, _ = _executor("batched")
+    incoming = make_message("user", json.dumps({
+        "task": "echo things",
+        "steps": [{"id": 1, "description": "echo", "tool": "echo", "inputs": {"text": "out-1"}}],
+    }))
+
+    reply = executor.step(incoming)
+    reply_async = asyncio.run(executor.step_async(incoming))
+
+    for message in (reply, reply_async):
+        assert message.metadata["type"] == "execution_step"
+        assert message.metadata["step_id"] == 1
+    assert executor.context.short_term[-1].metadata["type"] == "execution_summary"
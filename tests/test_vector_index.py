@@ -0,0 +1,112 @@
+"""
+Tests for in-process vector indexes.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agent_sdk.memory import (
+    MockEmbeddingProvider,
+    NumpyVectorIndex,
+    RetentionPolicy,
+    SemanticMemory,
+)
+
+
+class TestNumpyVectorIndex:
+    """Test NumpyVectorIndex behavior."""
+
+    def test_add_and_search(self):
+        """Test top-k ordering by cosine similarity."""
+        index = NumpyVectorIndex()
+        index.add("x", [1.0, 0.0])
+        index.add("y", [0.0, 1.0])
+        index.add("xy", [1.0, 1.0])
+
+        results = index.search([1.0, 0.1], top_k=2)
+        assert [item_id for item_id, _ in results] == ["x", "xy"]
+        assert results[0][1] == pytest.approx(0.995, abs=1e-3)
+        assert len(index) == 3
+        assert "xy" in index
+
+    def test_replace_existing_vector(self):
+        """Test that re-adding an ID updates its row in place."""
+        index = NumpyVectorIndex()
+        index.add("a", [1.0, 0.0])
+        index.add("a", [0.0, 1.0])
+        assert len(index) == 1
+        assert index.search([0.0, 1.0], top_k=1)[0] == ("a", pytest.approx(1.0))
+
+    def test_remove_excludes_from_results(self):
+        """Test that removed items are never returned."""
+        index = NumpyVectorIndex(compaction_ratio=1.0)
+        index.add("a", [1.0, 0.0])
+        index.add("b", [0.9, 0.1])
+        assert index.remove("a") is True
+        assert index.remove("a") is False
+        assert index.tombstones == 1
+        assert [item_id for item_id, _ in index.search([1.0, 0.0], top_k=5)] == ["b"]
+
+    def test_compaction_preserves_order(self):
+        """Test tombstone compaction keeps live rows in insertion order."""
+        index = NumpyVectorIndex(initial_capacity=2, compaction_ratio=0.2)
+        for i in range(8):
+            index.add(f"id{i}", [1.0, 0.0])
+        index.remove("id1")
+        index.remove("id3")
+        assert index.compactions >= 1
+        assert index.tombstones == 0
+        ids = [item_id for item_id, _ in index.search([1.0, 0.0], top_k=10)]
+        assert ids == ["id0", "id2", "id4", "id5", "id6", "id7"]
+
+    def test_dimension_mismatch_raises(self):
+        """Test that vectors must share the index dimension."""
+        index = NumpyVectorIndex(dimension=3)
+        with pytest.raises(ValueError):
+            index.add("a", [1.0, 0.0])
+
+    def test_clear(self):
+        """Test clearing the index."""
+        index = NumpyVectorIndex()
+        index.add("a", [1.0, 0.0])
+        index.clear()
+        assert len(index) == 0
+        assert index.search([1.0, 0.0]) == []
+
+
+class TestSemanticMemoryIndex:
+    """Test that SemanticMemory keeps its index in sync."""
+
+    def test_index_matches_linear_scan(self):
+        """Test indexed search returns the same ranking as a scan."""
+        provider = MockEmbeddingProvider(dimension=64)
+        indexed = SemanticMemory(embedding_provider=provider)
+        scanned = SemanticMemory(embedding_provider=provider, use_vector_index=False)
+        texts = [f"topic {i % 7} detail {i} note {i % 3}" for i in range(50)]
+        for text in texts:
+            indexed.add_memory(text)
+            scanned.add_memory(text)
+
+        assert scanned.vector_index is None
+        expected = [
+            (item.content, score)
+            for item, score in scanned.search("topic 3 note 1", top_k=5).results
+        ]
+        actual = [
+            (item.content, score)
+            for item, score in indexed.search("topic 3 note 1", top_k=5).results
+        ]
+        # float32 rounding may reorder exact ties, so compare scores.
+        assert actual[0][0] == expected[0][0]
+        assert [score for _, score in actual] == pytest.approx(
+            [score for _, score in expected], abs=1e-5
+        )
+
+    def test_retention_removes_from_index(self):
+        """Test evicted memories disappear from the index."""
+        memory = SemanticMemory(retention_policy=RetentionPolicy.SIZE_LIMITED, max_size=2)
+        memory.add_memory("alpha")
+        memory.add_memory("beta")
+        memory.add_memory("gamma")
+        assert len(memory.vector_index) == len(memory.memories) == 2
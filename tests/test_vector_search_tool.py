@@ -1,5 +1,10 @@
 """Tests for vector.search tool behavior."""
 
+import asyncio
+
+from agent_sdk.data_connectors.document import Document
+from agent_sdk.memory.persistence import SQLiteVectorStore
+from agent_sdk.memory.semantic_memory import MockEmbeddingProvider
 from agent_sdk.tool_packs.builtin import TOOL_DEFINITIONS
 
 
@@ -20,3 +25,21 @@ def test_vector_search_returns_citations():
     assert "citations" in payload
     assert len(payload["citations"]) == 2
     assert payload["citations"][0]["doc_id"] == "doc1"
+
+
+def test_vector_search_reads_stored_embeddings(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "vectors.db")
+    monkeypatch.setenv("AGENT_SDK_VECTOR_DB_PATH", db_path)
+    embedder = MockEmbeddingProvider()
+    store = SQLiteVectorStore(db_path)
+    docs = [
+        Document(content="Python is a programming language", source="wiki", doc_id="doc1"),
+        Document(content="Cats are animals", source="wiki", doc_id="doc2"),
+    ]
+    asyncio.run(store.save_many([(doc, embedder.embed(doc.content)) for doc in docs]))
+    store.close()
+
+    tool = TOOL_DEFINITIONS["vector.search"].func
+    payload = tool({"query": "programming language", "top_k": 1})
+
+    assert [match["doc_id"] for match in payload["matches"]] == ["doc1"]